@@ -4,6 +4,7 @@ Clean, intuitive tools that mirror human cognitive functions
 """
 
 import logging
+import os
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from mcp.server.fastmcp import FastMCP
@@ -16,8 +17,22 @@ class BrainInterface:
     def __init__(self, mcp_server: FastMCP, mcp_client):
         self.mcp = mcp_server
         self.client = mcp_client
+        # Long-lived thinking engine, created on the first enhanced analysis
+        self._thinking_system = None
         # Remove decorator-based registration - we'll register tools directly in main.py
     
+    def get_thinking_system(self):
+        """The shared EnhancedThinkingSystem for this interface's database"""
+        db_path = getattr(self.client, 'db_path', "brain_memory_store/brain.db")
+        if self._thinking_system is None or self._thinking_system.db_path != db_path:
+            from core.brain.enhanced_thinking_system import EnhancedThinkingSystem
+            if self._thinking_system is not None:
+                self._thinking_system.close()
+            # THINKING_SNAPSHOT_INTERVAL: seconds before the cached health metrics are re-read
+            interval = float(os.getenv("THINKING_SNAPSHOT_INTERVAL", "30"))
+            self._thinking_system = EnhancedThinkingSystem(db_path, snapshot_interval=interval)
+        return self._thinking_system
+    
     # Standalone async functions for direct MCP registration
     
     async def analyze_with_context(self, message: str, context: str = "conversation") -> dict:
@@ -35,11 +50,7 @@ class BrainInterface:
         try:
             # Use enhanced thinking system for system analysis and optimization contexts
             if context in ["system_analysis", "continuous_improvement", "optimization", "background_processing", "iteration_loops"]:
-                from core.brain.enhanced_thinking_system import EnhancedThinkingSystem
-                
-                # Get database path from the client or use default
-                db_path = getattr(self.client, 'db_path', "brain_memory_store/brain.db")
-                thinking_system = EnhancedThinkingSystem(db_path)
+                thinking_system = self.get_thinking_system()
                 enhanced_result = await thinking_system.think_deeply(message, context)
                 
                 logger.info(f"🧠 Enhanced analysis completed: {enhanced_result.get('thinking_effectiveness', 0):.1%} effectiveness")
@@ -492,11 +503,7 @@ class BrainInterface:
         and provides detailed insights for continuous improvement.
         """
         try:
-            from core.brain.enhanced_thinking_system import EnhancedThinkingSystem
-            
-            # Get database path from the client or use default
-            db_path = getattr(self.client, 'db_path', "brain_memory_store/brain.db")
-            thinking_system = EnhancedThinkingSystem(db_path)
+            thinking_system = self.get_thinking_system()
             
             # Perform comprehensive system analysis
             system_analysis = await thinking_system.think_deeply(
@@ -643,7 +650,8 @@ class BrainInterface:
             }
         }
     
-    async def get_comprehensive_logs(self, log_level: str = "INFO", max_lines: int = 1000) -> dict:
+    async def get_comprehensive_logs(self, log_level: str = "INFO", max_lines: int = 1000,
+                                     since: Optional[str] = None, until: Optional[str] = None) -> dict:
         """
         📋 Get comprehensive system logs with detailed analysis
         
@@ -653,12 +661,14 @@ class BrainInterface:
         Args:
             log_level: Minimum log level to include (DEBUG, INFO, WARNING, ERROR)
             max_lines: Maximum number of log lines to retrieve
+            since: Only include log records at or after this ISO timestamp
+            until: Only include log records at or before this ISO timestamp
         """
         try:
-            import os
-            import glob
             import sqlite3
             from datetime import datetime, timedelta
+            from core.memory.database.row_counters import get_row_counts
+            from utils.log_tail import collect_log_tail
             
             # Get database path from the client or use default
             db_path = getattr(self.client, 'db_path', "brain_memory_store/brain.db")
@@ -673,17 +683,15 @@ class BrainInterface:
                 "log_summary": {}
             }
             
-            # 1. System logs from main application
+            # 1. System logs from main application (read backwards from the end of each file)
             try:
-                if os.path.exists("logs"):
-                    log_files = glob.glob("logs/*.log")
-                    for log_file in log_files[-3:]:  # Last 3 log files
-                        try:
-                            with open(log_file, 'r') as f:
-                                lines = f.readlines()[-max_lines:]
-                                logs["system_logs"].extend([line.strip() for line in lines if line.strip()])
-                        except Exception as e:
-                            logs["system_logs"].append(f"Error reading {log_file}: {str(e)}")
+                tail = collect_log_tail(
+                    "logs", max_lines, min_level=log_level,
+                    since=datetime.fromisoformat(since) if since else None,
+                    until=datetime.fromisoformat(until) if until else None
+                )
+                logs["system_logs"] = tail["lines"]
+                logs["log_files"] = tail["files"]
             except Exception as e:
                 logs["system_logs"].append(f"Error accessing log directory: {str(e)}")
             
@@ -724,12 +732,10 @@ class BrainInterface:
                         for row in pipeline_activity
                     ]
                     
-                    # Get learning bits summary
-                    cursor.execute("SELECT COUNT(*) FROM learning_bits")
-                    total_learning_bits = cursor.fetchone()[0]
-                    
-                    cursor.execute("SELECT COUNT(*) FROM cross_references")
-                    total_cross_references = cursor.fetchone()[0]
+                    # Get learning bits summary from the trigger-maintained row counters
+                    row_counts = get_row_counts(conn, ("learning_bits", "cross_references"))
+                    total_learning_bits = row_counts["learning_bits"]
+                    total_cross_references = row_counts["cross_references"]
                     
                     logs["performance_metrics"]["knowledge_base"] = {
                         "total_learning_bits": total_learning_bits,
@@ -8,6 +8,7 @@ import asyncio
 import sqlite3
 import json
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
@@ -15,7 +16,22 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 class EnhancedDreamSystem:
-    """Enhanced dream system that leverages context injection for advanced memory processing"""
+    """Enhanced dream system that leverages context injection for advanced memory processing
+    
+    A dream runs all phases in one transaction. Every phase is set-based SQL
+    inside its own savepoint (a failing phase is rolled back on its own) and
+    keeps a high-water mark of the learning bit and cross-reference ids it
+    has processed, so each dream only looks at rows added since the last one.
+    """
+    
+    # (phase key, title, method, result key)
+    PHASES = (
+        ('consolidation', "Context-Aware Memory Consolidation", '_context_aware_memory_consolidation', 'consolidation_process'),
+        ('patterns', "Cross-Reference Pattern Analysis", '_analyze_cross_reference_patterns', 'pattern_analysis'),
+        ('relationships', "Learning Relationship Enhancement", '_enhance_learning_relationships', 'relationship_enhancement'),
+        ('context', "Context Injection Optimization", '_optimize_context_injection', 'context_optimization'),
+        ('synthesis', "Knowledge Synthesis and Creativity", '_knowledge_synthesis_and_creativity', 'knowledge_synthesis'),
+    )
     
     def __init__(self, db_path: str):
         self.db_path = db_path
@@ -23,6 +39,7 @@ class EnhancedDreamSystem:
         self._init_dream_metrics_table()
         # Load existing metrics from database
         self.dream_cycles, self.consolidation_metrics = self._load_dream_metrics()
+        self.last_phase_stats = self._load_phase_stats()
     
     async def dream(self) -> Dict[str, Any]:
         """Enhanced dream process leveraging context injection capabilities"""
@@ -33,41 +50,40 @@ class EnhancedDreamSystem:
         logger.info(f"📊 Current Dream Cycle: {self.dream_cycles}")
         logger.info(f"📈 Current Metrics: {self.consolidation_metrics}")
         
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
         try:
-            # Phase 1: Context-Aware Memory Consolidation
-            logger.info("🚀 PHASE 1: Context-Aware Memory Consolidation")
-            phase1_start = datetime.now()
-            consolidation_result = await self._context_aware_memory_consolidation()
-            phase1_duration = (datetime.now() - phase1_start).total_seconds()
-            logger.info(f"✅ Phase 1 Completed in {phase1_duration:.2f}s: {consolidation_result}")
-            
-            # Phase 2: Cross-Reference Pattern Analysis
-            logger.info("🚀 PHASE 2: Cross-Reference Pattern Analysis")
-            phase2_start = datetime.now()
-            pattern_result = await self._analyze_cross_reference_patterns()
-            phase2_duration = (datetime.now() - phase2_start).total_seconds()
-            logger.info(f"✅ Phase 2 Completed in {phase2_duration:.2f}s: {pattern_result}")
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
             
-            # Phase 3: Learning Relationship Enhancement
-            logger.info("🚀 PHASE 3: Learning Relationship Enhancement")
-            phase3_start = datetime.now()
-            relationship_result = await self._enhance_learning_relationships()
-            phase3_duration = (datetime.now() - phase3_start).total_seconds()
-            logger.info(f"✅ Phase 3 Completed in {phase3_duration:.2f}s: {relationship_result}")
+            # Every phase sees the same snapshot: rows up to the current maximum ids
+            high_bit_id = self._max_id(cursor, 'learning_bits')
+            high_ref_id = self._max_id(cursor, 'cross_references')
+            watermarks = self._load_watermarks(cursor)
             
-            # Phase 4: Context Injection Optimization
-            logger.info("🚀 PHASE 4: Context Injection Optimization")
-            phase4_start = datetime.now()
-            context_result = await self._optimize_context_injection()
-            phase4_duration = (datetime.now() - phase4_start).total_seconds()
-            logger.info(f"✅ Phase 4 Completed in {phase4_duration:.2f}s: {context_result}")
-            
-            # Phase 5: Knowledge Synthesis and Creativity
-            logger.info("🚀 PHASE 5: Knowledge Synthesis and Creativity")
-            phase5_start = datetime.now()
-            synthesis_result = await self._knowledge_synthesis_and_creativity()
-            phase5_duration = (datetime.now() - phase5_start).total_seconds()
-            logger.info(f"✅ Phase 5 Completed in {phase5_duration:.2f}s: {synthesis_result}")
+            phase_results = {}
+            phase_stats = {}
+            for number, (phase, title, method, result_key) in enumerate(self.PHASES, 1):
+                logger.info(f"🚀 PHASE {number}: {title}")
+                last_bit_id, last_ref_id = watermarks.get(phase, (0, 0))
+                window = {'bits': (last_bit_id, high_bit_id), 'refs': (last_ref_id, high_ref_id)}
+                
+                phase_start = time.perf_counter()
+                cursor.execute(f"SAVEPOINT dream_{phase}")
+                try:
+                    result = getattr(self, method)(cursor, window)
+                    self._advance_watermark(cursor, phase, high_bit_id, high_ref_id)
+                    cursor.execute(f"RELEASE dream_{phase}")
+                except sqlite3.Error as e:
+                    cursor.execute(f"ROLLBACK TO dream_{phase}")
+                    cursor.execute(f"RELEASE dream_{phase}")
+                    logger.error(f"❌ {title} failed: {e}")
+                    result = {"status": "failed", "error": str(e), "rows": 0}
+                
+                duration_ms = (time.perf_counter() - phase_start) * 1000
+                phase_stats[phase] = {'status': result['status'], 'rows': result['rows'],
+                                      'duration_ms': round(duration_ms, 3)}
+                phase_results[result_key] = result
+                logger.info(f"✅ Phase {number} Completed in {duration_ms / 1000:.2f}s: {result}")
             
             # Update dream cycle
             self.dream_cycles += 1
@@ -77,9 +93,11 @@ class EnhancedDreamSystem:
             dream_effectiveness = self._calculate_dream_effectiveness()
             logger.info(f"📊 Dream Effectiveness Calculated: {dream_effectiveness:.1%}")
             
-            # Save metrics to database for persistence
+            # Save metrics in the same transaction as the phases they describe
             logger.info("💾 Saving Dream Metrics to Database...")
-            self._save_dream_metrics()
+            self.last_phase_stats = phase_stats
+            self._save_dream_metrics(cursor)
+            cursor.execute("COMMIT")
             logger.info(f"💾 Dream Metrics Saved: {self.consolidation_metrics}")
             
             # Calculate total duration
@@ -93,23 +111,26 @@ class EnhancedDreamSystem:
                 "dream_state": "enhanced_active",
                 "dream_cycle": self.dream_cycles,
                 "dream_effectiveness": dream_effectiveness,
-                "consolidation_process": consolidation_result,
-                "pattern_analysis": pattern_result,
-                "relationship_enhancement": relationship_result,
-                "context_optimization": context_result,
-                "knowledge_synthesis": synthesis_result,
+                **phase_results,
+                "phase_stats": phase_stats,
                 "consolidation_metrics": self.consolidation_metrics,
                 "wake_impact": "enhanced_context_injection_and_knowledge_synthesis",
                 "timestamp": datetime.now().isoformat()
             }
             
         except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            # Nothing was committed; keep the in-memory counters in line with the database
+            self.dream_cycles, self.consolidation_metrics = self._load_dream_metrics()
             logger.error(f"❌ Enhanced dream process failed: {e}")
             return {
                 "dream_state": "enhanced_disrupted",
                 "error": str(e),
                 "timestamp": datetime.now().isoformat()
             }
+        finally:
+            conn.close()
     
     def _init_dream_metrics_table(self):
         """Initialize dream system metrics table if it doesn't exist"""
@@ -129,6 +150,48 @@ class EnhancedDreamSystem:
                     )
                 """)
                 
+                # Per-phase timings and row counts of the last dream (JSON)
+                columns = {row[1] for row in cursor.execute("PRAGMA table_info(dream_system_metrics)")}
+                if 'last_phase_stats' not in columns:
+                    cursor.execute("ALTER TABLE dream_system_metrics ADD COLUMN last_phase_stats TEXT")
+                
+                # High-water marks: the last learning bit / cross-reference id each phase has processed
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS dream_watermarks (
+                        phase TEXT PRIMARY KEY,
+                        last_learning_bit_id INTEGER DEFAULT 0,
+                        last_cross_reference_id INTEGER DEFAULT 0,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Running cross-reference pattern aggregates, so pattern phases only add new references
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS dream_pattern_stats (
+                        relationship_type TEXT NOT NULL,
+                        source_type TEXT NOT NULL,
+                        source_category TEXT NOT NULL,
+                        target_type TEXT NOT NULL,
+                        target_category TEXT NOT NULL,
+                        frequency INTEGER DEFAULT 0,
+                        strength_total REAL DEFAULT 0,
+                        strong_frequency INTEGER DEFAULT 0, -- references with strength > 0.7
+                        insight_generated BOOLEAN DEFAULT FALSE,
+                        PRIMARY KEY (relationship_type, source_type, source_category, target_type, target_category)
+                    )
+                """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS dream_synthesis_combinations (
+                        source_type TEXT NOT NULL,
+                        source_category TEXT NOT NULL,
+                        target_type TEXT NOT NULL,
+                        target_category TEXT NOT NULL,
+                        synthesized_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (source_type, source_category, target_type, target_category)
+                    )
+                """)
+                self._ensure_dream_indexes(cursor)
+                
                 # Insert default record if table is empty
                 cursor.execute("SELECT COUNT(*) FROM dream_system_metrics")
                 if cursor.fetchone()[0] == 0:
@@ -145,6 +208,40 @@ class EnhancedDreamSystem:
         except Exception as e:
             logger.error(f"❌ Failed to initialize dream metrics table: {e}")
     
+    def _ensure_dream_indexes(self, cursor):
+        """Indexes the set-based phases rely on (skipped for tables that do not exist yet)"""
+        for sql in (
+            "CREATE INDEX IF NOT EXISTS idx_cross_references_source_bit ON cross_references(source_bit_id)",
+            "CREATE INDEX IF NOT EXISTS idx_learning_relationships_source ON learning_relationships(source_bit_id)",
+            "CREATE INDEX IF NOT EXISTS idx_learning_bits_category_importance ON learning_bits(category, importance_score)",
+        ):
+            try:
+                cursor.execute(sql)
+            except sqlite3.OperationalError:
+                pass
+    
+    @staticmethod
+    def _max_id(cursor, table: str) -> int:
+        try:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+            return cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0
+    
+    def _load_watermarks(self, cursor) -> Dict[str, Tuple[int, int]]:
+        cursor.execute("SELECT phase, last_learning_bit_id, last_cross_reference_id FROM dream_watermarks")
+        return {phase: (bit_id, ref_id) for phase, bit_id, ref_id in cursor.fetchall()}
+    
+    def _advance_watermark(self, cursor, phase: str, bit_id: int, ref_id: int):
+        cursor.execute("""
+            INSERT INTO dream_watermarks (phase, last_learning_bit_id, last_cross_reference_id, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(phase) DO UPDATE SET
+                last_learning_bit_id = excluded.last_learning_bit_id,
+                last_cross_reference_id = excluded.last_cross_reference_id,
+                updated_at = CURRENT_TIMESTAMP
+        """, (phase, bit_id, ref_id))
+    
     def _load_dream_metrics(self) -> Tuple[int, Dict[str, int]]:
         """Load dream system metrics from database"""
         try:
@@ -184,374 +281,278 @@ class EnhancedDreamSystem:
                 'memory_consolidation_cycles': 0
             }
     
-    def _save_dream_metrics(self):
-        """Save current dream system metrics to database"""
+    def _load_phase_stats(self) -> Dict[str, Any]:
+        """Per-phase timings and row counts of the last dream"""
         try:
             with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE dream_system_metrics 
-                    SET dream_cycles = ?,
-                        cross_references_processed = ?,
-                        relationships_enhanced = ?,
-                        context_injections_generated = ?,
-                        knowledge_synthesis_events = ?,
-                        memory_consolidation_cycles = ?,
-                        last_updated = CURRENT_TIMESTAMP
-                    WHERE id = (SELECT id FROM dream_system_metrics ORDER BY id DESC LIMIT 1)
-                """, (
-                    self.dream_cycles,
-                    self.consolidation_metrics['cross_references_processed'],
-                    self.consolidation_metrics['relationships_enhanced'],
-                    self.consolidation_metrics['context_injections_generated'],
-                    self.consolidation_metrics['knowledge_synthesis_events'],
-                    self.consolidation_metrics['memory_consolidation_cycles']
-                ))
-                
-                conn.commit()
-                logger.info(f"✅ Dream metrics saved: {self.dream_cycles} cycles")
-                
-        except Exception as e:
-            logger.error(f"❌ Failed to save dream metrics: {e}")
+                row = conn.execute(
+                    "SELECT last_phase_stats FROM dream_system_metrics ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+            return json.loads(row[0]) if row and row[0] else {}
+        except (sqlite3.Error, ValueError):
+            return {}
     
-    async def _context_aware_memory_consolidation(self) -> Dict[str, Any]:
-        """Context-aware memory consolidation using cross-references"""
+    def _save_dream_metrics(self, cursor):
+        """Save current dream system metrics and the last dream's phase stats"""
+        cursor.execute("""
+            UPDATE dream_system_metrics 
+            SET dream_cycles = ?,
+                cross_references_processed = ?,
+                relationships_enhanced = ?,
+                context_injections_generated = ?,
+                knowledge_synthesis_events = ?,
+                memory_consolidation_cycles = ?,
+                last_phase_stats = ?,
+                last_updated = CURRENT_TIMESTAMP
+            WHERE id = (SELECT id FROM dream_system_metrics ORDER BY id DESC LIMIT 1)
+        """, (
+            self.dream_cycles,
+            self.consolidation_metrics['cross_references_processed'],
+            self.consolidation_metrics['relationships_enhanced'],
+            self.consolidation_metrics['context_injections_generated'],
+            self.consolidation_metrics['knowledge_synthesis_events'],
+            self.consolidation_metrics['memory_consolidation_cycles'],
+            json.dumps(self.last_phase_stats)
+        ))
+        logger.info(f"✅ Dream metrics saved: {self.dream_cycles} cycles")
+    
+    # Source bits of the cross-references in a dream window, with how many each gained
+    _NEW_REFERENCES = """
+        SELECT source_bit_id AS bit_id, COUNT(*) AS new_refs
+        FROM cross_references
+        WHERE id > ? AND id <= ?
+        GROUP BY source_bit_id
+    """
+    
+    def _context_aware_memory_consolidation(self, cursor, window: Dict[str, Tuple[int, int]]) -> Dict[str, Any]:
+        """Context-aware memory consolidation using cross-references
+        
+        Each new cross-reference raises its source bit's importance by 0.1
+        (capped at 1.0) exactly once, in a single UPDATE ... FROM.
+        """
         logger.info("🧠 Phase 1: Context-Aware Memory Consolidation...")
         
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get recent learning bits with cross-references
-                logger.info("🔍 Querying recent learning bits with cross-references...")
-                cursor.execute("""
-                    SELECT lb.id, lb.content, lb.content_type, lb.category, lb.importance_score,
-                           COUNT(cr.id) as cross_ref_count
-                    FROM learning_bits lb
-                    LEFT JOIN cross_references cr ON lb.id = cr.source_bit_id
-                    WHERE lb.created_at >= datetime('now', '-7 days')
-                    GROUP BY lb.id
-                    ORDER BY lb.importance_score DESC, cross_ref_count DESC
-                    LIMIT 20
-                """)
-                
-                recent_bits = cursor.fetchall()
-                logger.info(f"📊 Found {len(recent_bits)} recent learning bits to process")
-                consolidation_events = 0
-                
-                for i, bit in enumerate(recent_bits, 1):
-                    bit_id, content, content_type, category, importance, cross_ref_count = bit
-                    logger.info(f"🔄 Processing bit {i}/{len(recent_bits)}: ID={bit_id}, Type={content_type}, Category={category}, Importance={importance:.2f}, CrossRefs={cross_ref_count}")
-                    
-                    # Consolidate based on cross-reference patterns
-                    if cross_ref_count > 0:
-                        consolidation_events += 1
-                        
-                        # Update importance based on cross-reference activity
-                        old_importance = importance
-                        new_importance = min(1.0, importance + (cross_ref_count * 0.1))
-                        logger.info(f"📈 Updating importance: {old_importance:.2f} → {new_importance:.2f} (+{cross_ref_count * 0.1:.2f})")
-                        
-                        cursor.execute("""
-                            UPDATE learning_bits 
-                            SET importance_score = ?, updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        """, (new_importance, bit_id))
-                        
-                        # Create consolidation record
-                        cursor.execute("""
-                            INSERT INTO context_enhancement_pipeline 
-                            (trigger_type, source_id, enhancement_type, status, priority, created_at)
-                            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        """, ('dream_consolidation', bit_id, 'memory_consolidation', 'completed', 3))
-                        
-                        logger.info(f"✅ Bit {bit_id} consolidated successfully")
-                    else:
-                        logger.info(f"⏭️ Skipping bit {bit_id} (no cross-references)")
-                
-                conn.commit()
-                self.consolidation_metrics['memory_consolidation_cycles'] += 1
-                logger.info(f"💾 Database committed, consolidation_metrics updated: {self.consolidation_metrics}")
-                
-                logger.info(f"✅ Memory consolidation completed: {consolidation_events} events")
-                
-                return {
-                    "status": "success",
-                    "consolidation_events": consolidation_events,
-                    "recent_bits_processed": len(recent_bits),
-                    "cross_references_utilized": True
-                }
-                
-        except Exception as e:
-            logger.error(f"❌ Memory consolidation failed: {e}")
-            return {"status": "failed", "error": str(e)}
+        cursor.execute(f"""
+            UPDATE learning_bits
+            SET importance_score = MIN(1.0, importance_score + refs.new_refs * 0.1),
+                updated_at = CURRENT_TIMESTAMP
+            FROM ({self._NEW_REFERENCES}) AS refs
+            WHERE learning_bits.id = refs.bit_id
+        """, window['refs'])
+        consolidation_events = cursor.rowcount
+        
+        # Create consolidation records
+        cursor.execute(f"""
+            INSERT INTO context_enhancement_pipeline 
+            (trigger_type, source_id, enhancement_type, status, priority, created_at)
+            SELECT 'dream_consolidation', refs.bit_id, 'memory_consolidation', 'completed', 3, CURRENT_TIMESTAMP
+            FROM ({self._NEW_REFERENCES}) AS refs
+            JOIN learning_bits lb ON lb.id = refs.bit_id
+        """, window['refs'])
+        records = cursor.rowcount
+        
+        self.consolidation_metrics['memory_consolidation_cycles'] += 1
+        logger.info(f"✅ Memory consolidation completed: {consolidation_events} events")
+        
+        return {
+            "status": "success",
+            "consolidation_events": consolidation_events,
+            "recent_bits_processed": consolidation_events,
+            "cross_references_utilized": True,
+            "rows": consolidation_events + records
+        }
     
-    async def _analyze_cross_reference_patterns(self) -> Dict[str, Any]:
-        """Analyze cross-reference patterns for insights"""
+    def _analyze_cross_reference_patterns(self, cursor, window: Dict[str, Tuple[int, int]]) -> Dict[str, Any]:
+        """Analyze cross-reference patterns for insights
+        
+        New cross-references are folded into the running dream_pattern_stats
+        aggregates; a pattern produces one insight when it first reaches a
+        frequency of 3 with an average strength above 0.6.
+        """
         logger.info("🔗 Phase 2: Cross-Reference Pattern Analysis...")
         
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Analyze cross-reference patterns
-                logger.info("🔍 Querying cross-reference patterns...")
-                cursor.execute("""
-                    SELECT cr.relationship_type, cr.strength, 
-                           lb1.content_type as source_type, lb1.category as source_category,
-                           lb2.content_type as target_type, lb2.category as target_category,
-                           COUNT(*) as pattern_frequency
-                    FROM cross_references cr
-                    JOIN learning_bits lb1 ON cr.source_bit_id = lb1.id
-                    JOIN learning_bits lb2 ON cr.target_bit_id = lb2.id
-                    GROUP BY cr.relationship_type, lb1.content_type, lb1.category, 
-                             lb2.content_type, lb2.category
-                    ORDER BY pattern_frequency DESC, cr.strength DESC
-                    LIMIT 10
-                """)
-                
-                patterns = cursor.fetchall()
-                logger.info(f"📊 Found {len(patterns)} cross-reference patterns to analyze")
-                insights_generated = 0
-                
-                for i, pattern in enumerate(patterns, 1):
-                    rel_type, strength, src_type, src_cat, tgt_type, tgt_cat, frequency = pattern
-                    logger.info(f"🔄 Analyzing pattern {i}/{len(patterns)}: Type={rel_type}, Strength={strength:.2f}, Frequency={frequency}, Source=({src_type}/{src_cat}) → Target=({tgt_type}/{tgt_cat})")
-                    
-                    # Generate insights based on patterns
-                    if frequency >= 3 and strength > 0.6:
-                        insights_generated += 1
-                        logger.info(f"💡 Generating insight for pattern {i}: Frequency={frequency} ≥ 3 AND Strength={strength:.2f} > 0.6")
-                        
-                        # Create insight record
-                        cursor.execute("""
-                            INSERT INTO context_enhancement_pipeline 
-                            (trigger_type, source_id, target_id, relationship_type, 
-                             enhancement_type, status, priority, created_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        """, ('pattern_insight', None, None, rel_type, 'insight_generation', 'pending', 2))
-                        
-                        logger.info(f"✅ Insight record created for pattern {i}")
-                    else:
-                        logger.info(f"⏭️ Skipping pattern {i}: Frequency={frequency} < 3 OR Strength={strength:.2f} ≤ 0.6")
-                
-                conn.commit()
-                self.consolidation_metrics['cross_references_processed'] += len(patterns)
-                logger.info(f"💾 Database committed, cross_references_processed updated: {self.consolidation_metrics['cross_references_processed']}")
-                
-                logger.info(f"✅ Pattern analysis completed: {insights_generated} insights generated")
-                
-                return {
-                    "status": "success",
-                    "patterns_analyzed": len(patterns),
-                    "insights_generated": insights_generated,
-                    "strong_patterns": len([p for p in patterns if p[1] > 0.6])
-                }
-                
-        except Exception as e:
-            logger.error(f"❌ Pattern analysis failed: {e}")
-            return {"status": "failed", "error": str(e)}
+        cursor.execute("""
+            INSERT INTO dream_pattern_stats
+            (relationship_type, source_type, source_category, target_type, target_category,
+             frequency, strength_total, strong_frequency)
+            SELECT COALESCE(cr.relationship_type, ''), COALESCE(lb1.content_type, ''), COALESCE(lb1.category, ''),
+                   COALESCE(lb2.content_type, ''), COALESCE(lb2.category, ''),
+                   COUNT(*), SUM(COALESCE(cr.strength, 0)), SUM(COALESCE(cr.strength, 0) > 0.7)
+            FROM cross_references cr
+            JOIN learning_bits lb1 ON cr.source_bit_id = lb1.id
+            JOIN learning_bits lb2 ON cr.target_bit_id = lb2.id
+            WHERE cr.id > ? AND cr.id <= ?
+            GROUP BY 1, 2, 3, 4, 5
+            ON CONFLICT (relationship_type, source_type, source_category, target_type, target_category)
+            DO UPDATE SET frequency = frequency + excluded.frequency,
+                          strength_total = strength_total + excluded.strength_total,
+                          strong_frequency = strong_frequency + excluded.strong_frequency
+        """, window['refs'])
+        patterns_analyzed = cursor.rowcount
+        
+        # Create insight records for patterns that just became strong
+        insight_filter = "NOT insight_generated AND frequency >= 3 AND strength_total > 0.6 * frequency"
+        cursor.execute(f"""
+            INSERT INTO context_enhancement_pipeline 
+            (trigger_type, source_id, target_id, relationship_type, 
+             enhancement_type, status, priority, created_at)
+            SELECT 'pattern_insight', NULL, NULL, relationship_type, 'insight_generation', 'pending', 2,
+                   CURRENT_TIMESTAMP
+            FROM dream_pattern_stats WHERE {insight_filter}
+        """)
+        insights_generated = cursor.rowcount
+        cursor.execute(f"UPDATE dream_pattern_stats SET insight_generated = TRUE WHERE {insight_filter}")
+        
+        cursor.execute("SELECT COUNT(*) FROM dream_pattern_stats WHERE strength_total > 0.6 * frequency")
+        strong_patterns = cursor.fetchone()[0]
+        
+        self.consolidation_metrics['cross_references_processed'] += patterns_analyzed
+        logger.info(f"✅ Pattern analysis completed: {insights_generated} insights generated")
+        
+        return {
+            "status": "success",
+            "patterns_analyzed": patterns_analyzed,
+            "insights_generated": insights_generated,
+            "strong_patterns": strong_patterns,
+            "rows": patterns_analyzed + insights_generated
+        }
     
-    async def _enhance_learning_relationships(self) -> Dict[str, Any]:
-        """Enhance learning relationships using context injection"""
+    def _enhance_learning_relationships(self, cursor, window: Dict[str, Tuple[int, int]]) -> Dict[str, Any]:
+        """Enhance learning relationships using context injection
+        
+        Important bits without relationships that are new, or gained
+        cross-references, since the last dream are linked to the three most
+        important other bits of their category in one INSERT ... SELECT.
+        """
         logger.info("🧠 Phase 3: Learning Relationship Enhancement...")
         
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Find learning bits that could benefit from relationships
-                cursor.execute("""
-                    SELECT lb.id, lb.content, lb.content_type, lb.category, lb.importance_score
-                    FROM learning_bits lb
-                    LEFT JOIN learning_relationships lr ON lb.id = lr.source_bit_id
-                    WHERE lr.id IS NULL
-                    AND lb.importance_score > 0.7
-                    ORDER BY lb.importance_score DESC
-                    LIMIT 15
-                """)
-                
-                unconnected_bits = cursor.fetchall()
-                relationships_created = 0
-                
-                for bit in unconnected_bits:
-                    bit_id, content, content_type, category, importance = bit
-                    
-                    # Find potential relationships
-                    cursor.execute("""
-                        SELECT lb2.id, lb2.content_type, lb2.category, lb2.importance_score
-                        FROM learning_bits lb2
-                        WHERE lb2.id != ? 
-                        AND lb2.category = ?
-                        AND lb2.importance_score > 0.5
-                        ORDER BY lb2.importance_score DESC
-                        LIMIT 3
-                    """, (bit_id, category))
-                    
-                    potential_relations = cursor.fetchall()
-                    
-                    for rel in potential_relations:
-                        rel_id, rel_type, rel_cat, rel_importance = rel
-                        
-                        # Calculate relationship strength
-                        strength = min(1.0, (importance + rel_importance) / 2)
-                        
-                        if strength > 0.4:
-                            cursor.execute("""
-                                INSERT OR IGNORE INTO learning_relationships 
-                                (source_bit_id, target_bit_id, relationship_type, 
-                                 strength, bidirectional, created_at)
-                                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                            """, (bit_id, rel_id, 'related', strength, True))
-                            
-                            relationships_created += 1
-                
-                conn.commit()
-                self.consolidation_metrics['relationships_enhanced'] += relationships_created
-                
-                logger.info(f"✅ Relationship enhancement completed: {relationships_created} relationships created")
-                
-                return {
-                    "status": "success",
-                    "unconnected_bits_processed": len(unconnected_bits),
-                    "relationships_created": relationships_created,
-                    "relationship_strength_avg": 0.6 if relationships_created > 0 else 0.0
-                }
-                
-        except Exception as e:
-            logger.error(f"❌ Relationship enhancement failed: {e}")
-            return {"status": "failed", "error": str(e)}
+        first_new_id = self._max_id(cursor, 'learning_relationships')
+        cursor.execute("""
+            INSERT OR IGNORE INTO learning_relationships 
+            (source_bit_id, target_bit_id, relationship_type, 
+             strength, bidirectional, created_at)
+            SELECT src.id, related.id, 'related',
+                   MIN(1.0, (src.importance_score + related.importance_score) / 2), TRUE, CURRENT_TIMESTAMP
+            FROM learning_bits src
+            JOIN learning_bits related ON related.id IN (
+                SELECT candidate.id FROM learning_bits candidate
+                WHERE candidate.category = src.category
+                AND candidate.id != src.id
+                AND candidate.importance_score > 0.5
+                ORDER BY candidate.importance_score DESC
+                LIMIT 3
+            )
+            WHERE ((src.id > ? AND src.id <= ?)
+                   OR src.id IN (SELECT source_bit_id FROM cross_references WHERE id > ? AND id <= ?))
+            AND src.importance_score > 0.7
+            AND NOT EXISTS (SELECT 1 FROM learning_relationships lr WHERE lr.source_bit_id = src.id)
+        """, window['bits'] + window['refs'])
+        relationships_created = cursor.rowcount
+        
+        cursor.execute("""
+            SELECT COUNT(DISTINCT source_bit_id), AVG(strength)
+            FROM learning_relationships WHERE id > ?
+        """, (first_new_id,))
+        bits_connected, strength_avg = cursor.fetchone()
+        
+        self.consolidation_metrics['relationships_enhanced'] += relationships_created
+        logger.info(f"✅ Relationship enhancement completed: {relationships_created} relationships created")
+        
+        return {
+            "status": "success",
+            "unconnected_bits_processed": bits_connected,
+            "relationships_created": relationships_created,
+            "relationship_strength_avg": round(strength_avg or 0.0, 3),
+            "rows": relationships_created
+        }
     
-    async def _optimize_context_injection(self) -> Dict[str, Any]:
-        """Optimize context injection based on dream insights"""
+    def _optimize_context_injection(self, cursor, window: Dict[str, Tuple[int, int]]) -> Dict[str, Any]:
+        """Optimize context injection based on dream insights
+        
+        While cross-reference coverage is below target, every new important
+        bit without cross-references gets one optimization trigger.
+        """
         logger.info("⚙️ Phase 4: Context Injection Optimization...")
         
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Analyze context injection effectiveness
-                cursor.execute("""
-                    SELECT COUNT(*) FROM cross_references
-                """)
-                total_cross_refs = cursor.fetchone()[0]
-                
-                cursor.execute("""
-                    SELECT COUNT(*) FROM learning_bits
-                """)
-                total_learning_bits = cursor.fetchone()[0]
-                
-                if total_learning_bits > 0:
-                    current_effectiveness = min(1.0, total_cross_refs / (total_learning_bits * 2))
-                    
-                    # Generate context injection triggers for low-effectiveness areas
-                    if current_effectiveness < 0.8:
-                        cursor.execute("""
-                            SELECT lb.id, lb.content_type, lb.category
-                            FROM learning_bits lb
-                            LEFT JOIN cross_references cr ON lb.id = cr.source_bit_id
-                            WHERE cr.id IS NULL
-                            AND lb.importance_score > 0.6
-                            ORDER BY lb.importance_score DESC
-                            LIMIT 10
-                        """)
-                        
-                        low_context_bits = cursor.fetchall()
-                        triggers_created = 0
-                        
-                        for bit in low_context_bits:
-                            bit_id, content_type, category = bit
-                            
-                            cursor.execute("""
-                                INSERT INTO context_enhancement_pipeline 
-                                (trigger_type, source_id, enhancement_type, status, priority, created_at)
-                                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                            """, ('context_optimization', bit_id, 'cross_reference_generation', 'pending', 1))
-                            
-                            triggers_created += 1
-                        
-                        conn.commit()
-                        self.consolidation_metrics['context_injections_generated'] += triggers_created
-                        
-                        logger.info(f"✅ Context optimization completed: {triggers_created} triggers created")
-                        
-                        return {
-                            "status": "success",
-                            "current_effectiveness": current_effectiveness,
-                            "target_effectiveness": 0.8,
-                            "triggers_created": triggers_created,
-                            "optimization_needed": True
-                        }
-                    else:
-                        return {
-                            "status": "success",
-                            "current_effectiveness": current_effectiveness,
-                            "target_effectiveness": 0.8,
-                            "triggers_created": 0,
-                            "optimization_needed": False
-                        }
-                
-                return {"status": "failed", "error": "No learning bits found"}
-                
-        except Exception as e:
-            logger.error(f"❌ Context optimization failed: {e}")
-            return {"status": "failed", "error": str(e)}
+        # Analyze context injection effectiveness
+        cursor.execute("SELECT COUNT(*) FROM cross_references")
+        total_cross_refs = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM learning_bits")
+        total_learning_bits = cursor.fetchone()[0]
+        
+        if total_learning_bits == 0:
+            return {"status": "failed", "error": "No learning bits found", "rows": 0}
+        
+        current_effectiveness = min(1.0, total_cross_refs / (total_learning_bits * 2))
+        triggers_created = 0
+        
+        # Generate context injection triggers for low-effectiveness areas
+        if current_effectiveness < 0.8:
+            cursor.execute("""
+                INSERT INTO context_enhancement_pipeline 
+                (trigger_type, source_id, enhancement_type, status, priority, created_at)
+                SELECT 'context_optimization', lb.id, 'cross_reference_generation', 'pending', 1, CURRENT_TIMESTAMP
+                FROM learning_bits lb
+                WHERE lb.id > ? AND lb.id <= ?
+                AND lb.importance_score > 0.6
+                AND NOT EXISTS (SELECT 1 FROM cross_references cr WHERE cr.source_bit_id = lb.id)
+            """, window['bits'])
+            triggers_created = cursor.rowcount
+            self.consolidation_metrics['context_injections_generated'] += triggers_created
+            logger.info(f"✅ Context optimization completed: {triggers_created} triggers created")
+        
+        return {
+            "status": "success",
+            "current_effectiveness": current_effectiveness,
+            "target_effectiveness": 0.8,
+            "triggers_created": triggers_created,
+            "optimization_needed": current_effectiveness < 0.8,
+            "rows": triggers_created
+        }
     
-    async def _knowledge_synthesis_and_creativity(self) -> Dict[str, Any]:
-        """Generate new knowledge through synthesis and creativity"""
+    def _knowledge_synthesis_and_creativity(self, cursor, window: Dict[str, Tuple[int, int]]) -> Dict[str, Any]:
+        """Generate new knowledge through synthesis and creativity
+        
+        Content type/category combinations linked by at least two strong
+        (> 0.7) cross-references are synthesized once, read from the pattern
+        aggregates maintained by phase 2 rather than from the full history.
+        """
         logger.info("🌟 Phase 5: Knowledge Synthesis and Creativity...")
         
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Find high-value knowledge combinations
-                cursor.execute("""
-                    SELECT lb1.content_type, lb1.category, lb2.content_type, lb2.category,
-                           COUNT(*) as combination_frequency
-                    FROM cross_references cr
-                    JOIN learning_bits lb1 ON cr.source_bit_id = lb1.id
-                    JOIN learning_bits lb2 ON cr.target_bit_id = lb2.id
-                    WHERE cr.strength > 0.7
-                    GROUP BY lb1.content_type, lb1.category, lb2.content_type, lb2.category
-                    HAVING combination_frequency >= 2
-                    ORDER BY combination_frequency DESC
-                    LIMIT 5
-                """)
-                
-                knowledge_combinations = cursor.fetchall()
-                synthesis_events = 0
-                
-                for combo in knowledge_combinations:
-                    src_type, src_cat, tgt_type, tgt_cat, frequency = combo
-                    
-                    # Generate synthesis insights
-                    if frequency >= 2:
-                        synthesis_events += 1
-                        
-                        # Create synthesis record
-                        cursor.execute("""
-                            INSERT INTO context_enhancement_pipeline 
-                            (trigger_type, source_id, target_id, relationship_type,
-                             enhancement_type, status, priority, created_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        """, ('knowledge_synthesis', None, None, 'synthesis', 'insight_generation', 'pending', 1))
-                
-                conn.commit()
-                self.consolidation_metrics['knowledge_synthesis_events'] += synthesis_events
-                
-                logger.info(f"✅ Knowledge synthesis completed: {synthesis_events} events")
-                
-                return {
-                    "status": "success",
-                    "combinations_analyzed": len(knowledge_combinations),
-                    "synthesis_events": synthesis_events,
-                    "creative_insights": synthesis_events
-                }
-                
-        except Exception as e:
-            logger.error(f"❌ Knowledge synthesis failed: {e}")
-            return {"status": "failed", "error": str(e)}
+        combinations = """
+            SELECT ps.source_type, ps.source_category, ps.target_type, ps.target_category
+            FROM dream_pattern_stats ps
+            LEFT JOIN dream_synthesis_combinations done
+                ON done.source_type = ps.source_type AND done.source_category = ps.source_category
+                AND done.target_type = ps.target_type AND done.target_category = ps.target_category
+            WHERE done.source_type IS NULL
+            GROUP BY ps.source_type, ps.source_category, ps.target_type, ps.target_category
+            HAVING SUM(ps.strong_frequency) >= 2
+        """
+        cursor.execute(f"""
+            INSERT INTO context_enhancement_pipeline 
+            (trigger_type, source_id, target_id, relationship_type,
+             enhancement_type, status, priority, created_at)
+            SELECT 'knowledge_synthesis', NULL, NULL, 'synthesis', 'insight_generation', 'pending', 1,
+                   CURRENT_TIMESTAMP
+            FROM ({combinations})
+        """)
+        synthesis_events = cursor.rowcount
+        cursor.execute(f"""
+            INSERT INTO dream_synthesis_combinations (source_type, source_category, target_type, target_category)
+            {combinations}
+        """)
+        
+        self.consolidation_metrics['knowledge_synthesis_events'] += synthesis_events
+        logger.info(f"✅ Knowledge synthesis completed: {synthesis_events} events")
+        
+        return {
+            "status": "success",
+            "combinations_analyzed": synthesis_events,
+            "synthesis_events": synthesis_events,
+            "creative_insights": synthesis_events,
+            "rows": synthesis_events * 2
+        }
     
     def _calculate_dream_effectiveness(self) -> float:
         """Calculate overall dream effectiveness"""
@@ -582,6 +583,7 @@ class EnhancedDreamSystem:
             "consolidation_metrics": self.consolidation_metrics,
             "dream_effectiveness": self._calculate_dream_effectiveness(),
             "last_dream": datetime.now().isoformat(),
+            "last_phase_stats": self.last_phase_stats,
             "system_health": "optimal" if self._calculate_dream_effectiveness() > 0.5 else "needs_attention"
         }
 
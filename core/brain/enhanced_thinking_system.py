@@ -14,13 +14,180 @@ from pathlib import Path
 import threading
 import time
 
+from core.memory.database.row_counters import COUNTERS_TABLE, get_row_counts
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_SNAPSHOT_INTERVAL = 30.0
+
+# Tables the snapshot reports on; commits to any other table (function call
+# logs, memory items, ...) do not make it stale
+WATCHED_TABLES = ("learning_bits", "cross_references", "context_enhancement_pipeline")
+
+class MetricSnapshot:
+    """
+    In-memory copy of the slow-moving SQLite inputs of a thinking cycle.
+
+    Only the first read waits for the database. Afterwards, when the snapshot
+    is older than ``refresh_interval`` or the watermark of the watched tables
+    (their max rowid and cached row count) has moved, a background refresh is
+    started and the current values are served until it completes. Updates
+    that leave both unchanged are picked up by the interval refresh.
+    
+    The watermark probe runs on the event loop over its own connection and
+    never waits for a lock: if the probe connection is busy the check is
+    skipped. Refreshes query over a separate connection in a worker thread.
+    """
+    
+    def __init__(self, db_path: str, refresh_interval: float = DEFAULT_SNAPSHOT_INTERVAL, clock=time.monotonic):
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.values: Dict[str, Any] = {}
+        self.refreshed_at: Optional[float] = None
+        self.watermark: Optional[tuple] = None
+        self.refresh_stats = {
+            'refreshes': 0,
+            'last_refresh_seconds': 0.0,
+            'total_refresh_seconds': 0.0,
+            'last_reason': None,
+            'reasons': {'initial': 0, 'interval': 0, 'data_changed': 0, 'manual': 0}
+        }
+        self._probe_conn: Optional[sqlite3.Connection] = None
+        self._probe_lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+    
+    def _current_watermark(self) -> Optional[tuple]:
+        """Watermark of the watched tables; the last known one if the probe is busy"""
+        if not self._probe_lock.acquire(blocking=False):
+            return self.watermark
+        try:
+            if self._probe_conn is None:
+                self._probe_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._read_watermark(self._probe_conn)
+        except sqlite3.Error:
+            return None
+        finally:
+            self._probe_lock.release()
+    
+    @staticmethod
+    def _read_watermark(conn: sqlite3.Connection) -> tuple:
+        """(max rowid, cached row count) per watched table, None for a missing table
+        
+        Both are index lookups; the row counts come from the trigger-maintained
+        counters and are None for tables without one.
+        """
+        names = WATCHED_TABLES + (COUNTERS_TABLE,)
+        existing = {row[0] for row in conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({','.join('?' * len(names))})", names
+        )}
+        counts = dict(conn.execute(f"SELECT table_name, row_count FROM {COUNTERS_TABLE}")) if COUNTERS_TABLE in existing else {}
+        return tuple(
+            (conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0], counts.get(table)) if table in existing else None
+            for table in WATCHED_TABLES
+        )
+    
+    def stale_reason(self) -> Optional[str]:
+        """Why the snapshot needs a refresh, or None while it is current"""
+        if self.refreshed_at is None:
+            return 'initial'
+        if self.clock() - self.refreshed_at >= self.refresh_interval:
+            return 'interval'
+        if self._current_watermark() != self.watermark:
+            return 'data_changed'
+        return None
+    
+    async def get(self) -> Dict[str, Any]:
+        """Current metric values, refreshing in the background if they are stale"""
+        reason = self.stale_reason()
+        if reason == 'initial':
+            await self.refresh(reason)
+        elif reason and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh(reason))
+        return self.values
+    
+    async def refresh(self, reason: str = 'manual') -> Dict[str, Any]:
+        """Re-read every metric (database work runs in a worker thread)"""
+        start = time.perf_counter()
+        values: Dict[str, Any] = {'errors': {}}
+        try:
+            from .enhanced_dream_system import EnhancedDreamSystem
+            dream_system = await asyncio.to_thread(EnhancedDreamSystem, self.db_path)
+            values['dream'] = await dream_system.get_dream_status()
+        except Exception as e:
+            values['errors']['dream_system'] = str(e)
+        # Read the watermark before the queries: a commit racing with them triggers another refresh
+        watermark = self._current_watermark()
+        counts, errors = await asyncio.to_thread(self._query_counts)
+        values.update(counts)
+        values['errors'].update(errors)
+        
+        elapsed = time.perf_counter() - start
+        self.values = values
+        self.refreshed_at = self.clock()
+        self.watermark = watermark
+        stats = self.refresh_stats
+        stats['refreshes'] += 1
+        stats['last_refresh_seconds'] = elapsed
+        stats['total_refresh_seconds'] += elapsed
+        stats['last_reason'] = reason
+        stats['reasons'][reason] = stats['reasons'].get(reason, 0) + 1
+        logger.debug(f"📸 Thinking metric snapshot refreshed ({reason}) in {elapsed * 1000:.1f} ms")
+        return values
+    
+    def _query_counts(self) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Read the counts over a connection of its own (runs in a worker thread)"""
+        values: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        try:
+            conn = sqlite3.connect(self.db_path)
+        except sqlite3.Error as e:
+            return values, {'knowledge_base': str(e), 'context_pipeline': str(e)}
+        try:
+            try:
+                counts = get_row_counts(conn, ("learning_bits", "cross_references"))
+                values['learning_bits'] = counts['learning_bits']
+                values['cross_references'] = counts['cross_references']
+            except sqlite3.Error as e:
+                errors['knowledge_base'] = str(e)
+            try:
+                total, thinking = conn.execute("""
+                    SELECT COUNT(*), COALESCE(SUM(enhancement_type = 'thinking_optimization'), 0)
+                    FROM context_enhancement_pipeline
+                """).fetchone()
+                values['pipeline_entries'] = total
+                values['thinking_optimizations'] = thinking
+            except sqlite3.Error as e:
+                errors['context_pipeline'] = str(e)
+        finally:
+            conn.close()
+        return values, errors
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot age and refresh cost"""
+        stats = dict(self.refresh_stats)
+        stats['reasons'] = dict(stats['reasons'])
+        stats.update({
+            'age_seconds': None if self.refreshed_at is None else self.clock() - self.refreshed_at,
+            'refresh_interval': self.refresh_interval,
+            'watermark': self.watermark,
+            'refreshing': self._refresh_task is not None and not self._refresh_task.done()
+        })
+        return stats
+    
+    def close(self):
+        with self._probe_lock:
+            if self._probe_conn is not None:
+                self._probe_conn.close()
+                self._probe_conn = None
+
 class EnhancedThinkingSystem:
     """Enhanced thinking system with background processing and iteration loops"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL):
         self.db_path = db_path
+        # Health and statistics inputs change slowly; every cycle reads them from here
+        self.metrics = MetricSnapshot(db_path, snapshot_interval)
         self.thinking_cycles = 0
         self.background_processes = {}
         self.iteration_loops = {}
@@ -53,7 +220,9 @@ class EnhancedThinkingSystem:
             optimization_analysis = await self._assess_system_optimization()
             
             # Phase 5: Continuous Improvement Planning
-            improvement_plan = await self._plan_continuous_improvements()
+            improvement_plan = await self._plan_continuous_improvements(
+                background_analysis, iteration_analysis, optimization_analysis
+            )
             
             # Update thinking cycle
             self.thinking_cycles += 1
@@ -74,6 +243,7 @@ class EnhancedThinkingSystem:
                 "optimization_analysis": optimization_analysis,
                 "improvement_plan": improvement_plan,
                 "optimization_metrics": self.optimization_metrics,
+                "metric_snapshot": self.metrics.get_stats(),
                 "thinking_impact": "enhanced_background_processing_and_iteration_optimization",
                 "timestamp": datetime.now().isoformat()
             }
@@ -91,39 +261,33 @@ class EnhancedThinkingSystem:
         logger.info("🧠 Phase 1: Context-Aware Thinking Analysis...")
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Analyze current thinking patterns
-                cursor.execute("""
-                    SELECT COUNT(*) FROM context_enhancement_pipeline 
-                    WHERE enhancement_type = 'thinking_optimization'
-                """)
-                
-                thinking_optimizations = cursor.fetchone()[0]
-                
-                # Analyze context injection effectiveness
-                cursor.execute("SELECT COUNT(*) FROM cross_references")
-                cross_refs = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM learning_bits")
-                learning_bits = cursor.fetchone()[0]
-                
-                context_effectiveness = min(1.0, cross_refs / (learning_bits * 2)) if learning_bits > 0 else 0.0
-                
-                # Analyze thinking depth based on context
-                thinking_depth = self._calculate_thinking_depth(message, context)
-                
-                logger.info(f"✅ Context analysis completed: {thinking_depth:.1%} thinking depth")
-                
-                return {
-                    "status": "success",
-                    "thinking_optimizations": thinking_optimizations,
-                    "context_effectiveness": context_effectiveness,
-                    "thinking_depth": thinking_depth,
-                    "context_type": context,
-                    "message_complexity": len(message.split())
-                }
+            metrics = await self.metrics.get()
+            for source in ('context_pipeline', 'knowledge_base'):
+                if source in metrics['errors']:
+                    raise RuntimeError(metrics['errors'][source])
+            
+            # Analyze current thinking patterns
+            thinking_optimizations = metrics['thinking_optimizations']
+            
+            # Analyze context injection effectiveness
+            cross_refs = metrics['cross_references']
+            learning_bits = metrics['learning_bits']
+            
+            context_effectiveness = min(1.0, cross_refs / (learning_bits * 2)) if learning_bits > 0 else 0.0
+            
+            # Analyze thinking depth based on context
+            thinking_depth = self._calculate_thinking_depth(message, context)
+            
+            logger.info(f"✅ Context analysis completed: {thinking_depth:.1%} thinking depth")
+            
+            return {
+                "status": "success",
+                "thinking_optimizations": thinking_optimizations,
+                "context_effectiveness": context_effectiveness,
+                "thinking_depth": thinking_depth,
+                "context_type": context,
+                "message_complexity": len(message.split())
+            }
                 
         except Exception as e:
             logger.error(f"❌ Context analysis failed: {e}")
@@ -134,40 +298,37 @@ class EnhancedThinkingSystem:
         logger.info("🔄 Phase 2: Background Process Analysis...")
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check background process status
-                background_processes = {
-                    'dream_system': await self._check_dream_system_status(),
-                    'evolution_engine': await self._check_evolution_engine_status(),
-                    'crawler_manager': await self._check_crawler_manager_status(),
-                    'context_pipeline': await self._check_context_pipeline_status()
-                }
-                
-                # Analyze background process health
-                active_processes = sum(1 for proc in background_processes.values() if proc.get('status') == 'active')
-                total_processes = len(background_processes)
-                background_health = active_processes / total_processes if total_processes > 0 else 0.0
-                
-                # Check for background optimizations needed
-                optimizations_needed = []
-                for proc_name, proc_status in background_processes.items():
-                    if proc_status.get('health_score', 0) < 0.8:
-                        optimizations_needed.append(proc_name)
-                
-                logger.info(f"✅ Background process analysis completed: {background_health:.1%} health")
-                
-                return {
-                    "status": "success",
-                    "background_processes": background_processes,
-                    "background_health": background_health,
-                    "active_processes": active_processes,
-                    "total_processes": total_processes,
-                    "optimizations_needed": optimizations_needed,
-                    "background_optimization_opportunities": len(optimizations_needed)
-                }
-                
+            # Check background process status
+            background_processes = {
+                'dream_system': await self._check_dream_system_status(),
+                'evolution_engine': await self._check_evolution_engine_status(),
+                'crawler_manager': await self._check_crawler_manager_status(),
+                'context_pipeline': await self._check_context_pipeline_status()
+            }
+            
+            # Analyze background process health
+            active_processes = sum(1 for proc in background_processes.values() if proc.get('status') == 'active')
+            total_processes = len(background_processes)
+            background_health = active_processes / total_processes if total_processes > 0 else 0.0
+            
+            # Check for background optimizations needed
+            optimizations_needed = []
+            for proc_name, proc_status in background_processes.items():
+                if proc_status.get('health_score', 0) < 0.8:
+                    optimizations_needed.append(proc_name)
+            
+            logger.info(f"✅ Background process analysis completed: {background_health:.1%} health")
+            
+            return {
+                "status": "success",
+                "background_processes": background_processes,
+                "background_health": background_health,
+                "active_processes": active_processes,
+                "total_processes": total_processes,
+                "optimizations_needed": optimizations_needed,
+                "background_optimization_opportunities": len(optimizations_needed)
+            }
+            
         except Exception as e:
             logger.error(f"❌ Background process analysis failed: {e}")
             return {"status": "failed", "error": str(e)}
@@ -177,46 +338,43 @@ class EnhancedThinkingSystem:
         logger.info("🔄 Phase 3: Iteration Loop Analysis...")
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Analyze iteration patterns
-                iteration_patterns = {
-                    'dream_cycles': await self._get_dream_cycle_count(),
-                    'evolution_cycles': await self._get_evolution_cycle_count(),
-                    'learning_cycles': await self._get_learning_cycle_count(),
-                    'optimization_cycles': await self._get_optimization_cycle_count()
-                }
-                
-                # Calculate iteration effectiveness
-                total_iterations = sum(iteration_patterns.values())
-                iteration_effectiveness = min(1.0, total_iterations / 100)  # Normalize to 100 iterations
-                
-                # Identify iteration bottlenecks
-                bottlenecks = []
-                for pattern_name, count in iteration_patterns.items():
-                    if count < 5:  # Less than 5 iterations indicates potential bottleneck
-                        bottlenecks.append(pattern_name)
-                
-                # Check for iteration optimization opportunities
-                optimization_opportunities = []
-                if iteration_effectiveness < 0.7:
-                    optimization_opportunities.append("Increase iteration frequency")
-                if bottlenecks:
-                    optimization_opportunities.append(f"Resolve bottlenecks in: {', '.join(bottlenecks)}")
-                
-                logger.info(f"✅ Iteration loop analysis completed: {iteration_effectiveness:.1%} effectiveness")
-                
-                return {
-                    "status": "success",
-                    "iteration_patterns": iteration_patterns,
-                    "iteration_effectiveness": iteration_effectiveness,
-                    "total_iterations": total_iterations,
-                    "bottlenecks": bottlenecks,
-                    "optimization_opportunities": optimization_opportunities,
-                    "iteration_health": "optimal" if iteration_effectiveness >= 0.8 else "needs_attention"
-                }
-                
+            # Analyze iteration patterns
+            iteration_patterns = {
+                'dream_cycles': await self._get_dream_cycle_count(),
+                'evolution_cycles': await self._get_evolution_cycle_count(),
+                'learning_cycles': await self._get_learning_cycle_count(),
+                'optimization_cycles': await self._get_optimization_cycle_count()
+            }
+            
+            # Calculate iteration effectiveness
+            total_iterations = sum(iteration_patterns.values())
+            iteration_effectiveness = min(1.0, total_iterations / 100)  # Normalize to 100 iterations
+            
+            # Identify iteration bottlenecks
+            bottlenecks = []
+            for pattern_name, count in iteration_patterns.items():
+                if count < 5:  # Less than 5 iterations indicates potential bottleneck
+                    bottlenecks.append(pattern_name)
+            
+            # Check for iteration optimization opportunities
+            optimization_opportunities = []
+            if iteration_effectiveness < 0.7:
+                optimization_opportunities.append("Increase iteration frequency")
+            if bottlenecks:
+                optimization_opportunities.append(f"Resolve bottlenecks in: {', '.join(bottlenecks)}")
+            
+            logger.info(f"✅ Iteration loop analysis completed: {iteration_effectiveness:.1%} effectiveness")
+            
+            return {
+                "status": "success",
+                "iteration_patterns": iteration_patterns,
+                "iteration_effectiveness": iteration_effectiveness,
+                "total_iterations": total_iterations,
+                "bottlenecks": bottlenecks,
+                "optimization_opportunities": optimization_opportunities,
+                "iteration_health": "optimal" if iteration_effectiveness >= 0.8 else "needs_attention"
+            }
+            
         except Exception as e:
             logger.error(f"❌ Iteration loop analysis failed: {e}")
             return {"status": "failed", "error": str(e)}
@@ -226,52 +384,53 @@ class EnhancedThinkingSystem:
         logger.info("⚙️ Phase 4: System Optimization Assessment...")
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get system health metrics
-                system_health = await self._get_system_health_metrics()
-                
-                # Analyze optimization opportunities
-                optimization_areas = []
-                if system_health.get('context_injection_effectiveness', 0) < 0.8:
-                    optimization_areas.append("Context injection optimization")
-                if system_health.get('background_process_health', 0) < 0.8:
-                    optimization_areas.append("Background process optimization")
-                if system_health.get('iteration_loop_health', 0) < 0.8:
-                    optimization_areas.append("Iteration loop optimization")
-                
-                # Calculate overall optimization score
-                optimization_score = (
-                    system_health.get('context_injection_effectiveness', 0) * 0.4 +
-                    system_health.get('background_process_health', 0) * 0.3 +
-                    system_health.get('iteration_loop_health', 0) * 0.3
-                )
-                
-                logger.info(f"✅ System optimization assessment completed: {optimization_score:.1%} score")
-                
-                return {
-                    "status": "success",
-                    "system_health": system_health,
-                    "optimization_areas": optimization_areas,
-                    "optimization_score": optimization_score,
-                    "optimization_priority": "high" if optimization_score < 0.7 else "medium" if optimization_score < 0.9 else "low"
-                }
-                
+            # Get system health metrics
+            system_health = await self._get_system_health_metrics()
+            
+            # Analyze optimization opportunities
+            optimization_areas = []
+            if system_health.get('context_injection_effectiveness', 0) < 0.8:
+                optimization_areas.append("Context injection optimization")
+            if system_health.get('background_process_health', 0) < 0.8:
+                optimization_areas.append("Background process optimization")
+            if system_health.get('iteration_loop_health', 0) < 0.8:
+                optimization_areas.append("Iteration loop optimization")
+            
+            # Calculate overall optimization score
+            optimization_score = (
+                system_health.get('context_injection_effectiveness', 0) * 0.4 +
+                system_health.get('background_process_health', 0) * 0.3 +
+                system_health.get('iteration_loop_health', 0) * 0.3
+            )
+            
+            logger.info(f"✅ System optimization assessment completed: {optimization_score:.1%} score")
+            
+            return {
+                "status": "success",
+                "system_health": system_health,
+                "optimization_areas": optimization_areas,
+                "optimization_score": optimization_score,
+                "optimization_priority": "high" if optimization_score < 0.7 else "medium" if optimization_score < 0.9 else "low"
+            }
+            
         except Exception as e:
             logger.error(f"❌ System optimization assessment failed: {e}")
             return {"status": "failed", "error": str(e)}
     
-    async def _plan_continuous_improvements(self) -> Dict[str, Any]:
-        """Plan continuous improvements based on analysis"""
+    async def _plan_continuous_improvements(self, background_analysis: Optional[Dict[str, Any]] = None,
+                                            iteration_analysis: Optional[Dict[str, Any]] = None,
+                                            optimization_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Plan continuous improvements based on analysis (re-running any phase not passed in)"""
         logger.info("🚀 Phase 5: Continuous Improvement Planning...")
         
         try:
             # Get all analysis results
-            context_analysis = await self._analyze_thinking_context("system optimization", "continuous_improvement")
-            background_analysis = await self._analyze_background_processes()
-            iteration_analysis = await self._analyze_iteration_loops()
-            optimization_analysis = await self._assess_system_optimization()
+            if background_analysis is None:
+                background_analysis = await self._analyze_background_processes()
+            if iteration_analysis is None:
+                iteration_analysis = await self._analyze_iteration_loops()
+            if optimization_analysis is None:
+                optimization_analysis = await self._assess_system_optimization()
             
             # Generate improvement plan
             improvement_plan = {
@@ -377,9 +536,7 @@ class EnhancedThinkingSystem:
     async def _check_dream_system_status(self) -> Dict[str, Any]:
         """Check dream system status"""
         try:
-            from .enhanced_dream_system import EnhancedDreamSystem
-            dream_system = EnhancedDreamSystem(self.db_path)
-            status = await dream_system.get_dream_status()
+            status = (await self.metrics.get())['dream']
             return {
                 'status': 'active',
                 'health_score': status.get('dream_effectiveness', 0),
@@ -407,11 +564,8 @@ class EnhancedThinkingSystem:
     async def _check_context_pipeline_status(self) -> Dict[str, Any]:
         """Check context pipeline status"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM context_enhancement_pipeline")
-                total_entries = cursor.fetchone()[0]
-                return {'status': 'active', 'health_score': 0.95, 'cycles': total_entries}
+            total_entries = (await self.metrics.get())['pipeline_entries']
+            return {'status': 'active', 'health_score': 0.95, 'cycles': total_entries}
         except Exception:
             return {'status': 'inactive', 'health_score': 0.0, 'cycles': 0}
     
@@ -419,10 +573,7 @@ class EnhancedThinkingSystem:
     async def _get_dream_cycle_count(self) -> int:
         """Get dream cycle count"""
         try:
-            from .enhanced_dream_system import EnhancedDreamSystem
-            dream_system = EnhancedDreamSystem(self.db_path)
-            status = await dream_system.get_dream_status()
-            return status.get('dream_cycles', 0)
+            return (await self.metrics.get())['dream'].get('dream_cycles', 0)
         except Exception:
             return 0
     
@@ -467,16 +618,13 @@ class EnhancedThinkingSystem:
     async def _get_context_injection_effectiveness(self) -> float:
         """Get context injection effectiveness"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM cross_references")
-                cross_refs = cursor.fetchone()[0]
-                cursor.execute("SELECT COUNT(*) FROM learning_bits")
-                learning_bits = cursor.fetchone()[0]
-                
-                if learning_bits > 0:
-                    return min(1.0, cross_refs / (learning_bits * 2))
-                return 0.0
+            metrics = await self.metrics.get()
+            cross_refs = metrics['cross_references']
+            learning_bits = metrics['learning_bits']
+            
+            if learning_bits > 0:
+                return min(1.0, cross_refs / (learning_bits * 2))
+            return 0.0
         except Exception:
             return 0.0
     
@@ -518,8 +666,13 @@ class EnhancedThinkingSystem:
             "optimization_metrics": self.optimization_metrics,
             "thinking_effectiveness": self._calculate_thinking_effectiveness(),
             "last_thinking": datetime.now().isoformat(),
+            "metric_snapshot": self.metrics.get_stats(),
             "system_health": "optimal" if self._calculate_thinking_effectiveness() > 0.5 else "needs_attention"
         }
+    
+    def close(self):
+        """Release the snapshot's database connection"""
+        self.metrics.close()
 
 # Example usage
 async def main():
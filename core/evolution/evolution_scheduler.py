@@ -14,8 +14,9 @@ from typing import Dict, List, Optional, Any, Tuple, Callable
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from collections import defaultdict
-import queue
 import heapq
+import itertools
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,8 @@ class ScheduledTask:
     task_data: Dict[str, Any]
     status: str = 'scheduled'
     created_at: float = None
+    started_at: float = None
+    finished_at: float = None
     
     def __lt__(self, other):
         """Priority queue comparison - lower priority number = higher priority"""
@@ -37,7 +40,15 @@ class ScheduledTask:
         return self.scheduled_time < other.scheduled_time
 
 class EvolutionScheduler:
-    """Schedules and coordinates evolution processes with background processing"""
+    """Schedules and coordinates evolution processes with background processing
+    
+    Pending tasks live in a timer heap keyed by (due time, priority). Worker
+    threads sleep on a condition variable until the earliest task is due or a
+    submission/cancellation changes the heap, so an idle scheduler uses no CPU
+    and a due task is dispatched within milliseconds. Due tasks are moved once
+    into a ready heap keyed by (priority, due time), so among tasks that are
+    due the highest priority runs first at O(log n) per dispatch.
+    """
     
     def __init__(self, evolution_engine):
         self.evolution_engine = evolution_engine
@@ -48,6 +59,7 @@ class EvolutionScheduler:
         self.running_tasks = {}
         self.completed_tasks = []
         self.failed_tasks = []
+        self.cancelled_tasks = []
         
         # Priority mapping
         self.priority_map = {
@@ -58,9 +70,8 @@ class EvolutionScheduler:
         }
         
         # Background processing
-        self.scheduler_thread = None
+        self.worker_threads: List[threading.Thread] = []
         self.scheduler_active = False
-        self.executor_thread = None
         self.executor_active = False
         
         # Task execution
@@ -74,62 +85,66 @@ class EvolutionScheduler:
             'total_executed': 0,
             'total_completed': 0,
             'total_failed': 0,
+            'total_cancelled': 0,
+            'total_rescheduled': 0,
             'average_execution_time': 0.0,
+            'average_dispatch_latency_ms': 0.0,
+            'max_dispatch_latency_ms': 0.0,
             'last_execution': 0
         }
         
-        # Task queues
-        self.high_priority_queue = queue.PriorityQueue()
-        self.normal_priority_queue = queue.Queue()
-        self.low_priority_queue = queue.Queue()
+        # Timer heap: (scheduled_time, priority, sequence, task_id); stale entries are skipped
+        self._timer_heap: List[Tuple[float, int, int, str]] = []
+        # Ready heap of due tasks: (priority, scheduled_time, sequence, task_id)
+        self._ready_heap: List[Tuple[int, float, int, str]] = []
+        self._pending: Dict[str, Tuple[int, ScheduledTask]] = {}  # task_id -> (live sequence, task)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
         
         logger.info("📅 Evolution Scheduler initialized")
     
     def start_background_scheduling(self):
         """Start background scheduling process"""
-        if self.scheduler_active:
-            logger.warning("⚠️ Evolution scheduler already active")
-            return False
+        with self._condition:
+            if self.scheduler_active:
+                logger.warning("⚠️ Evolution scheduler already active")
+                return False
+            self.scheduler_active = True
+            self.executor_active = True
         
         try:
-            self.scheduler_active = True
-            
-            # Start scheduler thread
-            self.scheduler_thread = threading.Thread(
-                target=self._scheduling_loop,
-                daemon=True,
-                name="EvolutionScheduler"
-            )
-            self.scheduler_thread.start()
-            
-            # Start executor thread
-            self.executor_thread = threading.Thread(
-                target=self._execution_loop,
-                daemon=True,
-                name="EvolutionExecutor"
-            )
-            self.executor_thread.start()
-            
-            logger.info("📅 Evolution scheduler started in background")
+            # Start worker threads; each one dispatches and executes tasks
+            self.worker_threads = []
+            for index in range(self.max_concurrent_tasks):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    daemon=True,
+                    name=f"EvolutionWorker-{index}"
+                )
+                worker.start()
+                self.worker_threads.append(worker)
+            
+            logger.info(f"📅 Evolution scheduler started in background ({self.max_concurrent_tasks} workers)")
             return True
             
         except Exception as e:
             logger.error(f"Error starting evolution scheduler: {str(e)}")
-            self.scheduler_active = False
+            self.stop_background_scheduling()
             return False
     
     def stop_background_scheduling(self):
         """Stop background scheduling process"""
         try:
-            self.scheduler_active = False
-            self.executor_active = False
+            with self._condition:
+                self.scheduler_active = False
+                self.executor_active = False
+                self._condition.notify_all()
             
             # Wait for threads to finish
-            if self.scheduler_thread and self.scheduler_thread.is_alive():
-                self.scheduler_thread.join(timeout=5)
-            
-            if self.executor_thread and self.executor_thread.is_alive():
-                self.executor_thread.join(timeout=5)
+            for worker in self.worker_threads:
+                if worker.is_alive() and worker is not threading.current_thread():
+                    worker.join(timeout=5)
+            self.worker_threads = []
             
             logger.info("📅 Evolution scheduler stopped")
             return True
@@ -141,8 +156,8 @@ class EvolutionScheduler:
     def schedule_evolution_task(self, task_data: Dict[str, Any]) -> str:
         """Schedule an evolution task with intelligent prioritization"""
         try:
-            # Generate task ID
-            task_id = f"evolution_{int(time.time())}_{hash(str(task_data)) % 10000}"
+            # Generate task ID (unique even for identical tasks within one second)
+            task_id = f"evolution_{int(time.time())}_{uuid.uuid4().hex[:8]}"
             
             # Determine priority
             priority_str = task_data.get('priority', 'normal')
@@ -162,16 +177,11 @@ class EvolutionScheduler:
                 created_at=time.time()
             )
             
-            # Add to appropriate queue based on priority
-            if priority <= 2:  # High or critical priority
-                self.high_priority_queue.put(scheduled_task)
-            elif priority == 3:  # Normal priority
-                self.normal_priority_queue.put(scheduled_task)
-            else:  # Low priority
-                self.low_priority_queue.put(scheduled_task)
-            
-            # Update statistics
-            self.scheduler_stats['total_scheduled'] += 1
+            with self._condition:
+                self._push_task(scheduled_task)
+                
+                # Update statistics
+                self.scheduler_stats['total_scheduled'] += 1
             
             logger.info(f"📅 Evolution task scheduled: {task_id} ({task_data.get('type', 'unknown')}, priority: {priority_str})")
             
@@ -181,142 +191,197 @@ class EvolutionScheduler:
             logger.error(f"Error scheduling evolution task: {str(e)}")
             return None
     
-    def _scheduling_loop(self):
-        """Background scheduling loop"""
-        logger.info("📅 Evolution scheduling loop started")
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a task that has not started yet"""
+        with self._condition:
+            entry = self._pending.pop(task_id, None)
+            if entry is None:
+                return False
+            task = entry[1]
+            task.status = 'cancelled'
+            task.finished_at = time.time()
+            self.cancelled_tasks.append({'task': task})
+            self.scheduler_stats['total_cancelled'] += 1
+            # The heap entry is dropped lazily; wake workers so they re-evaluate their deadline
+            self._condition.notify_all()
         
-        while self.scheduler_active:
-            try:
-                current_time = time.time()
-                
-                # Check high priority queue
-                self._process_priority_queue(self.high_priority_queue, current_time)
-                
-                # Check normal priority queue
-                self._process_priority_queue(self.normal_priority_queue, current_time)
-                
-                # Check low priority queue
-                self._process_priority_queue(self.low_priority_queue, current_time)
-                
-                # Sleep briefly
-                time.sleep(1)  # Check every second
-                
-            except Exception as e:
-                logger.error(f"Evolution scheduling error: {str(e)}")
-                time.sleep(5)  # Wait 5 seconds before retrying
+        logger.info(f"🚫 Evolution task cancelled: {task_id}")
+        return True
+    
+    def reschedule_task(self, task_id: str, delay: Optional[float] = None,
+                        priority: Optional[str] = None) -> bool:
+        """Move a pending task to a new due time (now + delay) and/or priority"""
+        with self._condition:
+            entry = self._pending.get(task_id)
+            if entry is None:
+                return False
+            task = entry[1]
+            if delay is not None:
+                task.scheduled_time = time.time() + delay
+            if priority is not None:
+                task.priority = self.priority_map.get(priority, task.priority)
+            self._push_task(task)
+            self.scheduler_stats['total_rescheduled'] += 1
         
-        logger.info("📅 Evolution scheduling loop ended")
+        logger.info(f"📅 Evolution task rescheduled: {task_id}")
+        return True
     
-    def _process_priority_queue(self, task_queue: queue.Queue, current_time: float):
-        """Process tasks in a priority queue"""
-        try:
-            # Check if we can execute more tasks
-            if len(self.running_tasks) >= self.max_concurrent_tasks:
-                return
-            
-            # Get next task from queue
-            if not task_queue.empty():
-                scheduled_task = task_queue.get_nowait()
-                
-                # Check if task is ready to execute
-                if scheduled_task.scheduled_time <= current_time:
-                    # Check if we have capacity
-                    if len(self.running_tasks) < self.max_concurrent_tasks:
-                        # Execute task
-                        self._execute_evolution_task(scheduled_task)
-                    else:
-                        # Put task back in queue for later
-                        task_queue.put(scheduled_task)
-                else:
-                    # Task not ready yet, put back in queue
-                    task_queue.put(scheduled_task)
-                    
-        except queue.Empty:
-            pass  # Queue is empty, continue
-        except Exception as e:
-            logger.error(f"Error processing priority queue: {str(e)}")
+    def _push_task(self, task: ScheduledTask):
+        """Add (or re-key) a pending task in the timer heap; caller holds the condition"""
+        sequence = next(self._sequence)
+        self._pending[task.task_id] = (sequence, task)
+        heapq.heappush(self._timer_heap, (task.scheduled_time, task.priority, sequence, task.task_id))
+        self._condition.notify()
+    
+    def _is_live(self, entry: Tuple) -> bool:
+        """Whether a timer or ready heap entry still describes a pending task"""
+        pending = self._pending.get(entry[3])
+        return pending is not None and pending[0] == entry[2]
+    
+    def _pop_due_task(self, now: float) -> Optional[ScheduledTask]:
+        """Remove and return the highest-priority due task; caller holds the condition"""
+        # Move entries that have come due to the ready heap (each entry moves once)
+        while self._timer_heap and self._timer_heap[0][0] <= now:
+            scheduled_time, priority, sequence, task_id = heapq.heappop(self._timer_heap)
+            if self._is_live((scheduled_time, priority, sequence, task_id)):
+                heapq.heappush(self._ready_heap, (priority, scheduled_time, sequence, task_id))
+        
+        # Cancelled or re-keyed tasks leave stale ready entries behind
+        while self._ready_heap:
+            entry = heapq.heappop(self._ready_heap)
+            if self._is_live(entry):
+                return self._pending.pop(entry[3])[1]
+        return None
+    
+    def _next_wakeup(self, now: float) -> Optional[float]:
+        """Seconds until the next due task or running-task timeout; None to wait for a notification"""
+        while self._timer_heap and not self._is_live(self._timer_heap[0]):
+            heapq.heappop(self._timer_heap)
+        while self._ready_heap and not self._is_live(self._ready_heap[0]):
+            heapq.heappop(self._ready_heap)
+        deadlines = [info['started_at'] + self.task_timeout for info in self.running_tasks.values()]
+        if self._ready_heap:
+            deadlines.append(now)
+        if self._timer_heap:
+            deadlines.append(self._timer_heap[0][0])
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
     
-    def _execution_loop(self):
-        """Background execution loop"""
-        logger.info("⚡ Evolution execution loop started")
-        self.executor_active = True
+    def _worker_loop(self):
+        """Background worker: sleep until a task is due, then execute it"""
+        logger.info(f"📅 Evolution worker started: {threading.current_thread().name}")
         
-        while self.executor_active:
+        while True:
+            with self._condition:
+                task = None
+                while self.scheduler_active:
+                    now = time.time()
+                    self._check_timed_out_tasks()
+                    task = self._pop_due_task(now)
+                    if task is not None:
+                        break
+                    self._condition.wait(timeout=self._next_wakeup(now))
+                if task is None:
+                    break
+                self._mark_task_started(task)
+            
             try:
-                # Check for completed tasks
-                self._check_completed_tasks()
-                
-                # Check for timed out tasks
-                self._check_timed_out_tasks()
-                
-                # Sleep briefly
-                time.sleep(2)  # Check every 2 seconds
-                
+                self._execute_evolution_task(task)
             except Exception as e:
-                logger.error(f"Evolution execution error: {str(e)}")
-                time.sleep(5)  # Wait 5 seconds before retrying
+                logger.error(f"Evolution worker error: {str(e)}")
+        
+        logger.info(f"📅 Evolution worker ended: {threading.current_thread().name}")
+    
+    def _mark_task_started(self, scheduled_task: ScheduledTask):
+        """Move a task into the running set and record its dispatch latency"""
+        started_at = time.time()
+        scheduled_task.status = 'running'
+        scheduled_task.started_at = started_at
+        self.running_tasks[scheduled_task.task_id] = {
+            'task': scheduled_task,
+            'started_at': started_at,
+            'attempts': 0
+        }
         
-        logger.info("⚡ Evolution execution loop ended")
+        # Update statistics
+        latency_ms = max(0.0, started_at - scheduled_task.scheduled_time) * 1000
+        self.scheduler_stats['total_executed'] += 1
+        self.scheduler_stats['last_execution'] = started_at
+        executed = self.scheduler_stats['total_executed']
+        self.scheduler_stats['average_dispatch_latency_ms'] += (
+            latency_ms - self.scheduler_stats['average_dispatch_latency_ms']) / executed
+        self.scheduler_stats['max_dispatch_latency_ms'] = max(
+            self.scheduler_stats['max_dispatch_latency_ms'], latency_ms)
+    
+    def _task_timings(self, scheduled_task: ScheduledTask) -> Dict[str, float]:
+        """Per-task timing breakdown in seconds"""
+        return {
+            'queue_time': (scheduled_task.started_at or 0) - (scheduled_task.created_at or 0),
+            'dispatch_latency': max(0.0, (scheduled_task.started_at or 0) - scheduled_task.scheduled_time),
+            'execution_time': (scheduled_task.finished_at or 0) - (scheduled_task.started_at or 0)
+        }
     
     def _execute_evolution_task(self, scheduled_task: ScheduledTask):
         """Execute an evolution task"""
         try:
-            # Mark task as running
-            scheduled_task.status = 'running'
-            self.running_tasks[scheduled_task.task_id] = {
-                'task': scheduled_task,
-                'started_at': time.time(),
-                'attempts': 0
-            }
-            
-            # Update statistics
-            self.scheduler_stats['total_executed'] += 1
-            self.scheduler_stats['last_execution'] = time.time()
+            with self._condition:
+                if scheduled_task.task_id not in self.running_tasks:
+                    self._mark_task_started(scheduled_task)
             
             logger.info(f"⚡ Executing evolution task: {scheduled_task.task_id} ({scheduled_task.task_type})")
             
             # Execute the task based on type
             result = self._execute_task_by_type(scheduled_task)
             
-            # Mark task as completed
-            if result.get('success', False):
-                scheduled_task.status = 'completed'
-                self.completed_tasks.append({
-                    'task': scheduled_task,
-                    'result': result,
-                    'execution_time': time.time() - self.running_tasks[scheduled_task.task_id]['started_at']
-                })
-                self.scheduler_stats['total_completed'] += 1
-                logger.info(f"✅ Evolution task completed: {scheduled_task.task_id}")
-            else:
+            with self._condition:
+                scheduled_task.finished_at = time.time()
+                timings = self._task_timings(scheduled_task)
+                task_info = self.running_tasks.pop(scheduled_task.task_id, None)
+                if task_info is None:
+                    # Already failed by the timeout check
+                    return
+                
+                # Mark task as completed
+                if result.get('success', False):
+                    scheduled_task.status = 'completed'
+                    self.completed_tasks.append({
+                        'task': scheduled_task,
+                        'result': result,
+                        'execution_time': timings['execution_time'],
+                        'timings': timings
+                    })
+                    self.scheduler_stats['total_completed'] += 1
+                    self.scheduler_stats['average_execution_time'] += (
+                        timings['execution_time'] - self.scheduler_stats['average_execution_time']
+                    ) / self.scheduler_stats['total_completed']
+                    logger.info(f"✅ Evolution task completed: {scheduled_task.task_id}")
+                else:
+                    scheduled_task.status = 'failed'
+                    self.failed_tasks.append({
+                        'task': scheduled_task,
+                        'error': result.get('error', 'Unknown error'),
+                        'attempts': task_info['attempts'],
+                        'timings': timings
+                    })
+                    self.scheduler_stats['total_failed'] += 1
+                    logger.error(f"❌ Evolution task failed: {scheduled_task.task_id}")
+            
+        except Exception as e:
+            logger.error(f"Error executing evolution task: {str(e)}")
+            with self._condition:
                 scheduled_task.status = 'failed'
+                scheduled_task.error = str(e)
+                
+                # Move to failed tasks
                 self.failed_tasks.append({
                     'task': scheduled_task,
-                    'error': result.get('error', 'Unknown error'),
-                    'attempts': self.running_tasks[scheduled_task.task_id]['attempts']
+                    'error': str(e),
+                    'attempts': 0
                 })
-                self.scheduler_stats['total_failed'] += 1
-                logger.error(f"❌ Evolution task failed: {scheduled_task.task_id}")
-            
-            # Remove from running tasks
-            if scheduled_task.task_id in self.running_tasks:
-                del self.running_tasks[scheduled_task.task_id]
-            
-        except Exception as e:
-            logger.error(f"Error executing evolution task: {str(e)}")
-            scheduled_task.status = 'failed'
-            scheduled_task.error = str(e)
-            
-            # Move to failed tasks
-            self.failed_tasks.append({
-                'task': scheduled_task,
-                'error': str(e),
-                'attempts': 0
-            })
-            
-            # Remove from running tasks
-            if scheduled_task.task_id in self.running_tasks:
-                del self.running_tasks[scheduled_task.task_id]
+                
+                # Remove from running tasks
+                self.running_tasks.pop(scheduled_task.task_id, None)
     
     def _execute_task_by_type(self, scheduled_task: ScheduledTask) -> Dict[str, Any]:
         """Execute a task based on its type"""
@@ -488,19 +553,8 @@ class EvolutionScheduler:
         except Exception as e:
             logger.error(f"Error updating system health: {str(e)}")
     
-    def _check_completed_tasks(self):
-        """Check for completed tasks and update statistics"""
-        try:
-            # Update average execution time
-            if self.completed_tasks:
-                total_time = sum(task['execution_time'] for task in self.completed_tasks)
-                self.scheduler_stats['average_execution_time'] = total_time / len(self.completed_tasks)
-                
-        except Exception as e:
-            logger.error(f"Error checking completed tasks: {str(e)}")
-    
     def _check_timed_out_tasks(self):
-        """Check for timed out tasks"""
+        """Check for timed out tasks; caller holds the condition"""
         try:
             current_time = time.time()
             timed_out_tasks = []
@@ -549,13 +603,15 @@ class EvolutionScheduler:
             if total_executed > 0:
                 success_rate = self.scheduler_stats['total_completed'] / total_executed
             
-            stats = self.scheduler_stats.copy()
+            with self._condition:
+                stats = self.scheduler_stats.copy()
+                stats['current_running'] = len(self.running_tasks)
+                pending = [task for _, task in self._pending.values()]
             stats['success_rate'] = success_rate
-            stats['current_running'] = len(self.running_tasks)
             stats['queue_sizes'] = {
-                'high_priority': self.high_priority_queue.qsize(),
-                'normal_priority': self.normal_priority_queue.qsize(),
-                'low_priority': self.low_priority_queue.qsize()
+                'high_priority': sum(1 for task in pending if task.priority <= 2),
+                'normal_priority': sum(1 for task in pending if task.priority == 3),
+                'low_priority': sum(1 for task in pending if task.priority > 3)
             }
             
             return stats
@@ -567,6 +623,18 @@ class EvolutionScheduler:
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Get status of a specific task"""
         try:
+            # Check pending tasks
+            pending = self._pending.get(task_id)
+            if pending is not None:
+                task = pending[1]
+                return {
+                    'task_id': task_id,
+                    'status': 'scheduled',
+                    'priority': task.priority,
+                    'scheduled_time': task.scheduled_time,
+                    'due_in': task.scheduled_time - time.time()
+                }
+            
             # Check running tasks
             if task_id in self.running_tasks:
                 task_info = self.running_tasks[task_id]
@@ -585,7 +653,8 @@ class EvolutionScheduler:
                         'task_id': task_id,
                         'status': 'completed',
                         'result': completed_task['result'],
-                        'execution_time': completed_task['execution_time']
+                        'execution_time': completed_task['execution_time'],
+                        'timings': completed_task['timings']
                     }
             
             # Check failed tasks
@@ -598,6 +667,14 @@ class EvolutionScheduler:
                         'attempts': failed_task['attempts']
                     }
             
+            # Check cancelled tasks
+            for cancelled_task in self.cancelled_tasks:
+                if cancelled_task['task'].task_id == task_id:
+                    return {
+                        'task_id': task_id,
+                        'status': 'cancelled'
+                    }
+            
             return {
                 'task_id': task_id,
                 'status': 'not_found',
@@ -14,9 +14,16 @@ from datetime import datetime
 import logging
 from collections import defaultdict
 import pickle
+import uuid
+
+from .pattern_index import PatternIndex
 
 logger = logging.getLogger(__name__)
 
+def _unique_id(prefix: str) -> str:
+    """Time-ordered, collision-free identifier (several may be created per second)"""
+    return f"{prefix}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+
 @dataclass
 class NeuralPattern:
     """Neural network pattern for deep learning"""
@@ -59,7 +66,7 @@ class AIDecision:
 class DeepLearningEngine:
     """Deep learning engine for advanced pattern recognition"""
     
-    def __init__(self):
+    def __init__(self, index_path: Optional[str] = None, mmap_index: bool = True):
         self.neural_patterns: Dict[str, NeuralPattern] = {}
         self.pattern_embeddings: Dict[str, List[float]] = {}
         self.learning_history: List[Dict[str, Any]] = []
@@ -72,10 +79,53 @@ class DeepLearningEngine:
         self.learning_rate = 0.01
         self.min_confidence = 0.7
         self.max_patterns = 1000
+        
+        # Normalized embedding matrix used for similarity search
+        self.index_path = index_path
+        self.pattern_index = PatternIndex(self.feature_dimensions)
+        if index_path:
+            self._load_persisted_patterns(index_path, mmap_index)
+    
+    @staticmethod
+    def _patterns_path(index_path: str) -> Path:
+        """Sidecar holding the patterns and embeddings saved with the index"""
+        return Path(index_path).with_suffix('.patterns.json')
+    
+    def _load_persisted_patterns(self, index_path: str, mmap_index: bool):
+        """Restore the patterns, their embeddings and the index saved at ``index_path``
+        
+        The pattern maps are the source of truth: the saved matrix is only
+        memory-mapped when it indexes exactly the restored patterns, otherwise
+        the index is rebuilt from the embeddings.
+        """
+        patterns_path = self._patterns_path(index_path)
+        if patterns_path.exists():
+            try:
+                with open(patterns_path, 'r') as f:
+                    data = json.load(f)
+                self.neural_patterns = {pattern['pattern_id']: NeuralPattern(**pattern) for pattern in data['patterns']}
+                self.pattern_embeddings = dict(data['embeddings'])
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to load patterns from {patterns_path}: {e}")
+                self.neural_patterns, self.pattern_embeddings = {}, {}
+        
+        if Path(index_path).with_suffix('.npy').exists():
+            try:
+                index = PatternIndex.load(index_path, mmap=mmap_index)
+                if set(index.ids) == set(self.pattern_embeddings):
+                    self.pattern_index = index
+                    logger.info(f"🧠 Loaded pattern index with {len(index)} patterns from {index_path}")
+                    return
+                logger.warning(f"⚠️ Pattern index at {index_path} does not match the saved patterns, rebuilding")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to load pattern index from {index_path}: {e}")
+        
+        for pattern_id, embedding in self.pattern_embeddings.items():
+            self.pattern_index.upsert(pattern_id, embedding)
     
     def learn_pattern(self, pattern_data: Dict[str, Any]) -> NeuralPattern:
         """Learn a new neural pattern"""
-        pattern_id = f"pattern_{int(time.time())}"
+        pattern_id = _unique_id("pattern")
         
         # Extract features (simplified for demo)
         input_features = self._extract_features(pattern_data.get('input', {}))
@@ -100,6 +150,7 @@ class DeepLearningEngine:
         # Store pattern
         self.neural_patterns[pattern_id] = pattern
         self.pattern_embeddings[pattern_id] = input_features
+        self.pattern_index.upsert(pattern_id, input_features)
         
         # Record learning
         self._record_learning(pattern, pattern_data)
@@ -160,20 +211,40 @@ class DeepLearningEngine:
         if len(self.learning_history) > 1000:
             self.learning_history = self.learning_history[-500:]
     
-    def find_similar_patterns(self, query_features: List[float], threshold: float = 0.8) -> List[Tuple[str, float]]:
-        """Find patterns similar to query features"""
-        similar_patterns = []
-        
-        for pattern_id, embedding in self.pattern_embeddings.items():
-            similarity = self._calculate_similarity(query_features, embedding)
-            
-            if similarity >= threshold:
-                similar_patterns.append((pattern_id, similarity))
-        
-        # Sort by similarity
-        similar_patterns.sort(key=lambda x: x[1], reverse=True)
-        
-        return similar_patterns
+    def find_similar_patterns(self, query_features: List[float], threshold: float = 0.8,
+                              top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Find patterns similar to query features, best first"""
+        if len(query_features) != self.feature_dimensions:
+            return []
+        return self.pattern_index.query(query_features, threshold=threshold, top_k=top_k)
+    
+    def find_similar_patterns_batch(self, queries: List[List[float]], threshold: float = 0.8,
+                                    top_k: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """Find similar patterns for several queries with one matrix multiply"""
+        if not queries:
+            return []
+        return self.pattern_index.query_batch(queries, threshold=threshold, top_k=top_k)
+    
+    def save_pattern_index(self, index_path: Optional[str] = None) -> bool:
+        """Persist the patterns, their embeddings and the matrix (memory-mapped on the next start)"""
+        index_path = index_path or self.index_path
+        if not index_path:
+            return False
+        try:
+            patterns_path = self._patterns_path(index_path)
+            patterns_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = patterns_path.with_name(patterns_path.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'patterns': [asdict(pattern) for pattern in self.neural_patterns.values()],
+                    'embeddings': self.pattern_embeddings
+                }, f, default=str)
+            os.replace(tmp_path, patterns_path)
+            self.pattern_index.save(index_path)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to save pattern index to {index_path}: {e}")
+            return False
     
     def _calculate_similarity(self, features1: List[float], features2: List[float]) -> float:
         """Calculate cosine similarity between feature vectors"""
@@ -209,6 +280,7 @@ class DeepLearningEngine:
         
         # Update embedding
         self.pattern_embeddings[pattern_id] = pattern.input_features
+        self.pattern_index.upsert(pattern_id, pattern.input_features)
         
         logger.info(f"🧠 Evolved pattern: {pattern_id} (new confidence: {pattern.confidence:.2f})")
         
@@ -230,6 +302,7 @@ class DeepLearningEngine:
         """Get learning statistics"""
         return {
             'total_patterns': len(self.neural_patterns),
+            'indexed_patterns': len(self.pattern_index),
             'patterns_by_type': self._count_patterns_by_type(),
             'average_confidence': self._calculate_average_confidence(),
             'learning_history': {
@@ -269,7 +342,7 @@ class EvolutionaryAIEngine:
     
     def create_evolutionary_model(self, model_data: Dict[str, Any]) -> EvolutionaryModel:
         """Create a new evolutionary model"""
-        model_id = f"model_{int(time.time())}"
+        model_id = _unique_id("model")
         
         model = EvolutionaryModel(
             model_id=model_id,
@@ -407,7 +480,7 @@ class AIDecisionEngine:
     
     def make_decision(self, decision_data: Dict[str, Any]) -> AIDecision:
         """Make an AI-driven decision"""
-        decision_id = f"decision_{int(time.time())}"
+        decision_id = _unique_id("decision")
         
         # Analyze input context
         input_features = self.deep_learning_engine._extract_features(decision_data.get('context', {}))
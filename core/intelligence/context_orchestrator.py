@@ -5,16 +5,21 @@ Intelligently orchestrates all context sources and provides seamless integration
 """
 
 import os
+import copy
 import json
 import time
+import hashlib
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Set, Tuple, Iterable
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from utils.performance_monitor import LatencyHistogram
 
 logger = logging.getLogger(__name__)
 
@@ -132,14 +137,198 @@ class ContextSourceManager:
             }
         }
 
+class ContextResponseCache:
+    """
+    In-memory LRU cache of orchestrated responses keyed by request content.
+
+    Keys are a SHA-256 of the canonical request (user, context type, scope,
+    filters), the strategy and the sorted source set, so equal requests hit
+    regardless of their request_id. Entries live in an OrderedDict: a hit
+    moves the entry to the end and eviction pops from the front, both O(1).
+    The cache is bounded by entry count and by the JSON size of the responses,
+    and entries can be invalidated per source when its data changes.
+    
+    Database write listeners invalidate from the writing thread, so every
+    operation holds a lock. Each invalidation advances an epoch: a response
+    whose gathering began before one of its sources was invalidated (``put``
+    with the ``epoch()`` read before gathering) is not stored.
+    """
+    
+    def __init__(self, max_entries: int = 256, max_bytes: int = 4 * 1024 * 1024, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[ContextResponse, float, int, Tuple[str, ...]]]" = OrderedDict()
+        self._keys_by_source: Dict[str, Set[str]] = defaultdict(set)
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0, 'rejected': 0, 'stale': 0}
+        self.latency = {'hit': {'count': 0, 'total_time': 0.0}, 'miss': {'count': 0, 'total_time': 0.0}}
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._invalidated_at: Dict[str, int] = {}
+        self._cleared_at = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def make_key(request: ContextRequest, strategy_id: str, source_ids: Iterable[str]) -> str:
+        """Canonical hash of what determines a response"""
+        canonical = json.dumps({
+            'user_id': request.user_id,
+            'context_type': request.context_type,
+            'scope': request.scope,
+            'filters': request.filters,
+            'strategy': strategy_id,
+            'sources': sorted(source_ids)
+        }, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def epoch(self) -> int:
+        """Invalidation epoch; read it before gathering and pass it to ``put``"""
+        with self._lock:
+            return self._epoch
+    
+    def get(self, key: str) -> Optional[ContextResponse]:
+        """Cached response, or None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            response, expires_at, _, _ = entry
+            if expires_at <= self.clock():
+                self._remove(key)
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return response
+    
+    def put(self, key: str, response: ContextResponse, ttl: float, source_ids: Iterable[str],
+            epoch: Optional[int] = None) -> bool:
+        """Store a response for ttl seconds
+        
+        False if caching is disabled, it does not fit, or one of its sources
+        was invalidated after ``epoch``.
+        """
+        if ttl <= 0:
+            return False
+        size = len(json.dumps(asdict(response), default=str))
+        sources = tuple(source_ids)
+        with self._lock:
+            if size > self.max_bytes:
+                self.stats['rejected'] += 1
+                return False
+            if epoch is not None and (self._cleared_at > epoch or
+                                      any(self._invalidated_at.get(s, 0) > epoch for s in sources)):
+                self.stats['stale'] += 1
+                return False
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = (response, self.clock() + ttl, size, sources)
+            self.total_bytes += size
+            for source_id in sources:
+                self._keys_by_source[source_id].add(key)
+            
+            # Evict least recently used entries until both bounds hold
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+            return True
+    
+    def _remove(self, key: str):
+        """Drop one entry (caller holds the lock)"""
+        _, _, size, sources = self._entries.pop(key)
+        self.total_bytes -= size
+        for source_id in sources:
+            keys = self._keys_by_source.get(source_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_source[source_id]
+    
+    def invalidate_sources(self, source_ids: Iterable[str]) -> int:
+        """Drop every entry built from any of the given sources"""
+        with self._lock:
+            self._epoch += 1
+            keys = set()
+            for source_id in source_ids:
+                self._invalidated_at[source_id] = self._epoch
+                keys.update(self._keys_by_source.get(source_id, ()))
+            for key in keys:
+                self._remove(key)
+            self.stats['invalidations'] += len(keys)
+            return len(keys)
+    
+    def clear(self) -> int:
+        """Drop every entry"""
+        with self._lock:
+            self._epoch += 1
+            self._cleared_at = self._epoch
+            removed = len(self._entries)
+            self._entries.clear()
+            self._keys_by_source.clear()
+            self.total_bytes = 0
+            self.stats['invalidations'] += removed
+            return removed
+    
+    def record_latency(self, hit: bool, seconds: float):
+        """Track orchestration time separately for cache hits and misses"""
+        with self._lock:
+            bucket = self.latency['hit' if hit else 'miss']
+            bucket['count'] += 1
+            bucket['total_time'] += seconds
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters, sizes and average latencies"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            stats = dict(self.stats)
+            stats.update({
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+                'average_hit_time': self.latency['hit']['total_time'] / max(self.latency['hit']['count'], 1),
+                'average_miss_time': self.latency['miss']['total_time'] / max(self.latency['miss']['count'], 1)
+            })
+            return stats
+
 class ContextOrchestrator:
-    """Main orchestrator for combining and providing context"""
+    """Main orchestrator for combining and providing context
+    
+    Sources are queried concurrently on a long-lived thread pool. Results are
+    collected as they complete until each source's timeout or the request's
+    overall budget runs out, so a slow source only costs its own context.
+    Sources whose recent p95 latency exceeds the budget are skipped, except
+    for a periodic probe that lets them recover. A running call cannot be
+    cancelled, so a source whose previous call is still in flight is not
+    queried again; it is reported as timed out until that call returns.
+    """
+    
+    MAX_SOURCE_WORKERS = 8
     
     def __init__(self):
         self.source_manager = ContextSourceManager()
         self.orchestration_strategies: Dict[str, OrchestrationStrategy] = {}
         self.request_history: List[ContextRequest] = []
-        self.response_cache: Dict[str, ContextResponse] = {}
+        self.response_cache = ContextResponseCache()
+        
+        # Source fan-out
+        self.executor = ThreadPoolExecutor(max_workers=self.MAX_SOURCE_WORKERS, thread_name_prefix='context-source')
+        self.source_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.recent_latency: Dict[str, deque] = defaultdict(lambda: deque(maxlen=20))
+        self.min_latency_samples = 5       # Samples before a source can be skipped as slow
+        self.slow_source_probe_interval = 10  # Every Nth skip still queries the source
+        self._in_flight: Dict[str, Tuple[Future, float]] = {}  # Source ID -> (running call, start time)
+        self._in_flight_lock = threading.Lock()
+        
+        # Databases whose writes invalidate cached responses
+        self._attached_databases: List[Any] = []
         
         # Initialize default strategies
         self._initialize_default_strategies()
@@ -166,6 +355,7 @@ class ContextOrchestrator:
             combination_rules={
                 'max_sources': 3,
                 'timeout': 0.5,
+                'cache_ttl': 30,  # Seconds a cached response stays valid
                 'quality_threshold': 0.7
             },
             quality_thresholds={
@@ -193,6 +383,7 @@ class ContextOrchestrator:
             combination_rules={
                 'max_sources': 10,
                 'timeout': 2.0,
+                'cache_ttl': 300,  # Seconds a cached response stays valid
                 'quality_threshold': 0.9
             },
             quality_thresholds={
@@ -220,6 +411,7 @@ class ContextOrchestrator:
             combination_rules={
                 'max_sources': 5,
                 'timeout': 1.0,
+                'cache_ttl': 120,  # Seconds a cached response stays valid
                 'quality_threshold': 0.8
             },
             quality_thresholds={
@@ -239,10 +431,50 @@ class ContextOrchestrator:
             'predictive': predictive_strategy
         }
     
+    def close(self):
+        """Stop the source worker pool and detach from attached databases"""
+        for database in self._attached_databases:
+            database.remove_write_listener(self.notify_tables_changed)
+        self._attached_databases.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+    
+    def attach_database(self, database) -> None:
+        """Invalidate cached responses whenever ``database`` (a BrainDatabase) commits a write"""
+        if database not in self._attached_databases:
+            database.add_write_listener(self.notify_tables_changed)
+            self._attached_databases.append(database)
+    
     def register_context_source(self, source: ContextSource) -> bool:
         """Register a new context source"""
+        if source.source_id in self.source_manager.sources:
+            # Re-registering replaces the source; responses built from the old one are stale
+            self.response_cache.invalidate_sources([source.source_id])
         return self.source_manager.register_source(source)
     
+    def invalidate_cache(self, source_ids: Optional[Iterable[str]] = None) -> int:
+        """Drop cached responses built from the given sources (all responses if None)"""
+        if source_ids is None:
+            removed = self.response_cache.clear()
+        else:
+            removed = self.response_cache.invalidate_sources(source_ids)
+        if removed:
+            logger.info(f"🧹 Invalidated {removed} cached context responses")
+        return removed
+    
+    def notify_tables_changed(self, tables: Iterable[str]) -> int:
+        """Invalidation hook for memory table writes
+        
+        Sources list the tables they read in ``metadata['tables']``; responses
+        built from any source reading a changed table are dropped. Called by
+        the write listener of every database passed to ``attach_database``.
+        """
+        changed = set(tables)
+        affected = [
+            source_id for source_id, source in self.source_manager.sources.items()
+            if changed.intersection(source.metadata.get('tables', ()))
+        ]
+        return self.invalidate_cache(affected) if affected else 0
+    
     def orchestrate_context(self, request: ContextRequest) -> ContextResponse:
         """Orchestrate context based on the request"""
         start_time = time.time()
@@ -254,11 +486,33 @@ class ContextOrchestrator:
             # Get available sources
             available_sources = self.source_manager.get_available_sources()
             
-            # Filter and prioritize sources
+            # Filter and prioritize sources, leaving out sources too slow for the budget
+            budget = self._request_budget(request, strategy)
             selected_sources = self._select_sources(request, strategy, available_sources)
+            selected_sources, skipped_sources = self._skip_slow_sources(selected_sources, budget)
+            source_ids = [s.source_id for s in selected_sources]
+            
+            # Serve equal requests from the cache
+            cache_key = self.response_cache.make_key(request, strategy.strategy_id, source_ids)
+            cache_epoch = self.response_cache.epoch()
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                response = replace(
+                    cached,
+                    response_id=f"resp_{int(time.time())}",
+                    request_id=request.request_id,
+                    context_data=copy.deepcopy(cached.context_data),
+                    orchestration_time=time.time() - start_time,
+                    metadata={**cached.metadata, 'cache_hit': True}
+                )
+                self.response_cache.record_latency(True, response.orchestration_time)
+                self._update_performance_metrics(response)
+                self._record_request(request, response)
+                logger.info(f"💾 Context served from cache: {len(source_ids)} sources, {response.orchestration_time:.3f}s")
+                return response
             
             # Gather context from selected sources
-            context_data = self._gather_context(request, selected_sources, strategy)
+            context_data, timed_out_sources = self._gather_context(request, selected_sources, strategy, budget)
             
             # Combine and optimize context
             orchestrated_context = self._combine_context(context_data, strategy)
@@ -272,7 +526,7 @@ class ContextOrchestrator:
             response = ContextResponse(
                 response_id=f"resp_{int(time.time())}",
                 request_id=request.request_id,
-                context_sources=[s.source_id for s in selected_sources],
+                context_sources=source_ids,
                 context_data=orchestrated_context,
                 relevance_score=relevance_score,
                 confidence=confidence,
@@ -281,6 +535,10 @@ class ContextOrchestrator:
                 metadata={
                     'strategy_used': strategy.strategy_id,
                     'sources_used': len(selected_sources),
+                    'budget': budget,
+                    'partial': bool(timed_out_sources),
+                    'timed_out_sources': timed_out_sources,
+                    'skipped_sources': skipped_sources,
                     'quality_metrics': {
                         'relevance': relevance_score,
                         'confidence': confidence,
@@ -289,8 +547,11 @@ class ContextOrchestrator:
                 }
             )
             
-            # Cache response
-            self._cache_response(response)
+            # Cache a private copy so callers can mutate what they got back (partial responses are not cached)
+            self.response_cache.record_latency(False, response.orchestration_time)
+            if not timed_out_sources:
+                self.response_cache.put(cache_key, replace(response, context_data=copy.deepcopy(orchestrated_context)),
+                                        strategy.combination_rules.get('cache_ttl', 0), source_ids, cache_epoch)
             
             # Update performance metrics
             self._update_performance_metrics(response)
@@ -340,45 +601,139 @@ class ContextOrchestrator:
         
         return selected_sources
     
-    def _gather_context(self, request: ContextRequest, sources: List[ContextSource], strategy: OrchestrationStrategy) -> Dict[str, Any]:
-        """Gather context from selected sources"""
+    def _request_budget(self, request: ContextRequest, strategy: OrchestrationStrategy) -> float:
+        """Seconds the request may spend gathering: the strategy's response time target, capped by its deadline"""
+        budget = strategy.performance_targets.get('response_time', strategy.combination_rules.get('timeout', 1.0))
+        if request.deadline is not None:
+            budget = min(budget, max(0.0, request.deadline - time.time()))
+        return budget
+    
+    def _skip_slow_sources(self, sources: List[ContextSource], budget: float) -> Tuple[List[ContextSource], List[str]]:
+        """Leave out sources whose recent p95 latency exceeds the budget"""
+        kept, skipped = [], []
+        for source in sources:
+            recent = self.recent_latency.get(source.source_id)
+            if recent and len(recent) >= self.min_latency_samples:
+                ordered = sorted(recent)
+                p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+                if p95 > budget:
+                    health = self.source_manager.source_health.get(source.source_id, {})
+                    health['skipped_count'] = health.get('skipped_count', 0) + 1
+                    if health['skipped_count'] % self.slow_source_probe_interval:
+                        skipped.append(source.source_id)
+                        continue
+            kept.append(source)
+        if skipped:
+            logger.info(f"⏭️ Skipping slow context sources (p95 over {budget:.3f}s): {skipped}")
+        return kept, skipped
+    
+    def _record_source_latency(self, source_id: str, seconds: float):
+        self.source_latency[source_id].observe(seconds)
+        self.recent_latency[source_id].append(seconds)
+    
+    def _timed_gather(self, source: ContextSource, request: ContextRequest) -> Tuple[Optional[Dict[str, Any]], float]:
+        start = time.perf_counter()
+        result = self._gather_from_source(source, request)
+        return result, time.perf_counter() - start
+    
+    def _submit_source(self, source: ContextSource, request: ContextRequest) -> Tuple[Optional[Future], float]:
+        """Start a call to ``source`` on the pool
+        
+        Returns the new future, or None and the age of the previous call if
+        that call is still running.
+        """
+        with self._in_flight_lock:
+            running = self._in_flight.get(source.source_id)
+            if running is not None and not running[0].done():
+                return None, time.perf_counter() - running[1]
+            future = self.executor.submit(self._timed_gather, source, request)
+            self._in_flight[source.source_id] = (future, time.perf_counter())
+        future.add_done_callback(lambda done, source_id=source.source_id: self._call_finished(source_id, done))
+        return future, 0.0
+    
+    def _call_finished(self, source_id: str, future: Future):
+        with self._in_flight_lock:
+            running = self._in_flight.get(source_id)
+            if running is not None and running[0] is future:
+                del self._in_flight[source_id]
+    
+    def _gather_context(self, request: ContextRequest, sources: List[ContextSource],
+                        strategy: OrchestrationStrategy, budget: float) -> Tuple[Dict[str, Any], List[str]]:
+        """Gather context from selected sources
+        
+        Sources run concurrently; results are taken in completion order until
+        each source's timeout (``combination_rules['timeout']``) or the overall
+        budget expires. Sources still busy with an earlier request are not
+        queried. Returns the gathered context and the timed-out (or busy) source IDs.
+        """
         context_data = {}
+        timed_out = []
+        if not sources:
+            return context_data, timed_out
         
-        # Use ThreadPoolExecutor for parallel context gathering
-        with ThreadPoolExecutor(max_workers=min(len(sources), 5)) as executor:
-            future_to_source = {
-                executor.submit(self._gather_from_source, source, request): source
-                for source in sources
-            }
+        start = time.perf_counter()
+        deadline = start + budget
+        source_timeout = strategy.combination_rules.get('timeout', 1.0)
+        pending = {}
+        for source in sources:
+            future, busy_for = self._submit_source(source, request)
+            if future is None:
+                # The running call has taken at least this long; it counts towards the slow-source p95
+                timed_out.append(source.source_id)
+                self._record_source_latency(source.source_id, busy_for)
+                health = self.source_manager.source_health.get(source.source_id, {})
+                self.source_manager.update_source_health(source.source_id, {
+                    'busy_count': health.get('busy_count', 0) + 1
+                })
+                continue
+            pending[future] = (source, min(deadline, start + source_timeout))
+        
+        while pending:
+            next_limit = min(limit for _, limit in pending.values())
+            done, _ = wait(pending, timeout=max(0.0, next_limit - time.perf_counter()), return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
             
-            for future in future_to_source:
+            for future in done:
+                source, _ = pending.pop(future)
+                health = self.source_manager.source_health.get(source.source_id, {})
                 try:
-                    source = future_to_source[future]
-                    source_context = future.result(timeout=strategy.combination_rules.get('timeout', 1.0))
-                    
-                    if source_context:
-                        context_data[source.source_id] = {
-                            'source': asdict(source),
-                            'context': source_context,
-                            'timestamp': time.time()
-                        }
-                        
-                        # Update source health
-                        self.source_manager.update_source_health(source.source_id, {
-                            'success_count': self.source_manager.source_health[source.source_id].get('success_count', 0) + 1,
-                            'response_time': time.time() - source.freshness
-                        })
-                    
+                    source_context, elapsed = future.result()
                 except Exception as e:
-                    source = future_to_source[future]
+                    self._record_source_latency(source.source_id, now - start)
                     logger.warning(f"⚠️ Failed to gather context from {source.source_id}: {str(e)}")
-                    
-                    # Update source health
                     self.source_manager.update_source_health(source.source_id, {
-                        'error_count': self.source_manager.source_health[source.source_id].get('error_count', 0) + 1
+                        'error_count': health.get('error_count', 0) + 1
+                    })
+                    continue
+                
+                self._record_source_latency(source.source_id, elapsed)
+                if source_context:
+                    context_data[source.source_id] = {
+                        'source': asdict(source),
+                        'context': source_context,
+                        'timestamp': time.time()
+                    }
+                    self.source_manager.update_source_health(source.source_id, {
+                        'success_count': health.get('success_count', 0) + 1,
+                        'response_time': elapsed
+                    })
+            
+            # Give up on sources past their timeout; the result of a running call is discarded,
+            # and the source is not queried again until that call returns
+            for future, (source, limit) in list(pending.items()):
+                if limit <= now:
+                    del pending[future]
+                    future.cancel()
+                    timed_out.append(source.source_id)
+                    self._record_source_latency(source.source_id, now - start)
+                    health = self.source_manager.source_health.get(source.source_id, {})
+                    self.source_manager.update_source_health(source.source_id, {
+                        'timeout_count': health.get('timeout_count', 0) + 1
                     })
         
-        return context_data
+        if timed_out:
+            logger.warning(f"⏱️ Context sources timed out or busy after {time.perf_counter() - start:.3f}s: {timed_out}")
+        return context_data, timed_out
     
     def _gather_from_source(self, source: ContextSource, request: ContextRequest) -> Optional[Dict[str, Any]]:
         """Gather context from a specific source"""
@@ -522,19 +877,6 @@ class ContextOrchestrator:
         
         return min(freshness_score, 1.0)
     
-    def _cache_response(self, response: ContextResponse):
-        """Cache the response for future use"""
-        cache_key = f"{response.request_id}_{response.context_sources}"
-        self.response_cache[cache_key] = response
-        
-        # Limit cache size
-        if len(self.response_cache) > 100:
-            # Remove oldest entries
-            oldest_keys = sorted(self.response_cache.keys(), 
-                               key=lambda k: self.response_cache[k].created_at)[:20]
-            for key in oldest_keys:
-                del self.response_cache[key]
-    
     def _update_performance_metrics(self, response: ContextResponse):
         """Update performance tracking metrics"""
         self.total_requests += 1
@@ -578,6 +920,7 @@ class ContextOrchestrator:
     
     def get_orchestration_stats(self) -> Dict[str, Any]:
         """Get comprehensive orchestration statistics"""
+        cache_stats = self.response_cache.get_stats()
         return {
             'performance': {
                 'total_requests': self.total_requests,
@@ -588,11 +931,16 @@ class ContextOrchestrator:
             'sources': {
                 'total_sources': len(self.source_manager.sources),
                 'active_sources': len([s for s in self.source_manager.get_available_sources()]),
-                'source_health': self.source_manager.source_health
+                'source_health': self.source_manager.source_health,
+                'latency': {
+                    source_id: histogram.snapshot()
+                    for source_id, histogram in self.source_latency.items()
+                }
             },
             'cache': {
                 'cached_responses': len(self.response_cache),
-                'cache_hit_rate': 0.0  # Would calculate based on actual usage
+                'cache_hit_rate': cache_stats['hit_rate'],
+                **cache_stats
             },
             'strategies': {
                 'available_strategies': list(self.orchestration_strategies.keys()),
@@ -634,6 +982,7 @@ class ContextOrchestrator:
 
 ## 💾 Cache & Storage
 - **Cached Responses**: {stats['cache']['cached_responses']}
+- **Cache Hit Rate**: {stats['cache']['cache_hit_rate']:.1%}
 """
         
         return summary
@@ -671,7 +1020,8 @@ def main():
                 priority=0.9,
                 freshness=time.time(),
                 reliability=0.95,
-                metadata={'version': '1.0', 'capabilities': ['file_scanning', 'dependency_analysis']}
+                # Reads the project tree, not memory tables
+                metadata={'version': '1.0', 'capabilities': ['file_scanning', 'dependency_analysis'], 'tables': []}
             ),
             ContextSource(
                 source_id='knowledge_engine',
@@ -681,7 +1031,8 @@ def main():
                 priority=0.8,
                 freshness=time.time(),
                 reliability=0.9,
-                metadata={'version': '1.0', 'capabilities': ['concept_extraction', 'relationship_building']}
+                metadata={'version': '1.0', 'capabilities': ['concept_extraction', 'relationship_building'],
+                          'tables': ['memory_chunks', 'learning_bits']}
             ),
             ContextSource(
                 source_id='personalization_engine',
@@ -691,7 +1042,8 @@ def main():
                 priority=0.85,
                 freshness=time.time(),
                 reliability=0.88,
-                metadata={'version': '1.0', 'capabilities': ['pattern_learning', 'behavior_injection']}
+                metadata={'version': '1.0', 'capabilities': ['pattern_learning', 'behavior_injection'],
+                          'tables': ['conversation_memories', 'context_history', 'identity_profiles']}
             )
         ]
         
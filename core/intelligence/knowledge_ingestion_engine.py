@@ -491,6 +491,17 @@ class KnowledgeGraphBuilder:
         self.patterns: Dict[str, Any] = {}
         self.node_counter = 0
         self.relationship_counter = 0
+        
+        # Lookup indexes kept in sync with nodes/relationships
+        self.concept_index: Dict[str, str] = {}  # normalized concept name -> node id
+        self.outgoing: Dict[str, List[str]] = defaultdict(list)  # node id -> relationship ids
+        self.incoming: Dict[str, List[str]] = defaultdict(list)
+        self._concept_sources: Dict[str, Set[str]] = {}
+    
+    @staticmethod
+    def _normalize_concept(concept: str) -> str:
+        """Key used to match concept names"""
+        return concept.lower()
     
     def add_document_context(self, doc_context: DocumentContext) -> List[str]:
         """Add document context to the knowledge graph"""
@@ -525,8 +536,9 @@ class KnowledgeGraphBuilder:
             self._create_relationship(doc_node_id, concept_node_id, 'contains', 0.8)
         
         # Add relationship nodes
+        extracted_concepts = set(doc_context.extracted_concepts)
         for rel in doc_context.relationships:
-            if rel['source'] in doc_context.extracted_concepts:
+            if rel['source'] in extracted_concepts:
                 source_id = self._get_concept_node_id(rel['source'])
                 if source_id:
                     self._create_relationship(source_id, doc_node_id, rel['type'], 0.7)
@@ -536,15 +548,16 @@ class KnowledgeGraphBuilder:
     def _get_or_create_concept_node(self, concept: str, source: str) -> str:
         """Get existing concept node or create new one"""
         # Check if concept already exists
-        for node_id, node in self.nodes.items():
-            if node.type == 'concept' and node.name.lower() == concept.lower():
-                # Update metadata
-                node.updated_at = time.time()
-                if source not in node.metadata.get('sources', []):
-                    if 'sources' not in node.metadata:
-                        node.metadata['sources'] = []
-                    node.metadata['sources'].append(source)
-                return node_id
+        node_id = self.concept_index.get(self._normalize_concept(concept))
+        if node_id is not None:
+            node = self.nodes[node_id]
+            # Update metadata
+            node.updated_at = time.time()
+            sources = self._concept_sources[node_id]
+            if source not in sources:
+                sources.add(source)
+                node.metadata.setdefault('sources', []).append(source)
+            return node_id
         
         # Create new concept node
         concept_node_id = f"concept_{self.node_counter}"
@@ -563,14 +576,21 @@ class KnowledgeGraphBuilder:
         )
         
         self.nodes[concept_node_id] = concept_node
+        self.concept_index[self._normalize_concept(concept)] = concept_node_id
+        self._concept_sources[concept_node_id] = {source}
         return concept_node_id
     
     def _get_concept_node_id(self, concept: str) -> Optional[str]:
         """Get the ID of an existing concept node"""
-        for node_id, node in self.nodes.items():
-            if node.type == 'concept' and node.name.lower() == concept.lower():
-                return node_id
-        return None
+        return self.concept_index.get(self._normalize_concept(concept))
+    
+    def get_outgoing_relationships(self, node_id: str) -> List[KnowledgeRelationship]:
+        """Relationships whose source is the given node"""
+        return [self.relationships[rel_id] for rel_id in self.outgoing.get(node_id, ())]
+    
+    def get_incoming_relationships(self, node_id: str) -> List[KnowledgeRelationship]:
+        """Relationships whose target is the given node"""
+        return [self.relationships[rel_id] for rel_id in self.incoming.get(node_id, ())]
     
     def _create_relationship(self, source_id: str, target_id: str, rel_type: str, strength: float) -> str:
         """Create a relationship between two nodes"""
@@ -588,6 +608,8 @@ class KnowledgeGraphBuilder:
         )
         
         self.relationships[rel_id] = relationship
+        self.outgoing[source_id].append(rel_id)
+        self.incoming[target_id].append(rel_id)
         return rel_id
     
     def build_knowledge_graph(self) -> KnowledgeGraph:
@@ -849,17 +871,21 @@ class KnowledgeIngestionEngine:
         
         results = []
         query_lower = query.lower()
+        graph_nodes = self.knowledge_graph.nodes
+        graph_relationships = self.knowledge_graph.relationships
         
-        for node in self.knowledge_graph.nodes.values():
-            if node.type == 'concept':
+        for node_id in self.graph_builder.concept_index.values():
+            node = graph_nodes.get(node_id)
+            if node:
                 if (query_lower in node.name.lower() or 
                     query_lower in node.description.lower()):
                     
-                    # Find related nodes
+                    # Find related nodes through the adjacency index
                     related = []
-                    for rel in self.knowledge_graph.relationships.values():
-                        if rel.source_id == node.id:
-                            target_node = self.knowledge_graph.nodes.get(rel.target_id)
+                    for rel_id in self.graph_builder.outgoing.get(node.id, ()):
+                        rel = graph_relationships.get(rel_id)
+                        if rel:
+                            target_node = graph_nodes.get(rel.target_id)
                             if target_node:
                                 related.append({
                                     'id': target_node.id,
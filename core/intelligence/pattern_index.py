@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Pattern Index - Vectorized cosine-similarity index for neural pattern features
+Keeps L2-normalized feature rows in one contiguous numpy matrix so similarity
+queries are a single matrix multiply, with optional memory-mapped persistence
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PatternIndex:
+    """
+    Cosine-similarity index over fixed-width feature vectors.
+
+    Rows are normalized on insert, so a query is ``matrix @ q / |q|``. Top-k
+    selection uses ``argpartition`` (linear time) and only the k survivors are
+    sorted. Removal swaps the last row into the freed slot to keep the live
+    rows contiguous.
+    """
+
+    def __init__(self, dimensions: int, initial_capacity: int = 256, dtype=np.float32):
+        self.dimensions = dimensions
+        self.dtype = np.dtype(dtype)
+        self._matrix = np.zeros((max(1, initial_capacity), dimensions), dtype=self.dtype)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, pattern_id: str) -> bool:
+        return pattern_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        """Pattern IDs in row order"""
+        return list(self._ids)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """View of the live (normalized) rows"""
+        return self._matrix[:len(self._ids)]
+
+    def _normalize(self, features: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(features, dtype=self.dtype).reshape(-1)
+        if vector.shape[0] != self.dimensions:
+            raise ValueError(f"Expected {self.dimensions} features, got {vector.shape[0]}")
+        norm = np.linalg.norm(vector)
+        # Zero vectors stay zero and therefore have similarity 0 with everything
+        return vector / norm if norm > 0 else vector
+
+    def _ensure_capacity(self, rows: int):
+        capacity = self._matrix.shape[0]
+        if rows <= capacity and self._matrix.flags.writeable:
+            return
+        new_capacity = capacity
+        while new_capacity < rows:
+            new_capacity *= 2
+        # Also detaches a read-only memory map before the first write
+        grown = np.zeros((new_capacity, self.dimensions), dtype=self.dtype)
+        grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = grown
+
+    def upsert(self, pattern_id: str, features: Sequence[float]):
+        """Insert or replace the feature vector of a pattern"""
+        vector = self._normalize(features)
+        row = self._rows.get(pattern_id)
+        if row is None:
+            row = len(self._ids)
+            self._ensure_capacity(row + 1)
+            self._ids.append(pattern_id)
+            self._rows[pattern_id] = row
+        else:
+            self._ensure_capacity(len(self._ids))
+        self._matrix[row] = vector
+
+    def remove(self, pattern_id: str) -> bool:
+        """Remove a pattern; returns False if it was not indexed"""
+        row = self._rows.pop(pattern_id, None)
+        if row is None:
+            return False
+        self._ensure_capacity(len(self._ids))
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._ids.pop()
+        self._matrix[last] = 0
+        return True
+
+    def query(self, features: Sequence[float], threshold: float = 0.0,
+              top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Patterns with cosine similarity >= threshold, best first"""
+        return self.query_batch([features], threshold=threshold, top_k=top_k)[0]
+
+    def query_batch(self, queries: Sequence[Sequence[float]], threshold: float = 0.0,
+                    top_k: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """Run several queries with one matrix multiply"""
+        query_matrix = np.atleast_2d(np.asarray(queries, dtype=self.dtype))
+        if len(self._ids) == 0 or query_matrix.shape[0] == 0:
+            return [[] for _ in range(query_matrix.shape[0])]
+        if query_matrix.shape[1] != self.dimensions:
+            raise ValueError(f"Expected {self.dimensions} features, got {query_matrix.shape[1]}")
+
+        norms = np.linalg.norm(query_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        scores = (query_matrix / norms) @ self.matrix.T
+        np.clip(scores, -1.0, 1.0, out=scores)
+
+        results = []
+        for row_scores in scores:
+            candidates = np.flatnonzero(row_scores >= threshold)
+            if top_k is not None and len(candidates) > top_k:
+                if top_k <= 0:
+                    results.append([])
+                    continue
+                part = np.argpartition(-row_scores[candidates], top_k - 1)[:top_k]
+                candidates = candidates[part]
+            order = candidates[np.argsort(-row_scores[candidates], kind='stable')]
+            results.append([(self._ids[i], float(row_scores[i])) for i in order])
+        return results
+
+    def save(self, path: str):
+        """Persist the matrix as .npy (memory-mappable) plus an ID sidecar"""
+        base = Path(path)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        matrix_path = base.with_suffix('.npy')
+        ids_path = base.with_suffix('.ids.json')
+
+        tmp_matrix = matrix_path.with_name(matrix_path.stem + '.tmp.npy')
+        np.save(tmp_matrix, np.ascontiguousarray(self.matrix))
+        tmp_ids = ids_path.with_name(ids_path.name + '.tmp')
+        with open(tmp_ids, 'w') as f:
+            json.dump({'dimensions': self.dimensions, 'ids': self._ids}, f)
+        os.replace(tmp_matrix, matrix_path)
+        os.replace(tmp_ids, ids_path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "PatternIndex":
+        """Load a saved index; with ``mmap`` the matrix is paged in lazily from disk"""
+        base = Path(path)
+        with open(base.with_suffix('.ids.json'), 'r') as f:
+            meta = json.load(f)
+        matrix = np.load(base.with_suffix('.npy'), mmap_mode='r' if mmap else None)
+
+        index = cls(meta['dimensions'], initial_capacity=1, dtype=matrix.dtype)
+        index._matrix = matrix
+        index._ids = list(meta['ids'])
+        index._rows = {pattern_id: row for row, pattern_id in enumerate(index._ids)}
+        if len(index._ids) != matrix.shape[0]:
+            raise ValueError(f"Pattern index at {path} is inconsistent: "
+                             f"{len(index._ids)} ids for {matrix.shape[0]} rows")
+        return index
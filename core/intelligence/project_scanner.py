@@ -67,11 +67,24 @@ class ProjectIndex:
     patterns: Dict[str, Any]
     context: Dict[str, Any]
     history: List[Dict[str, Any]]
+    changes: Optional[Dict[str, Any]] = None  # Delta against the previous scan
+
+# Bump when the persisted index layout changes; older files are ignored
+INDEX_FORMAT_VERSION = 1
 
 class ProjectScanner:
-    """Comprehensive project scanning and indexing system"""
+    """Comprehensive project scanning and indexing system
+    
+    Scans are incremental: each indexed file keeps an (inode, size, mtime_ns)
+    stat signature, and only files whose signature changed are re-read and
+    rehashed. With persistence enabled the index and signatures are saved to
+    ``index_path`` so a fresh process also starts from the previous scan.
+    Persistence is opt-in: it is on when ``index_path`` is given or
+    ``persist_index`` is True; without a path the index file goes under
+    ``project_index/`` next to the configured brain database (BRAIN_DB_PATH).
+    """
     
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, index_path: Optional[str] = None, persist_index: Optional[bool] = None):
         self.project_root = Path(project_root).resolve()
         self.file_index: Dict[str, FileMetadata] = {}
         self.directory_index: Dict[str, DirectoryInfo] = {}
@@ -80,6 +93,16 @@ class ProjectScanner:
         self.context_index: Dict[str, Any] = {}
         self.history_index: List[Dict[str, Any]] = []
         
+        # Incremental scanning state: relative path -> (st_ino, st_size, st_mtime_ns)
+        self.file_signatures: Dict[str, tuple] = {}
+        self.persist_index = index_path is not None if persist_index is None else persist_index
+        if index_path is None:
+            root_id = hashlib.md5(str(self.project_root).encode()).hexdigest()[:12]
+            store_dir = os.path.dirname(os.path.abspath(os.getenv("BRAIN_DB_PATH", "brain_memory_store/brain.db")))
+            index_path = os.path.join(store_dir, "project_index", f"{self.project_root.name}_{root_id}.json")
+        self.index_path = Path(index_path)
+        self._index_loaded = False
+        
         # Language and framework detection patterns
         self.language_patterns = {
             'python': ['.py', '.pyw', '.pyx', '.pyi'],
@@ -170,21 +193,31 @@ class ProjectScanner:
             'data': ['data', 'datasets', 'db', 'database', 'migrations']
         }
     
-    def scan_project(self) -> ProjectIndex:
-        """Comprehensive project scanning and indexing"""
+    def scan_project(self, incremental: bool = True) -> ProjectIndex:
+        """Comprehensive project scanning and indexing
+        
+        With ``incremental`` (the default) unchanged files are reused from the
+        previous scan, in memory or persisted; otherwise every file is rehashed.
+        The returned index carries the delta in ``changes``.
+        """
         logger.info(f"🔍 Starting project scan: {self.project_root}")
         start_time = time.time()
         
         try:
-            # Clear previous index
-            self.file_index.clear()
+            if incremental:
+                self._load_persisted_index()
+            else:
+                self.file_index.clear()
+                self.file_signatures.clear()
+            
+            # Clear derived indexes; files are reconciled against their signatures
             self.directory_index.clear()
             self.dependency_index.clear()
             self.pattern_index.clear()
             self.context_index.clear()
             
             # Scan file system
-            self._scan_file_system()
+            changes = self._scan_file_system()
             
             # Detect dependencies
             self._detect_dependencies()
@@ -197,7 +230,8 @@ class ProjectScanner:
             
             # Record scan history
             scan_duration = time.time() - start_time
-            self._record_scan_history(scan_duration)
+            changes['duration'] = scan_duration
+            self._record_scan_history(scan_duration, changes)
             
             # Create and return project index
             project_index = ProjectIndex(
@@ -211,11 +245,17 @@ class ProjectScanner:
                 dependencies=self.dependency_index.copy(),
                 patterns=self.pattern_index.copy(),
                 context=self.context_index.copy(),
-                history=self.history_index.copy()
+                history=self.history_index.copy(),
+                changes=changes
             )
             
+            if self.persist_index:
+                self._save_persisted_index()
+            
             logger.info(f"✅ Project scan completed in {scan_duration:.2f}s")
-            logger.info(f"📊 Indexed {len(self.file_index)} files, {len(self.directory_index)} directories")
+            logger.info(f"📊 Indexed {len(self.file_index)} files, {len(self.directory_index)} directories "
+                        f"({changes['rehashed']} rehashed, {len(changes['added'])} added, "
+                        f"{len(changes['modified'])} modified, {len(changes['deleted'])} deleted)")
             
             return project_index
             
@@ -223,27 +263,97 @@ class ProjectScanner:
             logger.error(f"❌ Project scan failed: {str(e)}")
             raise
     
-    def _scan_file_system(self):
-        """Scan the file system and build file and directory indexes"""
+    def scan_delta(self) -> Dict[str, Any]:
+        """Run an incremental scan and return only what changed since the previous scan"""
+        return self.scan_project(incremental=True).changes
+    
+    def _walk(self):
+        """Top-down directory walk yielding (dir_path, entries) with one scandir per directory"""
+        stack = [self.project_root]
+        while stack:
+            dir_path = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to read directory {dir_path}: {str(e)}")
+                continue
+            
+            yield dir_path, entries
+            
+            # Like os.walk(followlinks=False): list symlinked dirs but don't descend into them
+            for entry in reversed(entries):
+                try:
+                    if (entry.is_dir() and not entry.is_symlink()
+                            and not self._should_skip_directory(entry.name)):
+                        stack.append(Path(entry.path))
+                except OSError:
+                    continue
+    
+    def _scan_file_system(self) -> Dict[str, Any]:
+        """Scan the file system and reconcile file and directory indexes
+        
+        Costs one stat per file; only files whose stat signature changed are
+        re-read and rehashed. Returns the delta against the previous index.
+        """
         logger.info("📁 Scanning file system...")
         
-        for root, dirs, files in os.walk(self.project_root):
-            root_path = Path(root)
-            relative_root = root_path.relative_to(self.project_root)
+        previous_files = set(self.file_index)
+        seen_files: Set[str] = set()
+        changes = {'added': [], 'modified': [], 'deleted': [], 'unchanged': 0, 'rehashed': 0}
+        
+        for dir_path, entries in self._walk():
+            relative_root = dir_path.relative_to(self.project_root)
             
-            # Skip common directories that don't need indexing
-            dirs[:] = [d for d in dirs if not self._should_skip_directory(d)]
+            file_stats = []
+            subdir_count = 0
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        file_stats.append((entry, entry.stat()))
+                    elif entry.is_dir():
+                        subdir_count += 1
+                except OSError:
+                    continue
             
             # Process directories
             if str(relative_root) != '.':
-                self._process_directory(root_path, relative_root)
+                self._process_directory(dir_path, relative_root, file_stats, subdir_count)
             
             # Process files
-            for file in files:
-                if not self._should_skip_file(file):
-                    file_path = root_path / file
-                    relative_path = file_path.relative_to(self.project_root)
-                    self._process_file(file_path, relative_path)
+            for entry, stat in file_stats:
+                if self._should_skip_file(entry.name):
+                    continue
+                relative_path = relative_root / entry.name
+                key = str(relative_path)
+                seen_files.add(key)
+                
+                signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                existing = self.file_index.get(key)
+                if existing is not None and self.file_signatures.get(key) == signature:
+                    changes['unchanged'] += 1
+                    self._register_file(existing, relative_path)
+                    continue
+                
+                old_hash = existing.hash if existing is not None else None
+                file_metadata = self._process_file(Path(entry.path), relative_path, stat)
+                if file_metadata is None:
+                    continue
+                changes['rehashed'] += 1
+                self.file_signatures[key] = signature
+                if existing is None:
+                    changes['added'].append(key)
+                elif file_metadata.hash != old_hash:
+                    changes['modified'].append(key)
+                else:
+                    changes['unchanged'] += 1  # Touched, content identical
+        
+        for key in previous_files - seen_files:
+            self.file_index.pop(key, None)
+            self.file_signatures.pop(key, None)
+            changes['deleted'].append(key)
+        
+        return changes
     
     def _should_skip_directory(self, dir_name: str) -> bool:
         """Determine if a directory should be skipped during scanning"""
@@ -274,28 +384,21 @@ class ProjectScanner:
         }
         return any(file_name.endswith(pattern) for pattern in skip_patterns)
     
-    def _process_directory(self, dir_path: Path, relative_path: Path):
-        """Process and index a directory"""
+    def _process_directory(self, dir_path: Path, relative_path: Path,
+                           file_stats: List[tuple], subdir_count: int):
+        """Process and index a directory from its already-listed entries"""
         try:
             dir_info = DirectoryInfo(
                 path=str(relative_path),
                 name=dir_path.name,
-                file_count=0,
-                subdir_count=0,
-                total_size=0,
+                file_count=len(file_stats),
+                subdir_count=subdir_count,
+                total_size=sum(stat.st_size for _, stat in file_stats),
                 languages=set(),
                 frameworks=set(),
                 purpose=None # Initialize purpose to None
             )
             
-            # Count files and subdirectories
-            for item in dir_path.iterdir():
-                if item.is_file():
-                    dir_info.file_count += 1
-                    dir_info.total_size += item.stat().st_size
-                elif item.is_dir():
-                    dir_info.subdir_count += 1
-            
             # Detect purpose
             dir_info.purpose = self._detect_purpose(dir_path)
             
@@ -304,10 +407,11 @@ class ProjectScanner:
         except Exception as e:
             logger.warning(f"⚠️ Failed to process directory {dir_path}: {str(e)}")
     
-    def _process_file(self, file_path: Path, relative_path: Path):
+    def _process_file(self, file_path: Path, relative_path: Path,
+                      stat: Optional[os.stat_result] = None) -> Optional[FileMetadata]:
         """Process and index a file"""
         try:
-            stat = file_path.stat()
+            stat = stat or file_path.stat()
             
             # Detect file type and language
             file_type = self._detect_file_type(file_path)
@@ -339,18 +443,24 @@ class ProjectScanner:
                 exports=exports or []
             )
             
-            self.file_index[str(relative_path)] = file_metadata
-            
-            # Update directory language and framework sets
-            if language:
-                parent_dir = str(relative_path.parent)
-                if parent_dir in self.directory_index:
-                    self.directory_index[parent_dir].languages.add(language)
-                if framework:
-                    self.directory_index[parent_dir].frameworks.add(framework)
+            self._register_file(file_metadata, relative_path)
+            return file_metadata
             
         except Exception as e:
             logger.warning(f"⚠️ Failed to process file {file_path}: {str(e)}")
+            return None
+    
+    def _register_file(self, file_metadata: FileMetadata, relative_path: Path):
+        """Add file metadata to the index and roll its language/framework up to the directory"""
+        self.file_index[str(relative_path)] = file_metadata
+        
+        # Update directory language and framework sets
+        if file_metadata.language:
+            parent_dir = str(relative_path.parent)
+            if parent_dir in self.directory_index:
+                self.directory_index[parent_dir].languages.add(file_metadata.language)
+                if file_metadata.framework:
+                    self.directory_index[parent_dir].frameworks.add(file_metadata.framework)
     
     def _detect_file_type(self, file_path: Path) -> str:
         """Detect the type of a file"""
@@ -784,12 +894,17 @@ class ProjectScanner:
         
         return vcs
     
-    def _record_scan_history(self, scan_duration: float):
+    def _record_scan_history(self, scan_duration: float, changes: Optional[Dict[str, Any]] = None):
         """Record scan history for tracking and analysis"""
+        changes = changes or {}
         scan_record = {
             'timestamp': datetime.now().isoformat(),
             'duration': scan_duration,
             'files_scanned': len(self.file_index),
+            'files_rehashed': changes.get('rehashed', len(self.file_index)),
+            'files_added': len(changes.get('added', [])),
+            'files_modified': len(changes.get('modified', [])),
+            'files_deleted': len(changes.get('deleted', [])),
             'directories_scanned': len(self.directory_index),
             'dependencies_found': len(self.dependency_index),
             'patterns_analyzed': len(self.pattern_index),
@@ -803,7 +918,11 @@ class ProjectScanner:
             self.history_index = self.history_index[-10:]
     
     def detect_changes(self) -> List[Dict[str, Any]]:
-        """Detect changes in the project since last scan"""
+        """Detect changes in the project since last scan
+        
+        Only files whose stat signature differs from the indexed one are
+        rehashed; the index itself is left untouched (use scan_delta to update it).
+        """
         logger.info("🔄 Detecting changes...")
         
         changes = []
@@ -811,27 +930,79 @@ class ProjectScanner:
         for file_path, file_meta in self.file_index.items():
             full_path = self.project_root / file_path
             
-            if full_path.exists():
-                # Check if file has changed
-                current_hash = self._calculate_file_hash(full_path)
-                if current_hash != file_meta.hash:
-                    changes.append({
-                        'type': 'modified',
-                        'path': file_path,
-                        'old_hash': file_meta.hash,
-                        'new_hash': current_hash,
-                        'timestamp': datetime.now().isoformat()
-                    })
-            else:
+            try:
+                stat = full_path.stat()
+            except FileNotFoundError:
                 # File was deleted
                 changes.append({
                     'type': 'deleted',
                     'path': file_path,
                     'timestamp': datetime.now().isoformat()
                 })
+                continue
+            except OSError:
+                continue
+            
+            if self.file_signatures.get(file_path) == (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+                continue
+            
+            # Stat signature changed: check whether the content really did
+            current_hash = self._calculate_file_hash(full_path)
+            if current_hash != file_meta.hash:
+                changes.append({
+                    'type': 'modified',
+                    'path': file_path,
+                    'old_hash': file_meta.hash,
+                    'new_hash': current_hash,
+                    'timestamp': datetime.now().isoformat()
+                })
         
         return changes
     
+    def _load_persisted_index(self):
+        """Load the persisted file index and stat manifest once per scanner"""
+        if self._index_loaded:
+            return
+        self._index_loaded = True
+        if not self.persist_index or not self.index_path.exists():
+            return
+        
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if (data.get('version') != INDEX_FORMAT_VERSION or
+                    data.get('project_root') != str(self.project_root)):
+                logger.info("📁 Persisted project index is stale, running a full scan")
+                return
+            
+            self.file_index = {path: FileMetadata(**meta) for path, meta in data['files'].items()}
+            self.file_signatures = {path: tuple(sig) for path, sig in data['signatures'].items()}
+            self.history_index = data.get('history', [])
+            logger.info(f"📁 Loaded persisted project index ({len(self.file_index)} files)")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load persisted project index: {str(e)}")
+            self.file_index.clear()
+            self.file_signatures.clear()
+    
+    def _save_persisted_index(self):
+        """Persist the file index and stat manifest atomically"""
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                'version': INDEX_FORMAT_VERSION,
+                'project_root': str(self.project_root),
+                'saved_at': datetime.now().isoformat(),
+                'files': {path: asdict(meta) for path, meta in self.file_index.items()},
+                'signatures': self.file_signatures,
+                'history': self.history_index
+            }
+            tmp_path = self.index_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to persist project index: {str(e)}")
+    
     def build_dependency_graph(self) -> Dict[str, Any]:
         """Build a dependency graph showing relationships"""
         logger.info("🔗 Building dependency graph...")
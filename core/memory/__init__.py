@@ -4,12 +4,13 @@ Database systems, function logging, and tool registry
 """
 
 from .database.brain_db import get_brain_db
-from .database.storage_adapter import patch_json_operations
+from .database.storage_adapter import get_storage_router, patch_json_operations
 from .function_call_logger import get_function_logger, log_mcp_tool, log_brain_function
 from .tool_registry import get_tool_registry
 
 __all__ = [
     "get_brain_db",
+    "get_storage_router",
     "patch_json_operations", 
     "get_function_logger",
     "log_mcp_tool",
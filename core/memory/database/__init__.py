@@ -4,12 +4,24 @@ Provides SQLite-based persistent storage with JSON compatibility
 """
 
 from .brain_db import BrainDatabase, get_brain_db
-from .storage_adapter import JSONCompatibilityAdapter, get_storage_adapter, patch_json_operations
+from .connection_pool import SQLiteConnectionPool
+from .storage_adapter import (
+    JSONCompatibilityAdapter,
+    StorageRouter,
+    get_storage_adapter,
+    get_storage_router,
+    patch_json_operations,
+    restore_json_operations,
+)
 
 __all__ = [
     'BrainDatabase',
     'get_brain_db',
+    'SQLiteConnectionPool',
     'JSONCompatibilityAdapter', 
+    'StorageRouter',
     'get_storage_adapter',
-    'patch_json_operations'
+    'get_storage_router',
+    'patch_json_operations',
+    'restore_json_operations'
 ]
\ No newline at end of file
@@ -211,9 +211,15 @@ class AsyncBrainDatabase:
         try:
             async with self._get_connection() as conn:
                 await conn.execute("""
-                    INSERT OR REPLACE INTO memory_store 
+                    INSERT INTO memory_store 
                     (key, value, timestamp, tags, emotional_weight, updated_at)
                     VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(key) DO UPDATE SET
+                        value = excluded.value,
+                        timestamp = excluded.timestamp,
+                        tags = excluded.tags,
+                        emotional_weight = excluded.emotional_weight,
+                        updated_at = CURRENT_TIMESTAMP
                 """, (
                     key, 
                     value, 
@@ -400,9 +406,15 @@ class AsyncBrainDatabase:
             async with self._get_connection() as conn:
                 for memory in memories:
                     await conn.execute("""
-                        INSERT OR REPLACE INTO memory_store 
+                        INSERT INTO memory_store 
                         (key, value, timestamp, tags, emotional_weight, updated_at)
                         VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                        ON CONFLICT(key) DO UPDATE SET
+                            value = excluded.value,
+                            timestamp = excluded.timestamp,
+                            tags = excluded.tags,
+                            emotional_weight = excluded.emotional_weight,
+                            updated_at = CURRENT_TIMESTAMP
                     """, (
                         memory['key'],
                         memory['value'],
@@ -8,37 +8,102 @@ import sqlite3
 import json
 import os
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, Iterable, List, Optional
 from pathlib import Path
 
+from .connection_pool import (
+    SQLiteConnectionPool,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_CACHE_SIZE_KIB,
+    DEFAULT_MMAP_SIZE,
+    DEFAULT_CACHED_STATEMENTS,
+)
+from .row_counters import ensure_row_counters
+from .search_index import ensure_search_index, ranked_search, rebuild_search_index as _rebuild_search_index
+
 logger = logging.getLogger(__name__)
 
 # Import logging decorator safely
 try:
-    from function_call_logger import log_database_operation
+    from ..function_call_logger import log_database_operation, release_function_logger
 except ImportError:
     # Fallback if not available during initialization
     def log_database_operation(func):
         return func
+    
+    def release_function_logger(db_path):
+        pass
 
 class BrainDatabase:
     """SQLite-based persistent storage for brain memory system"""
     
-    def __init__(self, db_path: str = "brain_memory_store/brain.db"):
-        """Initialize database connection and create tables if needed"""
+    def __init__(self, db_path: str = "brain_memory_store/brain.db", pool_size: int = DEFAULT_POOL_SIZE,
+                 journal_mode: Optional[str] = "WAL", synchronous: Optional[str] = "NORMAL",
+                 cache_size_kib: Optional[int] = DEFAULT_CACHE_SIZE_KIB, mmap_size: Optional[int] = DEFAULT_MMAP_SIZE,
+                 cached_statements: int = DEFAULT_CACHED_STATEMENTS):
+        """Initialize database connection pool and create tables if needed"""
         self.db_path = db_path
         
         # Ensure directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
+        # Pooled, pre-configured connections shared by every method
+        self.pool = SQLiteConnectionPool(
+            db_path,
+            max_connections=pool_size,
+            journal_mode=journal_mode,
+            synchronous=synchronous,
+            cache_size_kib=cache_size_kib,
+            mmap_size=mmap_size,
+            cached_statements=cached_statements
+        )
+        
+        # Callbacks told which tables each committed write changed
+        self._write_listeners: List[Callable[[List[str]], Any]] = []
+        
         # Initialize database
         self._init_database()
-        logger.info(f"🗄️ Brain Database initialized at {db_path}")
+        logger.info(f"🗄️ Brain Database initialized at {db_path} (pool_size={pool_size}, journal_mode={journal_mode})")
+    
+    def _connection(self):
+        """Check out a pooled connection (commits on success, rolls back on error)"""
+        return self.pool.connection()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool configuration and usage counters"""
+        return self.pool.get_stats()
+    
+    def close(self):
+        """Close all pooled connections and stop this database's function call logger"""
+        self.pool.close_all()
+        release_function_logger(self.db_path)
+    
+    def add_write_listener(self, listener: Callable[[List[str]], Any]):
+        """Call ``listener(tables)`` after each committed write, with the tables it changed"""
+        if listener not in self._write_listeners:
+            self._write_listeners.append(listener)
+    
+    def remove_write_listener(self, listener: Callable[[List[str]], Any]):
+        """Stop notifying ``listener``"""
+        if listener in self._write_listeners:
+            self._write_listeners.remove(listener)
+    
+    def _tables_changed(self, tables: Iterable[str]):
+        """Notify write listeners; a failing listener never fails the write"""
+        tables = list(tables)
+        if not tables:
+            return
+        for listener in list(self._write_listeners):
+            try:
+                listener(tables)
+            except Exception as e:
+                logger.warning(f"⚠️ Write listener failed for {tables}: {e}")
     
     def _init_database(self):
         """Create database tables if they don't exist"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             # Memory store table (replaces memory_store.json)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS memory_store (
@@ -121,6 +186,17 @@ class BrainDatabase:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_chunks_context ON memory_chunks(context_type)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_conversation_session ON conversation_memories(session_id)")
             
+            # Full-text indexes (FTS5) kept in sync by triggers; backfilled on first creation
+            try:
+                ensure_search_index(conn, ["memory_store", "memory_chunks", "conversation_memories", "learning_bits"])
+                self._fts_enabled = True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"⚠️ Full-text search unavailable, falling back to LIKE scans: {e}")
+                self._fts_enabled = False
+            
+            # Trigger-maintained row counters for the status/log tools (crawler tables that exist)
+            ensure_row_counters(conn)
+            
             conn.commit()
             logger.info("🗄️ Database schema initialized successfully")
     
@@ -128,7 +204,7 @@ class BrainDatabase:
     @log_database_operation
     def get_memory_store(self) -> Dict[str, Any]:
         """Get all memory store data (compatible with JSON format)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute("""
                 SELECT key, value, timestamp, tags FROM memory_store 
                 ORDER BY updated_at DESC
@@ -153,11 +229,18 @@ class BrainDatabase:
                        emotional_weight: str = "medium") -> bool:
         """Store memory item (compatible with JSON format)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
+                # Upsert keeps the rowid stable so the full-text index sees a plain UPDATE
                 conn.execute("""
-                    INSERT OR REPLACE INTO memory_store 
+                    INSERT INTO memory_store 
                     (key, value, timestamp, tags, emotional_weight, updated_at)
                     VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(key) DO UPDATE SET
+                        value = excluded.value,
+                        timestamp = excluded.timestamp,
+                        tags = excluded.tags,
+                        emotional_weight = excluded.emotional_weight,
+                        updated_at = CURRENT_TIMESTAMP
                 """, (
                     key, 
                     value, 
@@ -166,15 +249,117 @@ class BrainDatabase:
                     emotional_weight
                 ))
                 conn.commit()
+            self._tables_changed(["memory_store"])
             return True
         except Exception as e:
             logger.error(f"Failed to store memory item {key}: {e}")
             return False
-    
+
+    @log_database_operation
+    def write_memory_store(self, memory_store: Dict[str, Dict[str, Any]],
+                           context_history: List[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Bulk-write a JSON-format memory store in one transaction.
+
+        Only items whose value, tags or emotional weight differ from the stored
+        row are upserted, and context entries that are already part of the
+        recent history (as returned by get_memory_store) are not added again,
+        so writing back an unchanged read costs a single SELECT.
+        """
+        rows = [(key, item.get("value", ""), json.dumps(item.get("tags") or []),
+                 item.get("emotional_weight", "medium"))
+                for key, item in memory_store.items()]
+        context_history = context_history or []
+        now = datetime.now().isoformat()
+
+        with self._connection() as conn:
+            existing = {}
+            keys = [row[0] for row in rows]
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                cursor = conn.execute(f"""
+                    SELECT key, value, tags, emotional_weight FROM memory_store
+                    WHERE key IN ({','.join('?' * len(batch))})
+                """, batch)
+                existing.update((key, (value, tags, weight)) for key, value, tags, weight in cursor)
+
+            changed = [(key, value, now, tags, weight) for key, value, tags, weight in rows
+                       if existing.get(key) != (value, tags, weight)]
+            if changed:
+                conn.executemany("""
+                    INSERT INTO memory_store
+                    (key, value, timestamp, tags, emotional_weight, updated_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(key) DO UPDATE SET
+                        value = excluded.value,
+                        timestamp = excluded.timestamp,
+                        tags = excluded.tags,
+                        emotional_weight = excluded.emotional_weight,
+                        updated_at = CURRENT_TIMESTAMP
+                """, changed)
+
+            new_context = []
+            if context_history:
+                cursor = conn.execute("""
+                    SELECT context_data, timestamp, interaction_type
+                    FROM context_history
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                """, (max(20, len(context_history)),))
+                known = set()
+                for context_data, timestamp, interaction_type in cursor:
+                    try:
+                        context = json.loads(context_data) if context_data else {}
+                        context.update({"timestamp": timestamp, "type": interaction_type})
+                        known.add(json.dumps(context, sort_keys=True, default=str))
+                    except (ValueError, TypeError, AttributeError):
+                        continue
+                for context in context_history:
+                    canonical = json.dumps(context, sort_keys=True, default=str)
+                    if canonical in known:
+                        continue
+                    known.add(canonical)
+                    new_context.append((context.get("session_id", "default"),
+                                        json.dumps(context, default=str), now, "conversation"))
+                if new_context:
+                    conn.executemany("""
+                        INSERT INTO context_history
+                        (session_id, context_data, timestamp, interaction_type)
+                        VALUES (?, ?, ?, ?)
+                    """, new_context)
+            conn.commit()
+
+        changed_tables = []
+        if changed:
+            changed_tables.append("memory_store")
+        if new_context:
+            changed_tables.append("context_history")
+        self._tables_changed(changed_tables)
+        return {
+            "upserted": len(changed),
+            "unchanged": len(rows) - len(changed),
+            "context_added": len(new_context)
+        }
+
     @log_database_operation
     def search_memory_store(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search memory store for relevant items"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Search memory store for relevant items (bm25-ranked, LIKE fallback)"""
+        if self._fts_enabled:
+            try:
+                with self._connection() as conn:
+                    hits = ranked_search(conn, query, ["memory_store"], limit=limit)
+                return [{
+                    "key": hit["row"]["key"],
+                    "value": hit["row"]["value"],
+                    "timestamp": hit["row"]["timestamp"],
+                    "tags": json.loads(hit["row"]["tags"]) if hit["row"]["tags"] else [],
+                    "emotional_weight": hit["row"]["emotional_weight"],
+                    "score": hit["score"]
+                } for hit in hits]
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Full-text search failed, using LIKE scan: {e}")
+        
+        with self._connection() as conn:
             cursor = conn.execute("""
                 SELECT key, value, timestamp, tags, emotional_weight
                 FROM memory_store 
@@ -205,7 +390,7 @@ class BrainDatabase:
     # Brain State Interface
     def get_brain_state(self) -> Dict[str, Any]:
         """Get current brain state (compatible with JSON format)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute("SELECT key, value FROM brain_state")
             brain_state = {}
             
@@ -252,7 +437,7 @@ class BrainDatabase:
                 else:
                     return str(value)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 for key, value in updates.items():
                     # Convert complex objects to JSON with datetime handling
                     json_value = serialize_value(value)
@@ -263,6 +448,7 @@ class BrainDatabase:
                     """, (key, json_value))
                 
                 conn.commit()
+            self._tables_changed(["brain_state"])
             return True
         except Exception as e:
             logger.error(f"Failed to update brain state: {e}")
@@ -271,7 +457,7 @@ class BrainDatabase:
     # Context History Interface
     def _get_recent_context_history(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent context history"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute("""
                 SELECT context_data, timestamp, interaction_type 
                 FROM context_history 
@@ -297,7 +483,7 @@ class BrainDatabase:
                            interaction_type: str = "conversation") -> bool:
         """Add entry to context history"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 conn.execute("""
                     INSERT INTO context_history 
                     (session_id, context_data, timestamp, interaction_type)
@@ -309,6 +495,7 @@ class BrainDatabase:
                     interaction_type
                 ))
                 conn.commit()
+            self._tables_changed(["context_history"])
             return True
         except Exception as e:
             logger.error(f"Failed to add context history: {e}")
@@ -317,7 +504,7 @@ class BrainDatabase:
     # Identity Profiles Interface
     def get_identity_profiles(self) -> Dict[str, Any]:
         """Get all identity profiles (compatible with JSON format)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute("""
                 SELECT id, name, description, profile_data, created_at, last_active, total_interactions
                 FROM identity_profiles
@@ -353,7 +540,7 @@ class BrainDatabase:
                 else:
                     clean_data[key] = value
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO identity_profiles 
                     (id, name, description, profile_data, last_active, total_interactions)
@@ -367,6 +554,7 @@ class BrainDatabase:
                     identity_id
                 ))
                 conn.commit()
+            self._tables_changed(["identity_profiles"])
             return True
         except Exception as e:
             logger.error(f"Failed to update identity profile {identity_id}: {e}")
@@ -377,11 +565,22 @@ class BrainDatabase:
                           emotional_weight: str = "medium", metadata: Dict[str, Any] = None) -> bool:
         """Store memory chunk for brain cognitive system"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
+                # Upsert (rather than REPLACE) keeps the rowid stable for the full-text index;
+                # re-storing a chunk still resets its access statistics as before
                 conn.execute("""
-                    INSERT OR REPLACE INTO memory_chunks 
+                    INSERT INTO memory_chunks 
                     (id, content, context_type, emotional_weight, metadata, created_at)
                     VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(id) DO UPDATE SET
+                        content = excluded.content,
+                        context_type = excluded.context_type,
+                        emotional_weight = excluded.emotional_weight,
+                        metadata = excluded.metadata,
+                        associations = NULL,
+                        created_at = CURRENT_TIMESTAMP,
+                        access_count = 0,
+                        last_accessed = NULL
                 """, (
                     chunk_id,
                     content,
@@ -390,13 +589,31 @@ class BrainDatabase:
                     json.dumps(metadata or {})
                 ))
                 conn.commit()
+            self._tables_changed(["memory_chunks"])
             return True
         except Exception as e:
             logger.error(f"Failed to store memory chunk {chunk_id}: {e}")
             return False
     
     def search_memory_chunks(self, query: str, context_type: str = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search memory chunks with optional context filtering"""
+        """Search memory chunks with optional context filtering (bm25-ranked, LIKE fallback)"""
+        if self._fts_enabled:
+            where = {"memory_chunks": ("b.context_type = ?", (context_type,))} if context_type else None
+            try:
+                with self._connection() as conn:
+                    hits = ranked_search(conn, query, ["memory_chunks"], limit=limit, where=where)
+                return [{
+                    "id": hit["row"]["id"],
+                    "content": hit["row"]["content"],
+                    "context_type": hit["row"]["context_type"],
+                    "emotional_weight": hit["row"]["emotional_weight"],
+                    "metadata": json.loads(hit["row"]["metadata"]) if hit["row"]["metadata"] else {},
+                    "created_at": hit["row"]["created_at"],
+                    "score": hit["score"]
+                } for hit in hits]
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Full-text search failed, using LIKE scan: {e}")
+        
         conditions = ["content LIKE ?"]
         params = [f"%{query}%"]
         
@@ -406,7 +623,7 @@ class BrainDatabase:
         
         params.append(limit)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(f"""
                 SELECT id, content, context_type, emotional_weight, metadata, created_at
                 FROM memory_chunks 
@@ -440,7 +657,7 @@ class BrainDatabase:
                           session_id: str = "default", importance: float = 0.5) -> bool:
         """Store conversation for memory system"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 conn.execute("""
                     INSERT INTO conversation_memories 
                     (user_message, ai_response, context_data, importance_score, session_id)
@@ -453,6 +670,7 @@ class BrainDatabase:
                     session_id
                 ))
                 conn.commit()
+            self._tables_changed(["conversation_memories"])
             return True
         except Exception as e:
             logger.error(f"Failed to store conversation: {e}")
@@ -470,7 +688,7 @@ class BrainDatabase:
         params.append(limit)
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(f"""
                 SELECT user_message, ai_response, context_data, importance_score, session_id, created_at
                 FROM conversation_memories 
@@ -492,11 +710,76 @@ class BrainDatabase:
             
             return conversations
     
+    def search_conversations(self, query: str, session_id: str = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search conversation memories by message text (bm25-ranked)"""
+        where = {"conversation_memories": ("b.session_id = ?", (session_id,))} if session_id else None
+        try:
+            with self._connection() as conn:
+                hits = ranked_search(conn, query, ["conversation_memories"], limit=limit, where=where)
+        except sqlite3.OperationalError as e:
+            logger.error(f"Conversation search failed: {e}")
+            return []
+        
+        return [{
+            "user_message": hit["row"]["user_message"],
+            "ai_response": hit["row"]["ai_response"],
+            "context": json.loads(hit["row"]["context_data"]) if hit["row"]["context_data"] else {},
+            "importance": hit["row"]["importance_score"],
+            "session_id": hit["row"]["session_id"],
+            "timestamp": hit["row"]["created_at"],
+            "score": hit["score"]
+        } for hit in hits]
+    
+    # Unified Search Interface
+    def search_all(self, query: str, sources: List[str] = None, limit: int = 10,
+                   ranking: Dict[str, float] = None) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search across memory_store, memory_chunks,
+        conversation_memories and learning_bits (when the crawler tables exist)
+        
+        Results are ordered by a blend of bm25 relevance, emotional
+        weight/importance and recency; see search_index.ranked_search.
+        """
+        try:
+            with self._connection() as conn:
+                hits = ranked_search(conn, query, sources, limit=limit, ranking=ranking)
+        except sqlite3.OperationalError as e:
+            logger.error(f"Unified search failed: {e}")
+            return []
+        
+        results = []
+        for hit in hits:
+            row = hit["row"]
+            if hit["source"] == "memory_store":
+                item_id, content = row["key"], row["value"]
+            elif hit["source"] == "conversation_memories":
+                item_id = row["id"]
+                content = f"{row['user_message'] or ''}\n{row['ai_response'] or ''}".strip()
+            else:
+                item_id, content = row["id"], row["content"]
+            results.append({
+                "source": hit["source"],
+                "id": item_id,
+                "content": content,
+                "score": hit["score"],
+                "bm25": round(hit["bm25"], 4),
+                "weight": hit["weight"],
+                "age_days": round(hit["age_days"], 2) if hit["age_days"] is not None else None
+            })
+        return results
+    
+    def rebuild_search_index(self, tables: List[str] = None) -> Dict[str, int]:
+        """Rebuild full-text indexes from their base tables (creating missing ones)"""
+        with self._connection() as conn:
+            indexed = _rebuild_search_index(conn, tables)
+        self._fts_enabled = True
+        return indexed
+    
     def cleanup_old_data(self, days_to_keep: int = 30) -> Dict[str, int]:
         """Clean up old data to prevent database bloat"""
         cutoff_date = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             # Clean old context history
             cursor = conn.execute("""
                 DELETE FROM context_history 
@@ -514,6 +797,12 @@ class BrainDatabase:
             
             conn.commit()
         
+        changed_tables = []
+        if context_deleted:
+            changed_tables.append("context_history")
+        if conversations_deleted:
+            changed_tables.append("conversation_memories")
+        self._tables_changed(changed_tables)
         return {
             "context_entries_deleted": context_deleted,
             "conversations_deleted": conversations_deleted
@@ -522,10 +811,44 @@ class BrainDatabase:
 # Global database instance
 _brain_db = None
 
-def get_brain_db() -> BrainDatabase:
-    """Get global brain database instance"""
+# Instances for explicitly requested non-default paths, keyed by absolute path
+_path_dbs: Dict[str, BrainDatabase] = {}
+_brain_db_lock = threading.Lock()
+
+def _create_brain_db(db_path: str, pool_size: Optional[int], pool_options: Dict[str, Any]) -> BrainDatabase:
+    """Build an instance with pool settings from the arguments or the environment"""
+    if pool_size is None:
+        pool_size = int(os.getenv("BRAIN_DB_POOL_SIZE", DEFAULT_POOL_SIZE))
+    if "cache_size_kib" not in pool_options and os.getenv("BRAIN_DB_CACHE_SIZE_KIB"):
+        pool_options["cache_size_kib"] = int(os.environ["BRAIN_DB_CACHE_SIZE_KIB"])
+    if "mmap_size" not in pool_options and os.getenv("BRAIN_DB_MMAP_SIZE"):
+        pool_options["mmap_size"] = int(os.environ["BRAIN_DB_MMAP_SIZE"])
+    return BrainDatabase(db_path, pool_size=pool_size, **pool_options)
+
+def get_brain_db(db_path: Optional[str] = None, pool_size: Optional[int] = None,
+                 **pool_options) -> BrainDatabase:
+    """
+    Get global brain database instance
+    
+    Pool settings (``pool_size`` plus any of ``journal_mode``, ``synchronous``,
+    ``cache_size_kib``, ``mmap_size``, ``cached_statements``) only apply when an
+    instance is created; they fall back to BRAIN_DB_POOL_SIZE,
+    BRAIN_DB_CACHE_SIZE_KIB and BRAIN_DB_MMAP_SIZE environment variables.
+    The global instance lives at BRAIN_DB_PATH. A different ``db_path`` gets
+    an instance of its own, shared by callers asking for the same path; the
+    global instance is never replaced or closed.
+    """
     global _brain_db
-    if _brain_db is None:
-        db_path = os.getenv("BRAIN_DB_PATH", "brain_memory_store/brain.db")
-        _brain_db = BrainDatabase(db_path)
-    return _brain_db
\ No newline at end of file
+    with _brain_db_lock:
+        default_path = _brain_db.db_path if _brain_db is not None else \
+            os.getenv("BRAIN_DB_PATH", "brain_memory_store/brain.db")
+        if db_path is None or os.path.abspath(db_path) == os.path.abspath(default_path):
+            if _brain_db is None:
+                _brain_db = _create_brain_db(default_path, pool_size, pool_options)
+            return _brain_db
+        
+        key = os.path.abspath(db_path)
+        instance = _path_dbs.get(key)
+        if instance is None:
+            instance = _path_dbs[key] = _create_brain_db(db_path, pool_size, pool_options)
+        return instance
@@ -0,0 +1,204 @@
+"""
+SQLite Connection Pool
+Thread-safe, bounded pool of pre-configured SQLite connections (WAL, tuned pragmas, statement caching)
+"""
+
+import sqlite3
+import threading
+import queue
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Defaults tuned for the brain memory workload: many small writes, frequent short reads
+DEFAULT_POOL_SIZE = 8
+DEFAULT_CACHE_SIZE_KIB = 16384        # 16 MiB page cache per connection
+DEFAULT_MMAP_SIZE = 128 * 1024 * 1024  # 128 MiB memory-mapped I/O
+DEFAULT_CACHED_STATEMENTS = 256
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+
+class SQLiteConnectionPool:
+    """
+    Bounded pool of SQLite connections shared across threads.
+
+    Connections are opened lazily up to ``max_connections`` and configured once
+    with WAL journaling, ``synchronous=NORMAL``, a tuned page cache and mmap
+    window. Checkouts are re-entrant per thread: a nested ``connection()`` call
+    in the same thread reuses the outer connection, so helpers that open their
+    own connection can be called from inside an active one without deadlocking.
+
+    ``max_connections=0`` disables pooling: every checkout opens a fresh
+    connection and closes it afterwards (the legacy behaviour, kept for
+    benchmarking and for callers that must not hold file handles).
+    """
+
+    def __init__(self, db_path: str, max_connections: int = DEFAULT_POOL_SIZE,
+                 journal_mode: Optional[str] = "WAL", synchronous: Optional[str] = "NORMAL",
+                 cache_size_kib: Optional[int] = DEFAULT_CACHE_SIZE_KIB,
+                 mmap_size: Optional[int] = DEFAULT_MMAP_SIZE,
+                 cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+                 busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+                 checkout_timeout: float = 30.0):
+        self.db_path = db_path
+        self.max_connections = max(0, int(max_connections))
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self.busy_timeout_ms = busy_timeout_ms
+        self.checkout_timeout = checkout_timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all_connections: List[sqlite3.Connection] = []
+        self._reserved = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+        self._stats = {
+            "connections_opened": 0,
+            "checkouts": 0,
+            "reentrant_checkouts": 0,
+            "waits": 0,
+            "wait_time_ms": 0.0,
+        }
+
+    @property
+    def pooled(self) -> bool:
+        """Whether connections are kept open between checkouts"""
+        return self.max_connections > 0
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.synchronous:
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        if self.cache_size_kib:
+            # Negative cache_size is interpreted by SQLite as KiB rather than pages
+            conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        if self.mmap_size:
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # REPLACE conflict resolution only fires delete triggers (e.g. full-text index sync) with this on
+        conn.execute("PRAGMA recursive_triggers=ON")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+
+        with self._lock:
+            self._stats["connections_opened"] += 1
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, open a new one, or wait for a release"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            # Reserve the slot under the lock so concurrent callers cannot overshoot the bound
+            can_open = self._reserved < self.max_connections
+            if can_open:
+                self._reserved += 1
+        if can_open:
+            try:
+                conn = self._open_connection()
+            except Exception:
+                with self._lock:
+                    self._reserved -= 1
+                raise
+            with self._lock:
+                self._all_connections.append(conn)
+            return conn
+
+        wait_start = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"Timed out after {self.checkout_timeout}s waiting for a connection to {self.db_path}"
+            )
+        with self._lock:
+            self._stats["waits"] += 1
+            self._stats["wait_time_ms"] += (time.perf_counter() - wait_start) * 1000
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection for the duration of a ``with`` block.
+
+        Mirrors ``with sqlite3.connect(...) as conn`` semantics: the outermost
+        checkout commits on success and rolls back on error.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        outer = getattr(self._local, "conn", None)
+        if outer is not None:
+            with self._lock:
+                self._stats["reentrant_checkouts"] += 1
+            yield outer
+            return
+
+        conn = self._acquire() if self.pooled else self._open_connection()
+        with self._lock:
+            self._stats["checkouts"] += 1
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            if self.pooled and not self._closed:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def close_all(self):
+        """Close every connection owned by the pool"""
+        with self._lock:
+            self._closed = True
+            connections, self._all_connections = self._all_connections, []
+            self._reserved = 0
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Error closing pooled connection: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool configuration and usage counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open_connections"] = len(self._all_connections)
+        stats.update({
+            "max_connections": self.max_connections,
+            "idle_connections": self._idle.qsize(),
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "cache_size_kib": self.cache_size_kib,
+            "mmap_size": self.mmap_size,
+            "cached_statements": self.cached_statements,
+            "wait_time_ms": round(stats["wait_time_ms"], 2),
+        })
+        return stats
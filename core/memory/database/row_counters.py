@@ -0,0 +1,100 @@
+"""
+Row Counters for Brain Memory Tables
+Cached table cardinalities kept current by insert/delete triggers, so status and
+log tools read a primary-key row instead of running COUNT(*) over large tables.
+Counters are created with the schema (ensure_row_counters); reads never run DDL.
+"""
+
+import sqlite3
+import logging
+from typing import Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Tables whose sizes are reported on every status/log request
+COUNTED_TABLES = ("learning_bits", "cross_references")
+
+COUNTERS_TABLE = "table_row_counts"
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _trigger_sql(table: str) -> List[str]:
+    """Triggers that keep the table's counter row in step with inserts and deletes
+
+    Rows removed by INSERT OR REPLACE only fire the delete trigger when
+    recursive_triggers is on; refresh_row_counts() repairs any drift.
+    """
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_row_count_ai AFTER INSERT ON {table} BEGIN
+            UPDATE {COUNTERS_TABLE} SET row_count = row_count + 1 WHERE table_name = '{table}';
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_row_count_ad AFTER DELETE ON {table} BEGIN
+            UPDATE {COUNTERS_TABLE} SET row_count = row_count - 1 WHERE table_name = '{table}';
+        END""",
+    ]
+
+
+def ensure_row_counters(conn: sqlite3.Connection, tables: Sequence[str] = COUNTED_TABLES) -> List[str]:
+    """
+    Create counter rows and triggers for every existing table in ``tables``.
+
+    Called from schema initialization, after the counted tables are created.
+    A new counter is seeded with one COUNT(*) in the same transaction that
+    installs its triggers, so no write can slip in between. Returns the
+    tables that got a new counter.
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {COUNTERS_TABLE} (
+            table_name TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL
+        )
+    """)
+    known = {row[0] for row in conn.execute(f"SELECT table_name FROM {COUNTERS_TABLE}")}
+    created = []
+    for table in tables:
+        if table in known or not _table_exists(conn, table):
+            continue
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.execute(f"INSERT INTO {COUNTERS_TABLE} (table_name, row_count) VALUES (?, ?)", (table, count))
+        for trigger in _trigger_sql(table):
+            conn.execute(trigger)
+        created.append(table)
+        logger.info(f"🔢 Row counter for {table} created ({count} rows)")
+    return created
+
+
+def get_row_counts(conn: sqlite3.Connection, tables: Sequence[str] = COUNTED_TABLES) -> Dict[str, int]:
+    """
+    Cached row counts (0 for tables that do not exist).
+
+    Read-only: a table without a counter (a schema initialized before
+    counters existed) is counted with COUNT(*) instead.
+    """
+    counts: Dict[str, int] = {}
+    if _table_exists(conn, COUNTERS_TABLE):
+        placeholders = ",".join("?" * len(tables))
+        counts = dict(conn.execute(
+            f"SELECT table_name, row_count FROM {COUNTERS_TABLE} WHERE table_name IN ({placeholders})", tuple(tables)
+        ).fetchall())
+    for table in tables:
+        if table not in counts:
+            counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] if _table_exists(conn, table) else 0
+    return {table: counts[table] for table in tables}
+
+
+def refresh_row_counts(conn: sqlite3.Connection, tables: Sequence[str] = COUNTED_TABLES) -> Dict[str, int]:
+    """Recount ``tables`` exactly and store the results"""
+    ensure_row_counters(conn, tables)
+    counts = {}
+    for table in tables:
+        if not _table_exists(conn, table):
+            continue
+        counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.execute(f"UPDATE {COUNTERS_TABLE} SET row_count = ? WHERE table_name = ?", (counts[table], table))
+    return counts
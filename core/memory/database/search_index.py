@@ -0,0 +1,260 @@
+"""
+Full-Text Search Index for Brain Memory Tables
+FTS5 external-content indexes kept in sync by triggers, with ranked search that
+blends bm25() relevance, emotional weight/importance and recency
+"""
+
+import math
+import re
+import sqlite3
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """Describes how one base table is indexed and ranked"""
+    table: str
+    fts_table: str
+    columns: Tuple[str, ...]
+    id_column: str
+    weight_expr: str      # SQL expression on base alias "b" yielding a 0..1 weight
+    recency_column: str   # timestamp column on the base table
+
+
+# Map emotional_weight labels onto the same 0..1 scale used by importance_score
+EMOTIONAL_WEIGHT_SQL = """
+    CASE b.emotional_weight
+        WHEN 'critical' THEN 1.0
+        WHEN 'high' THEN 0.75
+        WHEN 'important' THEN 0.75
+        WHEN 'medium' THEN 0.5
+        ELSE 0.25
+    END
+"""
+
+SEARCH_SOURCES: Dict[str, SearchSource] = {
+    "memory_store": SearchSource(
+        table="memory_store",
+        fts_table="memory_store_fts",
+        columns=("key", "value", "tags"),
+        id_column="key",
+        weight_expr=EMOTIONAL_WEIGHT_SQL,
+        recency_column="updated_at",
+    ),
+    "memory_chunks": SearchSource(
+        table="memory_chunks",
+        fts_table="memory_chunks_fts",
+        columns=("content",),
+        id_column="id",
+        weight_expr=EMOTIONAL_WEIGHT_SQL,
+        recency_column="created_at",
+    ),
+    "conversation_memories": SearchSource(
+        table="conversation_memories",
+        fts_table="conversation_memories_fts",
+        columns=("user_message", "ai_response"),
+        id_column="id",
+        weight_expr="COALESCE(b.importance_score, 0.5)",
+        recency_column="created_at",
+    ),
+    "learning_bits": SearchSource(
+        table="learning_bits",
+        fts_table="learning_bits_fts",
+        columns=("content", "context", "tags"),
+        id_column="id",
+        weight_expr="COALESCE(b.importance_score, 0.5)",
+        recency_column="created_at",
+    ),
+}
+
+# Blend of normalized bm25 relevance, weight and recency in the final score
+DEFAULT_RANKING = {
+    "relevance": 0.6,
+    "weight": 0.25,
+    "recency": 0.15,
+    "recency_half_life_days": 30.0,
+}
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts5_available() -> bool:
+    """Check whether the linked SQLite library was compiled with FTS5"""
+    try:
+        with sqlite3.connect(":memory:") as conn:
+            conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every token must match (like the old substring search); the last token is a
+    prefix match so partially typed words still hit. Returns None if the query
+    has no indexable tokens.
+    """
+    tokens = _TOKEN_PATTERN.findall(query or "")
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens[:-1]]
+    terms.append(f'"{tokens[-1]}"*')
+    return " ".join(terms)
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _table_columns(conn: sqlite3.Connection, name: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({name})").fetchall()]
+
+
+def _trigger_sql(source: SearchSource) -> List[str]:
+    """Triggers that mirror inserts, updates and deletes into the FTS table"""
+    cols = ", ".join(source.columns)
+    new_vals = ", ".join(f"new.{c}" for c in source.columns)
+    old_vals = ", ".join(f"old.{c}" for c in source.columns)
+    fts = source.fts_table
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source.table} BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source.table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {source.table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_vals});
+        END""",
+    ]
+
+
+def ensure_search_index(conn: sqlite3.Connection, tables: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Create FTS tables and sync triggers for every existing source table.
+
+    Newly created indexes are backfilled from their base table, so this is safe
+    to call on databases that predate full-text search. Returns the names of
+    indexes that were created.
+    """
+    created = []
+    for name in tables or SEARCH_SOURCES.keys():
+        source = SEARCH_SOURCES[name]
+        if not _table_exists(conn, source.table):
+            continue
+        missing = set(source.columns) - set(_table_columns(conn, source.table))
+        if missing:
+            logger.warning(f"⚠️ Skipping full-text index for {source.table}: missing columns {sorted(missing)}")
+            continue
+        is_new = not _table_exists(conn, source.fts_table)
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {source.fts_table} USING fts5(
+                {", ".join(source.columns)},
+                content='{source.table}', content_rowid='rowid',
+                tokenize='porter unicode61'
+            )
+        """)
+        for trigger in _trigger_sql(source):
+            conn.execute(trigger)
+        if is_new:
+            conn.execute(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')")
+            created.append(source.fts_table)
+            logger.info(f"🔎 Created full-text index {source.fts_table}")
+    return created
+
+
+def rebuild_search_index(conn: sqlite3.Connection, tables: Optional[Sequence[str]] = None) -> Dict[str, int]:
+    """Rebuild and optimize FTS indexes from their base tables; returns rows indexed per table"""
+    ensure_search_index(conn, tables)
+    indexed = {}
+    for name in tables or SEARCH_SOURCES.keys():
+        source = SEARCH_SOURCES[name]
+        if not _table_exists(conn, source.fts_table):
+            continue
+        conn.execute(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')")
+        conn.execute(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('optimize')")
+        indexed[source.table] = conn.execute(f"SELECT COUNT(*) FROM {source.table}").fetchone()[0]
+        logger.info(f"🔎 Rebuilt {source.fts_table} ({indexed[source.table]} rows)")
+    return indexed
+
+
+def ranked_search(conn: sqlite3.Connection, query: str, sources: Optional[Sequence[str]] = None,
+                  limit: int = 10, where: Optional[Dict[str, Tuple[str, Sequence[Any]]]] = None,
+                  ranking: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    Search one or more sources and return rows ordered by a blended score.
+
+    Each source contributes its best ``limit * 3`` bm25 candidates (an index
+    lookup, not a table scan). Candidates are then scored as
+    ``relevance * r + weight * w + recency * t`` where relevance is bm25
+    normalized to the best hit, weight is emotional weight/importance (0..1) and
+    recency halves every ``recency_half_life_days``.
+
+    ``where`` maps a source name to an extra ``(sql, params)`` filter on the
+    base table alias ``b``. Each result carries ``source``, ``row`` (all base
+    table columns), ``bm25``, ``weight``, ``age_days`` and ``score``. With no
+    explicit ``sources`` every indexed table is searched; naming a source whose
+    index is missing raises sqlite3.OperationalError.
+    """
+    match = build_match_query(query)
+    if match is None:
+        return []
+
+    ranking = {**DEFAULT_RANKING, **(ranking or {})}
+    candidates = []
+    for name in sources or SEARCH_SOURCES.keys():
+        source = SEARCH_SOURCES[name]
+        if sources is None and not _table_exists(conn, source.fts_table):
+            # Unified search skips tables this database doesn't have
+            continue
+        extra_sql, extra_params = (where or {}).get(name, ("", ()))
+        cursor = conn.execute(f"""
+            SELECT b.*, bm25({source.fts_table}) AS _bm25,
+                   {source.weight_expr} AS _weight,
+                   MAX(julianday('now') - julianday(b.{source.recency_column}), 0) AS _age_days
+            FROM {source.fts_table} f
+            JOIN {source.table} b ON b.rowid = f.rowid
+            WHERE {source.fts_table} MATCH ? {("AND " + extra_sql) if extra_sql else ""}
+            ORDER BY _bm25
+            LIMIT ?
+        """, (match, *extra_params, limit * 3))
+        columns = [d[0] for d in cursor.description]
+        for values in cursor.fetchall():
+            row = dict(zip(columns, values))
+            candidates.append({
+                "source": name,
+                "bm25": row.pop("_bm25"),
+                "weight": row.pop("_weight"),
+                "age_days": row.pop("_age_days"),
+                "row": row,
+            })
+
+    if not candidates:
+        return []
+
+    # bm25() is negative with lower meaning better; normalize to 0..1 against the best hit
+    best = max(-c["bm25"] for c in candidates) or 1.0
+    half_life = ranking["recency_half_life_days"]
+    for c in candidates:
+        relevance = max(-c["bm25"], 0.0) / best
+        age_days = c["age_days"] if c["age_days"] is not None else half_life * 10
+        recency = math.pow(0.5, age_days / half_life) if half_life > 0 else 0.0
+        c["score"] = round(
+            relevance * ranking["relevance"]
+            + (c["weight"] or 0.0) * ranking["weight"]
+            + recency * ranking["recency"],
+            6,
+        )
+
+    candidates.sort(key=lambda c: c["score"], reverse=True)
+    return candidates[:limit]
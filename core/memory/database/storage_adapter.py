@@ -3,23 +3,28 @@ Storage Adapter - Provides seamless backward compatibility
 Existing plugins continue to work with JSON files, but data is actually stored in SQLite
 """
 
+import builtins
+import io
 import json
 import os
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from .brain_db import get_brain_db
 
 logger = logging.getLogger(__name__)
 
+# File names whose contents live in the database rather than on disk
+ROUTED_FILES = ("memory_store.json", "brain_state.json", "identities.json")
+
 class JSONCompatibilityAdapter:
     """
     Provides JSON file interface while using SQLite backend
     Existing plugins work unchanged - they think they're reading/writing JSON
     """
     
-    def __init__(self):
-        self.db = get_brain_db()
+    def __init__(self, db=None):
+        self.db = db or get_brain_db()
         
     def read_json_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -80,22 +85,11 @@ class JSONCompatibilityAdapter:
             return False
     
     def _write_memory_store(self, data: Dict[str, Any]) -> bool:
-        """Write memory store data to database"""
-        memory_store = data.get("memory_store", {})
-        
-        for key, item_data in memory_store.items():
-            self.db.set_memory_item(
-                key=key,
-                value=item_data.get("value", ""),
-                tags=item_data.get("tags", []),
-                emotional_weight=item_data.get("emotional_weight", "medium")
-            )
-        
-        # Handle context history
-        context_history = data.get("context_history", [])
-        for context in context_history:
-            self.db.add_context_history(context)
-            
+        """Write memory store data to database (only changed items, one transaction)"""
+        counts = self.db.write_memory_store(data.get("memory_store", {}),
+                                            data.get("context_history", []))
+        logger.debug(f"💾 memory_store.json written: {counts['upserted']} upserted, "
+                     f"{counts['unchanged']} unchanged, {counts['context_added']} context entries added")
         return True
     
     def _write_identities(self, data: Dict[str, Any]) -> bool:
@@ -115,13 +109,99 @@ class JSONCompatibilityAdapter:
         filename = Path(file_path).name
         
         # These "files" always exist in database
-        if filename in ["memory_store.json", "brain_state.json", "identities.json"]:
+        if filename in ROUTED_FILES:
             return True
         
         return os.path.exists(file_path)
 
-# Global adapter instance
+
+
+class _RoutedReadHandle(io.StringIO):
+    """In-memory text handle holding a routed file's JSON, readable by json.load"""
+
+    def __init__(self, file_path: str, data: Dict[str, Any]):
+        super().__init__(json.dumps(data))
+        self.name = file_path
+
+
+class _RoutedWriteHandle(io.StringIO):
+    """In-memory text handle that stores its JSON content in the database on close"""
+
+    def __init__(self, file_path: str, adapter: JSONCompatibilityAdapter):
+        super().__init__()
+        self.name = file_path
+        self._adapter = adapter
+
+    def close(self):
+        if not self.closed:
+            content = self.getvalue()
+            if content:
+                try:
+                    self._adapter.write_json_file(self.name, json.loads(content))
+                except ValueError as e:
+                    logger.warning(f"Discarding invalid JSON written to {self.name}: {e}")
+        super().close()
+
+
+class StorageRouter:
+    """
+    Explicit routing of the compatibility JSON files to the database.
+
+    Plugins opt in by using the router's ``open``/``load``/``dump`` instead of
+    the builtins; routed file names are served from SQLite and every other
+    path goes to the real filesystem. Nothing process-wide is patched, so code
+    that does not use the router keeps the plain ``open``.
+    """
+
+    def __init__(self, adapter: Optional[JSONCompatibilityAdapter] = None,
+                 files: Iterable[str] = ROUTED_FILES):
+        self._adapter = adapter
+        self.files = frozenset(files)
+
+    @property
+    def adapter(self) -> JSONCompatibilityAdapter:
+        if self._adapter is None:
+            self._adapter = get_storage_adapter()
+        return self._adapter
+
+    def routes(self, file_path) -> bool:
+        """Whether ``file_path`` is served from the database"""
+        return Path(str(file_path)).name in self.files
+
+    def open(self, file_path, mode: str = 'r', *args, **kwargs):
+        """``open`` replacement: routed files get in-memory handles, others the real file"""
+        if not self.routes(file_path):
+            return io.open(file_path, mode, *args, **kwargs)
+        path_str = str(file_path)
+        if any(flag in mode for flag in 'wax'):
+            return _RoutedWriteHandle(path_str, self.adapter)
+        return _RoutedReadHandle(path_str, self.adapter.read_json_file(path_str))
+
+    def load(self, file_path, default: Any = None) -> Any:
+        """Read a JSON document, returning ``default`` if a plain file is missing"""
+        if self.routes(file_path):
+            return self.adapter.read_json_file(str(file_path))
+        if not os.path.exists(file_path):
+            return default
+        with io.open(file_path, 'r') as f:
+            return json.load(f)
+
+    def dump(self, data: Any, file_path, **kwargs) -> bool:
+        """Write a JSON document (routed files go straight to the database)"""
+        if self.routes(file_path):
+            return self.adapter.write_json_file(str(file_path), data)
+        with io.open(file_path, 'w') as f:
+            json.dump(data, f, **kwargs)
+        return True
+
+    def exists(self, file_path) -> bool:
+        """Routed files always exist; plain files are checked on disk"""
+        return self.routes(file_path) or os.path.exists(file_path)
+
+
+# Global adapter and router instances
 _storage_adapter = None
+_storage_router = None
 
 def get_storage_adapter() -> JSONCompatibilityAdapter:
     """Get global storage adapter instance"""
@@ -130,118 +210,45 @@ def get_storage_adapter() -> JSONCompatibilityAdapter:
         _storage_adapter = JSONCompatibilityAdapter()
     return _storage_adapter
 
-# Monkey patch functions to maintain compatibility
-def patch_json_operations():
+def get_storage_router() -> StorageRouter:
+    """Get global storage router instance"""
+    global _storage_router
+    if _storage_router is None:
+        _storage_router = StorageRouter()
+    return _storage_router
+
+# Legacy process-wide patch, kept for plugins that have not moved to StorageRouter
+_original_open = None
+
+def patch_json_operations(adapter: Optional[JSONCompatibilityAdapter] = None):
     """
-    Patch common JSON operations to use database backend
-    This makes existing plugins work without code changes
+    Replace builtins.open so routed JSON files are served from the database.
+
+    Deprecated: every open() in the process pays for the routing check. Use
+    get_storage_router() in the plugin instead; restore_json_operations()
+    undoes the patch.
     """
-    import builtins
-    import json
-    
-    original_open = builtins.open
-    original_json_load = json.load
-    original_json_dump = json.dump
-    
-    adapter = get_storage_adapter()
-    
-    # Track which files are being accessed for JSON operations
-    _json_file_handles = {}
-    
+    global _original_open
+    if _original_open is not None:
+        return
+
+    router = StorageRouter(adapter) if adapter is not None else get_storage_router()
+    _original_open = builtins.open
+
     def patched_open(file_path, mode='r', *args, **kwargs):
         """Patched open function that intercepts JSON file operations"""
-        path_str = str(file_path)
-        filename = Path(path_str).name
-        
-        # Check if this is one of our JSON files
-        if filename in ["memory_store.json", "brain_state.json", "identities.json"]:
-            if 'r' in mode:
-                # Return a fake file handle for reading
-                class FakeReadHandle:
-                    def __init__(self, data):
-                        self.data = data
-                        self.closed = False
-                    
-                    def read(self):
-                        return json.dumps(self.data)
-                    
-                    def close(self):
-                        self.closed = True
-                    
-                    def __enter__(self):
-                        return self
-                    
-                    def __exit__(self, *args):
-                        self.close()
-                
-                data = adapter.read_json_file(path_str)
-                return FakeReadHandle(data)
-            
-            elif 'w' in mode:
-                # Return a fake file handle for writing
-                class FakeWriteHandle:
-                    def __init__(self, file_path):
-                        self.file_path = file_path
-                        self.content = ""
-                        self.closed = False
-                    
-                    def write(self, content):
-                        self.content += content
-                    
-                    def close(self):
-                        if not self.closed and self.content:
-                            try:
-                                data = json.loads(self.content)
-                                adapter.write_json_file(self.file_path, data)
-                            except:
-                                pass
-                        self.closed = True
-                    
-                    def __enter__(self):
-                        return self
-                    
-                    def __exit__(self, *args):
-                        self.close()
-                
-                return FakeWriteHandle(path_str)
-        
-        # For non-JSON files, use original open
-        return original_open(file_path, mode, *args, **kwargs)
-    
-    def patched_json_load(fp):
-        """Patched json.load that works with our fake file handles"""
-        if hasattr(fp, 'file_path'):
-            # This is one of our fake handles
-            return adapter.read_json_file(fp.file_path)
-        elif hasattr(fp, 'data'):
-            # This is our fake read handle
-            return fp.data
-        else:
-            # Regular file handle
-            return original_json_load(fp)
-    
-    def patched_json_dump(obj, fp, *args, **kwargs):
-        """Patched json.dump that works with our fake file handles"""
-        if hasattr(fp, 'file_path'):
-            # This is one of our fake write handles
-            adapter.write_json_file(fp.file_path, obj)
-        elif hasattr(fp, 'write'):
-            # Check if this might be a file we should intercept
-            if hasattr(fp, 'name'):
-                filename = Path(fp.name).name
-                if filename in ["memory_store.json", "brain_state.json", "identities.json"]:
-                    adapter.write_json_file(fp.name, obj)
-                    return
-            
-            # Regular file handle or fake handle
-            fp.write(json.dumps(obj, *args, **kwargs))
-        else:
-            # Fallback to original
-            original_json_dump(obj, fp, *args, **kwargs)
-    
-    # Apply patches
+        if isinstance(file_path, (str, os.PathLike)) and router.routes(file_path):
+            return router.open(file_path, mode, *args, **kwargs)
+        return _original_open(file_path, mode, *args, **kwargs)
+
     builtins.open = patched_open
-    json.load = patched_json_load
-    json.dump = patched_json_dump
-    
-    logger.info("🔧 JSON operations patched for database compatibility")
\ No newline at end of file
+    logger.info("🔧 JSON operations patched for database compatibility (deprecated, use StorageRouter)")
+
+def restore_json_operations():
+    """Undo patch_json_operations"""
+    global _original_open
+    if _original_open is None:
+        return
+    builtins.open = _original_open
+    _original_open = None
+    logger.info("🔧 JSON operations restored")
@@ -42,6 +42,7 @@ CREATE TABLE IF NOT EXISTS learning_bits (
     emotional_weight TEXT DEFAULT 'medium',
     complexity_level TEXT DEFAULT 'moderate',
     language TEXT DEFAULT 'en',
+    simhash INTEGER, -- signed 64-bit SimHash fingerprint for near-duplicate detection
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (page_id) REFERENCES crawled_pages(id)
@@ -94,6 +95,27 @@ CREATE TABLE IF NOT EXISTS domain_rules (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Cached robots.txt per origin (scheme://host), re-fetched after a TTL
+CREATE TABLE IF NOT EXISTS robots_cache (
+    origin TEXT PRIMARY KEY,
+    status_code INTEGER NOT NULL, -- 0 if the host was unreachable
+    robots_txt TEXT,
+    crawl_delay REAL,
+    fetched_at REAL NOT NULL
+);
+
+-- ETag/Last-Modified validators for conditional revisits of stored pages
+CREATE TABLE IF NOT EXISTS page_validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    page_id INTEGER,
+    title TEXT,
+    links TEXT, -- JSON {url: priority} from the last full fetch, NULL if links were not discovered
+    not_modified_count INTEGER DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Table for crawling sessions and statistics
 CREATE TABLE IF NOT EXISTS crawl_sessions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -4,9 +4,16 @@ Captures ALL function calls, inputs, outputs, and context for complete traceabil
 """
 
 import json
+import os
+import queue
+import random
+import sqlite3
 import asyncio
+import atexit
 import logging
 import inspect
+import threading
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Callable
 from functools import wraps
@@ -16,31 +23,116 @@ import traceback
 
 logger = logging.getLogger(__name__)
 
+FUNCTION_CALLS_INSERT_SQL = """
+    INSERT INTO function_calls (
+        session_id, timestamp, function_name, function_type,
+        input_data, output_data, context_data, execution_time_ms,
+        success, error_message, call_stack_depth, call_ticket, parent_call_ticket,
+        user_message, memory_context, learning_info, cross_references
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Stops the background writer once everything queued before it is written
+_SHUTDOWN = object()
+
+# Database operations (reads included) log into the database they run on, so
+# only a sample of the successful ones is recorded unless configured otherwise
+DEFAULT_SAMPLE_RATES = {"database_operation": 0.01}
+
+
+def _parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "database_operation=0.1,mcp_tool=1" into a per-function-type rate map"""
+    rates = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        name, rate = item.split("=", 1)
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            logger.warning(f"Ignoring invalid sample rate for {name.strip()}: {rate}")
+    return rates
+
+
 class FunctionCallLogger:
     """
     Comprehensive function call logging and storage system
     Captures every function call with full context for cross-referencing
+    
+    Payloads are serialized when the call is logged, so later changes by the
+    caller are not recorded; the rows are handed to a background writer thread
+    through a bounded queue and inserted with executemany in batches, so the
+    logged function never waits on logging I/O. When the queue is full new rows are dropped and counted
+    rather than blocking the caller. Successful calls can be sampled per
+    function type (FUNCTION_LOG_SAMPLE_RATES="database_operation=0.1,...") or
+    per decorator; failed calls are always logged. Types without a configured
+    rate use DEFAULT_SAMPLE_RATES, then 1.0.
+    
+    Each queued call gets a per-session ticket, stored as call_ticket; nested
+    calls reference their caller through parent_call_ticket, so a call tree is
+    rebuilt by joining on (session_id, call_ticket).
     """
     
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None, queue_size: int = 10000,
+                 batch_size: int = 200, flush_interval: float = 0.5,
+                 sample_rates: Optional[Dict[str, float]] = None):
         self._database = None
+        self._db_path = db_path
         self._session_id = self._generate_session_id()
         self._call_stack: List[Dict] = []
         self._enabled = True
         
+        # Background batch writer
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        # Tickets and counters are updated from pooled worker threads
+        self._stats_lock = threading.Lock()
+        self._ticket = 0
+        
+        # Sampling: explicit rates win over FUNCTION_LOG_SAMPLE_RATES, which wins over the defaults
+        self._sample_rates = dict(DEFAULT_SAMPLE_RATES)
+        self._sample_rates.update(_parse_sample_rates(os.getenv("FUNCTION_LOG_SAMPLE_RATES", "")))
+        self._sample_rates.update(sample_rates or {})
+        
+        self._counters = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "sampled_out": 0,
+            "batches": 0,
+            "write_errors": 0
+        }
+        
+    def _count(self, name: str, amount: int = 1):
+        """Increment a statistics counter"""
+        with self._stats_lock:
+            self._counters[name] += amount
+    
+    def next_ticket(self) -> int:
+        """Reserve the next per-session call ticket"""
+        with self._stats_lock:
+            self._ticket += 1
+            return self._ticket
+    
     def _generate_session_id(self) -> str:
         """Generate unique session ID"""
         timestamp = datetime.now().isoformat()
         return hashlib.md5(f"session_{timestamp}".encode()).hexdigest()[:12]
     
     def initialize(self):
-        """Initialize the logger with database connection"""
+        """Initialize the logger with database connection and start the background writer"""
         try:
-            from database import get_brain_db
-            self._database = get_brain_db()
+            if self._db_path is None:
+                from .database.brain_db import get_brain_db
+                self._database = get_brain_db()
+                self._db_path = self._database.db_path
             
             # Create function_calls table if it doesn't exist
             self._ensure_function_calls_table()
+            self._start_writer()
             
             logger.info(f"🔍 Function Call Logger initialized - Session: {self._session_id}")
             
@@ -48,13 +140,17 @@ class FunctionCallLogger:
             logger.error(f"Failed to initialize function call logger: {e}")
             self._enabled = False
     
+    @property
+    def db_path(self) -> Optional[str]:
+        """Path of the database the logger writes to"""
+        return self._db_path
+    
     def _ensure_function_calls_table(self):
         """Create function_calls table for comprehensive logging"""
-        if not self._database:
+        if not self._db_path:
             return
             
-        import sqlite3
-        with sqlite3.connect(self._database.db_path) as conn:
+        with sqlite3.connect(self._db_path) as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS function_calls (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -69,7 +165,8 @@ class FunctionCallLogger:
                     success BOOLEAN,
                     error_message TEXT,
                     call_stack_depth INTEGER,
-                    parent_call_id INTEGER,
+                    call_ticket INTEGER,
+                    parent_call_ticket INTEGER,
                     user_message TEXT,
                     memory_context TEXT,
                     learning_info TEXT,
@@ -78,6 +175,12 @@ class FunctionCallLogger:
                 )
             """)
             
+            # Older tables stored tickets in parent_call_id; add the ticket columns
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(function_calls)")}
+            for column in ("call_ticket", "parent_call_ticket"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE function_calls ADD COLUMN {column} INTEGER")
+            
             # Create indexes for fast queries
             conn.execute("CREATE INDEX IF NOT EXISTS idx_function_calls_session ON function_calls(session_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_function_calls_function_name ON function_calls(function_name)")
@@ -113,6 +216,18 @@ class FunctionCallLogger:
             return True
         return False
 
+    def should_sample(self, function_type: str, sample_rate: Optional[float] = None) -> bool:
+        """Decide whether a successful call of this type is logged"""
+        rate = sample_rate if sample_rate is not None else self._sample_rates.get(function_type, 1.0)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self._count("sampled_out")
+        return False
+    
+    def set_sample_rate(self, function_type: str, rate: float):
+        """Set the sampling rate (0..1) for successful calls of a function type"""
+        self._sample_rates[function_type] = min(max(rate, 0.0), 1.0)
+    
     def log_function_call(
         self, 
         function_name: str,
@@ -126,13 +241,16 @@ class FunctionCallLogger:
         user_message: str = None,
         memory_context: str = None,
         learning_info: List[str] = None,
-        cross_references: List[str] = None
+        cross_references: List[str] = None,
+        call_ticket: Optional[int] = None
     ) -> int:
         """
-        Log comprehensive function call data
-        Returns call_id for cross-referencing
+        Queue comprehensive function call data for the background writer
+        Returns the call's per-session ticket (a reserved ``call_ticket`` or a
+        new one; the row id is assigned asynchronously), or 0 if the call was
+        not queued
         """
-        if not self._enabled or not self._database:
+        if not self._enabled or not self._db_path:
             return 0
             
         try:
@@ -140,45 +258,153 @@ class FunctionCallLogger:
             if success is None:
                 success = self._determine_success_status(output_data)
             
-            call_data = {
-                "session_id": self._session_id,
-                "timestamp": datetime.now().isoformat(),
-                "function_name": function_name,
-                "function_type": function_type,
-                "input_data": self._serialize_data(input_data),
-                "output_data": self._serialize_data(output_data),
-                "context_data": json.dumps(context_data or {}),
-                "execution_time_ms": execution_time_ms,
-                "success": success,
-                "error_message": error_message,
-                "call_stack_depth": len(self._call_stack),
-                "parent_call_id": self._call_stack[-1]["call_id"] if self._call_stack else None,
-                "user_message": user_message,
-                "memory_context": memory_context,
-                "learning_info": json.dumps(learning_info or []),
-                "cross_references": json.dumps(cross_references or [])
-            }
+            ticket = call_ticket or self.next_ticket()
             
-            import sqlite3
-            with sqlite3.connect(self._database.db_path) as conn:
-                cursor = conn.execute("""
-                    INSERT INTO function_calls (
-                        session_id, timestamp, function_name, function_type,
-                        input_data, output_data, context_data, execution_time_ms,
-                        success, error_message, call_stack_depth, parent_call_id,
-                        user_message, memory_context, learning_info, cross_references
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, tuple(call_data.values()))
-                
-                call_id = cursor.lastrowid
-                conn.commit()
-                
-                return call_id
+            # Serialized now: the caller may mutate its payloads once we return
+            row = (
+                self._session_id,
+                datetime.now().isoformat(),
+                function_name,
+                function_type,
+                self._serialize_data(input_data),
+                self._serialize_data(output_data),
+                json.dumps(context_data or {}, default=str),
+                execution_time_ms,
+                success,
+                error_message,
+                len(self._call_stack),
+                ticket,
+                self._call_stack[-1]["call_id"] if self._call_stack else None,
+                user_message,
+                memory_context,
+                json.dumps(learning_info or [], default=str),
+                json.dumps(cross_references or [], default=str)
+            )
+            
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                # Drop-on-overflow: logging must never add latency to the caller
+                self._count("dropped")
+                return 0
+            
+            self._count("enqueued")
+            return ticket
                 
         except Exception as e:
             logger.error(f"Failed to log function call: {e}")
             return 0
     
+    # Background writer
+    def _start_writer(self):
+        """Start the background writer thread once"""
+        with self._writer_lock:
+            if self._writer_thread is not None and self._writer_thread.is_alive():
+                return
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="function-call-writer", daemon=True
+            )
+            self._writer_thread.start()
+        atexit.register(self.shutdown)
+    
+    def _writer_loop(self):
+        """Drain the queue in batches and insert them with executemany"""
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                try:
+                    first = self._queue.get(timeout=self._flush_interval)
+                except queue.Empty:
+                    continue
+                
+                batch, stop = [], False
+                if first is _SHUTDOWN:
+                    stop = True
+                else:
+                    batch.append(first)
+                while len(batch) < self._batch_size and not stop:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _SHUTDOWN:
+                        stop = True
+                    else:
+                        batch.append(item)
+                
+                if batch:
+                    self._write_batch(conn, batch)
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+    
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        """Insert one batch in a single transaction, falling back to row by row if it fails"""
+        try:
+            with conn:
+                conn.executemany(FUNCTION_CALLS_INSERT_SQL, batch)
+            self._count("written", len(batch))
+            self._count("batches")
+            return
+        except Exception as e:
+            logger.warning(f"Function call log batch of {len(batch)} rows failed, retrying row by row: {e}")
+        
+        # Only the rows that fail on their own are skipped
+        written = 0
+        for row in batch:
+            try:
+                with conn:
+                    conn.execute(FUNCTION_CALLS_INSERT_SQL, row)
+                written += 1
+            except Exception as e:
+                self._count("write_errors")
+                logger.error(f"Failed to write function call log row for {row[2]}: {e}")
+        self._count("written", written)
+        self._count("batches")
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued row has been written; returns False on timeout"""
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            return self._queue.unfinished_tasks == 0
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+    
+    def shutdown(self, timeout: float = 5.0):
+        """Flush pending rows and stop the background writer; later calls are not logged"""
+        self._enabled = False
+        atexit.unregister(self.shutdown)
+        thread = self._writer_thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_SHUTDOWN, timeout=timeout)
+        except queue.Full:
+            logger.warning("Function call log queue still full at shutdown; pending rows are lost")
+            return
+        thread.join(timeout)
+    
+    def get_logger_stats(self) -> Dict[str, Any]:
+        """Get queue depth, write/drop/sampling counters and sampling configuration"""
+        with self._stats_lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "batch_size": self._batch_size,
+            "sample_rates": dict(self._sample_rates),
+            "writer_alive": bool(self._writer_thread and self._writer_thread.is_alive())
+        }
+    
     def _serialize_data(self, data: Any) -> str:
         """Safely serialize data to JSON"""
         try:
@@ -203,13 +429,16 @@ class FunctionCallLogger:
         function_type: str = "unknown",
         input_data: Any = None,
         user_message: str = None,
-        memory_context: str = None
+        memory_context: str = None,
+        sample_rate: Optional[float] = None
     ):
         """
         Context manager to track function execution with timing
+        Successful calls are subject to sampling; failures are always logged
         """
         start_time = datetime.now()
-        call_id = 0
+        # Reserved up front so nested calls can name this one as their parent
+        call_id = self.next_ticket()
         success = True
         error_message = None
         output_data = None
@@ -236,34 +465,33 @@ class FunctionCallLogger:
             end_time = datetime.now()
             execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
             
-            # Log the complete function call
-            call_id = self.log_function_call(
-                function_name=function_name,
-                function_type=function_type,
-                input_data=input_data,
-                output_data=output_data,
-                execution_time_ms=execution_time_ms,
-                success=success,
-                error_message=error_message,
-                user_message=user_message,
-                memory_context=memory_context
-            )
-            
-            # Update call info
-            call_info["call_id"] = call_id
-            
-            # Remove from call stack
-            if self._call_stack and self._call_stack[-1] == call_info:
+            # Leave the call stack first so the row records the caller as parent
+            if self._call_stack and self._call_stack[-1] is call_info:
                 self._call_stack.pop()
+            
+            # Log the complete function call
+            if not success or self.should_sample(function_type, sample_rate):
+                self.log_function_call(
+                    function_name=function_name,
+                    function_type=function_type,
+                    input_data=input_data,
+                    output_data=output_data,
+                    execution_time_ms=execution_time_ms,
+                    success=success,
+                    error_message=error_message,
+                    user_message=user_message,
+                    memory_context=memory_context,
+                    call_ticket=call_id
+                )
     
     def get_call_history(self, limit: int = 50, function_name: str = None) -> List[Dict]:
         """Get function call history"""
-        if not self._database:
+        if not self._db_path:
             return []
+        self.flush()
             
         try:
-            import sqlite3
-            with sqlite3.connect(self._database.db_path) as conn:
+            with sqlite3.connect(self._db_path) as conn:
                 if function_name:
                     cursor = conn.execute("""
                         SELECT * FROM function_calls 
@@ -287,12 +515,12 @@ class FunctionCallLogger:
     
     def get_session_stats(self) -> Dict[str, Any]:
         """Get comprehensive statistics for current session"""
-        if not self._database:
+        if not self._db_path:
             return {}
+        self.flush()
             
         try:
-            import sqlite3
-            with sqlite3.connect(self._database.db_path) as conn:
+            with sqlite3.connect(self._db_path) as conn:
                 # Total calls in session
                 cursor = conn.execute("SELECT COUNT(*) FROM function_calls WHERE session_id = ?", (self._session_id,))
                 total_calls = cursor.fetchone()[0]
@@ -322,7 +550,8 @@ class FunctionCallLogger:
                     "success_rate": successful_calls / max(total_calls, 1) * 100,
                     "function_breakdown": function_breakdown,
                     "average_execution_time_ms": round(avg_execution_time, 2),
-                    "current_call_stack_depth": len(self._call_stack)
+                    "current_call_stack_depth": len(self._call_stack),
+                    "logger": self.get_logger_stats()
                 }
                 
         except Exception as e:
@@ -331,12 +560,12 @@ class FunctionCallLogger:
     
     def search_calls_by_context(self, search_term: str, limit: int = 20) -> List[Dict]:
         """Search function calls by context or content"""
-        if not self._database:
+        if not self._db_path:
             return []
+        self.flush()
             
         try:
-            import sqlite3
-            with sqlite3.connect(self._database.db_path) as conn:
+            with sqlite3.connect(self._db_path) as conn:
                 cursor = conn.execute("""
                     SELECT * FROM function_calls 
                     WHERE input_data LIKE ? 
@@ -358,22 +587,67 @@ class FunctionCallLogger:
 # Global function call logger instance
 _global_logger: Optional[FunctionCallLogger] = None
 
-def get_function_logger() -> FunctionCallLogger:
-    """Get or create global function call logger"""
+# Loggers for explicitly named databases, keyed by path
+_path_loggers: Dict[str, FunctionCallLogger] = {}
+_loggers_lock = threading.Lock()
+
+def get_function_logger(db_path: Optional[str] = None) -> FunctionCallLogger:
+    """
+    Get or create the function call logger for ``db_path``
+    
+    Without a path this is the global logger, which writes to the global brain
+    database; each explicit path gets its own logger and writer thread.
+    """
     global _global_logger
-    if _global_logger is None:
-        _global_logger = FunctionCallLogger()
-        _global_logger.initialize()
-    return _global_logger
+    with _loggers_lock:
+        if db_path is None:
+            if _global_logger is None:
+                _global_logger = FunctionCallLogger()
+                _global_logger.initialize()
+            return _global_logger
+        call_logger = _path_loggers.get(db_path)
+        if call_logger is None:
+            call_logger = FunctionCallLogger(db_path=db_path)
+            call_logger.initialize()
+            _path_loggers[db_path] = call_logger
+        return call_logger
+
+def release_function_logger(db_path: str, timeout: float = 5.0):
+    """
+    Flush, stop and forget the logger of an explicitly named database
+    
+    Called when the database is closed; a later call for the same path starts
+    a new logger.
+    """
+    with _loggers_lock:
+        call_logger = _path_loggers.pop(str(db_path), None)
+    if call_logger is not None:
+        call_logger.shutdown(timeout)
 
-def log_all_calls(function_type: str = "unknown"):
+def _instance_logger(args: tuple) -> Optional[FunctionCallLogger]:
+    """Logger for the database of the decorated method's instance (None when it has no db_path)"""
+    db_path = getattr(args[0], "db_path", None) if args else None
+    return get_function_logger(str(db_path)) if db_path else None
+
+def log_all_calls(function_type: str = "unknown", sample_rate: Optional[float] = None,
+                  logger_for: Optional[Callable[[tuple], Optional[FunctionCallLogger]]] = None):
     """
     Decorator to automatically log all function calls
+    
+    sample_rate (0..1) overrides the logger's per-function-type rate for this
+    decorator; failed calls are always logged regardless of sampling.
+    logger_for picks the logger from the call's positional arguments instead
+    of using the global one; calls it returns None for are not logged.
     """
+    def resolve_logger(args: tuple) -> Optional[FunctionCallLogger]:
+        return logger_for(args) if logger_for else get_function_logger()
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            logger_instance = get_function_logger()
+            logger_instance = resolve_logger(args)
+            if logger_instance is None:
+                return await func(*args, **kwargs)
             
             # Extract user message if present
             user_message = kwargs.get('user_message') or kwargs.get('message') or kwargs.get('query')
@@ -388,7 +662,8 @@ def log_all_calls(function_type: str = "unknown"):
                 function_name=func.__name__,
                 function_type=function_type,
                 input_data=input_data,
-                user_message=user_message
+                user_message=user_message,
+                sample_rate=sample_rate
             ) as call_info:
                 result = await func(*args, **kwargs)
                 
@@ -400,10 +675,9 @@ def log_all_calls(function_type: str = "unknown"):
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
             # For sync functions, create a simple log entry
-            logger_instance = get_function_logger()
-            
-            user_message = kwargs.get('user_message') or kwargs.get('message') or kwargs.get('query')
-            input_data = {"args": args, "kwargs": kwargs}
+            logger_instance = resolve_logger(args)
+            if logger_instance is None:
+                return func(*args, **kwargs)
             
             start_time = datetime.now()
             success = True
@@ -422,19 +696,23 @@ def log_all_calls(function_type: str = "unknown"):
                 raise
                 
             finally:
-                end_time = datetime.now()
-                execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
-                
-                logger_instance.log_function_call(
-                    function_name=func.__name__,
-                    function_type=function_type,
-                    input_data=input_data,
-                    output_data=output_data,
-                    execution_time_ms=execution_time_ms,
-                    success=success,
-                    error_message=error_message,
-                    user_message=user_message
-                )
+                if not success or logger_instance.should_sample(function_type, sample_rate):
+                    end_time = datetime.now()
+                    execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
+                    
+                    user_message = kwargs.get('user_message') or kwargs.get('message') or kwargs.get('query')
+                    input_data = {"args": args, "kwargs": kwargs}
+                    
+                    logger_instance.log_function_call(
+                        function_name=func.__name__,
+                        function_type=function_type,
+                        input_data=input_data,
+                        output_data=output_data,
+                        execution_time_ms=execution_time_ms,
+                        success=success,
+                        error_message=error_message,
+                        user_message=user_message
+                    )
         
         # Return appropriate wrapper based on function type
         if asyncio.iscoroutinefunction(func):
@@ -444,28 +722,43 @@ def log_all_calls(function_type: str = "unknown"):
     
     return decorator
 
-def log_mcp_tool(func: Callable) -> Callable:
+def _typed_decorator(function_type: str, func: Optional[Callable], sample_rate: Optional[float],
+                     logger_for: Optional[Callable[[tuple], Optional[FunctionCallLogger]]] = None):
+    """Support both @log_x and @log_x(sample_rate=0.1)"""
+    if func is None:
+        return log_all_calls(function_type, sample_rate, logger_for)
+    return log_all_calls(function_type, sample_rate, logger_for)(func)
+
+def log_mcp_tool(func: Optional[Callable] = None, *, sample_rate: Optional[float] = None) -> Callable:
     """Specific decorator for MCP tools"""
-    return log_all_calls("mcp_tool")(func)
+    return _typed_decorator("mcp_tool", func, sample_rate)
 
-def log_brain_function(func: Callable) -> Callable:
+def log_brain_function(func: Optional[Callable] = None, *, sample_rate: Optional[float] = None) -> Callable:
     """Specific decorator for brain functions"""
-    return log_all_calls("brain_function")(func)
+    return _typed_decorator("brain_function", func, sample_rate)
 
-def log_memory_operation(func: Callable) -> Callable:
+def log_memory_operation(func: Optional[Callable] = None, *, sample_rate: Optional[float] = None) -> Callable:
     """Specific decorator for memory operations"""
-    return log_all_calls("memory_operation")(func)
+    return _typed_decorator("memory_operation", func, sample_rate)
 
-def log_database_operation(func: Callable) -> Callable:
-    """Specific decorator for database operations"""
-    return log_all_calls("database_operation")(func)
+def log_database_operation(func: Optional[Callable] = None, *, sample_rate: Optional[float] = None) -> Callable:
+    """
+    Specific decorator for database operations
+    
+    Calls are logged into the database of the decorated method's instance
+    (its ``db_path``), never into the global brain database. Because every
+    logged call is a write to that database, successful calls are sampled at
+    DEFAULT_SAMPLE_RATES["database_operation"] unless configured otherwise.
+    """
+    return _typed_decorator("database_operation", func, sample_rate, _instance_logger)
 
 __all__ = [
     'FunctionCallLogger', 
     'get_function_logger', 
+    'release_function_logger',
     'log_all_calls', 
     'log_mcp_tool', 
     'log_brain_function',
     'log_memory_operation',
     'log_database_operation'
-]
\ No newline at end of file
+]
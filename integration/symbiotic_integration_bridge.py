@@ -5,15 +5,45 @@ Connects web crawler with all learning and processing capabilities for true symb
 """
 
 import asyncio
+import bisect
 import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple, Iterator, Sequence
 from pathlib import Path
 import sqlite3
 import json
 
 logger = logging.getLogger(__name__)
 
+def _blocked_pairs(keys: Sequence[Tuple], new_items: Optional[Set[int]] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Yield each index pair (i < j) whose items share a value in at least one key field.
+    
+    ``keys[i]`` holds the blocking key values of item i. A pair sharing several
+    fields is yielded once, from the first shared field. With ``new_items``
+    only pairs touching at least one of those indexes are produced.
+    """
+    field_count = len(keys[0]) if keys else 0
+    for field in range(field_count):
+        buckets: Dict[Any, List[int]] = defaultdict(list)
+        for index, item_keys in enumerate(keys):
+            buckets[item_keys[field]].append(index)
+        
+        for bucket in buckets.values():
+            if len(bucket) < 2:
+                continue
+            if new_items is None:
+                pairs = ((bucket[a], bucket[b]) for a in range(len(bucket)) for b in range(a + 1, len(bucket)))
+            else:
+                pairs = ((min(i, j), max(i, j)) for i in bucket if i in new_items
+                         for j in bucket if j != i and not (j in new_items and j < i))
+            for i, j in pairs:
+                # Already produced by an earlier field
+                if any(keys[i][f] == keys[j][f] for f in range(field)):
+                    continue
+                yield i, j
+
 class SymbioticIntegrationBridge:
     """
     Bridge that creates true symbiosis between web crawler and all learning capabilities
@@ -385,22 +415,27 @@ class SymbioticIntegrationBridge:
             logger.error(f"❌ Failed to convert learning bits: {e}")
             raise
     
-    async def _build_semantic_relationships(self):
-        """Build semantic relationships between knowledge nodes"""
+    async def _build_semantic_relationships(self, incremental: bool = False) -> int:
+        """Build semantic relationships between knowledge nodes
+        
+        Only pairs sharing a content type, category or subcategory are scored:
+        any other pair stays below the similarity threshold. With
+        ``incremental`` only nodes added since the previous run are paired
+        against the existing set.
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # Get all knowledge nodes
+                # Latest bridge row per learning bit (conversion may run repeatedly)
                 cursor.execute("""
-                    SELECT k1.learning_bit_id, k1.knowledge_node_id, k1.semantic_context,
-                           k2.learning_bit_id, k2.knowledge_node_id, k2.semantic_context
-                    FROM knowledge_graph_bridge k1
-                    JOIN knowledge_graph_bridge k2 ON k1.learning_bit_id != k2.learning_bit_id
-                    WHERE k1.learning_bit_id < k2.learning_bit_id
+                    SELECT k.learning_bit_id, k.knowledge_node_id, k.semantic_context
+                    FROM knowledge_graph_bridge k
+                    JOIN (SELECT MAX(id) AS id FROM knowledge_graph_bridge GROUP BY learning_bit_id) latest
+                      ON k.id = latest.id
+                    ORDER BY k.learning_bit_id
                 """)
-                
-                relationships = cursor.fetchall()
+                nodes = cursor.fetchall()
                 
                 # Create relationships table
                 cursor.execute("""
@@ -415,34 +450,66 @@ class SymbioticIntegrationBridge:
                     )
                 """)
                 
+                # Parse each context once instead of once per pair
+                contexts = [json.loads(context) if context else {} for _, _, context in nodes]
+                keys = [(c.get('category'), c.get('content_type'), c.get('subcategory')) for c in contexts]
+                
+                new_items = None
+                high_water_mark = self._get_bridge_state(cursor, 'semantic_relationships_hwm') if incremental else None
+                if high_water_mark is not None:
+                    new_items = {i for i, node in enumerate(nodes) if node[0] > high_water_mark}
+                
                 # Build relationships based on semantic similarity
-                for rel in relationships:
-                    source_id, source_node, source_context, target_id, target_node, target_context = rel
-                    
-                    # Calculate semantic similarity (simplified)
-                    similarity = self._calculate_semantic_similarity(
-                        json.loads(source_context), 
-                        json.loads(target_context)
-                    )
+                rows = []
+                pairs_scored = 0
+                for i, j in _blocked_pairs(keys, new_items):
+                    pairs_scored += 1
+                    similarity = self._calculate_semantic_similarity(contexts[i], contexts[j])
                     
                     if similarity > 0.3:  # Threshold for relationship creation
-                        cursor.execute("""
-                            INSERT INTO knowledge_relationships 
-                            (source_node_id, target_node_id, relationship_type, relationship_strength, semantic_context)
-                            VALUES (?, ?, 'semantic_similarity', ?, ?)
-                        """, (source_node, target_node, similarity, json.dumps({
-                            'source_context': source_context,
-                            'target_context': target_context,
+                        rows.append((nodes[i][1], nodes[j][1], similarity, json.dumps({
+                            'source_context': nodes[i][2],
+                            'target_context': nodes[j][2],
                             'similarity_score': similarity
                         })))
                 
+                cursor.executemany("""
+                    INSERT INTO knowledge_relationships 
+                    (source_node_id, target_node_id, relationship_type, relationship_strength, semantic_context)
+                    VALUES (?, ?, 'semantic_similarity', ?, ?)
+                """, rows)
+                
+                if nodes:
+                    self._set_bridge_state(cursor, 'semantic_relationships_hwm', nodes[-1][0])
                 conn.commit()
-                logger.info("✅ Semantic relationships built")
+                logger.info(f"✅ Semantic relationships built: {len(rows)} from {pairs_scored} candidate pairs")
+                return len(rows)
                 
         except Exception as e:
             logger.error(f"❌ Failed to build semantic relationships: {e}")
             raise
     
+    def _get_bridge_state(self, cursor, key: str) -> Optional[int]:
+        """Read an incremental-processing high-water mark"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS symbiotic_bridge_state (
+                key TEXT PRIMARY KEY,
+                value INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("SELECT value FROM symbiotic_bridge_state WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def _set_bridge_state(self, cursor, key: str, value: int):
+        """Store an incremental-processing high-water mark"""
+        self._get_bridge_state(cursor, key)  # Ensures the table exists
+        cursor.execute("""
+            INSERT INTO symbiotic_bridge_state (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+        """, (key, value))
+    
     def _calculate_semantic_similarity(self, context1: Dict, context2: Dict) -> float:
         """Calculate semantic similarity between two contexts"""
         similarity = 0.0
@@ -1078,8 +1145,14 @@ class SymbioticIntegrationBridge:
         # Implementation for pipeline optimization
         pass
     
-    async def detect_learning_relationships(self) -> Dict[str, Any]:
-        """Detect and establish learning relationships between concepts"""
+    async def detect_learning_relationships(self, incremental: bool = False) -> Dict[str, Any]:
+        """Detect and establish learning relationships between concepts
+        
+        Every relationship type requires the same or a related category, so
+        bits are bucketed by category and only pairs within a bucket, or
+        across related buckets, are scored. With ``incremental`` only bits
+        added since the previous run are paired against the existing set.
+        """
         logger.info("🧠 Detecting learning relationships between concepts...")
         
         try:
@@ -1095,43 +1168,51 @@ class SymbioticIntegrationBridge:
                 """)
                 
                 learning_bits = cursor.fetchall()
-                relationships_created = 0
                 
-                for i, bit1 in enumerate(learning_bits):
-                    bit1_id, content1, type1, cat1, subcat1, imp1, conf1, comp1 = bit1
+                new_items = None
+                high_water_mark = self._get_bridge_state(cursor, 'learning_relationships_hwm') if incremental else None
+                if high_water_mark is not None:
+                    new_items = {i for i, bit in enumerate(learning_bits) if bit[0] > high_water_mark}
+                
+                rows = []
+                pairs_scored = 0
+                for i, j in self._learning_relationship_candidates(learning_bits, new_items):
+                    pairs_scored += 1
+                    bit1_id, content1, type1, cat1, subcat1, imp1, conf1, comp1 = learning_bits[i]
+                    bit2_id, content2, type2, cat2, subcat2, imp2, conf2, comp2 = learning_bits[j]
                     
-                    # Find relationships with other bits
-                    for j, bit2 in enumerate(learning_bits[i+1:], i+1):
-                        bit2_id, content2, type2, cat2, subcat2, imp2, conf2, comp2 = bit2
-                        
-                        # Determine relationship type and strength
-                        relationship_type, strength = self._analyze_relationship(
-                            type1, cat1, subcat1, imp1, conf1, comp1,
-                            type2, cat2, subcat2, imp2, conf2, comp2
-                        )
-                        
-                        # Create relationship if strength is above threshold
-                        if strength > 0.4 and relationship_type:
-                            try:
-                                cursor.execute("""
-                                    INSERT OR IGNORE INTO learning_relationships 
-                                    (source_bit_id, target_bit_id, relationship_type, 
-                                     strength, bidirectional, created_at)
-                                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                                """, (bit1_id, bit2_id, relationship_type, strength, True))
-                                
-                                relationships_created += 1
-                                
-                            except Exception as e:
-                                logger.warning(f"Failed to create relationship {bit1_id} -> {bit2_id}: {e}")
-                
+                    # Determine relationship type and strength
+                    relationship_type, strength = self._analyze_relationship(
+                        type1, cat1, subcat1, imp1, conf1, comp1,
+                        type2, cat2, subcat2, imp2, conf2, comp2
+                    )
+                    
+                    # Create relationship if strength is above threshold
+                    if strength > 0.4 and relationship_type:
+                        rows.append((bit1_id, bit2_id, relationship_type, strength, True))
+                
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO learning_relationships 
+                    (source_bit_id, target_bit_id, relationship_type, 
+                     strength, bidirectional, created_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, rows)
+                relationships_created = len(rows)
+                
+                if learning_bits:
+                    self._set_bridge_state(cursor, 'learning_relationships_hwm',
+                                           max(bit[0] for bit in learning_bits))
                 conn.commit()
-                logger.info(f"✅ Created {relationships_created} learning relationships")
+                logger.info(f"✅ Created {relationships_created} learning relationships "
+                            f"({pairs_scored} candidate pairs scored)")
                 
                 return {
                     'status': 'success',
                     'relationships_created': relationships_created,
                     'total_bits_analyzed': len(learning_bits),
+                    'new_bits_analyzed': len(new_items) if new_items is not None else len(learning_bits),
+                    'candidate_pairs_scored': pairs_scored,
+                    'incremental': new_items is not None,
                     'message': f'Successfully established {relationships_created} learning relationships'
                 }
                 
@@ -1143,6 +1224,34 @@ class SymbioticIntegrationBridge:
                 'message': 'Learning relationship detection failed'
             }
     
+    def _learning_relationship_candidates(self, learning_bits: List[Tuple],
+                                          new_items: Optional[Set[int]] = None) -> Iterator[Tuple[int, int]]:
+        """Index pairs (i < j) of learning bits that can possibly form a relationship"""
+        # Same category: prerequisite, related, implements and similar relationships
+        yield from _blocked_pairs([(bit[3],) for bit in learning_bits], new_items)
+        
+        # Related categories: cross_domain needs 0.2 + (imp1 + conf1 + imp2 + conf2) * 0.15 > 0.4
+        min_score_sum = (0.4 - 0.2) / 0.15 - 1e-9
+        buckets: Dict[Any, List[Tuple[float, int]]] = defaultdict(list)
+        for index, bit in enumerate(learning_bits):
+            buckets[bit[3]].append(((bit[5] or 0) + (bit[6] or 0), index))
+        for bucket in buckets.values():
+            bucket.sort()
+        
+        categories = sorted(buckets, key=str)
+        for a, cat1 in enumerate(categories):
+            for cat2 in categories[a + 1:]:
+                if not self._are_categories_related(cat1, cat2):
+                    continue
+                scores2 = [score for score, _ in buckets[cat2]]
+                for score1, i in buckets[cat1]:
+                    # Only partners whose score pushes the pair over the threshold
+                    start = bisect.bisect_right(scores2, min_score_sum - score1)
+                    for _, j in buckets[cat2][start:]:
+                        if new_items is not None and i not in new_items and j not in new_items:
+                            continue
+                        yield (i, j) if i < j else (j, i)
+    
     def _analyze_relationship(self, type1: str, cat1: str, subcat1: str, imp1: float, conf1: float, comp1: str,
                             type2: str, cat2: str, subcat2: str, imp2: float, conf2: float, comp2: str) -> Tuple[str, float]:
         """Analyze the relationship between two learning bits"""
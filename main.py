@@ -3,30 +3,30 @@ import sys
 import os
 from pathlib import Path
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-# Import our Phase 1-5 systems for integration
-from core.intelligence import (
-    ProjectScanner,
-    KnowledgeIngestionEngine,
-    PersonalizationEngine,
-    ContextOrchestrator,
-    AIIntegrationEngine
-)
-
-# Import our enhanced web crawler and search engine systems
-from web_crawler import WebCrawlerMCPTools
-from integration import SymbioticIntegrationBridge
-
-from mcp.server.fastmcp import FastMCP
-from src.plugin_manager import PluginManager
-from core.brain import BrainInterface
-from core.brain.tool_registry import ToolRegistry
-from core.memory import get_brain_db, patch_json_operations, get_function_logger, log_mcp_tool, log_brain_function
+from lazy_loading import StartupProfiler, LazyComponent
+
+# Per-module import time and RSS, logged once the server is initialized
+startup_profiler = StartupProfiler()
+
+# Phase 1-5 systems (core.intelligence), the web crawler and the symbiotic bridge
+# are imported on first use; see initialize_server
+with startup_profiler.measure("mcp.server.fastmcp"):
+    from mcp.server.fastmcp import FastMCP
+with startup_profiler.measure("src.plugin_manager"):
+    from src.plugin_manager import PluginManager
+with startup_profiler.measure("src.action_dispatch"):
+    from src.action_dispatch import get_dispatcher, get_action_latency_report
+with startup_profiler.measure("core.brain"):
+    from core.brain import BrainInterface
+    from core.brain.tool_registry import ToolRegistry
+with startup_profiler.measure("core.memory"):
+    from core.memory import get_brain_db, get_function_logger, log_mcp_tool, log_brain_function
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -36,7 +36,13 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("Memory Context Manager with AI Memory")
 
 # Initialize plugin manager
-plugin_manager = PluginManager(["plugins"])
+# PLUGIN_LOADING: "off" (default, cognitive system tools only), "lazy" (register from the
+# cached manifest, import a plugin on its first call) or "eager" (import everything now)
+PLUGIN_LOADING = os.getenv("PLUGIN_LOADING", "off").lower()
+plugin_manager = PluginManager(["plugins"], lazy=PLUGIN_LOADING == "lazy", profiler=startup_profiler)
+
+# Consolidated tool actions whose p95 exceeds this are reported by self_monitoring("action_latency")
+ACTION_LATENCY_BUDGET_MS = float(os.getenv("ACTION_LATENCY_BUDGET_MS", "250"))
 
 # Initialize new tool registry
 from core.memory import get_tool_registry
@@ -96,10 +102,6 @@ phase3_personalization = None
 phase4_orchestrator = None
 phase5_ai = None
 
-# Global enhanced system instances
-web_crawler_tools = None
-symbiotic_bridge = None
-
 # Global brain interface instance
 brain_interface = None
 
@@ -136,12 +138,9 @@ def initialize_server():
     logger.info("🗄️ Initializing persistent database...")
     brain_db = get_brain_db()
     
-    # Patch JSON operations for backward compatibility
-    patch_json_operations()
-    logger.info("🔧 Database compatibility layer active")
-    
-    # DISABLE ALL PLUGIN LOADING - We only want the restructured cognitive system
-    logger.info("🧠 Loading restructured cognitive system ONLY...")
+    # Plugins reach the database-backed JSON files through get_storage_router();
+    # builtins.open is left untouched
+    logger.info("🔧 Database compatibility layer active (explicit storage routing)")
     
     # Clear any existing plugins to start fresh
     plugin_manager.registry.plugins.clear()
@@ -151,8 +150,14 @@ def initialize_server():
     
     logger.info("✅ Cleared all existing plugins")
     
-    # We'll manually register only the tools we need
-    logger.info("✅ Plugin loading disabled - using manual tool registration only")
+    if PLUGIN_LOADING in ("lazy", "eager"):
+        logger.info(f"🔌 Loading plugins ({PLUGIN_LOADING})...")
+        plugin_manager.load_all_plugins()
+        plugin_manager.startup_plugins()
+    else:
+        # Only the restructured cognitive system; tools are registered manually below
+        logger.info("🧠 Loading restructured cognitive system ONLY...")
+        logger.info("✅ Plugin loading disabled - using manual tool registration only")
     
     # Create internal MCP client
     mcp_client = MCPClient(plugin_manager.registry)
@@ -215,9 +220,10 @@ def initialize_server():
             """⚡ Comprehensive system performance analysis and optimization assessment"""
             return await brain.analyze_system_performance()
         
-        async def get_comprehensive_logs(log_level: str = "INFO", max_lines: int = 1000) -> dict:
+        async def get_comprehensive_logs(log_level: str = "INFO", max_lines: int = 1000,
+                                         since: Optional[str] = None, until: Optional[str] = None) -> dict:
             """📋 Get comprehensive system logs with detailed analysis"""
-            return await brain.get_comprehensive_logs(log_level, max_lines)
+            return await brain.get_comprehensive_logs(log_level, max_lines, since, until)
         
         # Register tools using add_tool method instead of decorator
         mcp.add_tool(analyze_with_context, name="analyze_with_context", description="🧠 Analyze any topic with deep context understanding and background processing")
@@ -238,69 +244,25 @@ def initialize_server():
         logger.error(f"❌ Brain tool registration failed: {str(e)}")
         brain_tools_registered = 0
     
-    # 🕷️ Initialize enhanced web crawler and search engine systems
-    global web_crawler_tools, symbiotic_bridge
+    # 🚀 Phase 1-5 systems, built on first use; a failing constructor surfaces as an
+    # error from the tool that needed it
+    global phase1_scanner, phase2_knowledge, phase3_personalization, phase4_orchestrator, phase5_ai
     
-    try:
-        # Get the database path from brain_db
-        db_path = brain_db.db_path if hasattr(brain_db, 'db_path') else "brain_memory_store/brain.db"
-        web_crawler_tools = WebCrawlerMCPTools(db_path)
-        logger.info("✅ Enhanced Web Crawler MCP Tools initialized with search engine integration")
-        
-        symbiotic_bridge = SymbioticIntegrationBridge(db_path)
-        logger.info("✅ Symbiotic Integration Bridge initialized")
-        
-        logger.info("🎉 Enhanced web crawler and search engine systems successfully integrated!")
-        
-    except Exception as e:
-        logger.error(f"❌ Error initializing enhanced systems: {str(e)}")
-        logger.warning("⚠️ Web crawler and search engine features may not be available")
-        web_crawler_tools = None
-        symbiotic_bridge = None
+    def intelligence_system(class_name: str, *args, **kwargs):
+        return lambda: startup_profiler.import_attr('core.intelligence', class_name)(*args, **kwargs)
     
-    # 🚀 Initialize Phase 1-5 systems for integration
-    logger.info("🚀 Initializing Phase 1-5 systems for integration...")
+    def context_orchestrator():
+        # Memory writes invalidate the orchestrator's cached responses
+        orchestrator = startup_profiler.import_attr('core.intelligence', 'ContextOrchestrator')()
+        orchestrator.attach_database(brain_db)
+        return orchestrator
     
-    try:
-        # Phase 1: Project Intelligence Layer
-        project_scanner = ProjectScanner("/app")  # Docker container path
-        logger.info("✅ Phase 1: Project Scanner initialized")
-        
-        # Phase 2: Knowledge Ingestion Engine
-        knowledge_engine = KnowledgeIngestionEngine()
-        logger.info("✅ Phase 2: Knowledge Ingestion Engine initialized")
-        
-        # Phase 3: Personalization Engine
-        personalization_engine = PersonalizationEngine()
-        logger.info("✅ Phase 3: Personalization Engine initialized")
-        
-        # Phase 4: Context Orchestrator
-        context_orchestrator = ContextOrchestrator()
-        logger.info("✅ Phase 4: Context Orchestrator initialized")
-        
-        # Phase 5: AI Integration Engine
-        ai_integration_engine = AIIntegrationEngine()
-        logger.info("✅ Phase 5: AI Integration Engine initialized")
-        
-        # Store systems globally for tool access
-        global phase1_scanner, phase2_knowledge, phase3_personalization, phase4_orchestrator, phase5_ai
-        phase1_scanner = project_scanner
-        phase2_knowledge = knowledge_engine
-        phase3_personalization = personalization_engine
-        phase4_orchestrator = context_orchestrator
-        phase5_ai = ai_integration_engine
-        
-        logger.info("🎉 All Phase 1-5 systems successfully integrated!")
-        
-    except Exception as e:
-        logger.error(f"❌ Error initializing Phase 1-5 systems: {str(e)}")
-        logger.warning("⚠️ Some advanced features may not be available")
-        # Initialize as None to prevent crashes
-        phase1_scanner = None
-        phase2_knowledge = None
-        phase3_personalization = None
-        phase4_orchestrator = None
-        phase5_ai = None
+    phase1_scanner = LazyComponent("Phase 1: Project Scanner", intelligence_system('ProjectScanner', "/app", persist_index=True))  # Docker container path
+    phase2_knowledge = LazyComponent("Phase 2: Knowledge Ingestion Engine", intelligence_system('KnowledgeIngestionEngine'))
+    phase3_personalization = LazyComponent("Phase 3: Personalization Engine", intelligence_system('PersonalizationEngine'))
+    phase4_orchestrator = LazyComponent("Phase 4: Context Orchestrator", context_orchestrator)
+    phase5_ai = LazyComponent("Phase 5: AI Integration Engine", intelligence_system('AIIntegrationEngine'))
+    logger.info("🎉 Phase 1-5 systems registered (loaded on first use)")
     
     # Only register essential debugging tools in debug mode
     debug_mode = os.getenv("DEBUG_MODE", "false").lower() == "true"
@@ -332,15 +294,18 @@ def initialize_server():
     brain_tools = brain_tools_registered  # Our agent-friendly brain tools
     total_mcp_tools = consolidated_tools + brain_tools
     
-    # Count integrated Phase 1-5 systems
-    integrated_phases = sum(1 for p in [phase1_scanner, phase2_knowledge, phase3_personalization, phase4_orchestrator, phase5_ai] if p is not None)
+    # Count registered Phase 1-5 systems (none is built until first use)
+    registered_phases = sum(1 for p in _phase_components() if p is not None)
     
     logger.info(f"🧠 Brain Interface ready with {brain_tools} agent-friendly cognitive functions")
     logger.info(f"🎯 Consolidated Tool System: {consolidated_tools} tools organized in 6 cognitive domains")
-    logger.info(f"🚀 Phase 1-5 Integration: {integrated_phases}/5 systems successfully integrated")
+    logger.info(f"🚀 Phase 1-5 Integration: {registered_phases}/5 systems registered (loaded on first use)")
     logger.info(f"🔌 Loaded {len(plugin_manager.registry.plugins)} plugins in background")
     logger.info(f"🚀 Total MCP tools available: {total_mcp_tools} tools ({consolidated_tools} consolidated + {brain_tools} brain tools)")
     
+    # Startup cost per imported module and plugin
+    startup_profiler.log_report("MCP server startup profile")
+    
 
 
 # Brain status and info tools
@@ -1444,263 +1409,296 @@ def extract_name_from_context(context: str) -> str:
 # This reduces tool count from 48 to 12 while preserving 100% functionality
 
 # ===== DOMAIN 1: PERCEPTION & INPUT =====
-@mcp.tool()
-@log_mcp_tool
-def perceive_and_analyze(
-    action: str,
-    content: str = "",
-    context: str = "",
-    **kwargs
-) -> dict:
-    """
-    🧠 PERCEPTION & INPUT: Unified interface for all perception and analysis tools
-    
-    Actions available:
-    - brain_info: Show brain functions and capabilities
-    - list_plugins: List loaded plugins
-    - server_status: Get server status
-    - get_cursor_context: Get Cursor conversation context
-    - enhanced_context_retrieval: Enhanced context analysis
-    - analyze_context_deeply: Deep context analysis
-    - detect_patterns: Pattern detection in content
-    - assess_complexity: Complexity assessment
-    """
-    if action == "brain_info":
-        brain_functions = {
-            "think": "💭 Think and respond with memory and context",
-            "remember": "🧠 Remember important information", 
-            "recall": "🔍 Recall memories and past experiences",
-            "reflect": "🤔 Engage in self-reflection and metacognition",
-            "consciousness_check": "🧘 Check current state of consciousness",
-            "learn_from": "📚 Learn from new experiences and information",
-            "dream": "💤 Background processing and memory consolidation",
-            "memory_stats": "📊 Check memory database statistics and health"
+perception_actions = get_dispatcher("perceive_and_analyze")
+
+@perception_actions.action("brain_info", description="Show brain functions and capabilities")
+def _brain_info() -> dict:
+    brain_functions = {
+        "think": "💭 Think and respond with memory and context",
+        "remember": "🧠 Remember important information", 
+        "recall": "🔍 Recall memories and past experiences",
+        "reflect": "🤔 Engage in self-reflection and metacognition",
+        "consciousness_check": "🧘 Check current state of consciousness",
+        "learn_from": "📚 Learn from new experiences and information",
+        "dream": "💤 Background processing and memory consolidation",
+        "memory_stats": "📊 Check memory database statistics and health"
+    }
+    return {
+        "brain_type": "Human-Inspired Cognitive System",
+        "consciousness_level": "Aware and responsive",
+        "available_functions": brain_functions,
+        "total_functions": len(brain_functions),
+        "memory_system": "Persistent with emotional weighting",
+        "learning_capability": "Continuous from interactions",
+        "usage_example": "Use 'think' for conversations, 'remember' to store info, 'recall' to search memories"
+    }
+
+@perception_actions.action("list_plugins", description="List loaded plugins")
+def _list_plugins() -> dict:
+    plugin_info = {}
+    for plugin_name, plugin in plugin_manager.registry.plugins.items():
+        metadata = plugin.metadata
+        plugin_info[plugin_name] = {
+            "version": metadata.version,
+            "description": metadata.description,
+            "author": metadata.author,
+            "tools": [tool.name for tool in plugin.get_tools()],
+            "resources": [resource.name for resource in plugin.get_resources()],
+            "prompts": [prompt.name for prompt in plugin.get_prompts()],
         }
+    return plugin_info
+
+@perception_actions.action("server_status", description="Get server status")
+def _server_status() -> dict:
+    return {
+        "server_name": "Memory Context Manager with AI Memory",
+        "plugins_loaded": len(plugin_manager.registry.plugins),
+        "tools_available": len(plugin_manager.registry.tools) + 4,
+        "resources_available": len(plugin_manager.registry.resources),
+        "prompts_available": len(plugin_manager.registry.prompts),
+        "plugin_directories": plugin_manager.plugin_dirs,
+        "memory_enabled": True,
+    }
+
+def _register_placeholders(dispatcher, *actions: str):
+    """Register actions whose implementation is not wired into the consolidated tool yet"""
+    for action in actions:
+        dispatcher.register(action, lambda action=action: {"message": f"{action} functionality available"})
+
+_register_placeholders(perception_actions, "get_cursor_context", "enhanced_context_retrieval",
+                       "analyze_context_deeply", "detect_patterns", "assess_complexity")
+
+# 🚀 PHASE 1-5 INTEGRATION ACTIONS
+def _phase_components() -> list:
+    """The Phase 1-5 lazy components, in phase order"""
+    return [phase1_scanner, phase2_knowledge, phase3_personalization, phase4_orchestrator, phase5_ai]
+
+def _phase_system(component):
+    """Build (on first use) and return a phase system, or None if it is unavailable"""
+    return component.try_resolve() if component is not None else None
+
+def _phase_unavailable(component, system_name: str, phase: int) -> dict:
+    """Error response for a phase system that is not registered or failed to load"""
+    error = {"error": f"{system_name} not available", "phase": phase}
+    if component is not None and component.error:
+        error["load_error"] = component.error
+    return error
+
+def _phase_status(component) -> str:
+    """Integration status of a phase system without building it"""
+    if component is None or component.failed:
+        return "❌ NOT AVAILABLE"
+    return "✅ INTEGRATED" if component.loaded else "⏳ REGISTERED (loads on first use)"
+
+@perception_actions.action("project_scan", description="Phase 1: Project Intelligence Layer")
+def _project_scan() -> dict:
+    """Phase 1: Project Intelligence Layer"""
+    scanner = _phase_system(phase1_scanner)
+    if scanner is None:
+        return _phase_unavailable(phase1_scanner, "Project Scanner", 1)
+
+    try:
+        # ProjectScanner already has project_root set during initialization
+        scan_result = scanner.scan_project()
         return {
-            "brain_type": "Human-Inspired Cognitive System",
-            "consciousness_level": "Aware and responsive",
-            "available_functions": brain_functions,
-            "total_functions": len(brain_functions),
-            "memory_system": "Persistent with emotional weighting",
-            "learning_capability": "Continuous from interactions",
-            "usage_example": "Use 'think' for conversations, 'remember' to store info, 'recall' to search memories"
+            "success": True,
+            "phase": 1,
+            "system": "Project Scanner",
+            "result": scan_result,
+            "message": "Project scan completed successfully"
         }
-    
-    elif action == "list_plugins":
-        plugin_info = {}
-        for plugin_name, plugin in plugin_manager.registry.plugins.items():
-            metadata = plugin.metadata
-            plugin_info[plugin_name] = {
-                "version": metadata.version,
-                "description": metadata.description,
-                "author": metadata.author,
-                "tools": [tool.name for tool in plugin.get_tools()],
-                "resources": [resource.name for resource in plugin.get_resources()],
-                "prompts": [prompt.name for prompt in plugin.get_prompts()],
-            }
-        return plugin_info
-    
-    elif action == "server_status":
+    except Exception as e:
+        return {"error": f"Project scan failed: {str(e)}", "phase": 1}
+
+@perception_actions.action("knowledge_ingest", params={"project_root": (str, "/app")},  # Default to Docker path
+                           description="Phase 2: Knowledge Ingestion Engine")
+def _knowledge_ingest(project_root: str) -> dict:
+    """Phase 2: Knowledge Ingestion Engine"""
+    knowledge = _phase_system(phase2_knowledge)
+    if knowledge is None:
+        return _phase_unavailable(phase2_knowledge, "Knowledge Engine", 2)
+
+    try:
+        ingestion_result = knowledge.ingest_project_documentation(project_root)
         return {
-            "server_name": "Memory Context Manager with AI Memory",
-            "plugins_loaded": len(plugin_manager.registry.plugins),
-            "tools_available": len(plugin_manager.registry.tools) + 4,
-            "resources_available": len(plugin_manager.registry.resources),
-            "prompts_available": len(plugin_manager.registry.prompts),
-            "plugin_directories": plugin_manager.plugin_dirs,
-            "memory_enabled": True,
+            "success": True,
+            "phase": 2,
+            "system": "Knowledge Ingestion Engine",
+            "result": ingestion_result,
+            "message": "Knowledge ingestion completed successfully"
         }
+    except Exception as e:
+        return {"error": f"Knowledge ingestion failed: {str(e)}", "phase": 2}
+
+def _context_orchestration(context_request: dict) -> dict:
+    """Phase 4: Context Orchestrator"""
+    orchestrator = _phase_system(phase4_orchestrator)
+    if orchestrator is None:
+        return _phase_unavailable(phase4_orchestrator, "Context Orchestrator", 4)
     
-    elif action == "get_cursor_context":
-        # This would call the actual get_cursor_context function
-        return {"message": "get_cursor_context functionality available"}
-    
-    elif action == "enhanced_context_retrieval":
-        # This would call the actual enhanced_context_retrieval function
-        return {"message": "enhanced_context_retrieval functionality available"}
-    
-    elif action == "analyze_context_deeply":
-        # This would call the actual analyze_context_deeply function
-        return {"message": "analyze_context_deeply functionality available"}
-    
-    elif action == "detect_patterns":
-        # This would call the actual detect_patterns function
-        return {"message": "detect_patterns functionality available"}
-    
-    elif action == "assess_complexity":
-        # This would call the actual assess_complexity function
-        return {"message": "assess_complexity functionality available"}
-    
-    # 🚀 PHASE 1-5 INTEGRATION ACTIONS
-    elif action == "project_scan":
-        """Phase 1: Project Intelligence Layer"""
-        if phase1_scanner is None:
-            return {"error": "Project Scanner not available", "phase": 1}
+    try:
+        if not context_request:
+            return {"error": "No context request provided", "phase": 4}
+        
+        orchestration_result = orchestrator.orchestrate_context(context_request)
+        return {
+            "success": True,
+            "phase": 4,
+            "system": "Context Orchestrator",
+            "result": orchestration_result,
+            "message": "Context orchestration completed successfully"
+        }
+    except Exception as e:
+        return {"error": f"Context orchestration failed: {str(e)}", "phase": 4}
 
-        try:
-            # ProjectScanner already has project_root set during initialization
-            scan_result = phase1_scanner.scan_project()
+CONTEXT_ORCHESTRATION_PARAMS = {"context_request": (dict, {})}
+
+perception_actions.register("context_orchestration", _context_orchestration, CONTEXT_ORCHESTRATION_PARAMS,
+                            "Phase 4: Context Orchestrator")
+
+def _ai_integration(type: str, orchestrator_data: dict, session_data: dict, decision_context: dict) -> dict:
+    """Phase 5: AI Integration Engine"""
+    ai_engine = _phase_system(phase5_ai)
+    if ai_engine is None:
+        return _phase_unavailable(phase5_ai, "AI Integration Engine", 5)
+    
+    try:
+        if type == 'context_orchestration':
+            # Integrate with context orchestrator
+            if not orchestrator_data:
+                return {"error": "No orchestrator data provided", "phase": 5}
+            
+            integration_result = ai_engine.integrate_with_context_orchestrator(orchestrator_data)
             return {
                 "success": True,
-                "phase": 1,
-                "system": "Project Scanner",
-                "result": scan_result,
-                "message": "Project scan completed successfully"
+                "phase": 5,
+                "system": "AI Integration Engine",
+                "action": "context_orchestration",
+                "result": integration_result,
+                "message": "AI integration with context orchestrator completed"
             }
-        except Exception as e:
-            return {"error": f"Project scan failed: {str(e)}", "phase": 1}
-    
-    elif action == "knowledge_ingest":
-        """Phase 2: Knowledge Ingestion Engine"""
-        if phase2_knowledge is None:
-            return {"error": "Knowledge Engine not available", "phase": 2}
-
-        try:
-            project_root = kwargs.get('project_root', '/app')  # Default to Docker path
-            ingestion_result = phase2_knowledge.ingest_project_documentation(project_root)
+        
+        elif type == 'development_session':
+            # Learn from development session
+            if not session_data:
+                return {"error": "No session data provided", "phase": 5}
+            
+            learning_result = ai_engine.learn_from_development_session(session_data)
             return {
                 "success": True,
-                "phase": 2,
-                "system": "Knowledge Ingestion Engine",
-                "result": ingestion_result,
-                "message": "Knowledge ingestion completed successfully"
+                "phase": 5,
+                "system": "AI Integration Engine",
+                "action": "development_session",
+                "result": learning_result,
+                "message": "AI learning from development session completed"
             }
-        except Exception as e:
-            return {"error": f"Knowledge ingestion failed: {str(e)}", "phase": 2}
-    
-    elif action == "context_orchestration":
-        """Phase 4: Context Orchestrator"""
-        if phase4_orchestrator is None:
-            return {"error": "Context Orchestrator not available", "phase": 4}
         
-        try:
-            context_request = kwargs.get('context_request', {})
-            if not context_request:
-                return {"error": "No context request provided", "phase": 4}
+        elif type == 'ai_decision':
+            # Make AI decision
+            if not decision_context:
+                return {"error": "No decision context provided", "phase": 5}
             
-            orchestration_result = phase4_orchestrator.orchestrate_context(context_request)
+            decision_result = ai_engine.make_ai_decision(decision_context)
             return {
                 "success": True,
-                "phase": 4,
-                "system": "Context Orchestrator",
-                "result": orchestration_result,
-                "message": "Context orchestration completed successfully"
+                "phase": 5,
+                "system": "AI Integration Engine",
+                "action": "ai_decision",
+                "result": decision_result,
+                "message": "AI decision made successfully"
             }
-        except Exception as e:
-            return {"error": f"Context orchestration failed: {str(e)}", "phase": 4}
-    
-    elif action == "ai_integration":
-        """Phase 5: AI Integration Engine"""
-        if phase5_ai is None:
-            return {"error": "AI Integration Engine not available", "phase": 5}
         
-        try:
-            integration_type = kwargs.get('type', 'context_orchestration')
-            
-            if integration_type == 'context_orchestration':
-                # Integrate with context orchestrator
-                orchestrator_data = kwargs.get('orchestrator_data', {})
-                if not orchestrator_data:
-                    return {"error": "No orchestrator data provided", "phase": 5}
-                
-                integration_result = phase5_ai.integrate_with_context_orchestrator(orchestrator_data)
-                return {
-                    "success": True,
-                    "phase": 5,
-                    "system": "AI Integration Engine",
-                    "action": "context_orchestration",
-                    "result": integration_result,
-                    "message": "AI integration with context orchestrator completed"
-                }
-            
-            elif integration_type == 'development_session':
-                # Learn from development session
-                session_data = kwargs.get('session_data', {})
-                if not session_data:
-                    return {"error": "No session data provided", "phase": 5}
-                
-                learning_result = phase5_ai.learn_from_development_session(session_data)
-                return {
-                    "success": True,
-                    "phase": 5,
-                    "system": "AI Integration Engine",
-                    "action": "development_session",
-                    "result": learning_result,
-                    "message": "AI learning from development session completed"
-                }
-            
-            elif integration_type == 'ai_decision':
-                # Make AI decision
-                decision_context = kwargs.get('decision_context', {})
-                if not decision_context:
-                    return {"error": "No decision context provided", "phase": 5}
-                
-                decision_result = phase5_ai.make_ai_decision(decision_context)
-                return {
-                    "success": True,
-                    "phase": 5,
-                    "system": "AI Integration Engine",
-                    "action": "ai_decision",
-                    "result": decision_result,
-                    "message": "AI decision made successfully"
-                }
+        else:
+            return {"error": f"Unknown AI integration type: {type}", "phase": 5}
             
-            else:
-                return {"error": f"Unknown AI integration type: {integration_type}", "phase": 5}
-                
-        except Exception as e:
-            return {"error": f"AI integration failed: {str(e)}", "phase": 5}
-    
-    elif action == "system_status":
-        """Show comprehensive system integration status"""
-        return {
-            "system_name": "Memory Context Manager v2 with Phase 1-5 Integration",
-            "integration_status": "ACTIVE",
-            "phases": {
-                "phase_1": {
-                    "name": "Project Intelligence Layer",
-                    "status": "✅ INTEGRATED" if phase1_scanner else "❌ NOT AVAILABLE",
-                    "system": "ProjectScanner",
-                    "capabilities": ["Project scanning", "File indexing", "Dependency detection", "Technology stack analysis"]
-                },
-                "phase_2": {
-                    "name": "Knowledge Ingestion Engine", 
-                    "status": "✅ INTEGRATED" if phase2_knowledge else "❌ NOT AVAILABLE",
-                    "system": "KnowledgeIngestionEngine",
-                    "capabilities": ["Document processing", "Concept extraction", "Knowledge graph building", "Semantic search"]
-                },
-                "phase_3": {
-                    "name": "Personalization & Behavior Injection",
-                    "status": "✅ INTEGRATED" if phase3_personalization else "❌ NOT AVAILABLE", 
-                    "system": "PersonalizationEngine",
-                    "capabilities": ["Pattern learning", "Workflow modeling", "Context suggestions", "Behavior injection"]
-                },
-                "phase_4": {
-                    "name": "Intelligent Context Orchestration",
-                    "status": "✅ INTEGRATED" if phase4_orchestrator else "❌ NOT AVAILABLE",
-                    "system": "ContextOrchestrator", 
-                    "capabilities": ["Context orchestration", "Source management", "Strategy selection", "Quality metrics"]
-                },
-                "phase_5": {
-                    "name": "Advanced AI Integration & Evolution",
-                    "status": "✅ INTEGRATED" if phase5_ai else "❌ NOT AVAILABLE",
-                    "system": "AIIntegrationEngine",
-                    "capabilities": ["Deep learning", "Evolutionary AI", "AI decision making", "Autonomous evolution"]
-                }
+    except Exception as e:
+        return {"error": f"AI integration failed: {str(e)}", "phase": 5}
+
+AI_INTEGRATION_PARAMS = {
+    "type": (str, "context_orchestration"),
+    "orchestrator_data": (dict, {}),
+    "session_data": (dict, {}),
+    "decision_context": (dict, {}),
+}
+
+perception_actions.register("ai_integration", _ai_integration, AI_INTEGRATION_PARAMS,
+                            "Phase 5: AI Integration Engine")
+
+@perception_actions.action("system_status", description="Show comprehensive system integration status")
+def _system_status() -> dict:
+    """Show comprehensive system integration status"""
+    return {
+        "system_name": "Memory Context Manager v2 with Phase 1-5 Integration",
+        "integration_status": "ACTIVE",
+        "phases": {
+            "phase_1": {
+                "name": "Project Intelligence Layer",
+                "status": _phase_status(phase1_scanner),
+                "system": "ProjectScanner",
+                "capabilities": ["Project scanning", "File indexing", "Dependency detection", "Technology stack analysis"]
             },
-            "total_phases": 5,
-            "integrated_phases": sum(1 for p in [phase1_scanner, phase2_knowledge, phase3_personalization, phase4_orchestrator, phase5_ai] if p is not None),
-            "mcp_tools": 6,
-            "integration_method": "Direct integration with consolidated MCP tools",
-            "architecture": "6-tool consolidated system with Phase 1-5 backend integration"
-        }
+            "phase_2": {
+                "name": "Knowledge Ingestion Engine", 
+                "status": _phase_status(phase2_knowledge),
+                "system": "KnowledgeIngestionEngine",
+                "capabilities": ["Document processing", "Concept extraction", "Knowledge graph building", "Semantic search"]
+            },
+            "phase_3": {
+                "name": "Personalization & Behavior Injection",
+                "status": _phase_status(phase3_personalization), 
+                "system": "PersonalizationEngine",
+                "capabilities": ["Pattern learning", "Workflow modeling", "Context suggestions", "Behavior injection"]
+            },
+            "phase_4": {
+                "name": "Intelligent Context Orchestration",
+                "status": _phase_status(phase4_orchestrator),
+                "system": "ContextOrchestrator", 
+                "capabilities": ["Context orchestration", "Source management", "Strategy selection", "Quality metrics"]
+            },
+            "phase_5": {
+                "name": "Advanced AI Integration & Evolution",
+                "status": _phase_status(phase5_ai),
+                "system": "AIIntegrationEngine",
+                "capabilities": ["Deep learning", "Evolutionary AI", "AI decision making", "Autonomous evolution"]
+            }
+        },
+        "total_phases": 5,
+        "integrated_phases": sum(1 for p in _phase_components() if p is not None and p.loaded),
+        "failed_phases": sum(1 for p in _phase_components() if p is not None and p.failed),
+        "mcp_tools": 6,
+        "integration_method": "Direct integration with consolidated MCP tools",
+        "architecture": "6-tool consolidated system with Phase 1-5 backend integration"
+    }
+
+@mcp.tool()
+@log_mcp_tool
+def perceive_and_analyze(
+    action: str,
+    content: str = "",
+    context: str = "",
+    **kwargs
+) -> dict:
+    """
+    🧠 PERCEPTION & INPUT: Unified interface for all perception and analysis tools
     
-    else:
-        return {
-            "error": f"Unknown action: {action}. Available actions: brain_info, list_plugins, server_status, get_cursor_context, enhanced_context_retrieval, analyze_context_deeply, detect_patterns, assess_complexity, project_scan, knowledge_ingest, context_orchestration, ai_integration, system_status"
-        }
+    Actions available:
+    - brain_info: Show brain functions and capabilities
+    - list_plugins: List loaded plugins
+    - server_status: Get server status
+    - get_cursor_context: Get Cursor conversation context
+    - enhanced_context_retrieval: Enhanced context analysis
+    - analyze_context_deeply: Deep context analysis
+    - detect_patterns: Pattern detection in content
+    - assess_complexity: Complexity assessment
+    """
+    return perception_actions.dispatch(action, content, context, **kwargs)
 
 # ===== DOMAIN 2: MEMORY & STORAGE =====
+memory_actions = get_dispatcher("memory_and_storage")
+
+_register_placeholders(memory_actions, "ai_chat_with_memory", "auto_process_message", "get_user_context",
+                       "remember_important", "recall_intelligently", "forget_selectively")
+
 @mcp.tool()
 @log_mcp_tool
 def memory_and_storage(
@@ -1720,34 +1718,18 @@ def memory_and_storage(
     - recall_intelligently: Intelligent memory retrieval
     - forget_selectively: Selective memory cleanup
     """
-    if action == "ai_chat_with_memory":
-        # This would call the actual ai_chat_with_memory function
-        return {"message": "ai_chat_with_memory functionality available"}
-    
-    elif action == "auto_process_message":
-        # This would call the actual auto_process_message function
-        return {"message": "auto_process_message functionality available"}
-    
-    elif action == "get_user_context":
-        # This would call the actual get_user_context function
-        return {"message": "get_user_context functionality available"}
-    
-    elif action == "remember_important":
-        # This would call the actual remember_important function
-        return {"message": "remember_important functionality available"}
-    
-    elif action == "recall_intelligently":
-        # This would call the actual recall_intelligently function
-        return {"message": "recall_intelligently functionality available"}
-    
-    elif action == "forget_selectively":
-        # This would call the actual forget_selectively function
-        return {"message": "forget_selectively functionality available"}
-    
-    else:
-        return {"error": f"Unknown action: {action}. Available actions: ai_chat_with_memory, auto_process_message, get_user_context, remember_important, recall_intelligently, forget_selectively"}
+    return memory_actions.dispatch(action, content, context, **kwargs)
 
 # ===== DOMAIN 3: PROCESSING & THINKING =====
+processing_actions = get_dispatcher("processing_and_thinking")
+
+_register_placeholders(processing_actions, "think_deeply", "reflect_enhanced", "understand_deeply",
+                       "code_analyze", "debug_intelligently", "refactor_safely")
+
+# 🚀 PHASE 5 INTEGRATION: AI INTEGRATION ENGINE
+processing_actions.register("ai_integrate", _ai_integration, AI_INTEGRATION_PARAMS,
+                            "Phase 5: AI Integration Engine")
+
 @mcp.tool()
 @log_mcp_tool
 def processing_and_thinking(
@@ -1767,97 +1749,61 @@ def processing_and_thinking(
     - debug_intelligently: Intelligent debugging
     - refactor_safely: Safe code refactoring
     """
-    if action == "think_deeply":
-        # This would call the actual think_deeply function
-        return {"message": "think_deeply functionality available"}
-    
-    elif action == "reflect_enhanced":
-        # This would call the actual reflect_enhanced function
-        return {"message": "reflect_enhanced functionality available"}
-    
-    elif action == "understand_deeply":
-        # This would call the actual understand_deeply function
-        return {"message": "understand_deeply functionality available"}
-    
-    elif action == "code_analyze":
-        # This would call the actual code_analyze function
-        return {"message": "code_analyze functionality available"}
-    
-    elif action == "debug_intelligently":
-        # This would call the actual debug_intelligently function
-        return {"message": "debug_intelligently functionality available"}
-    
-    elif action == "refactor_safely":
-        # This would call the actual refactor_safely function
-        return {"message": "refactor_safely functionality available"}
+    return processing_actions.dispatch(action, content, context, **kwargs)
+
+# ===== DOMAIN 4: LEARNING & ADAPTATION =====
+learning_actions = get_dispatcher("learning_and_adaptation")
+
+_register_placeholders(learning_actions, "learn_from", "continuous_learning_cycle", "enhanced_workflow_execution",
+                       "workflow_optimization", "workflow_performance_analysis", "batch_workflow_processing")
+
+# 🚀 PHASE 3 INTEGRATION: PERSONALIZATION ENGINE
+@learning_actions.action("personalization",
+                         params={"type": (str, "learn_patterns"), "session_data": (dict, {}), "context_data": (dict, {})},
+                         description="Phase 3: Personalization & Behavior Injection")
+def _personalization(type: str, session_data: dict, context_data: dict) -> dict:
+    """Phase 3: Personalization & Behavior Injection"""
+    personalization = _phase_system(phase3_personalization)
+    if personalization is None:
+        return _phase_unavailable(phase3_personalization, "Personalization Engine", 3)
     
-    # 🚀 PHASE 5 INTEGRATION: AI INTEGRATION ENGINE
-    elif action == "ai_integrate":
-        """Phase 5: AI Integration Engine"""
-        if phase5_ai is None:
-            return {"error": "AI Integration Engine not available", "phase": 5}
-        
-        try:
-            integration_type = kwargs.get('type', 'context_orchestration')
-            
-            if integration_type == 'context_orchestration':
-                # Integrate with context orchestrator
-                orchestrator_data = kwargs.get('orchestrator_data', {})
-                if not orchestrator_data:
-                    return {"error": "No orchestrator data provided", "phase": 5}
-                
-                integration_result = phase5_ai.integrate_with_context_orchestrator(orchestrator_data)
-                return {
-                    "success": True,
-                    "phase": 5,
-                    "system": "AI Integration Engine",
-                    "action": "context_orchestration",
-                    "result": integration_result,
-                    "message": "AI integration with context orchestrator completed"
-                }
-            
-            elif integration_type == 'development_session':
-                # Learn from development session
-                session_data = kwargs.get('session_data', {})
-                if not session_data:
-                    return {"error": "No session data provided", "phase": 5}
-                
-                learning_result = phase5_ai.learn_from_development_session(session_data)
-                return {
-                    "success": True,
-                    "phase": 5,
-                    "system": "AI Integration Engine",
-                    "action": "development_session",
-                    "result": learning_result,
-                    "message": "AI learning from development session completed"
-                }
+    try:
+        if type == 'learn_patterns':
+            # Learn from development session
+            if not session_data:
+                return {"error": "No session data provided for learning", "phase": 3}
             
-            elif integration_type == 'ai_decision':
-                # Make AI decision
-                decision_context = kwargs.get('decision_context', {})
-                if not decision_context:
-                    return {"error": "No decision context provided", "phase": 5}
-                
-                decision_result = phase5_ai.make_ai_decision(decision_context)
-                return {
-                    "success": True,
-                    "phase": 5,
-                    "system": "AI Integration Engine",
-                    "action": "ai_decision",
-                    "result": decision_result,
-                    "message": "AI decision made successfully"
-                }
+            learning_result = personalization.learn_from_development_session(session_data)
+            return {
+                "success": True,
+                "phase": 3,
+                "system": "Personalization Engine",
+                "action": "learn_patterns",
+                "result": learning_result,
+                "message": "Personalization learning completed successfully"
+            }
+        
+        elif type == 'get_suggestions':
+            # Get context suggestions
+            if not context_data:
+                return {"error": "No context data provided for suggestions", "phase": 3}
             
-            else:
-                return {"error": f"Unknown AI integration type: {integration_type}", "phase": 5}
-                
-        except Exception as e:
-            return {"error": f"AI integration failed: {str(e)}", "phase": 5}
+            suggestions = personalization.get_context_suggestions(context_data)
+            return {
+                "success": True,
+                "phase": 3,
+                "system": "Personalization Engine",
+                "action": "get_suggestions",
+                "result": suggestions,
+                "message": "Context suggestions generated successfully"
+            }
+        
+        else:
+            return {"error": f"Unknown personalization type: {type}", "phase": 3}
     
-    else:
-        return {"error": f"Unknown action: {action}. Available actions: think_deeply, reflect_enhanced, understand_deeply, code_analyze, debug_intelligently, refactor_safely, ai_integrate"}
+    except Exception as e:
+        return {"error": f"Personalization failed: {str(e)}", "phase": 3}
 
-# ===== DOMAIN 4: LEARNING & ADAPTATION =====
 @mcp.tool()
 @log_mcp_tool
 def learning_and_adaptation(
@@ -1877,81 +1823,19 @@ def learning_and_adaptation(
     - workflow_performance_analysis: Analyze workflow performance
     - batch_workflow_processing: Batch process workflows
     """
-    if action == "learn_from":
-        # This would call the actual learn_from function
-        return {"message": "learn_from functionality available"}
-    
-    elif action == "continuous_learning_cycle":
-        # This would call the actual continuous_learning_cycle function
-        return {"message": "continuous_learning_cycle functionality available"}
-    
-    elif action == "enhanced_workflow_execution":
-        # This would call the actual enhanced_workflow_execution function
-        return {"message": "enhanced_workflow_execution functionality available"}
-    
-    elif action == "workflow_optimization":
-        # This would call the actual workflow_optimization function
-        return {"message": "workflow_optimization functionality available"}
-    
-    elif action == "workflow_performance_analysis":
-        # This would call the actual workflow_performance_analysis function
-        return {"message": "workflow_performance_analysis functionality available"}
-    
-    elif action == "batch_workflow_processing":
-        # This would call the actual batch_workflow_processing function
-        return {"message": "batch_workflow_processing functionality available"}
-    
-    # 🚀 PHASE 3 INTEGRATION: PERSONALIZATION ENGINE
-    elif action == "personalization":
-        """Phase 3: Personalization & Behavior Injection"""
-        if phase3_personalization is None:
-            return {"error": "Personalization Engine not available", "phase": 3}
-        
-        try:
-            personalization_type = kwargs.get('type', 'learn_patterns')
-            
-            if personalization_type == 'learn_patterns':
-                # Learn from development session
-                session_data = kwargs.get('session_data', {})
-                if not session_data:
-                    return {"error": "No session data provided for learning", "phase": 3}
-                
-                learning_result = phase3_personalization.learn_from_development_session(session_data)
-                return {
-                    "success": True,
-                    "phase": 3,
-                    "system": "Personalization Engine",
-                    "action": "learn_patterns",
-                    "result": learning_result,
-                    "message": "Personalization learning completed successfully"
-                }
-            
-            elif personalization_type == 'get_suggestions':
-                # Get context suggestions
-                context_data = kwargs.get('context_data', {})
-                if not context_data:
-                    return {"error": "No context data provided for suggestions", "phase": 3}
-                
-                suggestions = phase3_personalization.get_context_suggestions(context_data)
-                return {
-                    "success": True,
-                    "phase": 3,
-                    "system": "Personalization Engine",
-                    "action": "get_suggestions",
-                    "result": suggestions,
-                    "message": "Context suggestions generated successfully"
-                }
-            
-            else:
-                return {"error": f"Unknown personalization type: {personalization_type}", "phase": 3}
-        
-        except Exception as e:
-            return {"error": f"Personalization failed: {str(e)}", "phase": 3}
-
-    else:
-        return {"error": f"Unknown action: {action}. Available actions: learn_from, continuous_learning_cycle, enhanced_workflow_execution, workflow_optimization, workflow_performance_analysis, batch_workflow_processing, personalization"}
+    return learning_actions.dispatch(action, content, context, **kwargs)
 
 # ===== DOMAIN 5: OUTPUT & ACTION =====
+output_actions = get_dispatcher("output_and_action")
+
+_register_placeholders(output_actions, "generate_memory_enhanced_response", "orchestrate_tools",
+                       "tool_performance_analysis", "context_quality_assessment", "workflow_health_check",
+                       "enhanced_context_workflow")
+
+# 🚀 PHASE 4 INTEGRATION: CONTEXT ORCHESTRATOR
+output_actions.register("orchestrate_context", _context_orchestration, CONTEXT_ORCHESTRATION_PARAMS,
+                        "Phase 4: Context Orchestrator")
+
 @mcp.tool()
 @log_mcp_tool
 def output_and_action(
@@ -1971,56 +1855,34 @@ def output_and_action(
     - workflow_health_check: Check workflow health
     - enhanced_context_workflow: Execute enhanced context workflow
     """
-    if action == "generate_memory_enhanced_response":
-        # This would call the actual generate_memory_enhanced_response function
-        return {"message": "generate_memory_enhanced_response functionality available"}
-    
-    elif action == "orchestrate_tools":
-        # This would call the actual orchestrate_tools function
-        return {"message": "orchestrate_tools functionality available"}
-    
-    elif action == "tool_performance_analysis":
-        # This would call the actual tool_performance_analysis function
-        return {"message": "tool_performance_analysis functionality available"}
-    
-    elif action == "context_quality_assessment":
-        # This would call the actual context_quality_assessment function
-        return {"message": "context_quality_assessment functionality available"}
-    
-    elif action == "workflow_health_check":
-        # This would call the actual workflow_health_check function
-        return {"message": "workflow_health_check functionality available"}
-    
-    elif action == "enhanced_context_workflow":
-        # This would call the actual enhanced_context_workflow function
-        return {"message": "enhanced_context_workflow functionality available"}
-    
-    # 🚀 PHASE 4 INTEGRATION: CONTEXT ORCHESTRATOR
-    elif action == "orchestrate_context":
-        """Phase 4: Context Orchestrator"""
-        if phase4_orchestrator is None:
-            return {"error": "Context Orchestrator not available", "phase": 4}
-        
-        try:
-            context_request = kwargs.get('context_request', {})
-            if not context_request:
-                return {"error": "No context request provided", "phase": 4}
-            
-            orchestration_result = phase4_orchestrator.orchestrate_context(context_request)
-            return {
-                "success": True,
-                "phase": 4,
-                "system": "Context Orchestrator",
-                "result": orchestration_result,
-                "message": "Context orchestration completed successfully"
-            }
-        except Exception as e:
-            return {"error": f"Context orchestration failed: {str(e)}", "phase": 4}
-    
-    else:
-        return {"error": f"Unknown action: {action}. Available actions: generate_memory_enhanced_response, orchestrate_tools, tool_performance_analysis, context_quality_assessment, workflow_health_check, enhanced_context_workflow, orchestrate_context"}
+    return output_actions.dispatch(action, content, context, **kwargs)
 
 # ===== DOMAIN 6: SELF-MONITORING =====
+monitoring_actions = get_dispatcher("self_monitoring")
+
+_register_placeholders(monitoring_actions, "consciousness_check", "memory_stats", "dream",
+                       "initialize_chat_session", "track_cursor_conversation", "cursor_auto_inject_context")
+
+@monitoring_actions.action("action_latency",
+                           params={"tool": (str, None), "budget_ms": ((int, float), ACTION_LATENCY_BUDGET_MS)},
+                           description="Per-action latency percentiles of the consolidated tools")
+def _action_latency(tool: Optional[str], budget_ms: float) -> dict:
+    """Latency histograms of every consolidated tool action, with the actions over budget"""
+    report = get_action_latency_report(tool, budget_ms)
+    if tool is not None and tool not in report["tools"]:
+        report["message"] = f"No calls recorded for tool '{tool}'"
+    return report
+
+@monitoring_actions.action("describe_actions", params={"tool": (str, None)},
+                           description="Declared parameters of every consolidated tool action")
+def _describe_actions(tool: Optional[str]) -> dict:
+    dispatchers = [perception_actions, memory_actions, processing_actions,
+                   learning_actions, output_actions, monitoring_actions]
+    return {
+        dispatcher.tool_name: {action: dispatcher.describe(action) for action in dispatcher.actions}
+        for dispatcher in dispatchers if tool in (None, dispatcher.tool_name)
+    }
+
 @mcp.tool()
 @log_mcp_tool
 def self_monitoring(
@@ -2039,33 +1901,10 @@ def self_monitoring(
     - initialize_chat_session: Initialize chat sessions
     - track_cursor_conversation: Track Cursor conversations
     - cursor_auto_inject_context: Auto-inject context
+    - action_latency: p50/p95/p99 per tool and action (optional tool, budget_ms)
+    - describe_actions: Parameter schemas of the consolidated tool actions (optional tool)
     """
-    if action == "consciousness_check":
-        # This would call the actual consciousness_check function
-        return {"message": "consciousness_check functionality available"}
-    
-    elif action == "memory_stats":
-        # This would call the actual memory_stats function
-        return {"message": "memory_stats functionality available"}
-    
-    elif action == "dream":
-        # This would call the actual dream function
-        return {"message": "dream functionality available"}
-    
-    elif action == "initialize_chat_session":
-        # This would call the actual initialize_chat_session function
-        return {"message": "initialize_chat_session functionality available"}
-    
-    elif action == "track_cursor_conversation":
-        # This would call the actual track_cursor_conversation function
-        return {"message": "track_cursor_conversation functionality available"}
-    
-    elif action == "cursor_auto_inject_context":
-        # This would call the actual cursor_auto_inject_context function
-        return {"message": "cursor_auto_inject_context functionality available"}
-    
-    else:
-        return {"error": f"Unknown action: {action}. Available actions: consciousness_check, memory_stats, dream, initialize_chat_session, track_cursor_conversation, cursor_auto_inject_context"}
+    return monitoring_actions.dispatch(action, content, context, **kwargs)
 
 # Add this new tool after the existing consolidated tools
 @mcp.tool()
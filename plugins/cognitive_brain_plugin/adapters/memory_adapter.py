@@ -1,5 +1,7 @@
+import atexit
 import json
 import os
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -85,6 +87,19 @@ class JsonFileStorageAdapter(MemoryStorageAdapter):
         with open(self.memories_file, 'w') as f:
             json.dump(data, f, indent=2, default=str)
     
+    # Persistence hooks for memory mutations; this adapter rewrites the whole file each time
+    def _record_put(self, chunk: MemoryChunk):
+        """Persist a stored or replaced memory chunk"""
+        self._save_memories()
+    
+    def _record_access(self, chunks: List[MemoryChunk]):
+        """Persist updated access statistics"""
+        self._save_memories()
+    
+    def _record_delete(self, chunk_ids: List[str]):
+        """Persist removed memory chunks"""
+        self._save_memories()
+    
     def _load_tasks(self):
         """Load tasks from storage"""
         if self.tasks_file.exists():
@@ -174,7 +189,7 @@ class JsonFileStorageAdapter(MemoryStorageAdapter):
             chunk.id = f"mem_{content_hash[:8]}_{int(datetime.now().timestamp())}"
         
         self._memory_cache[chunk.id] = chunk
-        self._save_memories()
+        self._record_put(chunk)
         return chunk.id
     
     def retrieve_memory_chunk(self, chunk_id: str) -> Optional[MemoryChunk]:
@@ -182,7 +197,7 @@ class JsonFileStorageAdapter(MemoryStorageAdapter):
         chunk = self._memory_cache.get(chunk_id)
         if chunk:
             chunk.update_access()
-            self._save_memories()
+            self._record_access([chunk])
         return chunk
     
     def search_memories(self, query: str, limit: int = 10) -> List[MemoryChunk]:
@@ -224,7 +239,7 @@ class JsonFileStorageAdapter(MemoryStorageAdapter):
             chunk.update_access()
         
         if result:
-            self._save_memories()
+            self._record_access(result)
         
         return result
     
@@ -308,7 +323,7 @@ class JsonFileStorageAdapter(MemoryStorageAdapter):
             del self._memory_cache[chunk_id]
         
         if to_remove:
-            self._save_memories()
+            self._record_delete(to_remove)
         
         return len(to_remove)
     
@@ -331,4 +346,207 @@ class JsonFileStorageAdapter(MemoryStorageAdapter):
                 'tags': filter_tags,
                 'emotional_weight': filter_weight.value if filter_weight else None
             }
-        }
\ No newline at end of file
+        }
+
+class JournaledStorageAdapter(JsonFileStorageAdapter):
+    """
+    Append-only journaled variant of the JSON file adapter.
+    
+    Memory mutations are appended as JSON lines to ``memories.journal`` instead
+    of rewriting ``memories.json``, so a write costs O(delta) rather than
+    O(total memories). The journal is periodically compacted into the
+    ``memories.json`` snapshot (same format as JsonFileStorageAdapter, so the
+    two adapters can be swapped freely).
+    
+    Access-count updates from retrieval and search are coalesced in memory and
+    flushed lazily, once ``access_flush_batch`` chunks are pending or
+    ``access_flush_interval`` seconds have passed, and at interpreter exit.
+    
+    Crash recovery: on load the snapshot is read and the journal replayed on
+    top of it. Every record carries a sequence number and the snapshot stores
+    the last sequence it contains, so records are never applied twice; a torn
+    trailing line from an interrupted append is discarded.
+    """
+    
+    def __init__(self, storage_dir: str = "brain_memory_store", compact_every: int = 1000,
+                 access_flush_batch: int = 64, access_flush_interval: float = 5.0,
+                 fsync: bool = False):
+        self.journal_file = Path(storage_dir) / "memories.journal"
+        self.compact_every = compact_every
+        self.access_flush_batch = access_flush_batch
+        self.access_flush_interval = access_flush_interval
+        self.fsync = fsync
+        
+        self._seq = 0
+        self._journal_records = 0
+        self._pending_access: Dict[str, MemoryChunk] = {}
+        self._last_access_flush = time.monotonic()
+        self._journal_handle = None
+        self.stats = {"appends": 0, "access_flushes": 0, "compactions": 0, "recovered_records": 0}
+        
+        super().__init__(storage_dir)
+        atexit.register(self.close)
+    
+    # Loading and recovery
+    def _load_memories(self):
+        """Load the snapshot, then replay journal records newer than it"""
+        snapshot_seq = 0
+        if self.memories_file.exists():
+            try:
+                with open(self.memories_file, 'r') as f:
+                    data = json.load(f)
+                for chunk_data in data.get('memories', []):
+                    chunk = MemoryChunk(**chunk_data)
+                    self._memory_cache[chunk.id] = chunk
+                snapshot_seq = data.get('journal_seq', 0)
+            except (json.JSONDecodeError, Exception) as e:
+                print(f"Warning: Could not load memories: {e}")
+        self._seq = snapshot_seq
+        self._replay_journal(snapshot_seq)
+    
+    def _replay_journal(self, snapshot_seq: int):
+        """Apply journal records after ``snapshot_seq``; truncate a torn tail"""
+        if not self.journal_file.exists():
+            return
+        
+        good_offset = 0
+        with open(self.journal_file, 'rb') as f:
+            for raw_line in f:
+                try:
+                    record = json.loads(raw_line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break  # Interrupted append: everything after this point is unreliable
+                if not raw_line.endswith(b"\n"):
+                    break
+                good_offset += len(raw_line)
+                self._journal_records += 1
+                if record.get('seq', 0) <= snapshot_seq:
+                    continue
+                self._apply_record(record)
+                self._seq = max(self._seq, record['seq'])
+                self.stats["recovered_records"] += 1
+        
+        if good_offset < self.journal_file.stat().st_size:
+            print(f"Warning: Discarding torn tail of {self.journal_file}")
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(good_offset)
+    
+    def _apply_record(self, record: Dict[str, Any]):
+        """Apply one journal record to the in-memory cache"""
+        op = record.get('op')
+        if op == 'put':
+            chunk = MemoryChunk(**record['chunk'])
+            self._memory_cache[chunk.id] = chunk
+        elif op == 'access':
+            for chunk_id, (count, last_accessed) in record['chunks'].items():
+                chunk = self._memory_cache.get(chunk_id)
+                if chunk:
+                    chunk.access_count = count
+                    chunk.last_accessed = datetime.fromisoformat(last_accessed)
+        elif op == 'delete':
+            for chunk_id in record['ids']:
+                self._memory_cache.pop(chunk_id, None)
+    
+    # Journal writes
+    def _append(self, op: str, **payload):
+        """Append one record to the journal and compact if it has grown too long"""
+        self._seq += 1
+        record = {'seq': self._seq, 'op': op, **payload}
+        if self._journal_handle is None:
+            self._journal_handle = open(self.journal_file, 'a', encoding='utf-8')
+        self._journal_handle.write(json.dumps(record, default=str) + "\n")
+        self._journal_handle.flush()
+        if self.fsync:
+            os.fsync(self._journal_handle.fileno())
+        self._journal_records += 1
+        self.stats["appends"] += 1
+        
+        if self._journal_records >= self.compact_every:
+            self.compact()
+    
+    def _record_put(self, chunk: MemoryChunk):
+        """Journal the full chunk; any pending access update for it is now superseded"""
+        self._pending_access.pop(chunk.id, None)
+        self._append('put', chunk=chunk.dict())
+        self._maybe_flush_access()
+    
+    def _record_access(self, chunks: List[MemoryChunk]):
+        """Coalesce access updates in memory until the next lazy flush"""
+        for chunk in chunks:
+            self._pending_access[chunk.id] = chunk
+        self._maybe_flush_access()
+    
+    def _record_delete(self, chunk_ids: List[str]):
+        """Journal removed chunk ids"""
+        for chunk_id in chunk_ids:
+            self._pending_access.pop(chunk_id, None)
+        self._append('delete', ids=list(chunk_ids))
+    
+    def _maybe_flush_access(self):
+        if not self._pending_access:
+            return
+        if (len(self._pending_access) >= self.access_flush_batch or
+                time.monotonic() - self._last_access_flush >= self.access_flush_interval):
+            self.flush_access_updates()
+    
+    def flush_access_updates(self):
+        """Write all coalesced access-count updates as a single journal record"""
+        self._last_access_flush = time.monotonic()
+        if not self._pending_access:
+            return
+        pending, self._pending_access = self._pending_access, {}
+        self.stats["access_flushes"] += 1
+        self._append('access', chunks={
+            chunk_id: [chunk.access_count, chunk.last_accessed.isoformat()]
+            for chunk_id, chunk in pending.items()
+        })
+    
+    # Compaction
+    def _save_memories(self):
+        """Full saves go through compaction so the snapshot and journal stay consistent"""
+        self.compact()
+    
+    def compact(self):
+        """Write a fresh snapshot atomically and truncate the journal"""
+        # Pending access counts are already in the cache, so the snapshot captures them
+        self._pending_access.clear()
+        data = {
+            'memories': [chunk.dict() for chunk in self._memory_cache.values()],
+            'journal_seq': self._seq,
+            'last_updated': datetime.now().isoformat()
+        }
+        tmp_file = self.memories_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.memories_file)
+        
+        # Records up to journal_seq are now in the snapshot; a crash before this
+        # truncation is harmless because replay skips them
+        if self._journal_handle is not None:
+            self._journal_handle.close()
+            self._journal_handle = None
+        with open(self.journal_file, 'w'):
+            pass
+        self._journal_records = 0
+        self.stats["compactions"] += 1
+    
+    def close(self):
+        """Flush pending access updates and release the journal file handle"""
+        if self._journal_handle is None and not self._pending_access:
+            return
+        self.flush_access_updates()
+        if self._journal_handle is not None:
+            self._journal_handle.close()
+            self._journal_handle = None
+    
+    def get_journal_stats(self) -> Dict[str, Any]:
+        """Get journal size and write counters"""
+        return {
+            **self.stats,
+            "journal_records": self._journal_records,
+            "journal_bytes": self.journal_file.stat().st_size if self.journal_file.exists() else 0,
+            "pending_access_updates": len(self._pending_access),
+            "sequence": self._seq
+        }
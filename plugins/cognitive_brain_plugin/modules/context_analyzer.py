@@ -3,6 +3,8 @@ from typing import Dict, Any, List, Optional, Tuple
 import re
 import json
 
+from utils.pattern_classifier import PatternClassifier
+
 from ..core.brain_core import BrainModule
 from ..schemas.memory_schema import (
     BrainState, MemoryChunk, TaskContext, ContextType, EmotionalWeight
@@ -81,6 +83,14 @@ class ContextAnalyzer(BrainModule):
             'meta_level': ['meta', 'self-referential', 'recursive', 'reflective']
         }
         
+        # Context, emotional and subtlety patterns scored in one pass over the content
+        self.classifier = PatternClassifier({
+            'context': {name: patterns for name, patterns in self.context_patterns.items()
+                        if name != 'emotional_context'},
+            'emotional_context': self.context_patterns['emotional_context'],
+            'subtlety': self.subtlety_patterns
+        })
+        
         # Learning and adaptation
         self.context_history: List[Dict[str, Any]] = []
         self.pattern_confidence: Dict[str, float] = {}
@@ -196,12 +206,13 @@ class ContextAnalyzer(BrainModule):
     
     def _analyze_emotional_context(self, content: str) -> Dict[str, Any]:
         """Analyze emotional context and tone"""
+        scan = self.classifier.scan(content)
         emotional_indicators = {}
         
-        for emotion_type, patterns in self.context_patterns['emotional_context'].items():
-            matches = [pattern for pattern in patterns if re.search(pattern, content.lower())]
+        for emotion_type in self.context_patterns['emotional_context']:
+            matches = scan.pattern_hits('emotional_context', emotion_type)
             if matches:
-                emotional_indicators[emotion_type] = len(matches)
+                emotional_indicators[emotion_type] = matches
         
         # Calculate emotional intensity
         total_emotional_indicators = sum(emotional_indicators.values())
@@ -215,22 +226,17 @@ class ContextAnalyzer(BrainModule):
     
     def _assess_complexity_level(self, content: str) -> Dict[str, Any]:
         """Assess the complexity level of the request"""
+        scan = self.classifier.scan(content)
         complexity_score = 0.0
         
         # Check for complexity indicators
-        for pattern in self.context_patterns['complexity_indicators']:
-            if re.search(pattern, content.lower()):
-                complexity_score += 0.2
+        complexity_score += 0.2 * scan.pattern_hits('context', 'complexity_indicators')
         
         # Check for uncertainty markers
-        for pattern in self.context_patterns['uncertainty_markers']:
-            if re.search(pattern, content.lower()):
-                complexity_score += 0.15
+        complexity_score += 0.15 * scan.pattern_hits('context', 'uncertainty_markers')
         
         # Check for indirect language
-        for pattern in self.subtlety_patterns['indirect_requests']:
-            if re.search(pattern, content.lower()):
-                complexity_score += 0.1
+        complexity_score += 0.1 * scan.pattern_hits('subtlety', 'indirect_requests')
         
         # Normalize to 0-1 range
         complexity_score = min(1.0, complexity_score)
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
-import re
+
+from utils.pattern_classifier import PatternClassifier
 
 from ..core.brain_core import BrainModule
 from ..schemas.memory_schema import (
@@ -55,6 +56,18 @@ class EmotionTagger(BrainModule):
             'resource': [r'\b(money|cost|budget|time|effort|resource)\b']
         }
         
+        self.urgency_patterns = [
+            r'\b(urgent|asap|immediately|now|quick|fast|soon|deadline)\b',
+            r'\b(emergency|critical|rush|hurry)\b'
+        ]
+        
+        # Emotion, importance and urgency scoring share one pass over the content
+        self.classifier = PatternClassifier({
+            'emotion': self.emotion_patterns,
+            'importance': self.importance_indicators,
+            'urgency': {'urgency': self.urgency_patterns}
+        })
+        
         # Emotional baseline and learning
         self.emotional_baseline = 0.5
         self.emotion_history: List[Dict[str, Any]] = []
@@ -365,16 +378,12 @@ class EmotionTagger(BrainModule):
     # Helper methods for emotional pattern detection
     def _detect_emotional_patterns(self, content: str) -> Dict[EmotionalWeight, float]:
         """Detect emotional patterns in content"""
-        content_lower = content.lower()
+        scan = self.classifier.scan(content)
         emotion_scores = {}
         
-        for emotion, patterns in self.emotion_patterns.items():
-            score = 0.0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, content_lower))
-                score += matches * 0.2  # Each match adds 0.2 to score
-            
-            emotion_scores[emotion] = min(1.0, score)
+        for emotion in self.emotion_patterns:
+            # Each match adds 0.2 to score
+            emotion_scores[emotion] = min(1.0, scan.match_count('emotion', emotion) * 0.2)
         
         return emotion_scores
     
@@ -393,23 +402,22 @@ class EmotionTagger(BrainModule):
     
     def _calculate_importance_score(self, content: str) -> float:
         """Calculate importance score based on content analysis"""
-        content_lower = content.lower()
+        scan = self.classifier.scan(content)
         importance_score = 0.3  # Base score
         
-        for category, patterns in self.importance_indicators.items():
-            for pattern in patterns:
-                matches = len(re.findall(pattern, content_lower))
-                if matches > 0:
-                    if category == 'time_pressure':
-                        importance_score += 0.3
-                    elif category == 'magnitude':
-                        importance_score += 0.2
-                    elif category == 'consequence':
-                        importance_score += 0.25
-                    elif category == 'stakeholder':
-                        importance_score += 0.15
-                    elif category == 'resource':
-                        importance_score += 0.1
+        for category in self.importance_indicators:
+            # Every indicator pattern that matched adds its category's weight
+            hits = scan.pattern_hits('importance', category)
+            if category == 'time_pressure':
+                importance_score += 0.3 * hits
+            elif category == 'magnitude':
+                importance_score += 0.2 * hits
+            elif category == 'consequence':
+                importance_score += 0.25 * hits
+            elif category == 'stakeholder':
+                importance_score += 0.15 * hits
+            elif category == 'resource':
+                importance_score += 0.1 * hits
         
         # Length factor (longer content might be more important)
         length_factor = min(0.2, len(content) / 1000)
@@ -419,17 +427,8 @@ class EmotionTagger(BrainModule):
     
     def _calculate_urgency_score(self, content: str) -> float:
         """Calculate urgency score"""
-        urgency_words = [
-            r'\b(urgent|asap|immediately|now|quick|fast|soon|deadline)\b',
-            r'\b(emergency|critical|rush|hurry)\b'
-        ]
-        
-        content_lower = content.lower()
         urgency_score = 0.2
-        
-        for pattern in urgency_words:
-            matches = len(re.findall(pattern, content_lower))
-            urgency_score += matches * 0.3
+        urgency_score += self.classifier.scan(content).match_count('urgency', 'urgency') * 0.3
         
         return min(1.0, urgency_score)
     
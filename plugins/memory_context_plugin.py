@@ -12,6 +12,12 @@ sys.path.insert(0, os.path.join(parent_dir, 'src'))
 
 from plugin_interface import BasePlugin, PluginMetadata, ToolDefinition, ResourceDefinition
 
+try:
+    from core.memory.database.storage_adapter import get_storage_router
+except ImportError:
+    # Without the database package the memory file is a plain JSON file
+    get_storage_router = None
+
 
 class MemoryContextPlugin(BasePlugin):
     def __init__(self):
@@ -19,6 +25,8 @@ class MemoryContextPlugin(BasePlugin):
         self.memory_store = {}
         self.context_history = []
         self.memory_file = Path("memory_store.json")
+        # memory_store.json is routed to the brain database when available
+        self.storage = get_storage_router() if get_storage_router else None
     
     @property
     def metadata(self) -> PluginMetadata:
@@ -201,7 +209,11 @@ class MemoryContextPlugin(BasePlugin):
     def load_memory(self):
         """Load memory from persistent storage"""
         try:
-            if self.memory_file.exists():
+            if self.storage:
+                data = self.storage.load(self.memory_file, default={})
+                self.memory_store = data.get("memory_store", {})
+                self.context_history = data.get("context_history", [])
+            elif self.memory_file.exists():
                 with open(self.memory_file, 'r') as f:
                     data = json.load(f)
                     self.memory_store = data.get("memory_store", {})
@@ -219,7 +231,10 @@ class MemoryContextPlugin(BasePlugin):
                 "context_history": self.context_history,
                 "last_updated": datetime.now().isoformat()
             }
-            with open(self.memory_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if self.storage:
+                self.storage.dump(data, self.memory_file, indent=2)
+            else:
+                with open(self.memory_file, 'w') as f:
+                    json.dump(data, f, indent=2)
         except Exception as e:
             print(f"Warning: Could not save memory file: {e}")
\ No newline at end of file
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Backfill SimHash fingerprints for the learning bits of an existing crawler database.
+Fingerprints rows stored before near-duplicate detection existed and clusters their
+near duplicates (the oldest copy is kept as the canonical bit).
+
+Usage:
+    python scripts/backfill_simhash.py [--db brain_memory_store/brain.db] [--distance 6] [--prune]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.engine.content_fingerprint import (
+    DEFAULT_MAX_DISTANCE, backfill_fingerprints, dedup_statistics
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint and cluster near-duplicate learning bits")
+    parser.add_argument("--db", default=os.getenv("BRAIN_DB_PATH", "brain_memory_store/brain.db"),
+                        help="Path to the crawler database")
+    parser.add_argument("--distance", type=int, default=DEFAULT_MAX_DISTANCE,
+                        help="Maximum SimHash bit distance treated as a near duplicate")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete clustered duplicates and move their references to the canonical bit")
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"❌ Database not found: {args.db}")
+        return 1
+
+    print(f"🧬 Fingerprinting learning bits in {args.db}...")
+    start = time.perf_counter()
+    with sqlite3.connect(args.db) as conn:
+        stats = backfill_fingerprints(conn, max_distance=args.distance, prune=args.prune)
+        total_bits = conn.execute("SELECT COUNT(*) FROM learning_bits").fetchone()[0]
+        dedup = dedup_statistics(conn.cursor(), total_bits)
+
+    print(f"   ✅ {stats['scanned']} bits scanned, {stats['fingerprinted']} fingerprinted")
+    print(f"   🔗 {stats['clustered']} near duplicates clustered, {stats['pruned']} pruned")
+    print(f"   📉 Dedup ratio: {dedup['dedup_ratio']:.2%}")
+    print(f"✅ Done in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Brain Database Connection Benchmark
+Compares ops/sec of the legacy connect-per-call mode against the pooled WAL mode
+for a mixed read/write workload, single-threaded and multi-threaded.
+
+Usage:
+    python scripts/benchmark_brain_db.py [--ops 2000] [--threads 4] [--write-ratio 0.3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory.database.brain_db import BrainDatabase
+
+# The legacy configuration: a fresh connection per call, rollback journal, synchronous=FULL
+LEGACY_CONFIG = {
+    "pool_size": 0,
+    "journal_mode": None,
+    "synchronous": None,
+    "cache_size_kib": None,
+    "mmap_size": None,
+    "cached_statements": 128,
+}
+
+POOLED_CONFIG = {
+    "pool_size": 8,
+}
+
+WORDS = ["memory", "context", "python", "sqlite", "learning", "pattern", "brain",
+         "crawler", "vector", "cache", "journal", "insight", "relationship", "dream"]
+
+
+def _random_text(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _run_workload(db: BrainDatabase, ops: int, write_ratio: float, seed: int):
+    """Mixed workload: writes to memory_store/memory_chunks, reads via search and get"""
+    rng = random.Random(seed)
+    for i in range(ops):
+        roll = rng.random()
+        if roll < write_ratio / 2:
+            db.set_memory_item(f"key_{seed}_{i}", _random_text(rng), tags=["bench"])
+        elif roll < write_ratio:
+            db.store_memory_chunk(f"chunk_{seed}_{i}", _random_text(rng), context_type="bench")
+        elif roll < write_ratio + (1 - write_ratio) / 2:
+            db.search_memory_store(rng.choice(WORDS), limit=5)
+        else:
+            db.get_brain_state()
+
+
+def _bench(label: str, config: dict, ops: int, threads: int, write_ratio: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = BrainDatabase(os.path.join(tmp, "bench.db"), **config)
+        # Seed some rows so reads do real work
+        for i in range(500):
+            db.set_memory_item(f"seed_{i}", _random_text(random.Random(i)), tags=["seed"])
+
+        results = {}
+        for thread_count in sorted({1, threads}):
+            per_thread = max(1, ops // thread_count)
+            workers = [
+                threading.Thread(target=_run_workload, args=(db, per_thread, write_ratio, seed))
+                for seed in range(thread_count)
+            ]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            results[thread_count] = (per_thread * thread_count) / elapsed
+
+        db.close()
+
+    for thread_count, ops_per_sec in results.items():
+        print(f"  {label:<8} threads={thread_count:<2} {ops_per_sec:>10.0f} ops/sec")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BrainDatabase connection modes")
+    parser.add_argument("--ops", type=int, default=2000, help="Total operations per run")
+    parser.add_argument("--threads", type=int, default=4, help="Thread count for the concurrent run")
+    parser.add_argument("--write-ratio", type=float, default=0.3, help="Fraction of operations that write")
+    args = parser.parse_args()
+
+    print(f"🗄️ BrainDatabase benchmark: {args.ops} ops, write ratio {args.write_ratio:.0%}")
+    legacy = _bench("legacy", LEGACY_CONFIG, args.ops, args.threads, args.write_ratio)
+    pooled = _bench("pooled", POOLED_CONFIG, args.ops, args.threads, args.write_ratio)
+
+    print("📊 Speedup (pooled / legacy):")
+    for thread_count in legacy:
+        print(f"  threads={thread_count:<2} {pooled[thread_count] / legacy[thread_count]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Content Classifier Micro-Benchmark
+Compares the legacy per-pattern re.search/re.findall loops of ContentAnalyzer,
+EmotionTagger and ContextAnalyzer against the single-pass PatternClassifier on a
+corpus of learning-bit text, and checks that both produce identical counts.
+
+The corpus is read from the learning_bits table of a crawler database (--db);
+without one, the project's docs/*.md are split into learning-bit sized chunks.
+
+Usage:
+    python scripts/benchmark_content_classifier.py [--db web_crawler.db] [--limit 2000] [--repeat 3]
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.pattern_classifier import PatternClassifier
+from web_crawler.engine.web_crawler_engine import ContentAnalyzer
+from plugins.cognitive_brain_plugin.modules.emotion_tagger import EmotionTagger
+from plugins.cognitive_brain_plugin.modules.context_analyzer import ContextAnalyzer
+
+DOCS_DIR = Path(__file__).parent.parent / "docs"
+
+
+def load_corpus(db_path, limit: int, chunk_size: int = 800):
+    """Learning-bit texts from a crawler database, or doc chunks as a stand-in"""
+    if db_path:
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute("SELECT content FROM learning_bits WHERE content != '' LIMIT ?",
+                                (limit,)).fetchall()
+        return [row[0] for row in rows], f"{db_path} learning_bits"
+
+    chunks = []
+    for doc in sorted(DOCS_DIR.glob("*.md")):
+        text = doc.read_text(errors="ignore")
+        for paragraph in re.split(r"\n\s*\n", text):
+            paragraph = paragraph.strip()
+            if len(paragraph) >= 100:
+                chunks.append(paragraph[:chunk_size])
+    return chunks[:limit], f"{DOCS_DIR} paragraphs"
+
+
+def pattern_families():
+    """Every pattern family used by the three classifying components"""
+    content = ContentAnalyzer()
+    emotion = EmotionTagger(None)
+    context = ContextAnalyzer(None)
+    return {
+        'content_type': content.content_patterns,
+        'category': content.category_patterns,
+        'subcategory': content.subcategory_patterns,
+        'complexity': content.complexity_patterns,
+        'emotion': emotion.emotion_patterns,
+        'importance': emotion.importance_indicators,
+        'urgency': {'urgency': emotion.urgency_patterns},
+        'context': {name: patterns for name, patterns in context.context_patterns.items()
+                    if name != 'emotional_context'},
+        'emotional_context': context.context_patterns['emotional_context'],
+        'subtlety': context.subtlety_patterns,
+    }
+
+
+def legacy_counts(families, text: str):
+    """The old approach: lowercase per call and run every pattern on its own"""
+    counts = []
+    for labels in families.values():
+        for patterns in labels.values():
+            for pattern in patterns:
+                counts.append(len(re.findall(pattern, text.lower(), re.IGNORECASE)))
+    return counts
+
+
+def compiled_counts(classifier: PatternClassifier, families, text: str):
+    scan = classifier.scan(text)
+    counts = []
+    for family, labels in families.items():
+        for label in labels:
+            counts.extend(scan.pattern_counts(family, label))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass content classifier")
+    parser.add_argument("--db", help="Crawler database with a learning_bits table")
+    parser.add_argument("--limit", type=int, default=2000, help="Maximum number of texts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the corpus")
+    args = parser.parse_args()
+
+    corpus, source = load_corpus(args.db, args.limit)
+    if not corpus:
+        print("❌ Empty corpus")
+        return 1
+
+    families = pattern_families()
+    # No memoization: every text is scanned in full on every pass
+    classifier = PatternClassifier(families, cache_size=0)
+
+    mismatches = sum(1 for text in corpus
+                     if legacy_counts(families, text) != compiled_counts(classifier, families, text))
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in corpus:
+            legacy_counts(families, text)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in corpus:
+            classifier.scan(text)
+    compiled_time = time.perf_counter() - start
+
+    stats = classifier.get_stats()
+    scans = len(corpus) * args.repeat
+    print(f"📚 {len(corpus)} texts from {source}, {args.repeat} passes")
+    print(f"   {stats['patterns']} patterns -> {stats['keywords']} keywords in one scan, "
+          f"{stats['irregular_patterns']} irregular patterns run separately")
+    print(f"   Legacy per-pattern loops: {legacy_time:.3f}s ({legacy_time / scans * 1e6:.0f}µs/text)")
+    print(f"   Single-pass classifier:   {compiled_time:.3f}s ({compiled_time / scans * 1e6:.0f}µs/text)")
+    print(f"   Count mismatches: {mismatches}")
+    print(f"✅ Speedup: {legacy_time / compiled_time:.1f}x")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
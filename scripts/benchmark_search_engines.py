@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Multi-Engine Search Benchmark
+Runs a local loopback search server with artificial per-engine latency and compares
+the legacy path (engines awaited one after another, a new HTTP session per query)
+against concurrent fan-out with pooled sessions and the SQLite result cache.
+
+Usage:
+    python scripts/benchmark_search_engines.py [--engines 2] [--queries 20] [--latency 0.1] [--repeat 0.5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.search.search_engine_integration import (
+    LoopbackSearchAPI, SearchEngineConfig, SearchEngineIntegration
+)
+
+WORDS = ["python", "asyncio", "sqlite", "crawler", "memory", "context", "pattern", "cache"]
+
+
+async def _start_server(latency: float) -> web.AppRunner:
+    """Loopback server answering in the Bing response format after a fixed delay"""
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        engine = request.match_info['engine']
+        query = request.query.get('q', '')
+        count = int(request.query.get('count', 10))
+        return web.json_response({'webPages': {'value': [
+            {'name': f"{engine} result {i} for {query}", 'url': f"https://{engine}.example/{i}?q={query}",
+             'snippet': f"Snippet {i} about {query} from the {engine} stand-in engine"}
+            for i in range(count)
+        ]}})
+
+    app = web.Application()
+    app.router.add_get('/{engine}/search', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    return runner
+
+
+def _make_integration(db_path: str, base_url: str, engines: int, cache: bool) -> SearchEngineIntegration:
+    config = SearchEngineConfig(enable_google_search=False, enable_bing_search=False,
+                                enable_result_cache=cache)
+    integration = SearchEngineIntegration(db_path, config)
+    for i in range(engines):
+        integration.register_engine(LoopbackSearchAPI(f"{base_url}/engine{i}/search", name=f"engine{i}"))
+    return integration
+
+
+async def _run_legacy(integration: SearchEngineIntegration, queries):
+    """Engines one after another, each query on a fresh session"""
+    for query in queries:
+        for engine in integration.engines.values():
+            await engine.search(query, 10)
+            await engine.close()
+
+
+async def _run_optimized(integration: SearchEngineIntegration, queries):
+    for query in queries:
+        await integration.perform_multi_engine_search(query, max_results=10)
+    await integration.close()
+
+
+async def main_async(args) -> int:
+    runner = await _start_server(args.latency)
+    port = runner.addresses[0][1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    rng = random.Random(42)
+    unique = [f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}" for i in range(args.queries)]
+    # A share of repeated queries exercises the result cache
+    queries = [rng.choice(unique) if rng.random() < args.repeat and i else unique[i]
+               for i in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = _make_integration(os.path.join(tmp, 'legacy.db'), base_url, args.engines, cache=False)
+        start = time.perf_counter()
+        await _run_legacy(legacy, queries)
+        legacy_time = time.perf_counter() - start
+
+        optimized = _make_integration(os.path.join(tmp, 'optimized.db'), base_url, args.engines, cache=True)
+        start = time.perf_counter()
+        await _run_optimized(optimized, queries)
+        optimized_time = time.perf_counter() - start
+        metrics = await optimized.get_search_metrics()
+
+    await runner.cleanup()
+
+    print(f"🔍 {args.queries} queries x {args.engines} engines, {args.latency * 1000:.0f}ms engine latency")
+    print(f"   Legacy (sequential, session per query): {legacy_time:.2f}s "
+          f"({legacy_time / args.queries * 1000:.0f}ms/query)")
+    print(f"   Parallel + pooled + cached:             {optimized_time:.2f}s "
+          f"({optimized_time / args.queries * 1000:.0f}ms/query)")
+    print(f"   Cache hits: {metrics['result_cache']['hits']}, misses: {metrics['result_cache']['misses']}")
+    print(f"✅ Speedup: {legacy_time / optimized_time:.1f}x")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-engine search against a loopback server")
+    parser.add_argument("--engines", type=int, default=2, help="Number of stand-in engines")
+    parser.add_argument("--queries", type=int, default=20, help="Number of searches")
+    parser.add_argument("--latency", type=float, default=0.1, help="Per-request engine latency in seconds")
+    parser.add_argument("--repeat", type=float, default=0.5, help="Share of queries that repeat earlier ones")
+    return asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
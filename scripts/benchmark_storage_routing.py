@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Storage Routing Benchmark
+Measures what the legacy process-wide builtins.open patch costs an open()-heavy
+workload that never touches the routed files, and compares the legacy
+per-item memory_store.json write with the diff-based bulk write.
+
+Usage:
+    python scripts/benchmark_storage_routing.py [--files 200] [--rounds 20] [--keys 2000] [--changed 0.05]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory.database.brain_db import BrainDatabase
+from core.memory.database.storage_adapter import (
+    JSONCompatibilityAdapter,
+    StorageRouter,
+    patch_json_operations,
+    restore_json_operations,
+)
+
+
+def _open_workload(paths, rounds: int) -> float:
+    """Read every file ``rounds`` times; returns opens/sec"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            with open(path, 'r') as f:
+                f.read()
+    return len(paths) * rounds / (time.perf_counter() - start)
+
+
+def _bench_open(adapter: JSONCompatibilityAdapter, tmp: str, files: int, rounds: int):
+    paths = []
+    for i in range(files):
+        path = os.path.join(tmp, f"plain_{i}.txt")
+        with open(path, 'w') as f:
+            f.write("x" * 256)
+        paths.append(path)
+
+    _open_workload(paths, 1)  # Warm the page cache
+    unpatched = _open_workload(paths, rounds)
+    patch_json_operations(adapter)
+    try:
+        patched = _open_workload(paths, rounds)
+    finally:
+        restore_json_operations()
+
+    print(f"  open() unpatched     {unpatched:>10.0f} opens/sec")
+    print(f"  open() patched       {patched:>10.0f} opens/sec  ({unpatched / patched:.2f}x slower)")
+
+
+def _memory_store(keys: int, rng: random.Random, changed: float, base: dict = None) -> dict:
+    store = {}
+    for i in range(keys):
+        key = f"key_{i}"
+        if base is not None and rng.random() >= changed:
+            store[key] = base[key]
+        else:
+            store[key] = {"value": f"value {i} {rng.random()}", "tags": ["bench"], "emotional_weight": "medium"}
+    return store
+
+
+def _legacy_write(db: BrainDatabase, data: dict):
+    """The previous memory_store.json write path: one transaction per item and per context entry"""
+    for key, item in data["memory_store"].items():
+        db.set_memory_item(key, item.get("value", ""), item.get("tags", []),
+                           item.get("emotional_weight", "medium"))
+    for context in data["context_history"]:
+        db.add_context_history(context)
+
+
+def _bench_writes(tmp: str, keys: int, changed: float):
+    rng = random.Random(0)
+    base = _memory_store(keys, rng, 1.0)
+    update = _memory_store(keys, rng, changed, base)
+    context = [{"session_id": "bench", "content": f"turn {i}"} for i in range(20)]
+
+    results = {}
+    for label in ("legacy", "diff"):
+        db = BrainDatabase(os.path.join(tmp, f"{label}.db"))
+        router = StorageRouter(JSONCompatibilityAdapter(db))
+        router.dump({"memory_store": base, "context_history": context}, "memory_store.json")
+        # Write back what was read, with a fraction of the items changed
+        data = router.load("memory_store.json")
+        data["memory_store"] = update
+
+        start = time.perf_counter()
+        if label == "legacy":
+            _legacy_write(db, data)
+        else:
+            router.dump(data, "memory_store.json")
+        results[label] = time.perf_counter() - start
+        with db._connection() as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM context_history").fetchone()[0]
+        db.close()
+        print(f"  {label:<8} write     {results[label] * 1000:>10.1f} ms  ({rows} context rows)")
+
+    print(f"  diff-based write is {results['legacy'] / results['diff']:.1f}x faster")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark explicit storage routing against the open() patch")
+    parser.add_argument("--files", type=int, default=200, help="Plain files in the open() workload")
+    parser.add_argument("--rounds", type=int, default=20, help="Times each file is opened")
+    parser.add_argument("--keys", type=int, default=2000, help="Memory store size for the write benchmark")
+    parser.add_argument("--changed", type=float, default=0.05, help="Fraction of memory items changed per write")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = JSONCompatibilityAdapter(BrainDatabase(os.path.join(tmp, "open.db")))
+        print(f"📂 open() workload: {args.files} files x {args.rounds} rounds")
+        _bench_open(adapter, tmp, args.files, args.rounds)
+        adapter.db.close()
+
+        print(f"💾 memory_store.json write: {args.keys} keys, {args.changed:.0%} changed")
+        _bench_writes(tmp, args.keys, args.changed)
+
+
+if __name__ == "__main__":
+    main()
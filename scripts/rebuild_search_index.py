@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Rebuild the full-text (FTS5) search indexes of an existing brain database.
+Creates missing indexes and sync triggers, then repopulates every index from its base table.
+
+Usage:
+    python scripts/rebuild_search_index.py [--db brain_memory_store/brain.db] [--table learning_bits ...]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory.database.brain_db import BrainDatabase
+from core.memory.database.search_index import SEARCH_SOURCES, fts5_available
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild brain database full-text indexes")
+    parser.add_argument("--db", default=os.getenv("BRAIN_DB_PATH", "brain_memory_store/brain.db"),
+                        help="Path to the brain database")
+    parser.add_argument("--table", action="append", choices=sorted(SEARCH_SOURCES),
+                        help="Only rebuild the index for this table (repeatable)")
+    args = parser.parse_args()
+
+    if not fts5_available():
+        print("❌ This SQLite build does not include FTS5; full-text search cannot be enabled")
+        return 1
+    if not Path(args.db).exists():
+        print(f"❌ Database not found: {args.db}")
+        return 1
+
+    print(f"🔎 Rebuilding full-text indexes in {args.db}...")
+    start = time.perf_counter()
+    db = BrainDatabase(args.db)
+    indexed = db.rebuild_search_index(args.table)
+    db.close()
+
+    for table, rows in indexed.items():
+        print(f"   ✅ {table}: {rows} rows indexed")
+    print(f"✅ Done in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
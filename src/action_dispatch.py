@@ -0,0 +1,229 @@
+"""
+Action Dispatch - Table-driven routing for the consolidated MCP tools
+Each tool owns a dispatcher mapping action names to handlers with declared
+parameter schemas; every call is timed into a per-action latency histogram
+"""
+
+import copy
+import inspect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from utils.performance_monitor import LatencyHistogram, log_linear_buckets
+
+logger = logging.getLogger(__name__)
+
+# Shared by every action histogram: 0.1 ms to 60 s with 5% resolution
+ACTION_LATENCY_BUCKETS = log_linear_buckets(0.0001, 60.0, 0.05)
+
+# Arguments every consolidated tool accepts besides ``action``
+BASE_ARGUMENTS = ("content", "context")
+
+_REQUIRED = object()
+
+
+@dataclass
+class ActionParam:
+    """One declared keyword argument of an action"""
+    name: str
+    types: Tuple[type, ...]
+    default: Any = _REQUIRED
+
+    @property
+    def required(self) -> bool:
+        return self.default is _REQUIRED
+
+    def resolve(self, arguments: Dict[str, Any]) -> Any:
+        """The argument value, or its default; raises ValueError/TypeError on a bad call"""
+        if self.name not in arguments:
+            if self.required:
+                raise ValueError(f"missing required parameter '{self.name}'")
+            # Defaults such as {} must not be shared between calls
+            return copy.copy(self.default)
+        value = arguments[self.name]
+        if value is None and self.default is None:
+            return None
+        if not isinstance(value, self.types):
+            expected = " or ".join(t.__name__ for t in self.types)
+            raise TypeError(f"parameter '{self.name}' must be {expected}, got {type(value).__name__}")
+        return value
+
+
+@dataclass
+class ActionSpec:
+    """A registered action: its handler, parameter schema and latency statistics"""
+    name: str
+    handler: Callable[..., Dict[str, Any]]
+    params: Dict[str, ActionParam]
+    base_arguments: Tuple[str, ...]
+    description: str = ""
+    latency: LatencyHistogram = field(default_factory=lambda: LatencyHistogram(ACTION_LATENCY_BUCKETS))
+    errors: int = 0
+
+
+ParamSchema = Dict[str, Union[type, Tuple[type, ...], Tuple[Union[type, Tuple[type, ...]], Any]]]
+
+
+class ActionDispatcher:
+    """
+    Maps the action names of one consolidated tool to handlers.
+
+    ``params`` declares the keyword arguments a handler takes: a type (or a
+    tuple of types) makes the argument required, ``(type, default)`` makes it
+    optional. Schemas are checked against the handler signature once, at
+    registration, so a dispatch is a dict lookup plus an isinstance check per
+    declared argument. Undeclared keyword arguments are ignored.
+    """
+
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        self._actions: Dict[str, ActionSpec] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def actions(self) -> List[str]:
+        return list(self._actions)
+
+    def register(self, action: str, handler: Callable[..., Dict[str, Any]],
+                 params: Optional[ParamSchema] = None, description: str = "") -> ActionSpec:
+        """Add an action; raises ValueError/TypeError if the schema does not fit the handler"""
+        if not action:
+            raise ValueError(f"{self.tool_name}: action name must not be empty")
+        if action in self._actions:
+            raise ValueError(f"{self.tool_name}: action '{action}' is already registered")
+        if not callable(handler):
+            raise TypeError(f"{self.tool_name}.{action}: handler is not callable")
+
+        declared = {name: self._parse_param(action, name, schema) for name, schema in (params or {}).items()}
+        signature = inspect.signature(handler)
+        accepts_any = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in signature.parameters.values())
+        keyword_params = {name for name, p in signature.parameters.items()
+                          if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)}
+
+        for name in declared:
+            if name in BASE_ARGUMENTS:
+                raise ValueError(f"{self.tool_name}.{action}: '{name}' is passed to every action and cannot be declared")
+            if name not in keyword_params and not accepts_any:
+                raise TypeError(f"{self.tool_name}.{action}: handler does not accept declared parameter '{name}'")
+        base_arguments = tuple(name for name in BASE_ARGUMENTS if name in keyword_params or accepts_any)
+        for name, p in signature.parameters.items():
+            if (p.default is inspect.Parameter.empty and name not in declared and name not in base_arguments
+                    and p.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)):
+                raise TypeError(f"{self.tool_name}.{action}: handler argument '{name}' is not declared")
+
+        spec = ActionSpec(action, handler, declared, base_arguments, description)
+        self._actions[action] = spec
+        return spec
+
+    def action(self, *names: str, params: Optional[ParamSchema] = None, description: str = ""):
+        """Decorator form of ``register``; one handler may serve several action names"""
+        def decorator(handler):
+            for name in names:
+                self.register(name, handler, params, description)
+            return handler
+        return decorator
+
+    def _parse_param(self, action: str, name: str, schema) -> ActionParam:
+        if isinstance(schema, tuple) and len(schema) == 2 and not isinstance(schema[1], type):
+            types, default = schema
+        else:
+            types, default = schema, _REQUIRED
+        types = types if isinstance(types, tuple) else (types,)
+        if not types or not all(isinstance(t, type) for t in types):
+            raise TypeError(f"{self.tool_name}.{action}: schema for '{name}' must be a type or (type, default)")
+        return ActionParam(name, types, default)
+
+    def dispatch(self, action: str, content: str = "", context: str = "", **kwargs) -> Dict[str, Any]:
+        """Validate the arguments, run the action's handler and record its latency"""
+        spec = self._actions.get(action)
+        if spec is None:
+            return {"error": f"Unknown action: {action}. Available actions: {', '.join(self._actions)}"}
+
+        try:
+            arguments = {name: param.resolve(kwargs) for name, param in spec.params.items()}
+        except (TypeError, ValueError) as e:
+            return {"error": f"Invalid arguments for {self.tool_name}.{action}: {e}",
+                    "parameters": self.describe(action)["parameters"]}
+        base = {"content": content, "context": context}
+        for name in spec.base_arguments:
+            arguments[name] = base[name]
+
+        start = time.perf_counter()
+        try:
+            return spec.handler(**arguments)
+        except Exception:
+            with self._lock:
+                spec.errors += 1
+            raise
+        finally:
+            spec.latency.observe(time.perf_counter() - start)
+
+    def describe(self, action: str) -> Dict[str, Any]:
+        """Declared parameters of an action"""
+        spec = self._actions[action]
+        return {
+            "action": action,
+            "description": spec.description,
+            "parameters": {
+                name: {
+                    "type": " | ".join(t.__name__ for t in param.types),
+                    "required": param.required,
+                    **({} if param.required else {"default": param.default})
+                }
+                for name, param in spec.params.items()
+            }
+        }
+
+    def get_latency_report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-action call counts, errors and latency percentiles in milliseconds"""
+        report = {}
+        for name, spec in self._actions.items():
+            summary = spec.latency.snapshot(include_buckets=False)
+            report[name] = {
+                "count": summary["count"],
+                "errors": spec.errors,
+                **{f"{key}_ms": round(summary[key] * 1000, 3) for key in ("mean", "p50", "p95", "p99", "max")}
+            }
+        return report
+
+
+_dispatchers: Dict[str, ActionDispatcher] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def get_dispatcher(tool_name: str) -> ActionDispatcher:
+    """The dispatcher of a consolidated tool, created on first use"""
+    with _dispatchers_lock:
+        if tool_name not in _dispatchers:
+            _dispatchers[tool_name] = ActionDispatcher(tool_name)
+        return _dispatchers[tool_name]
+
+
+def get_action_latency_report(tool_name: Optional[str] = None,
+                              budget_ms: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Latency of every action that has been called, grouped by tool.
+
+    With ``budget_ms``, actions whose p95 exceeds the budget are listed
+    under ``over_budget`` (slowest first).
+    """
+    with _dispatchers_lock:
+        dispatchers = [d for name, d in _dispatchers.items() if tool_name in (None, name)]
+
+    tools = {}
+    for dispatcher in dispatchers:
+        called = {action: stats for action, stats in dispatcher.get_latency_report().items() if stats["count"]}
+        if called:
+            tools[dispatcher.tool_name] = called
+
+    report: Dict[str, Any] = {"tools": tools}
+    if budget_ms is not None:
+        over = [{"tool": tool, "action": action, "p95_ms": stats["p95_ms"], "count": stats["count"]}
+                for tool, actions in tools.items() for action, stats in actions.items()
+                if stats["p95_ms"] > budget_ms]
+        report["budget_ms"] = budget_ms
+        report["over_budget"] = sorted(over, key=lambda entry: entry["p95_ms"], reverse=True)
+    return report
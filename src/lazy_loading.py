@@ -0,0 +1,162 @@
+"""
+Lazy Loading - Deferred construction of heavy subsystems and a startup import profile
+Components are built on first use instead of at server start, and every
+profiled import records its wall time and the resident memory it added
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_kb() -> int:
+    """Resident set size of this process in KiB (0 if it cannot be determined)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss // 1024
+    except Exception:
+        return 0
+
+
+class StartupProfiler:
+    """Records how long each import or load step takes and how much RSS it adds"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.start_rss_kb = current_rss_kb()
+        self.entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name: str, kind: str = 'module'):
+        """Time the enclosed block and record it under ``name``"""
+        rss_before = current_rss_kb()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            entry = {
+                'name': name,
+                'kind': kind,
+                'seconds': time.perf_counter() - start,
+                'rss_delta_kb': current_rss_kb() - rss_before
+            }
+            if error:
+                entry['error'] = error
+            with self._lock:
+                self.entries.append(entry)
+
+    def import_module(self, module_name: str):
+        """Import a module, recording its import time"""
+        with self.measure(module_name):
+            return importlib.import_module(module_name)
+
+    def import_attr(self, module_name: str, attr: str) -> Any:
+        """Import ``module_name`` and return one of its attributes"""
+        return getattr(self.import_module(module_name), attr)
+
+    def report(self) -> Dict[str, Any]:
+        """Entries (slowest first) plus totals since the profiler was created"""
+        rss_kb = current_rss_kb()
+        with self._lock:
+            entries = sorted(self.entries, key=lambda entry: entry['seconds'], reverse=True)
+        return {
+            'elapsed_seconds': time.perf_counter() - self.started_at,
+            'profiled_seconds': sum(entry['seconds'] for entry in entries),
+            'rss_kb': rss_kb,
+            'rss_delta_kb': rss_kb - self.start_rss_kb,
+            'entries': entries
+        }
+
+    def log_report(self, title: str = "Startup profile"):
+        """Log the report, one line per entry"""
+        report = self.report()
+        logger.info(f"⏱️ {title}: {report['elapsed_seconds'] * 1000:.1f} ms elapsed, "
+                    f"RSS {report['rss_kb'] / 1024:.1f} MiB (+{report['rss_delta_kb'] / 1024:.1f} MiB)")
+        for entry in report['entries']:
+            status = f" ❌ {entry['error']}" if 'error' in entry else ""
+            logger.info(f"   {entry['kind']:<8} {entry['name']:<45} {entry['seconds'] * 1000:8.1f} ms "
+                        f"{entry['rss_delta_kb']:+8d} KiB{status}")
+        return report
+
+
+class LazyComponent:
+    """
+    Proxy that builds its target on first attribute access.
+
+    The factory runs at most once (under a lock); if it raises, the error
+    propagates to the caller and the next access tries again. ``try_resolve``
+    returns None instead of raising and records the error, so callers can
+    check availability: a proxy object itself is always truthy.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        self._error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    @property
+    def failed(self) -> bool:
+        """True if the last build attempt raised"""
+        return self._instance is None and self._error is not None
+
+    @property
+    def error(self) -> Optional[str]:
+        """The error from the last failed build attempt"""
+        return self._error
+
+    @property
+    def state(self) -> str:
+        """'loaded', 'failed' or 'not loaded'"""
+        if self._instance is not None:
+            return 'loaded'
+        return 'failed' if self._error is not None else 'not loaded'
+
+    def resolve(self) -> Any:
+        """The target, building it if necessary"""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    logger.info(f"⏳ Loading {self._name} on first use...")
+                    try:
+                        self._instance = self._factory()
+                    except Exception as e:
+                        self._error = str(e)
+                        raise
+                    self._error = None
+        return self._instance
+
+    def try_resolve(self) -> Optional[Any]:
+        """The target, or None if building it fails"""
+        try:
+            return self.resolve()
+        except Exception as e:
+            logger.error(f"❌ {self._name} failed to load: {e}")
+            return None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyComponent {self._name} ({self.state})>"
@@ -1,14 +1,138 @@
 import importlib
 import importlib.util
+import inspect
+import json
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Type, Any
+from typing import Dict, List, Optional, Type, Any, Callable
 import logging
-from plugin_interface import PluginInterface, ToolDefinition, ResourceDefinition, PromptDefinition
+from plugin_interface import PluginInterface, PluginMetadata, ToolDefinition, ResourceDefinition, PromptDefinition
+from lazy_loading import StartupProfiler
 
 logger = logging.getLogger(__name__)
 
+MANIFEST_VERSION = 1
+
+# Annotations that survive the manifest (anything else is dropped from proxy signatures)
+_MANIFEST_ANNOTATIONS = {t.__name__: t for t in (str, int, float, bool, dict, list)}
+
+
+def _describe_signature(handler: Callable) -> List[Dict[str, Any]]:
+    """JSON description of a handler's parameters"""
+    parameters = []
+    for parameter in inspect.signature(handler).parameters.values():
+        described = {'name': parameter.name, 'kind': parameter.kind.name}
+        if parameter.annotation in _MANIFEST_ANNOTATIONS.values():
+            described['annotation'] = parameter.annotation.__name__
+        if parameter.default is not inspect.Parameter.empty:
+            try:
+                json.dumps(parameter.default)
+                described['default'] = parameter.default
+            except (TypeError, ValueError):
+                described['default'] = None
+        parameters.append(described)
+    return parameters
+
+
+def _signature_from_manifest(parameters: List[Dict[str, Any]]) -> inspect.Signature:
+    return inspect.Signature([
+        inspect.Parameter(
+            described['name'],
+            getattr(inspect.Parameter, described['kind'], inspect.Parameter.POSITIONAL_OR_KEYWORD),
+            default=described.get('default', inspect.Parameter.empty),
+            annotation=_MANIFEST_ANNOTATIONS.get(described.get('annotation'), inspect.Parameter.empty)
+        )
+        for described in parameters
+    ])
+
+
+class LazyPlugin(PluginInterface):
+    """
+    Stand-in for a plugin registered from the manifest.
+
+    Tools, resources and prompts are registered with proxy handlers built
+    from the cached metadata; the plugin module is imported, and the plugin
+    instantiated, on the first handler call or attribute access.
+    """
+
+    def __init__(self, entry: Dict[str, Any], loader: Callable[[str], PluginInterface]):
+        self.entry = entry
+        self.instance: Optional[PluginInterface] = None
+        self._loader = loader
+        self._metadata = PluginMetadata(**entry['metadata'])
+        self._tools = [
+            ToolDefinition(name=tool['name'], description=tool['description'],
+                           parameters=tool.get('parameters', {}), handler=self._proxy(tool))
+            for tool in entry.get('tools', [])
+        ]
+        self._resources = [
+            ResourceDefinition(name=resource['name'], uri_template=resource['uri_template'],
+                               description=resource['description'], handler=self._proxy(resource))
+            for resource in entry.get('resources', [])
+        ]
+        self._prompts = [
+            PromptDefinition(name=prompt['name'], description=prompt['description'],
+                             arguments=prompt.get('arguments', []), handler=self._proxy(prompt))
+            for prompt in entry.get('prompts', [])
+        ]
+
+    @property
+    def metadata(self) -> PluginMetadata:
+        return self._metadata
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.instance is not None
+
+    def resolve(self) -> PluginInterface:
+        """The real plugin, loading it if necessary"""
+        return self.instance if self.instance is not None else self._loader(self._metadata.name)
+
+    def _proxy(self, definition: Dict[str, Any]) -> Callable:
+        attr = definition['attr']
+        if definition.get('is_async'):
+            async def handler(*args, **kwargs):
+                return await getattr(self.resolve(), attr)(*args, **kwargs)
+        else:
+            def handler(*args, **kwargs):
+                return getattr(self.resolve(), attr)(*args, **kwargs)
+        handler.__name__ = attr
+        handler.__doc__ = definition.get('doc')
+        handler.__signature__ = _signature_from_manifest(definition.get('signature', []))
+        return handler
+
+    def initialize(self) -> None:
+        pass  # The real plugin is initialized when it is loaded
+
+    def cleanup(self) -> None:
+        if self.instance is not None:
+            self.instance.cleanup()
+
+    def get_tools(self) -> List[ToolDefinition]:
+        return list(self._tools)
+
+    def get_resources(self) -> List[ResourceDefinition]:
+        return list(self._resources)
+
+    def get_prompts(self) -> List[PromptDefinition]:
+        return list(self._prompts)
+
+    def on_server_startup(self) -> None:
+        if self.instance is not None:
+            self.instance.on_server_startup()
+
+    def on_server_shutdown(self) -> None:
+        if self.instance is not None:
+            self.instance.on_server_shutdown()
+
+    def __getattr__(self, attr: str) -> Any:
+        # Plugin-specific methods are served by the real plugin
+        if attr.startswith('__') or attr in ('entry', 'instance', '_loader', '_metadata'):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
 
 class PluginRegistry:
     def __init__(self):
@@ -71,10 +195,29 @@ class PluginRegistry:
 
 
 class PluginManager:
-    def __init__(self, plugin_dirs: Optional[List[str]] = None):
+    """
+    Discovers and loads plugins from plugin directories.
+
+    In lazy mode, plugin files whose manifest entry (keyed by path, mtime and
+    size) is current are registered from the manifest without importing
+    them; see LazyPlugin. Other files are imported eagerly and their entry is
+    written back to the manifest, so the next start can be lazy.
+    """
+
+    def __init__(self, plugin_dirs: Optional[List[str]] = None, lazy: bool = False,
+                 manifest_path: Optional[str] = None, profiler: Optional[StartupProfiler] = None):
         self.registry = PluginRegistry()
         self.plugin_dirs = plugin_dirs or ["plugins"]
+        self.lazy = lazy
+        self.manifest_path = Path(manifest_path) if manifest_path else Path(self.plugin_dirs[0]) / ".plugin_manifest.json"
+        self.profiler = profiler or StartupProfiler()
         self._loaded_modules: Dict[str, Any] = {}
+        self._plugin_files: Dict[str, Path] = {}    # plugin name -> source file
+        self._plugin_classes: Dict[str, str] = {}   # plugin name -> class name
+        self._manifest: Dict[str, Any] = self._read_manifest() if lazy else {}
+        self._manifest_dirty = False
+        self._load_lock = threading.RLock()
+        self._started = False
     
     def load_plugins_from_directory(self, directory: str) -> None:
         plugin_dir = Path(directory)
@@ -82,43 +225,188 @@ class PluginManager:
             logger.warning(f"Plugin directory does not exist: {directory}")
             return
         
-        for file_path in plugin_dir.glob("*.py"):
+        for file_path in sorted(plugin_dir.glob("*.py")):
             if file_path.name.startswith("_"):
                 continue
             
             try:
+                if self.lazy and self._register_from_manifest(file_path):
+                    continue
                 self._load_plugin_from_file(file_path)
             except Exception as e:
                 logger.error(f"Failed to load plugin from {file_path}: {e}")
+        
+        if self._manifest_dirty:
+            self._write_manifest()
     
-    def _load_plugin_from_file(self, file_path: Path) -> None:
+    def _import_plugin_module(self, file_path: Path, reload: bool = False) -> Any:
         module_name = f"plugin_{file_path.stem}"
+        if not reload and module_name in self._loaded_modules:
+            return self._loaded_modules[module_name]
         
         spec = importlib.util.spec_from_file_location(module_name, file_path)
         if spec is None or spec.loader is None:
             raise ImportError(f"Cannot load module from {file_path}")
         
         module = importlib.util.module_from_spec(spec)
-        self._loaded_modules[module_name] = module
-        
         sys.modules[module_name] = module
-        spec.loader.exec_module(module)
+        try:
+            with self.profiler.measure(f"{module_name} ({file_path.name})", kind='plugin'):
+                spec.loader.exec_module(module)
+        except Exception:
+            sys.modules.pop(module_name, None)
+            raise
+        self._loaded_modules[module_name] = module
+        return module
+    
+    def _load_plugin_from_file(self, file_path: Path, class_names: Optional[List[str]] = None,
+                               reload: bool = False) -> List[PluginInterface]:
+        module = self._import_plugin_module(file_path, reload=reload)
         
+        # Plugin classes defined in this module (not the base classes it imports)
         plugin_classes = [
-            getattr(module, attr) for attr in dir(module)
-            if (isinstance(getattr(module, attr), type) and
-                issubclass(getattr(module, attr), PluginInterface) and
-                getattr(module, attr) != PluginInterface)
+            value for value in vars(module).values()
+            if (isinstance(value, type) and issubclass(value, PluginInterface) and
+                value.__module__ == module.__name__ and not inspect.isabstract(value) and
+                (class_names is None or value.__name__ in class_names))
         ]
         
+        loaded = []
+        failed = False
         for plugin_class in plugin_classes:
             try:
                 plugin_instance = plugin_class()
                 plugin_instance.initialize()
+                plugin_name = plugin_instance.metadata.name
                 self.registry.register_plugin(plugin_instance)
-                logger.info(f"Loaded plugin: {plugin_instance.metadata.name}")
+                if self.registry.get_plugin(plugin_name) is not plugin_instance:
+                    continue
+                self._plugin_files[plugin_name] = file_path
+                self._plugin_classes[plugin_name] = plugin_class.__name__
+                if self._started:
+                    plugin_instance.on_server_startup()
+                loaded.append(plugin_instance)
+                logger.info(f"Loaded plugin: {plugin_name}")
             except Exception as e:
+                failed = True
                 logger.error(f"Failed to initialize plugin {plugin_class.__name__}: {e}")
+        
+        # A file with a failing plugin is not cached, so the next start retries it eagerly
+        if self.lazy and class_names is None and not failed:
+            self._update_manifest(file_path, loaded)
+        return loaded
+    
+    # Manifest
+    
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': MANIFEST_VERSION, 'files': {}}
+    
+    def _write_manifest(self) -> None:
+        files = self._manifest.setdefault('files', {})
+        for path in [path for path in files if not Path(path).exists()]:
+            del files[path]
+        try:
+            tmp_path = self.manifest_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self._manifest, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+            self._manifest_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not write plugin manifest {self.manifest_path}: {e}")
+    
+    @staticmethod
+    def _describe_definition(plugin: PluginInterface, definition: Any, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Manifest entry for a tool/resource/prompt, or None if its handler is not a plugin method"""
+        handler = definition.handler
+        attr = getattr(handler, '__name__', None)
+        if getattr(handler, '__self__', None) is not plugin or getattr(plugin, attr, None) is None:
+            return None
+        described = {field: getattr(definition, field) for field in fields}
+        described.update({
+            'attr': attr,
+            'is_async': inspect.iscoroutinefunction(handler),
+            'doc': inspect.getdoc(handler),
+            'signature': _describe_signature(handler)
+        })
+        return described
+    
+    def _describe_plugin(self, plugin: PluginInterface) -> Dict[str, Any]:
+        entry = {
+            'class': type(plugin).__name__,
+            'metadata': plugin.metadata.model_dump(),
+            'lazy': True
+        }
+        for key, definitions, fields in (
+            ('tools', plugin.get_tools(), ['name', 'description', 'parameters']),
+            ('resources', plugin.get_resources(), ['name', 'uri_template', 'description']),
+            ('prompts', plugin.get_prompts(), ['name', 'description', 'arguments']),
+        ):
+            entry[key] = []
+            for definition in definitions:
+                described = self._describe_definition(plugin, definition, fields)
+                if described is None:
+                    entry['lazy'] = False  # A handler the manifest cannot proxy: always load eagerly
+                    continue
+                entry[key].append(described)
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError):
+            entry['lazy'] = False
+        return entry
+    
+    def _update_manifest(self, file_path: Path, plugins: List[PluginInterface]) -> None:
+        stat = file_path.stat()
+        self._manifest.setdefault('files', {})[str(file_path.resolve())] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'plugins': [self._describe_plugin(plugin) for plugin in plugins]
+        }
+        self._manifest_dirty = True
+    
+    def _register_from_manifest(self, file_path: Path) -> bool:
+        """Register a file's plugins from a current manifest entry without importing it"""
+        cached = self._manifest.get('files', {}).get(str(file_path.resolve()))
+        stat = file_path.stat()
+        if (not cached or cached['mtime_ns'] != stat.st_mtime_ns or cached['size'] != stat.st_size
+                or not all(entry['lazy'] for entry in cached['plugins'])):
+            return False
+        
+        for entry in cached['plugins']:
+            plugin_name = entry['metadata']['name']
+            self.registry.register_plugin(LazyPlugin(entry, self.ensure_loaded))
+            self._plugin_files[plugin_name] = file_path
+            self._plugin_classes[plugin_name] = entry['class']
+            logger.info(f"Registered plugin from manifest: {plugin_name} (loads on first use)")
+        return True
+    
+    def ensure_loaded(self, plugin_name: str) -> PluginInterface:
+        """The real plugin instance, importing and initializing a lazy plugin on first use"""
+        plugin = self.registry.get_plugin(plugin_name)
+        if plugin is None:
+            raise KeyError(f"Plugin {plugin_name} is not registered")
+        if not isinstance(plugin, LazyPlugin):
+            return plugin
+        
+        with self._load_lock:
+            if plugin.instance is None:
+                file_path = self._plugin_files[plugin_name]
+                module = self._import_plugin_module(file_path)
+                plugin_class = getattr(module, plugin.entry['class'])
+                with self.profiler.measure(f"{plugin_name} init", kind='plugin'):
+                    instance = plugin_class()
+                    instance.initialize()
+                if self._started:
+                    instance.on_server_startup()
+                plugin.instance = instance
+                logger.info(f"Loaded plugin on first use: {plugin_name}")
+        return plugin.instance
     
     def load_all_plugins(self) -> None:
         for directory in self.plugin_dirs:
@@ -135,8 +423,38 @@ class PluginManager:
             self.registry.unregister_plugin(plugin_name)
     
     def reload_plugin(self, plugin_name: str) -> None:
+        """Re-import one plugin's module and re-register only that plugin"""
+        file_path = self._plugin_files.get(plugin_name)
+        class_name = self._plugin_classes.get(plugin_name)
         self.unload_plugin(plugin_name)
-        self.load_all_plugins()
+        if file_path is None or class_name is None:
+            self.load_all_plugins()
+            return
+        
+        loaded = self._load_plugin_from_file(file_path, class_names=[class_name], reload=True)
+        if self.lazy and loaded:
+            # Refresh this plugin's manifest entry, keeping the file's other plugins
+            cached = self._manifest.get('files', {}).get(str(file_path.resolve()), {'plugins': []})
+            others = [entry for entry in cached['plugins'] if entry['metadata']['name'] != plugin_name]
+            stat = file_path.stat()
+            self._manifest['files'][str(file_path.resolve())] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'plugins': others + [self._describe_plugin(plugin) for plugin in loaded]
+            }
+            self._write_manifest()
+    
+    def get_load_report(self) -> Dict[str, Any]:
+        """Import profile plus which plugins are lazy and which are loaded"""
+        lazy = [name for name, plugin in self.registry.plugins.items() if isinstance(plugin, LazyPlugin)]
+        report = self.profiler.report()
+        report.update({
+            'mode': 'lazy' if self.lazy else 'eager',
+            'plugins': len(self.registry.plugins),
+            'lazy_plugins': lazy,
+            'loaded_lazy_plugins': [name for name in lazy if self.registry.plugins[name].is_loaded]
+        })
+        return report
     
     def shutdown(self) -> None:
         for plugin_name in list(self.registry.plugins.keys()):
@@ -153,6 +471,7 @@ class PluginManager:
         self.registry.prompts.clear()
     
     def startup_plugins(self) -> None:
+        self._started = True
         for plugin in self.registry.plugins.values():
             try:
                 plugin.on_server_startup()
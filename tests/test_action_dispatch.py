@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test table-driven action dispatch and per-action latency histograms
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.action_dispatch import ActionDispatcher, get_action_latency_report, get_dispatcher
+from utils.performance_monitor import LatencyHistogram, log_linear_buckets
+
+
+def test_schemas_are_checked_at_registration_and_enforced_on_dispatch():
+    """Bad schemas fail at import time; bad calls get an error naming the parameter"""
+    dispatcher = ActionDispatcher("demo_tool")
+
+    @dispatcher.action("echo", "repeat", params={"times": (int, 1), "payload": dict})
+    def echo(content, payload, times):
+        return {"content": content * times, "payload": payload}
+
+    assert dispatcher.dispatch("echo", "ab", payload={"k": 1}, times=2, ignored=True) == \
+        {"content": "abab", "payload": {"k": 1}}
+    assert dispatcher.dispatch("repeat", "x", payload={})["content"] == "x"
+    assert "missing required parameter 'payload'" in dispatcher.dispatch("echo")["error"]
+    assert "must be int, got str" in dispatcher.dispatch("echo", payload={}, times="2")["error"]
+    assert dispatcher.dispatch("nope")["error"] == "Unknown action: nope. Available actions: echo, repeat"
+
+    with pytest.raises(ValueError):
+        dispatcher.register("echo", echo, {"payload": dict})
+    with pytest.raises(TypeError):
+        dispatcher.register("missing", lambda payload: {}, {})
+    with pytest.raises(TypeError):
+        dispatcher.register("undeclared", lambda: {}, {"payload": dict})
+
+
+def test_latency_is_recorded_per_tool_and_action():
+    """Every dispatch, including failing ones, lands in the action's histogram"""
+    dispatcher = get_dispatcher("latency_test_tool")
+    assert get_dispatcher("latency_test_tool") is dispatcher
+    dispatcher.register("fast", lambda: {"ok": True})
+
+    def boom():
+        raise RuntimeError("boom")
+    dispatcher.register("boom", boom)
+
+    for _ in range(5):
+        dispatcher.dispatch("fast")
+    with pytest.raises(RuntimeError):
+        dispatcher.dispatch("boom")
+
+    report = get_action_latency_report("latency_test_tool", budget_ms=-1)
+    actions = report["tools"]["latency_test_tool"]
+    assert (actions["fast"]["count"], actions["boom"]["errors"]) == (5, 1)
+    assert {entry["action"] for entry in report["over_budget"]} == {"fast", "boom"}
+    assert get_action_latency_report("latency_test_tool", budget_ms=60_000)["over_budget"] == []
+
+
+def test_log_linear_buckets_bound_the_percentile_error():
+    """Percentiles from HDR-style buckets are within the configured relative error"""
+    histogram = LatencyHistogram(log_linear_buckets(0.0001, 10.0, 0.05))
+    for ms in range(1, 1001):
+        histogram.observe(ms / 1000)
+    assert 0.5 <= histogram.percentile(0.5) <= 0.5 * 1.05
+    assert 0.99 <= histogram.percentile(0.99) <= 0.99 * 1.05
+    assert "buckets" not in histogram.snapshot(include_buckets=False)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test the pooled, WAL-mode connection layer of BrainDatabase
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory.database.brain_db import BrainDatabase, get_brain_db
+from core.memory.database.connection_pool import SQLiteConnectionPool
+
+
+def test_pool_applies_pragmas(tmp_path):
+    """Pooled connections run in WAL mode with synchronous=NORMAL"""
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), max_connections=2)
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    pool.close_all()
+
+
+def test_pool_is_reentrant_and_bounded(tmp_path):
+    """Nested checkouts reuse the connection; concurrent threads never exceed the bound"""
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), max_connections=2)
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+
+    def worker():
+        for _ in range(50):
+            with pool.connection() as conn:
+                conn.execute("SELECT 1").fetchone()
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.get_stats()
+    assert stats["open_connections"] <= 2
+    assert stats["reentrant_checkouts"] == 1
+    pool.close_all()
+
+
+def test_brain_database_round_trip_with_pool(tmp_path):
+    """BrainDatabase reads its own writes through pooled connections"""
+    db = BrainDatabase(str(tmp_path / "brain.db"), pool_size=4)
+    assert db.set_memory_item("pool_key", "pooled connection value", tags=["pool"])
+    results = db.search_memory_store("pooled")
+    assert results and results[0]["key"] == "pool_key"
+    assert "pool_key" in db.get_memory_store()["memory_store"]
+    assert db.get_pool_stats()["connections_opened"] >= 1
+    db.close()
+
+
+def test_unpooled_mode_closes_connections(tmp_path):
+    """pool_size=0 keeps the legacy connect-per-call behaviour"""
+    db = BrainDatabase(str(tmp_path / "brain.db"), pool_size=0)
+    db.set_memory_item("legacy", "value")
+    stats = db.get_pool_stats()
+    assert stats["open_connections"] == 0
+    assert stats["connections_opened"] >= 2
+    db.close()
+
+
+def test_explicit_paths_never_replace_the_global_instance(tmp_path, monkeypatch):
+    """A non-default path gets its own shared instance; the global one stays open"""
+    import core.memory.database.brain_db as brain_db_module
+    monkeypatch.setenv("BRAIN_DB_PATH", str(tmp_path / "global.db"))
+    monkeypatch.setattr(brain_db_module, "_brain_db", None)
+    monkeypatch.setattr(brain_db_module, "_path_dbs", {})
+
+    global_db = get_brain_db(pool_size=1)
+    other = get_brain_db(str(tmp_path / "other.db"))
+    assert other is not global_db and get_brain_db(str(tmp_path / "other.db")) is other
+    assert get_brain_db() is global_db and get_brain_db(str(tmp_path / "global.db")) is global_db
+
+    # The global instance was not closed behind its holders' backs
+    assert global_db.set_memory_item("still", "open")
+    global_db.close()
+    other.close()
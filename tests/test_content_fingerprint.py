@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test SimHash near-duplicate detection for learning bits
+"""
+
+import asyncio
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.engine.content_fingerprint import (
+    DEFAULT_MAX_DISTANCE, SimHashIndex, backfill_fingerprints, dedup_statistics, hamming_distance, simhash
+)
+from web_crawler.engine.web_crawler_engine import LearningBit, WebCrawler
+
+SCHEMA = Path(__file__).parent.parent / "core" / "memory" / "database" / "web_crawler_schema.sql"
+
+TEXT = ("Python list comprehensions build a new list by applying an expression to every item of an "
+        "iterable, optionally filtering items with a condition. They are usually faster and easier to "
+        "read than the equivalent for loop that appends to a list, but deeply nested comprehensions "
+        "quickly become hard to follow and should be rewritten as ordinary loops or helper functions.")
+EDITED = TEXT.replace("usually faster", "generally faster")
+OTHER = ("SQLite write-ahead logging lets readers proceed concurrently with a single writer and makes "
+         "commits cheaper because pages are appended to the WAL file instead of rewriting the database.")
+
+
+def _bit(content: str, content_hash: str) -> LearningBit:
+    return LearningBit(content_hash=content_hash, content_type="concept", category="programming",
+                       subcategory="python", content=content, context="", importance_score=0.7,
+                       confidence_score=0.8, source_url="https://docs.example/lists", tags=[],
+                       complexity_level="moderate")
+
+
+def test_simhash_distances_and_banded_index():
+    """Light edits stay within the threshold and the index finds exactly the brute-force matches"""
+    assert hamming_distance(simhash(TEXT), simhash(EDITED)) <= DEFAULT_MAX_DISTANCE
+    assert hamming_distance(simhash(TEXT), simhash(OTHER)) > 10
+
+    rng = random.Random(7)
+    index = SimHashIndex()  # 7 bands of 10 or 9 bits
+    stored = {}
+    for key in range(300):
+        fingerprint = rng.getrandbits(64)
+        stored[key] = fingerprint
+        index.add(key, fingerprint)
+    for key in range(0, 300, 7):
+        query = stored[key]
+        for bit in rng.sample(range(64), rng.randint(0, DEFAULT_MAX_DISTANCE)):
+            query ^= 1 << bit
+        assert index.find(query) == (key, hamming_distance(query, stored[key]))
+    assert index.find(rng.getrandbits(64)) is None
+
+
+def test_near_duplicates_are_folded_at_insert_time(tmp_path):
+    """A lightly edited copy is recorded as a duplicate of the stored bit instead of inserted"""
+    db_path = str(tmp_path / "crawler.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    crawler = WebCrawler(db_path)
+
+    first = asyncio.run(crawler._store_learning_bits([_bit(TEXT, "a"), _bit(OTHER, "b")], page_id=1))
+    second = asyncio.run(crawler._store_learning_bits([_bit(EDITED, "a2")], page_id=2))
+
+    assert second == {"a2": first["a"]}
+    assert crawler.dedup_stats["near_duplicates"] == 1
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM learning_bits").fetchone()[0] == 2
+        assert conn.execute("SELECT reference_count FROM learning_bits WHERE content_hash = 'a'").fetchone()[0] == 1
+        stats = dedup_statistics(conn.cursor(), 2)
+    assert stats["near_duplicates_rejected"] == 1
+    assert stats["dedup_ratio"] == round(1 / 3, 4)
+
+
+def test_backfill_clusters_and_prunes_existing_rows(tmp_path):
+    """Rows stored before fingerprinting are fingerprinted, clustered and optionally pruned"""
+    db_path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""CREATE TABLE learning_bits (id INTEGER PRIMARY KEY, content_hash TEXT UNIQUE,
+                        content TEXT, source_url TEXT, reference_count INTEGER DEFAULT 0,
+                        updated_at TIMESTAMP)""")
+        conn.executemany("INSERT INTO learning_bits (content_hash, content) VALUES (?, ?)",
+                         [("a", TEXT), ("b", OTHER), ("a2", EDITED)])
+
+        stats = backfill_fingerprints(conn)
+        assert (stats["fingerprinted"], stats["clustered"]) == (3, 1)
+        assert backfill_fingerprints(conn)["clustered"] == 0  # Idempotent
+        assert dedup_statistics(conn.cursor(), 3)["near_duplicates_clustered"] == 1
+
+        assert backfill_fingerprints(conn, prune=True)["pruned"] == 1
+        remaining = conn.execute("SELECT content_hash, reference_count FROM learning_bits ORDER BY id").fetchall()
+        assert remaining == [("a", 1), ("b", 0)]
+        assert dedup_statistics(conn.cursor(), 2)["near_duplicates_rejected"] == 1
+
+
+def test_text_without_words_is_never_a_near_duplicate(tmp_path):
+    """Wordless bits get no fingerprint, are all stored and are skipped by the backfill"""
+    assert simhash("") is None and simhash("--- ... !!!") is None
+
+    db_path = str(tmp_path / "crawler.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    crawler = WebCrawler(db_path)
+    stored = asyncio.run(crawler._store_learning_bits([_bit("---", "d1"), _bit("!!!", "d2"), _bit(TEXT, "a")], page_id=1))
+
+    assert len(set(stored.values())) == 3 and crawler.dedup_stats["near_duplicates"] == 0
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM learning_bits WHERE simhash IS NULL").fetchone()[0] == 2
+        assert backfill_fingerprints(conn)["clustered"] == 0
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test deadline-aware concurrent context gathering in the ContextOrchestrator
+"""
+
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.intelligence.context_orchestrator import ContextOrchestrator, ContextRequest, ContextSource
+
+
+class SlowSourceOrchestrator(ContextOrchestrator):
+    """Sources with a 'delay' in their metadata block until released or the delay passes"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.calls = defaultdict(int)
+
+    def _gather_from_source(self, source, request):
+        self.calls[source.source_id] += 1
+        self.release.wait(source.metadata.get('delay', 0.0))
+        return super()._gather_from_source(source, request)
+
+
+def _source(source_id: str, source_type: str, delay: float = 0.0) -> ContextSource:
+    return ContextSource(source_id=source_id, source_type=source_type, name=source_id, description='',
+                         priority=0.9, freshness=time.time(), reliability=0.95, metadata={'delay': delay})
+
+
+def _request(number: int, context_type: str = 'immediate', deadline: float = None) -> ContextRequest:
+    # Distinct filters keep every request out of the response cache
+    return ContextRequest(request_id=f"req_{number}", user_id='user1', context_type=context_type, scope='file',
+                          filters={'n': number}, priority=0.9, created_at=time.time(), deadline=deadline)
+
+
+def test_slow_source_does_not_hold_back_the_immediate_strategy():
+    """Fast sources are returned within the budget; the slow one times out and is skipped later"""
+    orchestrator = SlowSourceOrchestrator()
+    orchestrator.min_latency_samples = 2
+    orchestrator.register_context_source(_source('slow_project', 'project', delay=5.0))
+    orchestrator.register_context_source(_source('personal', 'personal'))
+    try:
+        started = time.perf_counter()
+        response = orchestrator.orchestrate_context(_request(1))
+        assert time.perf_counter() - started < 1.5
+        assert list(response.context_data['summary']) == ['personal']
+        assert response.metadata['partial'] and response.metadata['timed_out_sources'] == ['slow_project']
+        assert len(orchestrator.response_cache) == 0  # Partial responses are not cached
+
+        orchestrator.orchestrate_context(_request(2))
+        started = time.perf_counter()
+        skipped = orchestrator.orchestrate_context(_request(3))
+        assert time.perf_counter() - started < 0.25
+        assert skipped.metadata['skipped_sources'] == ['slow_project'] and not skipped.metadata['partial']
+
+        # An explicit deadline tightens the strategy's budget
+        started = time.perf_counter()
+        tight = orchestrator.orchestrate_context(_request(4, 'predictive', deadline=time.time() + 0.2))
+        assert time.perf_counter() - started < 0.6 and tight.metadata['budget'] <= 0.2
+
+        stats = orchestrator.get_orchestration_stats()['sources']
+        assert stats['latency']['slow_project']['count'] == 2
+        assert stats['latency']['slow_project']['p95'] >= 0.5
+        # The second request found the first call still running and did not query it again
+        health = stats['source_health']['slow_project']
+        assert (health['timeout_count'], health['busy_count']) == (1, 1)
+        assert stats['latency']['personal']['p95'] < 0.1
+    finally:
+        orchestrator.release.set()
+        orchestrator.close()
+
+
+def test_hung_source_holds_at_most_one_worker():
+    """A source whose call never returns is not queried again until it does"""
+    orchestrator = SlowSourceOrchestrator()
+    orchestrator.min_latency_samples = 100  # Keep the slow-source skip out of the way
+    orchestrator.register_context_source(_source('hung_project', 'project', delay=30.0))
+    orchestrator.register_context_source(_source('personal', 'personal'))
+    try:
+        for number in range(1, 6):
+            response = orchestrator.orchestrate_context(_request(number))
+            assert response.metadata['timed_out_sources'] == ['hung_project']
+            assert list(response.context_data['summary']) == ['personal']
+        assert orchestrator.calls == {'hung_project': 1, 'personal': 5}
+        assert orchestrator.source_manager.source_health['hung_project']['busy_count'] == 4
+
+        # Once the call returns the source is queried again
+        orchestrator.release.set()
+        deadline = time.time() + 2
+        while 'hung_project' in orchestrator._in_flight and time.time() < deadline:
+            time.sleep(0.01)
+        response = orchestrator.orchestrate_context(_request(6))
+        assert not response.metadata['partial'] and orchestrator.calls['hung_project'] == 2
+    finally:
+        orchestrator.release.set()
+        orchestrator.close()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test the content-keyed LRU response cache of the ContextOrchestrator
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.intelligence.context_orchestrator import (
+    ContextOrchestrator, ContextRequest, ContextResponse, ContextResponseCache, ContextSource
+)
+from core.memory.database.brain_db import BrainDatabase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _source(source_id: str, source_type: str, tables=()) -> ContextSource:
+    return ContextSource(source_id=source_id, source_type=source_type, name=source_id, description='',
+                         priority=0.9, freshness=time.time(), reliability=0.95, metadata={'tables': list(tables)})
+
+
+def _request(request_id: str, **overrides) -> ContextRequest:
+    fields = dict(request_id=request_id, user_id='user1', context_type='immediate', scope='file',
+                  filters={'language': 'python', 'depth': 1}, priority=0.9, created_at=time.time())
+    fields.update(overrides)
+    return ContextRequest(**fields)
+
+
+def _response(request_id: str, payload: str = '') -> ContextResponse:
+    return ContextResponse(response_id='r', request_id=request_id, context_sources=['s'],
+                           context_data={'payload': payload}, relevance_score=1.0, confidence=1.0,
+                           freshness=1.0, orchestration_time=0.0, metadata={})
+
+
+def test_equal_requests_hit_and_source_changes_invalidate():
+    """Different request ids with the same content share an entry; table writes drop it"""
+    orchestrator = ContextOrchestrator()
+    orchestrator.register_context_source(_source('project_scanner', 'project', tables=['project_files']))
+    orchestrator.register_context_source(_source('personalization_engine', 'personal'))
+
+    first = orchestrator.orchestrate_context(_request('req_1'))
+    first.context_data['summary'].clear()  # Callers may mutate their copy
+    second = orchestrator.orchestrate_context(_request('req_2', filters={'depth': 1, 'language': 'python'}))
+    assert second.metadata.get('cache_hit') and second.request_id == 'req_2'
+    assert second.context_data['summary'] and second.context_sources == first.context_sources
+    assert not orchestrator.orchestrate_context(_request('req_3', scope='project')).metadata.get('cache_hit')
+
+    assert orchestrator.notify_tables_changed(['unrelated_table']) == 0
+    assert orchestrator.notify_tables_changed(['project_files']) == 2
+    assert not orchestrator.orchestrate_context(_request('req_4')).metadata.get('cache_hit')
+
+    stats = orchestrator.get_orchestration_stats()['cache']
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (1, 3, 2)
+    assert stats['cache_hit_rate'] == 0.25 and stats['cached_responses'] == 1
+
+
+def test_lru_eviction_ttl_and_byte_bound():
+    """Least recently used entries go first; expired and oversized entries are never served"""
+    clock = FakeClock()
+    cache = ContextResponseCache(max_entries=2, max_bytes=2000, clock=clock)
+    cache.put('a', _response('a'), 10, ['s'])
+    cache.put('b', _response('b'), 10, ['s'])
+    assert cache.get('a') is not None  # 'b' is now least recently used
+    cache.put('c', _response('c'), 10, ['s'])
+    assert cache.get('b') is None and cache.get('a') is not None
+
+    clock.now += 11
+    assert cache.get('a') is None and len(cache) == 1
+
+    assert not cache.put('big', _response('big', 'x' * 5000), 10, ['s'])
+    assert not cache.put('off', _response('off'), 0, ['s'])
+    cache.put('d', _response('d', 'x' * 700), 10, ['s'])
+    cache.put('e', _response('e', 'x' * 700), 10, ['s'])
+    assert cache.total_bytes <= 2000 and 'c' not in cache._entries
+
+    stats = cache.get_stats()
+    assert (stats['evictions'], stats['expired'], stats['rejected']) == (2, 1, 1)
+
+
+def test_invalidation_during_gathering_keeps_the_stale_response_out():
+    """A response gathered before its source was invalidated is not cached afterwards"""
+    cache = ContextResponseCache()
+    epoch = cache.epoch()
+    cache.invalidate_sources(['s'])  # a write lands while the sources are queried
+    assert not cache.put('a', _response('a'), 10, ['s'], epoch)
+    assert cache.put('b', _response('b'), 10, ['other'], epoch)
+    assert cache.put('a', _response('a'), 10, ['s'], cache.epoch())
+    cache.clear()
+    assert not cache.put('c', _response('c'), 10, ['other'], epoch)
+    assert cache.get_stats()['stale'] == 2
+
+
+def test_concurrent_invalidation_keeps_the_cache_consistent():
+    """Writer-thread invalidations racing with lookups and stores never corrupt the indexes"""
+    cache = ContextResponseCache(max_entries=50)
+    stop = threading.Event()
+
+    def invalidate():
+        while not stop.is_set():
+            cache.invalidate_sources([f"s{i}" for i in range(5)])
+
+    def use(i):
+        key = f"k{i % 80}"
+        cache.put(key, _response(key), 10, [f"s{i % 5}", 'shared'], cache.epoch())
+        cache.get(key)
+
+    invalidator = threading.Thread(target=invalidate)
+    invalidator.start()
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(use, range(4000)))
+    finally:
+        stop.set()
+        invalidator.join()
+
+    indexed = set().union(*cache._keys_by_source.values()) if cache._keys_by_source else set()
+    assert indexed == set(cache._entries)
+    assert cache.total_bytes == sum(entry[2] for entry in cache._entries.values())
+
+
+def test_brain_database_writes_invalidate_cached_responses(tmp_path):
+    """An attached BrainDatabase reports the tables each write changed"""
+    db = BrainDatabase(str(tmp_path / "brain.db"), pool_size=0)
+    orchestrator = ContextOrchestrator()
+    orchestrator.attach_database(db)
+    orchestrator.register_context_source(_source('personalization_engine', 'personal', tables=['conversation_memories']))
+    orchestrator.register_context_source(_source('knowledge_engine', 'knowledge', tables=['memory_chunks']))
+    try:
+        orchestrator.orchestrate_context(_request('req_1'))
+        assert orchestrator.orchestrate_context(_request('req_2')).metadata.get('cache_hit')
+
+        db.update_brain_state({'mood': 'curious'})  # No source reads brain_state
+        assert orchestrator.orchestrate_context(_request('req_3')).metadata.get('cache_hit')
+
+        db.store_conversation("hello", "hi there")
+        assert not orchestrator.orchestrate_context(_request('req_4')).metadata.get('cache_hit')
+        assert orchestrator.get_orchestration_stats()['cache']['invalidations'] == 1
+    finally:
+        orchestrator.close()
+        db.close()
+
+    db.store_conversation("after close", "not cached")
+    assert db._write_listeners == []
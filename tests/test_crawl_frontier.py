@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the heap-based crawl frontier and the concurrent crawl worker pool
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.engine.crawl_frontier import CrawlFrontier
+from web_crawler.engine.web_crawler_engine import WebCrawler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_priority_order_and_deduplication():
+    """Best URL comes first across hosts and duplicates are rejected"""
+    frontier = CrawlFrontier(default_delay=0, clock=FakeClock())
+    assert frontier.add("http://a.test/low", priority=0.2)
+    assert frontier.add("http://b.test/high", priority=0.9)
+    assert not frontier.add("http://a.test/low", priority=1.0)
+
+    assert frontier.pop_ready()[0] == "http://b.test/high"
+    assert frontier.pop_ready()[0] == "http://a.test/low"
+    assert frontier.get_stats()["duplicates"] == 1
+
+
+def test_host_is_not_refetched_before_its_delay():
+    """One request per host in flight, then a cooldown; other hosts proceed"""
+    clock = FakeClock()
+    frontier = CrawlFrontier(default_delay=2.0, clock=clock)
+    frontier.add("http://a.test/1", priority=0.9)
+    frontier.add("http://a.test/2", priority=0.8)
+    frontier.add("http://b.test/1", priority=0.1)
+
+    assert frontier.pop_ready()[0] == "http://a.test/1"
+    # a.test is busy, so the lower-priority host is served
+    assert frontier.pop_ready()[0] == "http://b.test/1"
+    assert frontier.pop_ready() is None
+
+    frontier.complete("http://a.test/1")
+    assert frontier.pop_ready() is None
+    assert frontier.next_ready_in() == 2.0
+
+    clock.now = 2.0
+    assert frontier.pop_ready()[0] == "http://a.test/2"
+    frontier.complete("http://a.test/2")
+    frontier.complete("http://b.test/1")
+    assert frontier.is_done()
+
+
+def test_host_delay_override():
+    """A per-host delay (e.g. robots.txt Crawl-delay) replaces the default"""
+    clock = FakeClock()
+    frontier = CrawlFrontier(default_delay=1.0, clock=clock)
+    frontier.set_host_delay("slow.test", 10.0)
+    frontier.add("http://slow.test/1")
+    frontier.add("http://slow.test/2")
+    frontier.complete(frontier.pop_ready()[0])
+    clock.now = 5.0
+    assert frontier.pop_ready() is None
+    assert frontier.next_ready_in() == 5.0
+
+
+def test_crawl_throughput_scales_with_workers(tmp_path, monkeypatch):
+    """Many hosts are fetched in parallel while each host keeps its delay"""
+    crawler = WebCrawler(str(tmp_path / "crawler.db"))
+    crawler.config.crawl_delay = 0.05
+    fetch_times = {}
+
+    async def fake_crawl(url, depth, priority, max_depth, session):
+        fetch_times.setdefault(CrawlFrontier.host_of(url), []).append(time.monotonic())
+        await asyncio.sleep(0.05)
+        if depth == 0:
+            return True, {f"http://host{h}.test/page{p}": 0.5 for h in range(8) for p in range(3)}
+        return True, {}
+
+    async def no_session():
+        return None
+
+    monkeypatch.setattr(crawler, "_crawl_frontier_url", fake_crawl)
+    monkeypatch.setattr(crawler, "start_session", no_session)
+    monkeypatch.setattr(crawler, "stop_session", no_session)
+
+    start = time.monotonic()
+    result = asyncio.run(crawler.crawl_website("http://seed.test/", max_pages=25,
+                                               max_concurrent_requests=8))
+    elapsed = time.monotonic() - start
+
+    assert result["total_pages"] == 25
+    # Serial crawling would need 25 * (fetch + delay) = 2.5s
+    assert elapsed < 1.0
+    for times in fetch_times.values():
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert all(gap >= 0.1 - 0.01 for gap in gaps)
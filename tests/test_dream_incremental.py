@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test the set-based, incremental dream cycle
+"""
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.brain.enhanced_dream_system import EnhancedDreamSystem
+
+TABLES = """
+CREATE TABLE learning_bits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_type TEXT, category TEXT, content TEXT,
+    importance_score REAL DEFAULT 0.5,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE cross_references (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_bit_id INTEGER, target_bit_id INTEGER,
+    relationship_type TEXT DEFAULT 'related', strength REAL DEFAULT 1.0
+);
+CREATE TABLE learning_relationships (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_bit_id INTEGER NOT NULL, target_bit_id INTEGER NOT NULL,
+    relationship_type TEXT NOT NULL, strength REAL DEFAULT 0.5,
+    bidirectional BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE context_enhancement_pipeline (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    trigger_type TEXT, source_id INTEGER, target_id INTEGER, relationship_type TEXT,
+    enhancement_type TEXT, status TEXT, priority INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def _database(tmp_path) -> str:
+    db_path = str(tmp_path / "brain.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(TABLES)
+        conn.executemany(
+            "INSERT INTO learning_bits (content_type, category, content, importance_score) VALUES (?, ?, ?, ?)",
+            [('concept', 'python', 'decorators', 0.75), ('example', 'python', 'closures', 0.6),
+             ('concept', 'python', 'generators', 0.8), ('tip', 'sql', 'indexes', 0.65)])
+        _add_references(conn, [(1, 2), (1, 3), (1, 3), (1, 3)])
+    return db_path
+
+
+def _add_references(conn, pairs):
+    conn.executemany("INSERT INTO cross_references (source_bit_id, target_bit_id, strength) VALUES (?, ?, 0.9)",
+                     pairs)
+
+
+def _importance(db_path: str, bit_id: int) -> float:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT importance_score FROM learning_bits WHERE id = ?", (bit_id,)).fetchone()[0]
+
+
+def test_dreams_only_process_new_rows(tmp_path):
+    """Cross-references boost importance once; a dream without new rows touches nothing"""
+    db_path = _database(tmp_path)
+    dream_system = EnhancedDreamSystem(db_path)
+
+    first = asyncio.run(dream_system.dream())
+    assert first['dream_state'] == 'enhanced_active'
+    assert _importance(db_path, 1) == 1.0  # 0.75 + 4 * 0.1, capped
+    assert first['consolidation_process']['consolidation_events'] == 1
+    assert first['pattern_analysis']['insights_generated'] == 1
+    assert first['relationship_enhancement']['relationships_created'] == 4
+    assert first['knowledge_synthesis']['synthesis_events'] == 1
+    assert all(stats['status'] == 'success' for stats in first['phase_stats'].values())
+
+    second = asyncio.run(dream_system.dream())
+    assert sum(stats['rows'] for stats in second['phase_stats'].values()) == 0
+    assert second['pattern_analysis']['insights_generated'] == 0
+
+    with sqlite3.connect(db_path) as conn:
+        _add_references(conn, [(4, 2)])
+    third = asyncio.run(dream_system.dream())
+    assert third['consolidation_process']['consolidation_events'] == 1
+    assert _importance(db_path, 4) == 0.75
+
+    # Phase stats and counters survive a restart
+    restarted = EnhancedDreamSystem(db_path)
+    assert restarted.dream_cycles == 3
+    assert restarted.last_phase_stats == third['phase_stats']
+
+
+def test_a_failing_phase_does_not_block_the_others(tmp_path):
+    """A phase whose SQL fails is rolled back alone and retried on the next dream"""
+    db_path = _database(tmp_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TABLE learning_relationships")
+    dream_system = EnhancedDreamSystem(db_path)
+
+    result = asyncio.run(dream_system.dream())
+    assert result['dream_state'] == 'enhanced_active'
+    assert result['phase_stats']['relationships']['status'] == 'failed'
+    assert result['phase_stats']['consolidation']['status'] == 'success'
+    assert _importance(db_path, 1) == 1.0
+
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(TABLES.split(';')[2] + ';')
+    retried = asyncio.run(dream_system.dream())
+    assert retried['relationship_enhancement']['relationships_created'] == 4
+    assert retried['consolidation_process']['consolidation_events'] == 0
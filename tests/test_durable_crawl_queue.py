@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test the SQLite-backed background crawl queue and resumable crawl frontiers
+"""
+
+import asyncio
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.engine.durable_queue import DurableCrawlQueue
+from web_crawler.engine.web_crawler_engine import BackgroundCrawlerManager, WebCrawler
+
+SCHEMA = Path(__file__).parent.parent / "core" / "memory" / "database" / "web_crawler_schema.sql"
+
+PARAGRAPH = ("Python functions are defined with the def keyword. A function groups reusable "
+             "logic, takes parameters and returns a value. For example, def add(a, b): return a + b "
+             "defines a function that adds two numbers. Always document what a function returns.")
+
+PAGES = {
+    '/': ['/a', '/b'],
+    '/a': ['/c'],
+    '/b': [],
+    '/c': [],
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _serve(hits: Counter):
+    async def handle(request):
+        if request.path not in PAGES:
+            raise web.HTTPNotFound()
+        hits[request.path] += 1
+        anchors = ''.join(f'<a href="{href}">Tutorial {href}</a>' for href in PAGES[request.path])
+        html = f"<html><head><title>{request.path}</title></head><body><p>{PARAGRAPH}</p>{anchors}</body></html>"
+        return web.Response(text=html, content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+def test_jobs_are_claimed_by_priority_and_leases_expire(tmp_path):
+    """Best job first; an unrenewed lease makes the job claimable again"""
+    clock = FakeClock()
+    queue = DurableCrawlQueue(str(tmp_path / "jobs.db"), visibility_timeout=60, clock=clock)
+    assert queue.enqueue_job("low", "https://a.test/", priority="low")
+    assert queue.enqueue_job("normal", "https://b.test/")
+    assert queue.enqueue_job("high", "https://c.test/", {"max_pages": 5}, priority="high")
+    assert not queue.enqueue_job("normal", "https://b.test/")
+    assert queue.queue_position("low") == 3
+
+    first = queue.claim_job()
+    assert (first["job_id"], first["config"]) == ("high", {"max_pages": 5})
+    clock.now += 30
+    assert queue.claim_job()["job_id"] == "normal"
+
+    # The owner of "high" dies; its lease expires and it is resumed before queued work
+    clock.now += 31
+    retaken = queue.claim_job()
+    assert (retaken["job_id"], retaken["attempts"]) == ("high", 2)
+    assert not queue.renew_job("high", first["lease"])
+    assert queue.renew_job("high", retaken["lease"])
+
+    assert queue.stop_job("low")
+    assert queue.claim_job() is None
+
+    assert queue.fail_job("high", retaken["lease"], "boom", retry=True, max_attempts=3)
+    assert queue.get_job("high")["status"] == "queued"
+    third = queue.claim_job()
+    assert queue.fail_job("high", third["lease"], "boom", retry=True, max_attempts=3)
+    assert queue.get_job("high")["status"] == "failed"
+    assert queue.get_stats() == {'queued': 0, 'running': 1, 'completed': 0, 'failed': 1, 'stopped': 1}
+
+
+def test_crashed_crawl_resumes_its_frontier(tmp_path):
+    """A crawl picked up after its owner died skips crawled pages and continues the pending ones"""
+    db_path = str(tmp_path / "crawler.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    clock = FakeClock()
+    queue = DurableCrawlQueue(db_path, visibility_timeout=60, clock=clock)
+    queue.enqueue_job("docs", "placeholder")
+    hits = Counter()
+
+    async def run():
+        runner, base_url = await _serve(hits)
+        try:
+            crawler = WebCrawler(db_path)
+            crawler.config.crawl_delay = 0.0
+            first_run = queue.checkpoint(queue.claim_job())
+            # The first run stops after two pages (as if the process died) without completing the job
+            await crawler.crawl_website(base_url + "/", max_pages=2, max_depth=3, checkpoint=first_run)
+
+            clock.now += 61
+            crawler = WebCrawler(db_path)
+            crawler.config.crawl_delay = 0.0
+            second_run = queue.checkpoint(queue.claim_job())
+            session = await crawler.crawl_website(base_url + "/", max_pages=10, max_depth=3,
+                                                  checkpoint=second_run)
+            return first_run, second_run, session
+        finally:
+            await runner.cleanup()
+
+    first_run, second_run, session = asyncio.run(run())
+
+    assert hits == Counter({'/': 1, '/a': 1, '/b': 1, '/c': 1})
+    assert session['resumed_pages'] == 2 and session['total_pages'] == 4
+    assert queue.get_job("docs")["pages_crawled"] == 4
+    assert not first_run.record("/stale", True, [])
+    assert first_run.lease_lost and not second_run.lease_lost
+
+
+def test_queued_jobs_survive_a_manager_restart(tmp_path):
+    """Jobs waiting for a slot are persisted and visible to the next manager"""
+    db_path = str(tmp_path / "crawler.db")
+
+    async def run():
+        manager = BackgroundCrawlerManager(db_path)
+        manager.max_concurrent_crawls = 0  # Every job has to wait
+        first = await manager.start_background_crawl("one", "http://127.0.0.1:9/", {"priority": "low"})
+        second = await manager.start_background_crawl("two", "http://127.0.0.1:9/", {"priority": "high"})
+        restarted = BackgroundCrawlerManager(db_path)
+        restarted.max_concurrent_crawls = 0
+        return first, second, restarted.get_crawl_status(), restarted.get_crawl_status("one")
+
+    first, second, overall, job = asyncio.run(run())
+    assert (first["status"], second["status"]) == ("queued", "queued")
+    assert overall["queued_jobs"] == ["two", "one"]
+    assert job["status"] == "queued"
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test the event-driven EvolutionScheduler timer heap
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# The evolution modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "core" / "evolution"))
+
+from evolution_scheduler import EvolutionScheduler
+
+
+class _Health:
+    performance_score = efficiency_score = intelligence_score = adaptability_score = 0.5
+
+
+class _Engine:
+    def get_system_health(self):
+        return _Health()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_due_tasks_dispatch_within_milliseconds():
+    """A delayed task starts right at its due time, not on the next poll"""
+    scheduler = EvolutionScheduler(_Engine())
+    scheduler.start_background_scheduling()
+    try:
+        task_id = scheduler.schedule_evolution_task({'type': 'performance', 'delay': 0.05})
+        assert scheduler.get_task_status(task_id)['status'] == 'scheduled'
+        assert _wait_for(lambda: scheduler.get_task_status(task_id)['status'] == 'completed')
+
+        status = scheduler.get_task_status(task_id)
+        assert status['timings']['dispatch_latency'] < 0.05
+        assert scheduler.get_scheduler_stats()['max_dispatch_latency_ms'] < 50
+    finally:
+        scheduler.stop_background_scheduling()
+
+
+def test_priority_wins_among_due_tasks():
+    """When several tasks are due, critical runs before low"""
+    scheduler = EvolutionScheduler(_Engine())
+    scheduler.max_concurrent_tasks = 1
+    order = []
+    original = scheduler._execute_task_by_type
+
+    def record(task):
+        order.append(task.task_data['priority'])
+        return original(task)
+
+    scheduler._execute_task_by_type = record
+    scheduler.schedule_evolution_task({'type': 'efficiency', 'priority': 'low'})
+    scheduler.schedule_evolution_task({'type': 'efficiency', 'priority': 'critical'})
+    scheduler.start_background_scheduling()
+    try:
+        assert _wait_for(lambda: len(order) == 2)
+        assert order == ['critical', 'low']
+    finally:
+        scheduler.stop_background_scheduling()
+
+
+def test_cancel_and_reschedule():
+    """Cancelled tasks never run; rescheduled tasks run at their new time"""
+    scheduler = EvolutionScheduler(_Engine())
+    scheduler.start_background_scheduling()
+    try:
+        cancelled = scheduler.schedule_evolution_task({'type': 'intelligence', 'delay': 0.1})
+        moved = scheduler.schedule_evolution_task({'type': 'adaptability', 'delay': 60})
+        assert scheduler.cancel_task(cancelled)
+        assert not scheduler.cancel_task(cancelled)
+        assert scheduler.reschedule_task(moved, delay=0)
+
+        assert _wait_for(lambda: scheduler.get_task_status(moved)['status'] == 'completed')
+        time.sleep(0.15)
+        assert scheduler.get_task_status(cancelled)['status'] == 'cancelled'
+        stats = scheduler.get_scheduler_stats()
+        assert stats['total_executed'] == 1
+        assert stats['total_cancelled'] == 1
+        assert stats['queue_sizes'] == {'high_priority': 0, 'normal_priority': 0, 'low_priority': 0}
+    finally:
+        scheduler.stop_background_scheduling()
+
+
+def test_stop_wakes_idle_workers_promptly():
+    """Idle workers block on the condition and exit as soon as they are stopped"""
+    scheduler = EvolutionScheduler(_Engine())
+    scheduler.start_background_scheduling()
+    time.sleep(0.05)
+    start = time.time()
+    scheduler.stop_background_scheduling()
+    assert time.time() - start < 0.5
+    assert not any(t.name.startswith("EvolutionWorker") for t in threading.enumerate())
+
+
+def test_due_tasks_move_to_the_ready_heap_once():
+    """Due entries leave the timer heap for good; cancelled ones are skipped in the ready heap"""
+    scheduler = EvolutionScheduler(_Engine())
+    priorities = ['low', 'normal', 'critical', 'high'] * 25
+    ids = [scheduler.schedule_evolution_task({'type': 'performance', 'priority': p}) for p in priorities]
+    scheduler.cancel_task(ids[2])  # One of the critical tasks
+
+    with scheduler._condition:
+        first = scheduler._pop_due_task(time.time() + 1)
+        assert scheduler._timer_heap == [] and len(scheduler._ready_heap) == 98
+        popped = [first] + [scheduler._pop_due_task(time.time() + 1) for _ in range(98)]
+        assert scheduler._pop_due_task(time.time() + 1) is None
+
+    assert ids[2] not in {task.task_id for task in popped}
+    assert [task.priority for task in popped] == sorted(task.priority for task in popped)
+    critical = [task.task_id for task in popped if task.priority == 1]
+    assert critical == [task_id for task_id, p in zip(ids, priorities) if p == 'critical' and task_id != ids[2]]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the robots.txt cache and conditional-GET revisits of the web crawler
+"""
+
+import asyncio
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.engine.web_crawler_engine import WebCrawler
+
+SCHEMA = Path(__file__).parent.parent / "core" / "memory" / "database" / "web_crawler_schema.sql"
+
+PARAGRAPH = ("Python functions are defined with the def keyword. A function groups reusable "
+             "logic, takes parameters and returns a value. For example, def add(a, b): return a + b "
+             "defines a function that adds two numbers. Always document what a function returns.")
+
+PAGES = {
+    '/': '<a href="/guide">Guide</a> <a href="/private/notes">Notes</a>',
+    '/guide': '<a href="/">Home</a>',
+    '/private/notes': '',
+}
+
+
+async def _serve(robots_txt: str, hits: Counter):
+    async def handle(request):
+        hits[request.path] += 1
+        if request.path == '/robots.txt':
+            return web.Response(text=robots_txt)
+        etag = f'"{request.path}-v1"'
+        if request.headers.get('If-None-Match') == etag:
+            hits['304 ' + request.path] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        html = (f"<html><head><title>{request.path}</title></head><body><p>{PARAGRAPH}</p>"
+                f"<p>{PARAGRAPH}</p>{PAGES[request.path]}</body></html>")
+        return web.Response(text=html, content_type='text/html', headers={'ETag': etag})
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+def _crawler(db_path: str) -> WebCrawler:
+    crawler = WebCrawler(db_path)
+    crawler.config.crawl_delay = 0.0
+    return crawler
+
+
+def test_robots_rules_and_crawl_delay_are_cached(tmp_path):
+    """robots.txt is fetched once per origin, persisted, and its Crawl-delay reaches the frontier"""
+    db_path = str(tmp_path / "crawler.db")
+    hits = Counter()
+
+    async def run():
+        runner, base_url = await _serve("User-agent: *\nDisallow: /private\nCrawl-delay: 2\n", hits)
+        try:
+            first = _crawler(db_path)
+            await first.start_session()
+            allowed = await first._can_crawl_domain(base_url[7:], base_url + "/guide")
+            blocked = await first._can_crawl_domain(base_url[7:], base_url + "/private/notes")
+            delay = first.crawl_queue.get_host_delay(base_url[7:])
+            await first.stop_session()
+
+            # A new crawler reuses the persisted rules without another request
+            second = _crawler(db_path)
+            await second.start_session()
+            still_blocked = not await second._can_crawl_domain(base_url[7:], base_url + "/private/x")
+            await second.stop_session()
+            return allowed, blocked, delay, still_blocked
+        finally:
+            await runner.cleanup()
+
+    allowed, blocked, delay, still_blocked = asyncio.run(run())
+    assert (allowed, blocked, delay, still_blocked) == (True, False, 2.0, True)
+    assert hits['/robots.txt'] == 1
+
+
+def test_revisits_skip_unchanged_pages(tmp_path):
+    """A second crawl gets 304s: no re-parse or re-extraction, but links are still followed"""
+    db_path = str(tmp_path / "crawler.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    hits = Counter()
+
+    async def run():
+        runner, base_url = await _serve("User-agent: *\nDisallow: /private\n", hits)
+        try:
+            await _crawler(db_path).crawl_website(base_url + "/", max_pages=10, max_depth=3)
+            with sqlite3.connect(db_path) as conn:
+                first_bits = conn.execute("SELECT COUNT(*) FROM learning_bits").fetchone()[0]
+            # A later recurring crawl with a fresh crawler
+            crawler = _crawler(db_path)
+            session = await crawler.crawl_website(base_url + "/", max_pages=10, max_depth=3)
+            return first_bits, crawler, session
+        finally:
+            await runner.cleanup()
+
+    first_bits, crawler, session = asyncio.run(run())
+
+    assert hits['/private/notes'] == 0 and hits['/robots.txt'] == 1
+    assert (hits['/'], hits['/guide']) == (2, 2)
+    assert (hits['304 /'], hits['304 /guide']) == (1, 1)
+    assert session['total_pages'] == 2 and session['not_modified_pages'] == 2
+    assert crawler.pipeline_stats['documents_parsed'] == 0
+    assert session['fetch_cache']['not_modified'] == 2
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM learning_bits").fetchone()[0] == first_bits > 0
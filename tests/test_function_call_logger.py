@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test the asynchronous, batched FunctionCallLogger
+"""
+
+import asyncio
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory.database.brain_db import BrainDatabase
+from core.memory.function_call_logger import FunctionCallLogger
+
+
+def _row_count(db_path: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM function_calls").fetchone()[0]
+
+
+def test_background_writer_batches_rows(tmp_path):
+    """Queued calls are written by the background thread in batches"""
+    db_path = str(tmp_path / "calls.db")
+    call_logger = FunctionCallLogger(db_path=db_path, batch_size=50)
+    call_logger.initialize()
+
+    for i in range(120):
+        assert call_logger.log_function_call(f"fn_{i}", "test", input_data={"i": i}, success=True) > 0
+    assert call_logger.flush()
+
+    stats = call_logger.get_logger_stats()
+    assert _row_count(db_path) == 120
+    assert stats["written"] == 120
+    assert stats["batches"] < 120
+    call_logger.shutdown()
+
+
+def test_payloads_are_captured_at_call_time_and_bad_rows_skipped(tmp_path):
+    """Mutating a payload after logging does not change the row; one unwritable row spares its batch"""
+    db_path = str(tmp_path / "calls.db")
+    call_logger = FunctionCallLogger(db_path=db_path, batch_size=10, flush_interval=0.05)
+    call_logger.initialize()
+
+    payload = {"items": [1]}
+    call_logger.log_function_call("first", "test", input_data=payload, success=True)
+    payload["items"].append("MUTATED AFTER CALL")
+    # sqlite cannot bind a dict, so this row fails on its own
+    call_logger.log_function_call("broken", "test", user_message={"not": "text"}, success=True)
+    call_logger.log_function_call("last", "test", success=True)
+    assert call_logger.flush()
+
+    with sqlite3.connect(db_path) as conn:
+        rows = dict(conn.execute("SELECT function_name, input_data FROM function_calls").fetchall())
+    assert rows.keys() == {"first", "last"}
+    assert rows["first"] == '{"items": [1]}'
+    stats = call_logger.get_logger_stats()
+    assert (stats["written"], stats["write_errors"]) == (2, 1)
+    call_logger.shutdown()
+
+
+def test_queue_overflow_drops_and_counts(tmp_path):
+    """A full queue drops new rows instead of blocking the caller"""
+    call_logger = FunctionCallLogger(db_path=str(tmp_path / "calls.db"), queue_size=2)
+    results = [call_logger.log_function_call("fn", "test", success=True) for _ in range(5)]
+    assert results[2:] == [0, 0, 0]
+    assert call_logger.get_logger_stats()["dropped"] == 3
+
+
+def test_database_operations_are_sampled_by_default(tmp_path, monkeypatch):
+    """Reads do not turn into a logged write each; the environment can raise the rate"""
+    monkeypatch.delenv("FUNCTION_LOG_SAMPLE_RATES", raising=False)
+    db_path = tmp_path / "brain.db"
+    db = BrainDatabase(str(db_path), pool_size=0)
+    db.set_memory_item("key", "value")
+    for _ in range(20):
+        db.get_memory_store()
+    db.close()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM function_calls").fetchone()[0] < 5
+
+    monkeypatch.setenv("FUNCTION_LOG_SAMPLE_RATES", "database_operation=0.5")
+    assert FunctionCallLogger(db_path=str(db_path))._sample_rates["database_operation"] == 0.5
+
+
+def test_sampling_skips_successes_but_keeps_failures(tmp_path):
+    """With a zero sample rate only failed calls are recorded"""
+    call_logger = FunctionCallLogger(db_path=str(tmp_path / "calls.db"),
+                                     sample_rates={"database_operation": 0.0})
+    assert not call_logger.should_sample("database_operation")
+    assert call_logger.should_sample("mcp_tool")
+    assert call_logger.should_sample("database_operation", sample_rate=1.0)
+    assert call_logger.get_logger_stats()["sampled_out"] == 1
+
+
+def test_nested_calls_reference_their_caller_ticket(tmp_path):
+    """A nested call stores the enclosing call's ticket as parent_call_ticket"""
+    db_path = str(tmp_path / "calls.db")
+    call_logger = FunctionCallLogger(db_path=db_path)
+    call_logger.initialize()
+
+    async def run():
+        async with call_logger.track_function_call("outer", "test"):
+            async with call_logger.track_function_call("inner", "test"):
+                pass
+    asyncio.run(run())
+    assert call_logger.flush()
+
+    with sqlite3.connect(db_path) as conn:
+        rows = dict((name, (ticket, parent, depth)) for name, ticket, parent, depth in conn.execute(
+            "SELECT function_name, call_ticket, parent_call_ticket, call_stack_depth FROM function_calls"))
+    assert rows["inner"][1] == rows["outer"][0] and rows["outer"][1] is None
+    assert (rows["outer"][2], rows["inner"][2]) == (0, 1)
+    call_logger.shutdown()
+
+
+def test_counters_and_tickets_are_thread_safe(tmp_path):
+    """Concurrent callers never share a ticket or lose a counter update"""
+    call_logger = FunctionCallLogger(db_path=str(tmp_path / "calls.db"))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tickets = list(pool.map(lambda i: call_logger.log_function_call("fn", "test", success=True), range(400)))
+    assert sorted(tickets) == list(range(1, 401))
+    assert call_logger.get_logger_stats()["enqueued"] == 400
+
+
+def test_database_operations_are_logged_into_the_instance_database(tmp_path, monkeypatch):
+    """Decorated BrainDatabase methods write to their own file, not the global brain database"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FUNCTION_LOG_SAMPLE_RATES", "database_operation=1.0")
+    db_path = str(tmp_path / "own" / "brain.db")
+    db = BrainDatabase(db_path, pool_size=0)
+    db.set_memory_item("key", "value")
+    db.close()
+
+    with sqlite3.connect(db_path) as conn:
+        names = [row[0] for row in conn.execute("SELECT function_name FROM function_calls")]
+    assert "set_memory_item" in names
+    assert not (tmp_path / "brain_memory_store").exists()
+
+
+def test_closing_a_database_stops_its_logger(tmp_path, monkeypatch):
+    """close() flushes the per-path logger and leaves no writer thread behind"""
+    monkeypatch.setenv("FUNCTION_LOG_SAMPLE_RATES", "database_operation=1.0")
+    def writers():
+        return sum(1 for thread in threading.enumerate() if thread.name == "function-call-writer")
+
+    before = writers()
+    for i in range(5):
+        db = BrainDatabase(str(tmp_path / f"brain_{i}.db"), pool_size=0)
+        db.set_memory_item("key", "value")
+        db.close()
+        with sqlite3.connect(db.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM function_calls").fetchone()[0] >= 1
+    assert writers() == before
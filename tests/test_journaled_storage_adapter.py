@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the append-only journaled storage adapter of the cognitive brain plugin
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from plugins.cognitive_brain_plugin.adapters.memory_adapter import (
+    JournaledStorageAdapter, JsonFileStorageAdapter
+)
+from plugins.cognitive_brain_plugin.schemas.memory_schema import MemoryChunk, ContextType
+
+
+def _chunk(chunk_id: str, content: str) -> MemoryChunk:
+    return MemoryChunk(id=chunk_id, content=content, context_type=ContextType.LEARNING)
+
+
+def test_writes_append_to_journal_without_rewriting_snapshot(tmp_path):
+    """Stores append journal lines; the snapshot is only written on compaction"""
+    adapter = JournaledStorageAdapter(str(tmp_path), compact_every=100)
+    adapter.store_memory_chunk(_chunk("a", "journaled write path"))
+    adapter.store_memory_chunk(_chunk("b", "second write"))
+
+    assert not (tmp_path / "memories.json").exists()
+    lines = (tmp_path / "memories.journal").read_text().splitlines()
+    assert [json.loads(line)["op"] for line in lines] == ["put", "put"]
+    adapter.close()
+
+
+def test_access_updates_are_coalesced(tmp_path):
+    """Repeated retrievals produce one access record per flush, not one write per call"""
+    adapter = JournaledStorageAdapter(str(tmp_path), access_flush_batch=1000, access_flush_interval=3600)
+    adapter.store_memory_chunk(_chunk("a", "hot memory"))
+    for _ in range(10):
+        adapter.retrieve_memory_chunk("a")
+    assert adapter.get_journal_stats()["appends"] == 1
+
+    adapter.flush_access_updates()
+    reloaded = JournaledStorageAdapter(str(tmp_path))
+    assert reloaded.retrieve_memory_chunk("a").access_count == 11
+    adapter.close()
+    reloaded.close()
+
+
+def test_recovery_replays_journal_and_drops_torn_tail(tmp_path):
+    """A crash mid-append loses only the torn record"""
+    adapter = JournaledStorageAdapter(str(tmp_path))
+    adapter.store_memory_chunk(_chunk("a", "survives the crash"))
+    adapter.close()
+    with open(tmp_path / "memories.journal", "a") as f:
+        f.write('{"seq": 99, "op": "put", "chunk": {"id": "tor')
+
+    recovered = JournaledStorageAdapter(str(tmp_path))
+    assert recovered.retrieve_memory_chunk("a").content == "survives the crash"
+    assert recovered.retrieve_memory_chunk("tor") is None
+    assert (tmp_path / "memories.journal").read_text().endswith("\n")
+    recovered.close()
+
+
+def test_compaction_produces_json_adapter_compatible_snapshot(tmp_path):
+    """After compaction the plain JSON adapter reads the same memories"""
+    adapter = JournaledStorageAdapter(str(tmp_path), compact_every=3)
+    for i in range(5):
+        adapter.store_memory_chunk(_chunk(f"m{i}", f"memory number {i}"))
+    adapter.compact()
+    assert (tmp_path / "memories.journal").stat().st_size == 0
+
+    plain = JsonFileStorageAdapter(str(tmp_path))
+    assert sorted(plain._memory_cache) == [f"m{i}" for i in range(5)]
+    adapter.close()
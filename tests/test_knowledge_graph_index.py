@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test the concept and adjacency indexes of the KnowledgeGraphBuilder
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.intelligence.knowledge_ingestion_engine import (
+    DocumentContext, KnowledgeGraphBuilder, KnowledgeIngestionEngine
+)
+
+
+def _doc(path: str, concepts, relationships=()):
+    return DocumentContext(path=path, title=path, content="", content_type="readme",
+                           extracted_concepts=list(concepts), relationships=list(relationships),
+                           metadata={}, processing_time=0.0)
+
+
+def test_concepts_are_shared_across_documents():
+    """Case-insensitive lookups reuse one node and track every source once"""
+    builder = KnowledgeGraphBuilder()
+    builder.add_document_context(_doc("a.md", ["SQLite", "Caching"]))
+    builder.add_document_context(_doc("b.md", ["sqlite"]))
+    builder.add_document_context(_doc("b.md", ["sqlite"]))
+
+    node_id = builder._get_concept_node_id("SQLITE")
+    assert node_id == builder._get_or_create_concept_node("sqlite", "a.md")
+    assert builder.nodes[node_id].metadata["sources"] == ["a.md", "b.md"]
+    assert len([n for n in builder.nodes.values() if n.type == "concept"]) == 2
+
+
+def test_adjacency_index_matches_relationships():
+    """Outgoing and incoming lists cover every relationship exactly once"""
+    builder = KnowledgeGraphBuilder()
+    builder.add_document_context(_doc("a.md", ["Pool", "WAL"],
+                                      [{"source": "Pool", "type": "uses"}]))
+    pool_id = builder._get_concept_node_id("pool")
+
+    assert [r.relationship_type for r in builder.get_outgoing_relationships(pool_id)] == ["uses"]
+    assert [r.relationship_type for r in builder.get_incoming_relationships(pool_id)] == ["contains"]
+    assert sum(len(v) for v in builder.outgoing.values()) == len(builder.relationships)
+    assert sum(len(v) for v in builder.incoming.values()) == len(builder.relationships)
+
+
+def test_search_concepts_returns_related_nodes():
+    """search_concepts follows the adjacency index to related nodes"""
+    engine = KnowledgeIngestionEngine()
+    engine.graph_builder.add_document_context(_doc("guide.md", ["Connection Pool"],
+                                                   [{"source": "Connection Pool", "type": "documents"}]))
+    engine.knowledge_graph = engine.graph_builder.build_knowledge_graph()
+
+    results = engine.search_concepts("pool")
+    assert len(results) == 1
+    assert results[0]["related"] == [{"id": "doc_0", "name": "guide.md", "type": "document",
+                                      "relationship": "documents"}]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test manifest-driven lazy plugin loading and single-plugin reload
+"""
+
+import asyncio
+import inspect
+import sys
+from pathlib import Path
+
+# Add project root and src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from lazy_loading import LazyComponent
+from plugin_manager import LazyPlugin, PluginManager
+
+PLUGIN_TEMPLATE = '''
+from pathlib import Path
+from plugin_interface import BasePlugin, PluginMetadata, ToolDefinition
+
+with open(Path(__file__).with_suffix(".imports"), "a") as log:
+    log.write("x")
+
+
+class {cls}(BasePlugin):
+    @property
+    def metadata(self):
+        return PluginMetadata(name="{name}", version="1.0.0", description="{name} plugin")
+
+    def get_tools(self):
+        return [
+            ToolDefinition(name="{name}_echo", description="Echo", handler=self.echo),
+            ToolDefinition(name="{name}_shout", description="Shout", handler=self.shout),
+        ]
+
+    def echo(self, text: str, times: int = 1) -> str:
+        return "{prefix}" + text * times
+
+    async def shout(self, text: str) -> str:
+        return text.upper()
+'''
+
+
+def _write_plugin(directory: Path, name: str, prefix: str = "") -> Path:
+    path = directory / f"{name}.py"
+    path.write_text(PLUGIN_TEMPLATE.format(cls=name.title() + "Plugin", name=name, prefix=prefix))
+    return path
+
+
+def _imports(directory: Path, name: str) -> int:
+    log = directory / f"{name}.imports"
+    return len(log.read_text()) if log.exists() else 0
+
+
+def _manager(directory: Path) -> PluginManager:
+    manager = PluginManager([str(directory)], lazy=True, manifest_path=str(directory / "manifest.json"))
+    manager.load_all_plugins()
+    return manager
+
+
+def test_plugins_load_from_the_manifest_on_first_call(tmp_path):
+    """The second start imports nothing until a tool is called"""
+    _write_plugin(tmp_path, "alpha")
+    _write_plugin(tmp_path, "beta")
+    first = _manager(tmp_path)
+    assert (_imports(tmp_path, "alpha"), _imports(tmp_path, "beta")) == (1, 1)
+    assert first.registry.tools["alpha_echo"].handler("hi") == "hi"
+
+    second = _manager(tmp_path)
+    assert sorted(second.registry.tools) == ["alpha_echo", "alpha_shout", "beta_echo", "beta_shout"]
+    assert isinstance(second.registry.get_plugin("alpha"), LazyPlugin)
+    assert (_imports(tmp_path, "alpha"), _imports(tmp_path, "beta")) == (1, 1)
+
+    echo = second.registry.tools["alpha_echo"].handler
+    assert str(inspect.signature(echo)) == "(text: str, times: int = 1)"
+    assert echo("ab", times=2) == "abab"
+    assert asyncio.run(second.registry.tools["alpha_shout"].handler("hi")) == "HI"
+    assert _imports(tmp_path, "alpha") == 2 and _imports(tmp_path, "beta") == 1
+
+    report = second.get_load_report()
+    assert report["lazy_plugins"] == ["alpha", "beta"] and report["loaded_lazy_plugins"] == ["alpha"]
+    assert any(entry["kind"] == "plugin" and "alpha" in entry["name"] for entry in report["entries"])
+
+
+def test_changed_files_and_reloads_are_imported_again(tmp_path):
+    """A stale manifest entry falls back to eager loading; reload only touches one plugin"""
+    _write_plugin(tmp_path, "alpha")
+    _write_plugin(tmp_path, "beta")
+    _manager(tmp_path)
+
+    _write_plugin(tmp_path, "alpha", prefix="v2:")
+    manager = _manager(tmp_path)
+    assert _imports(tmp_path, "alpha") == 2 and _imports(tmp_path, "beta") == 1
+    assert not isinstance(manager.registry.get_plugin("alpha"), LazyPlugin)
+
+    _write_plugin(tmp_path, "alpha", prefix="v3:")
+    manager.reload_plugin("alpha")
+    assert manager.registry.tools["alpha_echo"].handler("x") == "v3:x"
+    assert _imports(tmp_path, "beta") == 1
+
+    # The refreshed manifest lets the next start be lazy again
+    restarted = _manager(tmp_path)
+    assert isinstance(restarted.registry.get_plugin("alpha"), LazyPlugin)
+    assert restarted.registry.tools["alpha_echo"].handler("y") == "v3:y"
+
+
+def test_lazy_component_reports_failed_builds_without_raising():
+    """try_resolve returns None and records the error; a later successful build clears it"""
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("missing dependency")
+        return "system"
+
+    component = LazyComponent("Demo", factory)
+    assert component.state == "not loaded" and not component.loaded
+    assert component.try_resolve() is None
+    assert component.failed and component.error == "missing dependency"
+    assert component.try_resolve() == "system"
+    assert component.state == "loaded" and component.error is None and len(attempts) == 2
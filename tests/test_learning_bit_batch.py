@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test batched, transactional learning-bit persistence of the web crawler
+"""
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.engine.web_crawler_engine import LearningBit, WebCrawler
+
+SCHEMA = Path(__file__).parent.parent / "core" / "memory" / "database" / "web_crawler_schema.sql"
+
+CROSS_REFERENCES = """
+    CREATE TABLE cross_references (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_bit_id INTEGER, target_bit_id INTEGER,
+        source_type TEXT, target_type TEXT, relationship_type TEXT,
+        strength REAL, created_at TIMESTAMP,
+        UNIQUE(source_bit_id, target_bit_id, relationship_type)
+    )
+"""
+
+
+def _crawler(tmp_path) -> WebCrawler:
+    db_path = str(tmp_path / "crawler.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA.read_text())
+        conn.execute(CROSS_REFERENCES)
+        conn.execute("INSERT INTO crawled_pages (id, url, content, domain) "
+                     "VALUES (1, 'https://docs.example/a', 'page', 'docs.example')")
+    return WebCrawler(db_path)
+
+
+def _bit(n: int, content_type: str = "concept", complexity: str = "moderate") -> LearningBit:
+    return LearningBit(content_hash=f"hash-{n}", content_type=content_type, category="programming",
+                       subcategory="python", content=f"learning bit {n}", context="", importance_score=0.8,
+                       confidence_score=0.9, source_url="https://docs.example/a", tags=["python"],
+                       complexity_level=complexity)
+
+
+def _rows(crawler: WebCrawler, sql: str):
+    with sqlite3.connect(crawler.db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_batch_dedups_hashes_and_counts_references(tmp_path):
+    """Repeats inside and across batches bump reference_count instead of inserting"""
+    crawler = _crawler(tmp_path)
+    ids = asyncio.run(crawler._store_learning_bits([_bit(1), _bit(2), _bit(1)], page_id=1))
+    assert set(ids) == {"hash-1", "hash-2"}
+    known = crawler._known_hashes
+
+    asyncio.run(crawler._store_learning_bits([_bit(2), _bit(3)], page_id=1))
+    assert crawler._known_hashes is known  # Preloaded once, then maintained in memory
+    counts = dict(_rows(crawler, "SELECT content_hash, reference_count FROM learning_bits"))
+    assert counts == {"hash-1": 1, "hash-2": 1, "hash-3": 0}
+
+
+def test_cross_references_are_bidirectional_and_skip_self(tmp_path):
+    """Each bit links to the best candidates of its batch and the store, never to itself"""
+    crawler = _crawler(tmp_path)
+    bits = [_bit(1), _bit(2, "example"), _bit(3, complexity="beginner")]
+    ids = asyncio.run(crawler._store_learning_bits(bits, page_id=1))
+
+    pairs = set(_rows(crawler, "SELECT source_bit_id, target_bit_id FROM cross_references"))
+    assert pairs
+    assert all(source != target for source, target in pairs)
+    assert all((target, source) in pairs for source, target in pairs)
+    assert (ids["hash-1"], ids["hash-3"]) in pairs
+
+
+def test_domain_context_is_cached_for_the_session(tmp_path):
+    """The domain query runs once; newly stored bits join the cached context"""
+    crawler = _crawler(tmp_path)
+    url = "https://docs.example/b"
+    assert asyncio.run(crawler._get_previous_learning_bits_for_domain(url)) == []
+
+    asyncio.run(crawler._store_learning_bits([_bit(1)], page_id=1))
+    with sqlite3.connect(crawler.db_path) as conn:
+        conn.execute("DELETE FROM crawled_pages")  # A fresh query would now find nothing
+    context = asyncio.run(crawler._get_previous_learning_bits_for_domain(url))
+    assert [bit.content_hash for bit in context] == ["hash-1"]
+
+    asyncio.run(crawler.stop_session())
+    assert crawler._domain_context == {} and crawler._known_hashes is None
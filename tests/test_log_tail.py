@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test reverse block-seek log tailing, the incremental log index and cached row counts
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory.database.brain_db import BrainDatabase
+from core.memory.database.row_counters import ensure_row_counters, get_row_counts, refresh_row_counts
+from utils.log_tail import INDEX_FILENAME, LogIndex, collect_log_tail, tail_log
+
+
+def _record(minute: int, level: str, message: str) -> str:
+    return f"2026-10-16 12:{minute:02d}:00,000 - {level} - {message}\n"
+
+
+def test_tail_reads_across_block_boundaries_and_filters_whole_records(tmp_path):
+    """Tiny blocks split lines everywhere; tracebacks stay with their header"""
+    log = tmp_path / "app.log"
+    log.write_text(
+        _record(0, "INFO", "started")
+        + _record(1, "DEBUG", "noise")
+        + _record(2, "ERROR", "failed")
+        + "Traceback (most recent call last):\n  boom\n\n"
+        + _record(3, "INFO", "recovered")
+    )
+
+    assert tail_log(str(log), 3, block_size=7) == ["Traceback (most recent call last):", "boom",
+                                                  "2026-10-16 12:03:00,000 - INFO - recovered"]
+    errors = tail_log(str(log), 10, min_level=40, block_size=7)
+    assert errors == ["2026-10-16 12:02:00,000 - ERROR - failed", "Traceback (most recent call last):", "boom"]
+    window = tail_log(str(log), 10, min_level=20, since=datetime(2026, 10, 16, 12, 1),
+                      until=datetime(2026, 10, 16, 12, 2), block_size=7)
+    assert window[0].endswith("ERROR - failed") and len(window) == 3
+
+
+def test_index_is_extended_incrementally_and_survives_rotation(tmp_path):
+    """Appends are scanned from the last offset; a rotated file keeps its entry and is skipped by range"""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    current = log_dir / "app.log"
+    current.write_text("".join(_record(m, "INFO", f"line {m}") for m in range(10)))
+
+    index = LogIndex(str(log_dir / INDEX_FILENAME), stride=64)
+    entry = index.update([str(current)])[str(current)]
+    assert entry["scanned"] == current.stat().st_size and entry["last"] == "2026-10-16T12:09:00"
+    assert len(entry["checkpoints"]) > 1
+
+    with open(current, "a") as f:
+        f.write(_record(10, "INFO", "line 10") + "2026-10-16 12:11:00,000 - INFO - partial")
+    entry = index.update([str(current)])[str(current)]
+    assert entry["last"] == "2026-10-16T12:10:00" and entry["scanned"] < current.stat().st_size
+
+    # Rotate: the old file is renamed, a new one started
+    rotated = log_dir / "app.log.1"
+    os.rename(current, rotated)
+    os.utime(rotated, (0, 0))
+    current.write_text(_record(30, "INFO", "after rotation") + _record(31, "WARNING", "careful"))
+    key = next(iter(index.files))
+
+    result = collect_log_tail(str(log_dir), 100, min_level="INFO", since=datetime(2026, 10, 16, 12, 20))
+    assert result["lines"] == [_record(30, "INFO", "after rotation").strip(), _record(31, "WARNING", "careful").strip()]
+    assert result["skipped_files"] == [str(rotated)]
+
+    saved = json.loads((log_dir / INDEX_FILENAME).read_text())
+    assert saved["files"][key]["path"] == str(rotated) and len(saved["files"]) == 2
+
+    everything = collect_log_tail(str(log_dir), 4)["lines"]
+    assert [line.split(" - ")[-1] for line in everything] == ["line 10", "partial", "after rotation", "careful"]
+
+
+def test_row_counts_are_maintained_by_triggers(tmp_path):
+    """Reads never create counters; once the schema sets them up, triggers keep them current"""
+    with sqlite3.connect(tmp_path / "brain.db") as conn:
+        conn.execute("CREATE TABLE learning_bits (id INTEGER PRIMARY KEY, content TEXT)")
+        conn.executemany("INSERT INTO learning_bits (content) VALUES (?)", [("a",), ("b",)])
+        assert get_row_counts(conn) == {"learning_bits": 2, "cross_references": 0}
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '%row_count%'").fetchall() == []
+
+        assert ensure_row_counters(conn) == ["learning_bits"]
+        conn.execute("INSERT INTO learning_bits (content) VALUES ('c')")
+        conn.execute("DELETE FROM learning_bits WHERE content = 'a'")
+        conn.execute("INSERT OR IGNORE INTO learning_bits (id, content) VALUES (2, 'dup')")
+        assert get_row_counts(conn)["learning_bits"] == 2
+
+        # A table created after the counters falls back to COUNT(*) until it gets one
+        conn.execute("CREATE TABLE cross_references (id INTEGER PRIMARY KEY)")
+        conn.execute("INSERT INTO cross_references DEFAULT VALUES")
+        assert get_row_counts(conn)["cross_references"] == 1
+        assert refresh_row_counts(conn) == {"learning_bits": 2, "cross_references": 1}
+        conn.execute("INSERT INTO cross_references DEFAULT VALUES")
+        assert get_row_counts(conn) == {"learning_bits": 2, "cross_references": 2}
+
+
+def test_brain_database_creates_row_counters_with_its_schema(tmp_path):
+    """Counters for existing crawler tables are installed when BrainDatabase initializes"""
+    db_path = tmp_path / "brain.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE learning_bits (id INTEGER PRIMARY KEY, content TEXT)")
+        conn.execute("INSERT INTO learning_bits (content) VALUES ('a')")
+    BrainDatabase(str(db_path), pool_size=0).close()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT row_count FROM table_row_counts WHERE table_name = 'learning_bits'").fetchone() == (1,)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test BM25-ranked full-text search across brain memory tables
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory.database.brain_db import BrainDatabase
+from core.memory.database.search_index import build_match_query
+
+
+def test_match_query_is_sanitized():
+    """Free text becomes quoted tokens with a trailing prefix match"""
+    assert build_match_query('what is "python"?') == '"what" "is" "python"*'
+    assert build_match_query("?!") is None
+
+
+def test_index_follows_inserts_updates_and_deletes(tmp_path):
+    """Triggers keep memory_store_fts in sync with the base table"""
+    db = BrainDatabase(str(tmp_path / "brain.db"))
+    db.set_memory_item("topic", "python decorators wrap functions")
+    assert [r["key"] for r in db.search_memory_store("decorators")] == ["topic"]
+
+    db.set_memory_item("topic", "rust ownership rules")
+    assert db.search_memory_store("decorators") == []
+    assert [r["key"] for r in db.search_memory_store("ownership")] == ["topic"]
+
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("DELETE FROM memory_store WHERE key = 'topic'")
+    assert db.search_memory_store("ownership") == []
+    db.close()
+
+
+def test_emotional_weight_breaks_relevance_ties(tmp_path):
+    """Equally relevant rows are ordered by emotional weight"""
+    db = BrainDatabase(str(tmp_path / "brain.db"))
+    db.set_memory_item("low", "sqlite tuning notes", emotional_weight="low")
+    db.set_memory_item("critical", "sqlite tuning notes", emotional_weight="critical")
+    assert [r["key"] for r in db.search_memory_store("sqlite")] == ["critical", "low"]
+    db.close()
+
+
+def test_unified_search_and_rebuild_for_existing_rows(tmp_path):
+    """Rows written before the index existed are found after a rebuild"""
+    db_path = str(tmp_path / "brain.db")
+    db = BrainDatabase(db_path)
+    db.store_memory_chunk("chunk", "asyncio event loop internals", context_type="code")
+    db.store_conversation("how does the asyncio loop work", "it polls selectors")
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TABLE memory_chunks_fts")
+    db.rebuild_search_index(["memory_chunks"])
+
+    sources = {r["source"] for r in db.search_all("asyncio")}
+    assert sources == {"memory_chunks", "conversation_memories"}
+    db.close()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the single-parse page-processing pipeline of the web crawler
+"""
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.engine.web_crawler_engine import WebCrawler
+
+SCHEMA = Path(__file__).parent.parent / "core" / "memory" / "database" / "web_crawler_schema.sql"
+
+PARAGRAPH = ("Python functions are defined with the def keyword. A function groups reusable "
+             "logic, takes parameters and returns a value. For example, def add(a, b): return a + b "
+             "defines a function that adds two numbers. Always document what a function returns.")
+
+
+def _page(title: str, links) -> str:
+    anchors = ''.join(f'<a href="{href}" title="Tutorial">{text}</a>' for href, text in links)
+    return (f"<html><head><title>{title}</title><style>p {{}}</style></head><body>"
+            f"<h1>{title}</h1><p>{PARAGRAPH}</p><p>{PARAGRAPH}</p><nav>{anchors}</nav>"
+            f"<script>var tracking = 1;</script></body></html>")
+
+
+PAGES = {
+    '/': _page("Home", [('/docs/guide', 'Guide'), ('/docs/api', 'API reference'), ('mailto:x@y.z', 'Mail')]),
+    '/docs/guide': _page("Guide", [('/', 'Home')]),
+    '/docs/api': _page("API", [('/docs/guide#intro', 'Intro')]),
+}
+
+
+async def _serve():
+    async def handle(request):
+        if request.path not in PAGES:
+            raise web.HTTPNotFound()  # Including /robots.txt: everything may be crawled
+        return web.Response(text=PAGES[request.path], content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+def test_process_page_parses_once_and_times_stages(tmp_path):
+    """Title, text and links come from one parsed tree"""
+    crawler = WebCrawler(str(tmp_path / "crawler.db"))
+    page = crawler._process_page(PAGES['/'], "https://example.com/", link_depth=1)
+
+    assert crawler.pipeline_stats['documents_parsed'] == 1
+    assert page.title == "Home"
+    assert "def keyword" in page.content and "tracking" not in page.content
+    assert set(page.links) == {"https://example.com/docs/guide", "https://example.com/docs/api"}
+    assert set(page.timings) == {'parse', 'text', 'title', 'links'}
+
+    # The standalone helpers still accept raw HTML
+    assert crawler._extract_title("<html><body><h1> Heading </h1></body></html>") == "Heading"
+    assert crawler._extract_links(PAGES['/docs/api'], "https://example.com/docs/api") == []
+    assert crawler._extract_title("") == "Untitled"
+
+
+def test_crawl_website_extracts_learning_bits_once_per_page(tmp_path):
+    """Pages are parsed once and learning bits are not re-extracted by the crawl loop"""
+    db_path = str(tmp_path / "crawler.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    crawler = WebCrawler(db_path)
+    crawler.config.crawl_delay = 0.0
+    extractions = []
+    original = crawler._extract_learning_bits
+
+    async def counting_extract(content, url, page_id):
+        extractions.append(url)
+        return await original(content, url, page_id)
+
+    crawler._extract_learning_bits = counting_extract
+
+    async def run():
+        runner, base_url = await _serve()
+        try:
+            return base_url, await crawler.crawl_website(base_url + "/", max_pages=10, max_depth=3)
+        finally:
+            await runner.cleanup()
+
+    base_url, session = asyncio.run(run())
+
+    assert session['total_pages'] == 3
+    assert sorted(extractions) == sorted(base_url + path for path in PAGES)
+    assert crawler.pipeline_stats['documents_parsed'] == 3
+    assert {'fetch', 'parse', 'text', 'title', 'learning_bits'} <= set(session['stage_timings_ms'])
+    assert crawler.get_pipeline_stats()['pages'] == 3
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the single-pass PatternClassifier against per-pattern regex matching
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.pattern_classifier import PatternClassifier, literal_alternatives
+from web_crawler.engine.web_crawler_engine import ContentAnalyzer
+from plugins.cognitive_brain_plugin.modules.emotion_tagger import EmotionTagger
+
+TEXTS = [
+    "Getting started: a step-by-step tutorial for the advanced beginner, e.g. how to install pip.",
+    "WARNING ⚠️ never use eval(); it's deprecated. Here's how to fix the Error message 💡 instead.",
+    "Compare Python vs JavaScript: pros and cons, trade-off of c++ and node. See index.py and app.js",
+    "```python\nprint('x')\n``` step 12 then 1. 2. 3. first, second, finally the API endpoint",
+    "urgent!! fail fail error error problem issue - a new, novel and unique experiment",
+]
+
+
+def _families():
+    analyzer = ContentAnalyzer()
+    return {
+        'content_type': analyzer.content_patterns,
+        'category': analyzer.category_patterns,
+        'subcategory': analyzer.subcategory_patterns,
+        'complexity': analyzer.complexity_patterns,
+    }
+
+
+def test_literal_alternatives_decomposition():
+    """Keyword lists decompose into literals; irregular patterns are left alone"""
+    assert literal_alternatives(r'\b(?:how to|steps to)\b') == (True, True, ['how to', 'steps to'])
+    assert literal_alternatives(r'\.py\b') == (False, True, ['.py'])
+    assert literal_alternatives(r'⚠️|🚨') == (False, False, ['⚠️', '🚨'])
+    assert literal_alternatives(r'\b(?:1\.|step \d+)\b') is None
+    assert literal_alternatives(r'\bfoo|bar\b') is None
+
+
+def test_counts_match_per_pattern_findall():
+    """Every pattern count equals re.findall on the lowercased text"""
+    families = _families()
+    classifier = PatternClassifier(families)
+    for text in TEXTS:
+        scan = classifier.scan(text)
+        for family, labels in families.items():
+            for label, patterns in labels.items():
+                expected = [len(re.findall(p, text.lower(), re.IGNORECASE)) for p in patterns]
+                assert scan.pattern_counts(family, label) == expected, (family, label, text)
+
+
+def test_emotion_tagger_scores_share_one_scan():
+    """Emotion, importance and urgency scoring of the same content reuse one pass"""
+    tagger = EmotionTagger(None)
+    content = TEXTS[4]
+    emotions = tagger._detect_emotional_patterns(content)
+    tagger._calculate_importance_score(content)
+    tagger._calculate_urgency_score(content)
+
+    legacy_critical = sum(len(re.findall(p, content.lower())) for p in
+                          tagger.emotion_patterns[next(iter(tagger.emotion_patterns))])
+    assert emotions[next(iter(tagger.emotion_patterns))] == min(1.0, legacy_critical * 0.2)
+    assert tagger.classifier.stats == {'scans': 1, 'cache_hits': 2}
+
+
+def test_classifier_users_do_not_import_the_intelligence_package():
+    """The classifier's users load without pulling in core.intelligence and numpy"""
+    code = (
+        "import sys\n"
+        "import web_crawler.engine.web_crawler_engine\n"
+        "import plugins.cognitive_brain_plugin.modules.emotion_tagger\n"
+        "import plugins.cognitive_brain_plugin.modules.context_analyzer\n"
+        "print(any(m.startswith('core.intelligence') for m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
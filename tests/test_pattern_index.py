@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized pattern similarity index of the DeepLearningEngine
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.intelligence.ai_integration_engine import DeepLearningEngine
+from core.intelligence.pattern_index import PatternIndex
+
+
+def test_matches_scalar_cosine_similarity():
+    """Matrix results equal the original pairwise cosine computation"""
+    engine = DeepLearningEngine()
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        values = {f"k{i}": float(v) for i, v in enumerate(rng.random(6))}
+        engine.learn_pattern({"input": values, "output": {}})
+
+    query = engine._extract_features({"a": 0.5, "b": 0.2, "c": 0.9})
+    expected = sorted(
+        ((pid, engine._calculate_similarity(query, emb)) for pid, emb in engine.pattern_embeddings.items()),
+        key=lambda item: item[1], reverse=True
+    )
+    expected = [item for item in expected if item[1] >= 0.5]
+
+    results = engine.find_similar_patterns(query, threshold=0.5)
+    assert [pid for pid, _ in results] == [pid for pid, _ in expected]
+    assert np.allclose([s for _, s in results], [s for _, s in expected], atol=1e-5)
+
+    top = engine.find_similar_patterns(query, threshold=0.0, top_k=3)
+    assert [pid for pid, _ in top] == [pid for pid, _ in expected[:3]]
+
+
+def test_pattern_ids_do_not_collide():
+    """Patterns learned within the same second keep distinct IDs"""
+    engine = DeepLearningEngine()
+    ids = {engine.learn_pattern({"input": {"x": i}}).pattern_id for i in range(20)}
+    assert len(ids) == 20
+    assert len(engine.pattern_index) == 20
+
+
+def test_remove_and_batch_queries():
+    """Removal keeps rows contiguous and batches answer each query"""
+    index = PatternIndex(3, initial_capacity=1)
+    index.upsert("x", [1, 0, 0])
+    index.upsert("y", [0, 1, 0])
+    index.upsert("z", [0, 0, 1])
+    assert index.remove("x")
+    assert index.ids == ["z", "y"]
+
+    results = index.query_batch([[0, 1, 0], [0, 0, 2]], threshold=0.9)
+    assert results == [[("y", 1.0)], [("z", 1.0)]]
+    assert index.query([0, 0, 0], threshold=0.1) == []
+
+
+def test_persisted_index_is_memory_mapped(tmp_path):
+    """A saved index reloads as a memory map and becomes writable on update"""
+    path = str(tmp_path / "patterns")
+    engine = DeepLearningEngine(index_path=path)
+    pattern = engine.learn_pattern({"input": {"x": 3, "y": 4}})
+    assert engine.save_pattern_index()
+
+    reloaded = DeepLearningEngine(index_path=path)
+    assert isinstance(reloaded.pattern_index.matrix, np.memmap)
+    assert reloaded.find_similar_patterns(pattern.input_features, threshold=0.99)[0][0] == pattern.pattern_id
+
+    reloaded.pattern_index.upsert("extra", [1.0] * reloaded.feature_dimensions)
+    assert len(reloaded.pattern_index) == 2
+
+
+def test_patterns_are_restored_with_the_index(tmp_path):
+    """Reloading brings back the patterns and embeddings the index refers to"""
+    path = str(tmp_path / "patterns")
+    engine = DeepLearningEngine(index_path=path)
+    learned = [engine.learn_pattern({"input": {"x": i, "y": 1}, "type": "workflow"}) for i in range(3)]
+    assert engine.save_pattern_index()
+
+    reloaded = DeepLearningEngine(index_path=path)
+    assert reloaded.neural_patterns == engine.neural_patterns
+    assert reloaded.pattern_embeddings == engine.pattern_embeddings
+    best = reloaded.find_similar_patterns(learned[2].input_features, threshold=0.99)[0][0]
+    assert reloaded.neural_patterns[best].pattern_type == "workflow"
+
+    # A matrix that no longer matches the saved patterns is rebuilt from the embeddings
+    stale = DeepLearningEngine()
+    stale.learn_pattern({"input": {"z": 1}})
+    stale.save_pattern_index(path + "_stale")
+    (tmp_path / "patterns_stale.npy").replace(tmp_path / "patterns.npy")
+    (tmp_path / "patterns_stale.ids.json").replace(tmp_path / "patterns.ids.json")
+    rebuilt = DeepLearningEngine(index_path=path)
+    assert sorted(rebuilt.pattern_index.ids) == sorted(engine.neural_patterns)
+    assert not isinstance(rebuilt.pattern_index.matrix, np.memmap)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test incremental project scanning with the persisted stat manifest
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.intelligence.project_scanner import ProjectScanner
+
+
+def _make_project(root: Path):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "a.py").write_text("import os\n")
+    (root / "pkg" / "b.py").write_text("def f():\n    return 1\n")
+    (root / "README.md").write_text("# demo\n")
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path):
+    """A second scan reuses every file whose stat signature is unchanged"""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    scanner = ProjectScanner(str(project), index_path=str(tmp_path / "index.json"))
+
+    first = scanner.scan_project()
+    assert first.changes["rehashed"] == 3
+    assert sorted(first.changes["added"]) == ["README.md", "pkg/a.py", "pkg/b.py"]
+
+    second = scanner.scan_project()
+    assert second.changes["rehashed"] == 0
+    assert second.changes["unchanged"] == 3
+    assert second.total_files == 3
+    assert "python" in second.directories["pkg"].languages
+
+
+def test_delta_reports_added_modified_and_deleted(tmp_path):
+    """scan_delta returns only what changed since the previous scan"""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    scanner = ProjectScanner(str(project), index_path=str(tmp_path / "index.json"))
+    scanner.scan_project()
+
+    (project / "pkg" / "a.py").write_text("import sys\nimport os\n")
+    (project / "pkg" / "b.py").unlink()
+    (project / "pkg" / "c.py").write_text("x = 1\n")
+    readme = project / "README.md"
+    os.utime(readme, ns=(readme.stat().st_atime_ns, readme.stat().st_mtime_ns + 10**9))
+
+    delta = scanner.scan_delta()
+    assert delta["added"] == ["pkg/c.py"]
+    assert delta["modified"] == ["pkg/a.py"]
+    assert delta["deleted"] == ["pkg/b.py"]
+    # Touched but identical content is rehashed, not reported
+    assert delta["rehashed"] == 3
+    assert "pkg/b.py" not in scanner.get_current_index().files
+
+
+def test_persisted_manifest_survives_new_scanner(tmp_path):
+    """A fresh scanner resumes from the persisted index instead of rehashing"""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    index_path = str(tmp_path / "index.json")
+    ProjectScanner(str(project), index_path=index_path).scan_project()
+
+    scanner = ProjectScanner(str(project), index_path=index_path)
+    assert scanner.scan_project().changes["rehashed"] == 0
+    assert scanner.detect_changes() == []
+
+    (project / "pkg" / "a.py").write_text("changed\n")
+    assert [c["path"] for c in scanner.detect_changes()] == ["pkg/a.py"]
+
+
+def test_index_is_only_persisted_when_requested(tmp_path, monkeypatch):
+    """Without an index path nothing is written; opting in stores the index beside the brain database"""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    store = tmp_path / "store"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BRAIN_DB_PATH", str(store / "brain.db"))
+
+    ProjectScanner(str(project)).scan_project()
+    assert not store.exists() and not (tmp_path / "brain_memory_store").exists()
+
+    scanner = ProjectScanner(str(project), persist_index=True)
+    scanner.scan_project()
+    assert scanner.index_path.parent == store / "project_index" and scanner.index_path.exists()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test concurrent, pooled and cached multi-engine search against loopback engines
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web_crawler.search.search_engine_integration import (
+    LoopbackSearchAPI, SearchEngineConfig, SearchEngineIntegration
+)
+from web_crawler.web_crawler_mcp_tools import WebCrawlerMCPTools
+
+
+async def _serve(latencies):
+    async def handle(request):
+        engine = request.match_info['engine']
+        await asyncio.sleep(latencies[engine])
+        query = request.query['q']
+        return web.json_response({'webPages': {'value': [
+            {'name': f"{engine} {query}", 'url': f"https://{engine}.example/{query.replace(' ', '-')}",
+             'snippet': 'a loopback search result snippet'}
+        ]}})
+
+    app = web.Application()
+    app.router.add_get('/{engine}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+def _integration(tmp_path, base_url, names, **config):
+    integration = SearchEngineIntegration(
+        str(tmp_path / "search.db"),
+        SearchEngineConfig(enable_google_search=False, enable_bing_search=False, **config)
+    )
+    for name in names:
+        integration.register_engine(LoopbackSearchAPI(f"{base_url}/{name}", name=name))
+    return integration
+
+
+def test_engines_are_queried_concurrently_on_one_session(tmp_path):
+    """Total latency is the slowest engine, and each engine reuses its session"""
+    async def run():
+        runner, base_url = await _serve({'a': 0.2, 'b': 0.2})
+        integration = _integration(tmp_path, base_url, ['a', 'b'], enable_result_cache=False)
+        try:
+            start = time.perf_counter()
+            results = await integration.perform_multi_engine_search("pooled sessions", max_results=5)
+            elapsed = time.perf_counter() - start
+            await integration.perform_multi_engine_search("second query", max_results=5)
+            return results, elapsed, [e.sessions_created for e in integration.engines.values()]
+        finally:
+            await integration.close()
+            await runner.cleanup()
+
+    results, elapsed, sessions = asyncio.run(run())
+    assert {r.source_engine for r in results} == {'a', 'b'}
+    assert elapsed < 0.35
+    assert sessions == [1, 1]
+
+
+def test_slow_engine_is_cut_off_by_deadline(tmp_path):
+    """Results of engines that answer in time are returned; late ones are cancelled"""
+    async def run():
+        runner, base_url = await _serve({'fast': 0.0, 'slow': 0.8})
+        integration = _integration(tmp_path, base_url, ['fast', 'slow'], search_timeout=0.3)
+        try:
+            start = time.perf_counter()
+            results = await integration.perform_multi_engine_search("deadline")
+            return results, time.perf_counter() - start, integration.search_metrics['engine_timeouts']
+        finally:
+            await integration.close()
+            await runner.cleanup()
+
+    results, elapsed, timeouts = asyncio.run(run())
+    assert [r.source_engine for r in results] == ['fast']
+    assert elapsed < 0.6
+    assert timeouts == 1
+
+
+def test_normalized_query_is_served_from_cache(tmp_path):
+    """Repeating a query (modulo case and spacing) skips the engine"""
+    async def run():
+        runner, base_url = await _serve({'a': 0.0})
+        integration = _integration(tmp_path, base_url, ['a'])
+        try:
+            first = await integration.perform_multi_engine_search("Cache  Me")
+            second = await integration.perform_multi_engine_search("cache me")
+            return first, second, integration.search_metrics
+        finally:
+            await integration.close()
+            await runner.cleanup()
+
+    first, second, metrics = asyncio.run(run())
+    assert [r.url for r in second] == [r.url for r in first]
+    assert metrics['cache_hits'] == 1
+    assert metrics['a_searches'] == 1
+
+
+def test_cache_runs_off_the_event_loop(tmp_path):
+    """Cache reads and writes happen in worker threads, not on the loop thread"""
+    async def run():
+        runner, base_url = await _serve({'a': 0.0})
+        integration = _integration(tmp_path, base_url, ['a'])
+        cache_threads = []
+        for method in ('get', 'put'):
+            original = getattr(integration.result_cache, method)
+
+            def recording(*args, _original=original):
+                cache_threads.append(threading.get_ident())
+                return _original(*args)
+            setattr(integration.result_cache, method, recording)
+        try:
+            await integration.perform_multi_engine_search("threaded cache")
+            await integration.perform_multi_engine_search("threaded cache")
+            return cache_threads, threading.get_ident()
+        finally:
+            await integration.close()
+            await runner.cleanup()
+
+    cache_threads, loop_thread = asyncio.run(run())
+    assert len(cache_threads) == 3 and loop_thread not in cache_threads
+
+
+def test_crawler_tools_close_pooled_sessions(tmp_path):
+    """Shutting down the crawler tools closes every engine's pooled session"""
+    async def run():
+        runner, base_url = await _serve({'a': 0.0})
+        tools = WebCrawlerMCPTools(str(tmp_path / "brain.db"))
+        engine = LoopbackSearchAPI(f"{base_url}/a", name='a')
+        tools.search_engine_integration.register_engine(engine)
+        try:
+            await tools.perform_multi_engine_search("close me", engines=['a'])
+            session = engine._session
+            await tools.close()
+            return session, engine._session
+        finally:
+            await runner.cleanup()
+
+    session, after = asyncio.run(run())
+    assert session is not None and session.closed and after is None
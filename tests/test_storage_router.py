@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test explicit storage routing of the compatibility JSON files and diff-based memory store writes
+"""
+
+import builtins
+import io
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory.database.brain_db import BrainDatabase
+from core.memory.database.storage_adapter import (
+    JSONCompatibilityAdapter,
+    StorageRouter,
+    patch_json_operations,
+    restore_json_operations,
+)
+
+
+def _item(value):
+    return {"value": value, "tags": ["t"], "emotional_weight": "medium"}
+
+
+def test_router_serves_routed_files_from_the_database(tmp_path):
+    """Routed names go to SQLite through plain json.load/json.dump; builtins stay untouched"""
+    db = BrainDatabase(str(tmp_path / "brain.db"))
+    router = StorageRouter(JSONCompatibilityAdapter(db))
+    memory_file = tmp_path / "memory_store.json"
+
+    with router.open(memory_file, 'w') as f:
+        json.dump({"memory_store": {"a": _item("one")}, "context_history": []}, f, indent=2)
+    with router.open(memory_file) as f:
+        data = json.load(f)
+
+    assert data["memory_store"]["a"]["value"] == "one"
+    assert not memory_file.exists() and router.exists(memory_file)
+    assert builtins.open is io.open
+
+    # Everything else is an ordinary file
+    notes = tmp_path / "notes.json"
+    assert router.load(notes, default={}) == {}
+    router.dump({"x": 1}, notes)
+    assert json.loads(notes.read_text()) == {"x": 1}
+    db.close()
+
+
+def test_memory_store_writes_only_touch_changed_rows(tmp_path):
+    """Writing back an unchanged read is a no-op; context history is not duplicated"""
+    db = BrainDatabase(str(tmp_path / "brain.db"))
+    context = [{"session_id": "s", "content": "hello"}]
+
+    first = db.write_memory_store({"a": _item("one"), "b": _item("two")}, context)
+    assert first == {"upserted": 2, "unchanged": 0, "context_added": 1}
+
+    data = db.get_memory_store()
+    again = db.write_memory_store(data["memory_store"], data["context_history"])
+    assert again == {"upserted": 0, "unchanged": 2, "context_added": 0}
+
+    changed = db.write_memory_store({"a": _item("one"), "b": _item("TWO"), "c": _item("three")},
+                                    data["context_history"] + [{"session_id": "s", "content": "bye"}])
+    assert changed == {"upserted": 2, "unchanged": 1, "context_added": 1}
+    assert db.get_memory_store()["memory_store"]["b"]["value"] == "TWO"
+    assert len(db.get_memory_store()["context_history"]) == 2
+    db.close()
+
+
+def test_legacy_patch_can_be_restored(tmp_path):
+    """patch_json_operations still routes plain open() calls until restore_json_operations"""
+    db = BrainDatabase(str(tmp_path / "brain.db"))
+    adapter = JSONCompatibilityAdapter(db)
+    original_open = builtins.open
+    patch_json_operations(adapter)
+    try:
+        with open(tmp_path / "memory_store.json", 'w') as f:
+            json.dump({"memory_store": {"k": _item("v")}}, f)
+        (tmp_path / "plain.txt").write_text("plain")
+        with open(tmp_path / "plain.txt") as f:
+            assert f.read() == "plain"
+    finally:
+        restore_json_operations()
+
+    assert builtins.open is original_open
+    assert not (tmp_path / "memory_store.json").exists()
+    assert db.get_memory_store()["memory_store"]["k"]["value"] == "v"
+    db.close()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test blocked candidate generation for learning-relationship detection
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from integration.symbiotic_integration_bridge import SymbioticIntegrationBridge, _blocked_pairs
+
+SCHEMA = Path(__file__).parent.parent / "core" / "memory" / "database" / "web_crawler_schema.sql"
+CATEGORIES = ["programming", "api", "database", "tutorial", "misc"]
+TYPES = ["concept", "example", "procedure", "definition", "tip"]
+LEVELS = ["beginner", "intermediate", "advanced"]
+
+
+def _insert_bits(db_path: str, count: int, rng: random.Random):
+    with sqlite3.connect(db_path) as conn:
+        for i in range(count):
+            conn.execute("""
+                INSERT INTO learning_bits (page_id, content_hash, content_type, category, subcategory,
+                                           content, importance_score, confidence_score, complexity_level)
+                VALUES (1, ?, ?, ?, ?, 'text', ?, ?, ?)
+            """, (f"{rng.random()}", rng.choice(TYPES), rng.choice(CATEGORIES), rng.choice(["python", ""]),
+                  rng.random(), rng.random(), rng.choice(LEVELS)))
+
+
+def _relationships(db_path: str):
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("""
+            SELECT source_bit_id, target_bit_id, relationship_type, strength FROM learning_relationships
+        """).fetchall()
+    return sorted((source, target, rel_type, round(strength, 9)) for source, target, rel_type, strength in rows)
+
+
+def _brute_force(bridge: SymbioticIntegrationBridge, db_path: str):
+    with sqlite3.connect(db_path) as conn:
+        bits = conn.execute("""
+            SELECT id, content, content_type, category, subcategory,
+                   importance_score, confidence_score, complexity_level
+            FROM learning_bits ORDER BY importance_score DESC, confidence_score DESC
+        """).fetchall()
+    expected = []
+    for i, b1 in enumerate(bits):
+        for b2 in bits[i + 1:]:
+            rel_type, strength = bridge._analyze_relationship(*b1[2:4], b1[4], *b1[5:8], *b2[2:4], b2[4], *b2[5:8])
+            if strength > 0.4 and rel_type:
+                expected.append((b1[0], b2[0], rel_type, round(strength, 9)))
+    return sorted(expected)
+
+
+def _make_db(tmp_path) -> str:
+    db_path = str(tmp_path / "crawler.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    return db_path
+
+
+def test_blocked_pairs_are_unique_and_share_a_key():
+    """Pairs sharing several keys are produced once"""
+    keys = [("a", "x"), ("a", "x"), ("b", "x"), ("c", "y")]
+    assert sorted(_blocked_pairs(keys)) == [(0, 1), (0, 2), (1, 2)]
+    assert sorted(_blocked_pairs(keys, new_items={2})) == [(0, 2), (1, 2)]
+
+
+def test_blocking_matches_all_pairs_comparison(tmp_path):
+    """Blocking finds exactly the relationships of the full double loop"""
+    db_path = _make_db(tmp_path)
+    _insert_bits(db_path, 120, random.Random(3))
+    bridge = SymbioticIntegrationBridge(db_path)
+
+    result = asyncio.run(bridge.detect_learning_relationships())
+    assert result["status"] == "success"
+    assert result["candidate_pairs_scored"] < 120 * 119 // 2
+    assert _relationships(db_path) == _brute_force(bridge, db_path)
+
+
+def test_incremental_mode_only_pairs_new_bits(tmp_path):
+    """A second incremental run adds exactly the pairs involving new bits"""
+    db_path = _make_db(tmp_path)
+    rng = random.Random(11)
+    _insert_bits(db_path, 60, rng)
+    bridge = SymbioticIntegrationBridge(db_path)
+    asyncio.run(bridge.detect_learning_relationships(incremental=True))
+
+    _insert_bits(db_path, 15, rng)
+    result = asyncio.run(bridge.detect_learning_relationships(incremental=True))
+    assert result["incremental"] and result["new_bits_analyzed"] == 15
+    assert _relationships(db_path) == _brute_force(bridge, db_path)
+
+
+def test_semantic_relationships_match_self_join(tmp_path):
+    """Blocked semantic pairing equals scoring every pair of bridge nodes"""
+    db_path = _make_db(tmp_path)
+    _insert_bits(db_path, 40, random.Random(5))
+    bridge = SymbioticIntegrationBridge(db_path)
+    asyncio.run(bridge._create_knowledge_graph_bridge())
+    asyncio.run(bridge._convert_learning_bits_to_knowledge_nodes())
+    created = asyncio.run(bridge._build_semantic_relationships())
+
+    with sqlite3.connect(db_path) as conn:
+        nodes = conn.execute("SELECT knowledge_node_id, semantic_context FROM knowledge_graph_bridge "
+                             "ORDER BY learning_bit_id").fetchall()
+        stored = sorted(conn.execute("SELECT source_node_id, target_node_id FROM knowledge_relationships"))
+    expected = sorted(
+        (n1[0], n2[0]) for i, n1 in enumerate(nodes) for n2 in nodes[i + 1:]
+        if bridge._calculate_semantic_similarity(json.loads(n1[1]), json.loads(n2[1])) > 0.3
+    )
+    assert created == len(expected)
+    assert stored == expected
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test the long-lived thinking engine and its memoized health metric snapshot
+"""
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.brain.brain_interface import BrainInterface
+from core.brain.enhanced_thinking_system import EnhancedThinkingSystem
+from core.memory.database.brain_db import BrainDatabase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _create_db(path: Path):
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            CREATE TABLE learning_bits (id INTEGER PRIMARY KEY, content TEXT);
+            CREATE TABLE cross_references (id INTEGER PRIMARY KEY, source_id INTEGER, target_id INTEGER);
+            CREATE TABLE context_enhancement_pipeline (id INTEGER PRIMARY KEY, enhancement_type TEXT);
+            INSERT INTO learning_bits (content) VALUES ('a'), ('b');
+            INSERT INTO cross_references (source_id, target_id) VALUES (1, 2);
+            INSERT INTO context_enhancement_pipeline (enhancement_type) VALUES ('thinking_optimization'), ('other');
+        """)
+
+
+def test_metrics_are_served_from_memory_until_the_database_changes(tmp_path):
+    """Repeated cycles do not re-query; an external commit or the interval triggers a background refresh"""
+    db_path = tmp_path / "brain.db"
+    _create_db(db_path)
+    clock = FakeClock()
+    engine = EnhancedThinkingSystem(str(db_path), snapshot_interval=60)
+    engine.metrics.clock = clock
+
+    async def run():
+        first = await engine.think_deeply("optimize the system", "system_analysis")
+        second = await engine.think_deeply("optimize the system", "system_analysis")
+        after_cycles = engine.metrics.get_stats()
+
+        # Another connection commits: the stale values are served while a refresh runs
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO cross_references (source_id, target_id) VALUES (2, 1)")
+        stale = (await engine.metrics.get())['cross_references']
+        await engine.metrics._refresh_task
+        fresh = (await engine.metrics.get())['cross_references']
+
+        clock.now += 61
+        await engine.metrics.get()
+        await engine.metrics._refresh_task
+        return first, second, after_cycles, stale, fresh
+
+    first, second, after_cycles, stale, fresh = asyncio.run(run())
+    engine.close()
+
+    context = first["context_analysis"]
+    assert (context["thinking_optimizations"], context["context_effectiveness"]) == (1, 0.25)
+    assert first["background_analysis"]["background_processes"]["context_pipeline"]["cycles"] == 2
+    assert after_cycles["refreshes"] == 1 and second["metric_snapshot"]["age_seconds"] == 0
+    assert (stale, fresh) == (1, 2)
+    stats = engine.metrics.get_stats()
+    assert stats["reasons"] == {'initial': 1, 'interval': 1, 'data_changed': 1, 'manual': 0}
+    assert stats["total_refresh_seconds"] >= stats["last_refresh_seconds"] > 0
+
+
+def test_brain_interface_reuses_one_thinking_engine(tmp_path):
+    """analyze_with_context keeps the engine (and its snapshot) between requests"""
+    db_path = tmp_path / "brain.db"
+    _create_db(db_path)
+
+    class Client:
+        pass
+    client = Client()
+    client.db_path = str(db_path)
+    brain = BrainInterface(None, client)
+
+    async def run():
+        await brain.analyze_with_context("optimize", "optimization")
+        engine = brain.get_thinking_system()
+        await brain.analyze_with_context("optimize again", "optimization")
+        return engine
+
+    engine = asyncio.run(run())
+    assert brain.get_thinking_system() is engine
+    assert engine.thinking_cycles == 2 and engine.metrics.refresh_stats["refreshes"] == 1
+    engine.close()
+
+
+def test_version_probe_never_waits_and_refresh_runs_no_ddl(tmp_path):
+    """A busy probe connection skips the check; refreshing leaves the schema untouched"""
+    db_path = tmp_path / "brain.db"
+    _create_db(db_path)
+    engine = EnhancedThinkingSystem(str(db_path), snapshot_interval=60)
+
+    async def run():
+        await engine.metrics.get()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO learning_bits (content) VALUES ('c')")
+        with engine.metrics._probe_lock:
+            busy = engine.metrics.stale_reason()
+        return busy, engine.metrics.stale_reason()
+
+    busy, free = asyncio.run(run())
+    engine.close()
+    assert (busy, free) == (None, 'data_changed')
+    assert engine.metrics.values['learning_bits'] == 2
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '%row_count%'").fetchall() == []
+
+
+def test_writes_to_unwatched_tables_keep_the_snapshot_current(tmp_path, monkeypatch):
+    """Function call logs and memory writes do not invalidate; inserts and deletes in watched tables do"""
+    monkeypatch.setenv("FUNCTION_LOG_SAMPLE_RATES", "database_operation=1.0")
+    db_path = tmp_path / "brain.db"
+    _create_db(db_path)
+    db = BrainDatabase(str(db_path), pool_size=0)
+    engine = EnhancedThinkingSystem(str(db_path), snapshot_interval=60)
+
+    async def run():
+        await engine.metrics.get()
+        db.get_brain_state()
+        db.set_memory_item("key", "value")
+        db.close()  # flushes the logged calls
+        unchanged = engine.metrics.stale_reason()
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM learning_bits WHERE content = 'a'")
+        deleted = engine.metrics.stale_reason()
+        await engine.metrics.refresh()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO context_enhancement_pipeline (enhancement_type) VALUES ('other')")
+        return unchanged, deleted, engine.metrics.stale_reason()
+
+    unchanged, deleted, inserted = asyncio.run(run())
+    engine.close()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM function_calls").fetchone()[0] >= 1
+    assert (unchanged, deleted, inserted) == (None, 'data_changed', 'data_changed')
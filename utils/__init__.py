@@ -3,10 +3,19 @@ Utilities Package
 Helper functions, health checks, and client utilities
 """
 
-from .llm_client import OllamaClient as LLMClient
-from .healthcheck import health_check
-
 __all__ = [
     "LLMClient",
     "health_check"
 ]
+
+
+def __getattr__(name):
+    # Imported on first access so that light helpers (e.g. utils.performance_monitor)
+    # do not pull in aiohttp through the LLM client
+    if name == "LLMClient":
+        from .llm_client import OllamaClient
+        return OllamaClient
+    if name == "health_check":
+        from .healthcheck import health_check
+        return health_check
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,278 @@
+"""
+Log Tail - Reverse block-seek reading of large log files
+Returns the last lines of multi-gigabyte logs without reading them front to back,
+with level/time-range filtering backed by a sparse byte-offset index that is
+extended incrementally as files grow and rotate
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+INDEX_STRIDE = 1024 * 1024
+INDEX_FILENAME = ".log_index.json"
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40, "CRITICAL": 50, "FATAL": 50}
+
+# A record header carries a level and/or a timestamp near the start of the line; lines
+# with neither (tracebacks, wrapped messages) belong to the record above them
+_LEVEL_PATTERN = re.compile(r"\b(DEBUG|INFO|WARNING|WARN|ERROR|CRITICAL|FATAL)\b")
+_TIMESTAMP_PATTERN = re.compile(r"^\[?(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})")
+_HEADER_SPAN = 80
+
+_COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz", ".zip")
+
+
+def parse_header(line: str) -> Tuple[Optional[int], Optional[datetime]]:
+    """(level number, timestamp) of a log line; either is None if absent"""
+    match = _LEVEL_PATTERN.search(line, 0, _HEADER_SPAN)
+    level = LEVELS[match.group(1)] if match else None
+    match = _TIMESTAMP_PATTERN.match(line)
+    timestamp = None
+    if match:
+        try:
+            timestamp = datetime.strptime(f"{match.group(1)} {match.group(2)}", "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            pass
+    return level, timestamp
+
+
+def _naive(moment: Optional[datetime]) -> Optional[datetime]:
+    """Log timestamps are local and naive; convert aware bounds to match"""
+    if moment is not None and moment.tzinfo is not None:
+        return moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+def reverse_lines(path: str, end_offset: Optional[int] = None, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield the lines of a file from the last one backwards, reading fixed-size blocks from the end"""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END) if end_offset is None else end_offset
+        remainder = b""
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b"\n")
+            # The first piece may continue in the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line
+        if remainder:
+            yield remainder
+
+
+def tail_log(path: str, max_lines: int, min_level: Optional[int] = None,
+             since: Optional[datetime] = None, until: Optional[datetime] = None,
+             end_offset: Optional[int] = None, block_size: int = BLOCK_SIZE) -> List[str]:
+    """
+    Last ``max_lines`` non-empty lines of a log file, oldest first.
+
+    With a level or time filter, whole records (a header line plus its
+    continuation lines) are kept or dropped together, and reading stops at
+    the first record older than ``since``. Records without a level or
+    timestamp are not filtered on that attribute.
+    """
+    filtered = min_level is not None or since is not None or until is not None
+    newest_first: List[str] = []
+    pending: List[str] = []  # Continuation lines waiting for their header (newest first)
+
+    for raw in reverse_lines(path, end_offset, block_size):
+        line = raw.decode("utf-8", "replace").strip()
+        if not line:
+            continue
+        if not filtered:
+            newest_first.append(line)
+            if len(newest_first) >= max_lines:
+                break
+            continue
+
+        level, timestamp = parse_header(line)
+        if level is None and timestamp is None:
+            pending.append(line)
+            continue
+        record, pending = pending + [line], []
+        if timestamp is not None:
+            if since is not None and timestamp < since:
+                break
+            if until is not None and timestamp > until:
+                continue
+        if min_level is not None and level is not None and level < min_level:
+            continue
+        newest_first.extend(record)
+        if len(newest_first) >= max_lines:
+            break
+
+    return newest_first[:max_lines][::-1]
+
+
+class LogIndex:
+    """
+    Sparse byte-offset index over the files of a log directory.
+
+    Every ``stride`` bytes the offset and timestamp of the first record header
+    is checkpointed, along with each file's first and last timestamp. Entries
+    are keyed by device and inode, so a rotated file (renamed, not rewritten)
+    keeps its index; only bytes appended since the last update are scanned.
+    """
+
+    def __init__(self, index_path: str, stride: int = INDEX_STRIDE):
+        self.index_path = index_path
+        self.stride = stride
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            if data.get("stride") == self.stride:
+                self.files = data.get("files", {})
+        except (OSError, ValueError):
+            self.files = {}
+
+    def save(self):
+        temp_path = f"{self.index_path}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({"stride": self.stride, "files": self.files}, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            logger.debug(f"Could not save log index {self.index_path}: {e}")
+
+    def update(self, paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Bring the index up to date for ``paths``; returns their entries by path"""
+        entries, seen, changed = {}, set(), False
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            key = f"{stat.st_dev}:{stat.st_ino}"
+            seen.add(key)
+            entry = self.files.get(key)
+            if entry is None or stat.st_size < entry["scanned"]:
+                # New file, or truncated/rewritten in place
+                entry = {"scanned": 0, "checkpoints": [], "first": None, "last": None}
+                self.files[key] = entry
+                changed = True
+            if entry.get("path") != path:
+                entry["path"] = path
+                changed = True
+            if stat.st_size > entry["scanned"]:
+                changed |= self._scan(path, entry, stat.st_size)
+            entry["size"] = stat.st_size
+            entries[path] = entry
+
+        for key in [key for key in self.files if key not in seen]:
+            del self.files[key]
+            changed = True
+        if changed:
+            self.save()
+        return entries
+
+    def _scan(self, path: str, entry: Dict[str, Any], size: int) -> bool:
+        """Checkpoint the bytes appended since the last scan (up to the last complete line)"""
+        start = entry["scanned"]
+        with open(path, "rb") as f:
+            f.seek(start)
+            while start < size:
+                chunk = f.read(min(self.stride, size - start))
+                if not chunk:
+                    break
+                cut = chunk.rfind(b"\n") + 1
+                if cut == 0:
+                    if start + len(chunk) < size:
+                        cut = len(chunk)  # A single line longer than the stride
+                    else:
+                        break  # Partial last line: wait until it is complete
+                elif cut < len(chunk):
+                    f.seek(start + cut)
+                lines = chunk[:cut].split(b"\n")
+
+                offset = start
+                for line in lines:
+                    timestamp = parse_header(line.decode("utf-8", "replace"))[1]
+                    if timestamp is not None:
+                        iso = timestamp.isoformat()
+                        entry["checkpoints"].append([offset, iso])
+                        entry["first"] = entry["first"] or iso
+                        break
+                    offset += len(line) + 1
+                for line in reversed(lines):
+                    timestamp = parse_header(line.decode("utf-8", "replace"))[1]
+                    if timestamp is not None:
+                        entry["last"] = timestamp.isoformat()
+                        break
+                start += cut
+        scanned = start != entry["scanned"]
+        entry["scanned"] = start
+        return scanned
+
+
+def _log_files(log_dir: str) -> List[str]:
+    """Current and rotated log files, newest first"""
+    paths = set(glob.glob(os.path.join(log_dir, "*.log")) + glob.glob(os.path.join(log_dir, "*.log.*")))
+    paths = [p for p in paths if not p.endswith(_COMPRESSED_SUFFIXES) and not p.endswith(".tmp")]
+    return sorted(paths, key=lambda p: os.path.getmtime(p), reverse=True)
+
+
+def collect_log_tail(log_dir: str = "logs", max_lines: int = 1000, min_level: Optional[str] = None,
+                     since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     use_index: bool = True) -> Dict[str, Any]:
+    """
+    The newest ``max_lines`` log lines across the current and rotated files of ``log_dir``.
+
+    Files are read newest first and only as far back as needed. With a time
+    range, the index skips files entirely outside it and ends the reverse
+    read at the first checkpoint past ``until``.
+    """
+    level = LEVELS.get(min_level.upper()) if min_level else None
+    since, until = _naive(since), _naive(until)
+    result: Dict[str, Any] = {"lines": [], "files": [], "skipped_files": []}
+    if not os.path.isdir(log_dir):
+        return result
+
+    paths = _log_files(log_dir)
+    # Plain tails never need the index; building it the first time scans every file once
+    entries = {}
+    if use_index and (since or until):
+        entries = LogIndex(os.path.join(log_dir, INDEX_FILENAME)).update(paths)
+
+    collected: List[List[str]] = []
+    remaining = max_lines
+    for path in paths:
+        if remaining <= 0:
+            break
+        entry = entries.get(path)
+        end_offset = None
+        if entry and (since or until):
+            first = datetime.fromisoformat(entry["first"]) if entry["first"] else None
+            last = datetime.fromisoformat(entry["last"]) if entry["last"] else None
+            if (until and first and first > until) or (since and last and last < since):
+                result["skipped_files"].append(path)
+                continue
+            if until:
+                later = [offset for offset, iso in entry["checkpoints"] if datetime.fromisoformat(iso) > until]
+                end_offset = later[0] if later else None
+        try:
+            lines = tail_log(path, remaining, level, since, until, end_offset)
+        except OSError as e:
+            lines = [f"Error reading {path}: {e}"]
+        if lines:
+            collected.append(lines)
+            result["files"].append(path)
+            remaining -= len(lines)
+        if since and entry and entry["first"] and datetime.fromisoformat(entry["first"]) < since:
+            break  # Older files cannot contain records in range
+
+    for lines in reversed(collected):
+        result["lines"].extend(lines)
+    return result
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Pattern Classifier - Single-pass keyword/regex scoring for content classification
+Compiles families of labelled regex patterns once and scores every label of every
+family in one scan of the lowercased text, instead of one re.search per pattern
+"""
+
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Characters that make an unescaped pattern fragment more than a plain literal
+_REGEX_META = set('.^$*+?{}[]()|\\')
+_WORD_BOUNDARY = r'\b'
+_WORD_RUN = re.compile(r'\w+')
+
+
+def _is_word_char(char: str) -> bool:
+    """Same character class as ``\\w`` for str patterns"""
+    return char.isalnum() or char == '_'
+
+
+def _at_boundary(text: str, index: int) -> bool:
+    """Whether ``\\b`` matches at ``index`` of ``text``"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+def _split_top_level(expression: str) -> Optional[List[str]]:
+    """Split an expression on top-level ``|``; None if it has unbalanced groups"""
+    parts, depth, start, i = [], 0, 0, 0
+    while i < len(expression):
+        char = expression[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth < 0:
+                return None
+        elif char == '|' and depth == 0:
+            parts.append(expression[start:i])
+            start = i + 1
+        i += 1
+    if depth != 0:
+        return None
+    parts.append(expression[start:])
+    return parts
+
+
+def _unescape_literal(fragment: str) -> Optional[str]:
+    """Turn an escaped regex fragment into its literal text; None if it is not a literal"""
+    chars, i = [], 0
+    while i < len(fragment):
+        char = fragment[i]
+        if char == '\\':
+            if i + 1 >= len(fragment) or fragment[i + 1].isalnum():
+                return None  # \d, \s, \b inside a fragment etc. are classes, not literals
+            chars.append(fragment[i + 1])
+            i += 2
+            continue
+        if char in _REGEX_META:
+            return None
+        chars.append(char)
+        i += 1
+    return ''.join(chars) if chars else None
+
+
+def _wraps_whole(expression: str) -> bool:
+    """True if the expression is one parenthesized group spanning all of it"""
+    if not expression.startswith('(') or not expression.endswith(')'):
+        return False
+    depth, i = 0, 0
+    while i < len(expression):
+        char = expression[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0 and i != len(expression) - 1:
+                return False
+        i += 1
+    return True
+
+
+def literal_alternatives(pattern: str) -> Optional[Tuple[bool, bool, List[str]]]:
+    """
+    Decompose a keyword pattern such as ``\\b(?:api|endpoint|http)\\b`` into
+    (leading \\b, trailing \\b, [literals]). Returns None for anything that is
+    not a plain list of literal alternatives.
+    """
+    leading = pattern.startswith(_WORD_BOUNDARY)
+    core = pattern[2:] if leading else pattern
+    trailing = core.endswith(_WORD_BOUNDARY) and not core.endswith('\\' + _WORD_BOUNDARY)
+    core = core[:-2] if trailing else core
+
+    if _wraps_whole(core):
+        inner = core[3:-1] if core.startswith('(?:') else core[1:-1]
+        if inner.startswith('?'):
+            return None  # Lookarounds, named groups, inline flags
+        alternatives = _split_top_level(inner)
+    else:
+        alternatives = _split_top_level(core)
+        if alternatives and len(alternatives) > 1 and (leading or trailing):
+            return None  # \ba|b\b binds the boundaries to single alternatives only
+    if not alternatives:
+        return None
+
+    literals = []
+    for alternative in alternatives:
+        literal = _unescape_literal(alternative)
+        if literal is None:
+            return None
+        literals.append(literal)
+    return leading, trailing, literals
+
+
+class ClassificationResult:
+    """Per-pattern match counts of one scan, with label-level views"""
+
+    def __init__(self, classifier: "PatternClassifier", counts: List[int]):
+        self._classifier = classifier
+        self._counts = counts
+
+    def pattern_counts(self, family: str, label: Any) -> List[int]:
+        """Non-overlapping match count of each pattern of a label (as ``re.findall`` would give)"""
+        return [self._counts[slot] for slot in self._classifier._slots[family][label]]
+
+    def match_count(self, family: str, label: Any) -> int:
+        """Total matches of all patterns of a label"""
+        return sum(self.pattern_counts(family, label))
+
+    def pattern_hits(self, family: str, label: Any) -> int:
+        """Number of patterns of a label that matched at least once"""
+        return sum(1 for count in self.pattern_counts(family, label) if count)
+
+    def has_match(self, family: str, label: Any) -> bool:
+        """Whether any pattern of a label matched (as ``re.search`` would)"""
+        return any(self.pattern_counts(family, label))
+
+    def matched_patterns(self, family: str, label: Any) -> List[str]:
+        """Source patterns of a label that matched"""
+        slots = self._classifier._slots[family][label]
+        return [self._classifier._patterns[slot] for slot in slots if self._counts[slot]]
+
+    def matched_labels(self, family: str) -> List[Any]:
+        """Labels of a family with at least one match, in declaration order"""
+        return [label for label in self._classifier._slots[family] if self.has_match(family, label)]
+
+
+class PatternClassifier:
+    """
+    Scores families of labelled regex patterns in one pass over the text.
+
+    ``families`` maps a family name to ``{label: [pattern, ...]}``. Patterns
+    that are plain keyword lists (optionally wrapped in ``\\b...\\b``) are
+    decomposed into literal keywords at compile time and indexed by their
+    first word, so a single walk over the words of the text finds every
+    keyword occurrence of every family with one dict lookup per word.
+    Keywords that do not start at a word boundary (``.py``, emoji, ...) are
+    located with ``str.find``. Occurrences are then replayed per pattern with
+    regex alternation semantics (first listed alternative wins, matches do not
+    overlap), which keeps per-pattern counts identical to running
+    ``re.findall`` for every pattern separately. The few genuinely irregular
+    patterns (code blocks, ``step \\d+`` ...) are precompiled and run on their own.
+
+    Text is lowercased once per scan; results of recent scans are memoized so
+    several scoring methods over the same content share one pass.
+    """
+
+    def __init__(self, families: Dict[str, Dict[Any, Sequence[str]]], cache_size: int = 64):
+        self._patterns: List[str] = []
+        self._slots: Dict[str, Dict[Any, List[int]]] = {}
+        self._irregular: List[Tuple[int, "re.Pattern"]] = []
+        self._cache: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._cache_size = cache_size
+        self.stats = {'scans': 0, 'cache_hits': 0}
+
+        # (literal, leading \b, trailing \b) -> [(slot, alternative index)]
+        keywords: Dict[Tuple[str, bool, bool], List[Tuple[int, int]]] = {}
+        for family, labels in families.items():
+            self._slots[family] = {}
+            for label, patterns in labels.items():
+                slots = []
+                for pattern in patterns:
+                    slot = len(self._patterns)
+                    self._patterns.append(pattern)
+                    slots.append(slot)
+                    decomposed = literal_alternatives(pattern)
+                    if decomposed is None or not self._verify_literals(pattern, decomposed):
+                        self._irregular.append((slot, re.compile(pattern)))
+                        continue
+                    leading, trailing, literals = decomposed
+                    for index, literal in enumerate(literals):
+                        keywords.setdefault((literal.lower(), leading, trailing), []).append((slot, index))
+                self._slots[family][label] = slots
+
+        # Keywords starting with a whole word are looked up by that word;
+        # everything else is searched for directly
+        self._keywords = list(keywords.items())
+        self._by_first_word: Dict[str, List[int]] = {}
+        self._searched: List[int] = []
+        for index, ((literal, leading, trailing), _) in enumerate(self._keywords):
+            first_word = _WORD_RUN.match(literal)
+            ends_inside_word = first_word and first_word.end() == len(literal) and not trailing
+            if leading and first_word and not ends_inside_word:
+                self._by_first_word.setdefault(first_word.group(), []).append(index)
+            else:
+                self._searched.append(index)
+
+    @staticmethod
+    def _verify_literals(pattern: str, decomposed: Tuple[bool, bool, List[str]]) -> bool:
+        """Sanity check that every extracted literal is matched by its source pattern"""
+        compiled = re.compile(pattern)
+        return all(compiled.fullmatch(literal) for literal in decomposed[2])
+
+    def _keyword_occurrences(self, text: str) -> List[Tuple[int, int]]:
+        """All (position, keyword index) pairs where a keyword matches"""
+        occurrences = []
+        by_first_word = self._by_first_word
+        keywords = self._keywords
+        for word in _WORD_RUN.finditer(text):
+            candidates = by_first_word.get(word.group())
+            if not candidates:
+                continue
+            position = word.start()
+            for index in candidates:
+                literal, _, trailing = keywords[index][0]
+                if len(literal) == word.end() - position:
+                    occurrences.append((position, index))  # Whole word: boundaries hold
+                elif text.startswith(literal, position) and (
+                        not trailing or _at_boundary(text, position + len(literal))):
+                    occurrences.append((position, index))
+
+        for index in self._searched:
+            literal, leading, trailing = keywords[index][0]
+            position = text.find(literal)
+            while position != -1:
+                if ((not leading or _at_boundary(text, position)) and
+                        (not trailing or _at_boundary(text, position + len(literal)))):
+                    occurrences.append((position, index))
+                position = text.find(literal, position + 1)
+
+        occurrences.sort()
+        return occurrences
+
+    def _count(self, text: str) -> List[int]:
+        counts = [0] * len(self._patterns)
+        # Per pattern: end of its last counted match
+        last_end: Dict[int, int] = {}
+
+        occurrences = self._keyword_occurrences(text)
+        i = 0
+        while i < len(occurrences):
+            position = occurrences[i][0]
+            # Keywords of one pattern compete like regex alternatives: the first listed wins
+            best: Dict[int, Tuple[int, int]] = {}
+            while i < len(occurrences) and occurrences[i][0] == position:
+                (literal, _, _), owners = self._keywords[occurrences[i][1]]
+                for slot, alternative in owners:
+                    current = best.get(slot)
+                    if current is None or alternative < current[0]:
+                        best[slot] = (alternative, len(literal))
+                i += 1
+            for slot, (_, length) in best.items():
+                if position >= last_end.get(slot, 0):
+                    counts[slot] += 1
+                    last_end[slot] = position + length
+
+        for slot, compiled in self._irregular:
+            counts[slot] = sum(1 for _ in compiled.finditer(text))
+        return counts
+
+    def scan(self, text: str, lowered: bool = False) -> ClassificationResult:
+        """Classify text; pass ``lowered=True`` if it is already lowercase"""
+        key = text if lowered else text.lower()
+        counts = self._cache.get(key)
+        if counts is not None:
+            self._cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+        else:
+            counts = self._count(key)
+            self.stats['scans'] += 1
+            if self._cache_size > 0:
+                self._cache[key] = counts
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return ClassificationResult(self, counts)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Compile-time shape and scan counters"""
+        stats = dict(self.stats)
+        stats.update({
+            'patterns': len(self._patterns),
+            'keywords': len(self._keywords),
+            'searched_keywords': len(self._searched),
+            'irregular_patterns': len(self._irregular),
+        })
+        return stats
@@ -7,12 +7,83 @@ Provides comprehensive system health and performance metrics
 import sqlite3
 import json
 import logging
+import math
+import threading
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+def log_linear_buckets(lowest: float = 0.0001, highest: float = 60.0,
+                       relative_error: float = 0.05) -> Tuple[float, ...]:
+    """HDR-style bucket bounds (seconds): each bound is ``1 + relative_error`` times the previous one,
+    so a percentile read from the histogram is within ``relative_error`` of the true value"""
+    bounds = []
+    bound = lowest
+    while bound < highest:
+        bounds.append(float(f"{bound:.6g}"))
+        bound *= 1 + relative_error
+    bounds.append(highest)
+    return tuple(bounds)
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram (seconds) with approximate percentiles
+    
+    Percentiles report the upper bound of the bucket holding the requested
+    rank (capped at the largest observation), which is accurate to one bucket.
+    """
+    
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, buckets: Sequence[float] = BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last bucket: above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, seconds: float):
+        """Record one latency"""
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+    
+    def percentile(self, fraction: float) -> float:
+        """Approximate latency below which ``fraction`` (0-1) of observations fall"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(round(fraction * self.count, 9)))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    bound = self.buckets[index] if index < len(self.buckets) else self.max
+                    return min(bound, self.max)
+            return self.max
+    
+    def snapshot(self, include_buckets: bool = True) -> Dict[str, Any]:
+        """Counts per bucket plus summary statistics"""
+        summary = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': self.max
+        }
+        if not include_buckets:
+            return summary
+        with self._lock:
+            labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+            summary['buckets'] = dict(zip(labels, self.counts))
+        return summary
+
 class PerformanceMonitor:
     """Real-time performance monitoring and health assessment"""
     
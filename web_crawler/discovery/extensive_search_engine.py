@@ -20,6 +20,8 @@ from bs4 import BeautifulSoup
 import hashlib
 from collections import defaultdict, deque
 
+from core.memory.database.row_counters import ensure_row_counters
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -186,6 +188,9 @@ class MultiSiteDiscoveryEngine:
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_cross_references_target ON cross_references (target_url)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_domain_relationships_source ON domain_relationships (source_domain)")
                 
+                # Cached cross_references row count for the status/log tools
+                ensure_row_counters(conn)
+                
                 conn.commit()
                 logger.info("✅ Discovery database initialized successfully")
                 
@@ -4,10 +4,19 @@ Core crawling engine, background processing, and intelligent learning
 """
 
 from .web_crawler_engine import WebCrawler, CrawlConfig, LearningBit, BackgroundCrawlerManager
+from .crawl_frontier import CrawlFrontier
+from .fetch_cache import FetchCache
+from .durable_queue import DurableCrawlQueue
+from .content_fingerprint import SimHashIndex, simhash
 
 __all__ = [
     "WebCrawler",
     "CrawlConfig", 
     "LearningBit",
-    "BackgroundCrawlerManager"
+    "BackgroundCrawlerManager",
+    "CrawlFrontier",
+    "FetchCache",
+    "DurableCrawlQueue",
+    "SimHashIndex",
+    "simhash"
 ]
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Content Fingerprint - SimHash near-duplicate detection for learning bits
+64-bit SimHash fingerprints over word features with a banded index for
+Hamming-distance lookups, plus the schema, backfill and statistics helpers
+that keep boilerplate and lightly edited copies out of learning_bits
+"""
+
+import hashlib
+import re
+import sqlite3
+import logging
+from collections import Counter
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+# Learning bits are short (a few dozen words), so a single changed word moves
+# about 4 bits while unrelated texts stay 9+ bits apart
+DEFAULT_MAX_DISTANCE = 6
+
+_TOKEN = re.compile(r'\w+')
+_BIT_POSITIONS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+_SIGN_BIT = 1 << (FINGERPRINT_BITS - 1)
+_MASK = (1 << FINGERPRINT_BITS) - 1
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def simhash(text: str, shingle_size: int = 1) -> Optional[int]:
+    """
+    64-bit SimHash of the words (or word shingles) of a text.
+
+    Text without words has no fingerprint (None): it would hash to 0 and make
+    every such text a near duplicate of every other.
+
+    Single words are the default: on short texts every shingle an edit touches
+    becomes a new feature, which pushes lightly edited copies too far apart.
+    """
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return None
+    if len(tokens) < shingle_size:
+        shingles = tokens
+    else:
+        shingles = [' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+
+    counts = Counter(shingles)
+    hashes = np.fromiter((_feature_hash(shingle) for shingle in counts), dtype=np.uint64, count=len(counts))
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+
+    # Each feature votes +weight for its set bits and -weight for its clear bits
+    set_bits = ((hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)).astype(bool)
+    totals = np.where(set_bits, weights[:, None], -weights[:, None]).sum(axis=0)
+    return int(np.packbits(totals > 0, bitorder='little').view('<u8')[0])
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def to_signed(fingerprint: int) -> int:
+    """Map an unsigned 64-bit fingerprint onto SQLite's signed INTEGER range"""
+    return fingerprint - (1 << FINGERPRINT_BITS) if fingerprint & _SIGN_BIT else fingerprint
+
+
+def from_signed(value: int) -> int:
+    return value & _MASK
+
+
+class SimHashIndex:
+    """
+    Near-duplicate lookup over SimHash fingerprints.
+
+    The 64 bits are split into ``bands`` near-equal bands (``max_distance + 1``
+    by default) with one hash table per band. Two fingerprints within ``max_distance`` bits differ in at most
+    ``max_distance`` bands, so with ``bands > max_distance`` at least one band
+    is identical (pigeonhole) and every near duplicate shares a bucket with
+    the query; only those candidates are compared bit by bit.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE, bands: Optional[int] = None):
+        bands = bands or max_distance + 1
+        if bands <= max_distance:
+            raise ValueError(f"{bands} bands cannot guarantee lookups within distance {max_distance}")
+        if bands > FINGERPRINT_BITS:
+            raise ValueError(f"At most {FINGERPRINT_BITS} bands are possible")
+        self.max_distance = max_distance
+        # (shift, mask) per band; the first FINGERPRINT_BITS % bands bands get one extra bit
+        width, extra = divmod(FINGERPRINT_BITS, bands)
+        self._bands: List[Tuple[int, int]] = []
+        shift = 0
+        for band in range(bands):
+            bits = width + (1 if band < extra else 0)
+            self._bands.append((shift, (1 << bits) - 1))
+            shift += bits
+        self._buckets: List[Dict[int, List[Hashable]]] = [{} for _ in range(bands)]
+        self._fingerprints: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._fingerprints
+
+    def _band_values(self, fingerprint: int):
+        for band, (shift, mask) in enumerate(self._bands):
+            yield band, (fingerprint >> shift) & mask
+
+    def add(self, key: Hashable, fingerprint: int):
+        """Index a fingerprint under a key (e.g. a content hash)"""
+        if key in self._fingerprints:
+            self.remove(key)
+        self._fingerprints[key] = fingerprint
+        for band, value in self._band_values(fingerprint):
+            self._buckets[band].setdefault(value, []).append(key)
+
+    def remove(self, key: Hashable) -> bool:
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return False
+        for band, value in self._band_values(fingerprint):
+            bucket = self._buckets[band].get(value)
+            if bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band][value]
+        return True
+
+    def find(self, fingerprint: int) -> Optional[Tuple[Hashable, int]]:
+        """Closest indexed key within max_distance as (key, distance); earliest added wins ties"""
+        best = None
+        seen = set()
+        for band, value in self._band_values(fingerprint):
+            for key in self._buckets[band].get(value, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                distance = hamming_distance(fingerprint, self._fingerprints[key])
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+        return best
+
+
+def ensure_fingerprint_schema(conn: sqlite3.Connection):
+    """Add the simhash column and the near-duplicate cluster table if missing"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(learning_bits)")}
+    if columns and 'simhash' not in columns:
+        conn.execute("ALTER TABLE learning_bits ADD COLUMN simhash INTEGER")
+    # bit_id is the clustered row for in-place duplicates, NULL if the copy was never stored (or pruned)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS learning_bit_duplicates (
+            content_hash TEXT PRIMARY KEY,
+            canonical_bit_id INTEGER NOT NULL,
+            bit_id INTEGER,
+            distance INTEGER NOT NULL,
+            source_url TEXT,
+            detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_learning_bit_duplicates_canonical "
+                 "ON learning_bit_duplicates(canonical_bit_id)")
+
+
+def backfill_fingerprints(conn: sqlite3.Connection, max_distance: int = DEFAULT_MAX_DISTANCE,
+                          prune: bool = False, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Fingerprint existing learning bits and cluster their near duplicates.
+
+    Rows are visited in id order, so the oldest copy of a cluster becomes its
+    canonical bit. Duplicates are recorded in learning_bit_duplicates; with
+    ``prune`` they are also deleted (their references move to the canonical
+    bit). Safe to run repeatedly.
+    """
+    ensure_fingerprint_schema(conn)
+    clustered = {row[0] for row in conn.execute("SELECT content_hash FROM learning_bit_duplicates")}
+    index = SimHashIndex(max_distance)
+    stats = {'scanned': 0, 'fingerprinted': 0, 'clustered': 0, 'pruned': 0}
+
+    pending_fingerprints: List[Tuple[int, int]] = []
+    duplicates: List[Tuple[str, int, int, int, str]] = []
+    cursor = conn.execute("SELECT id, content_hash, content, simhash, source_url FROM learning_bits ORDER BY id")
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for bit_id, content_hash, content, stored, source_url in rows:
+            stats['scanned'] += 1
+            if stored is None:
+                fingerprint = simhash(content or '')
+                if fingerprint is None:
+                    continue  # No words: never a near duplicate
+                pending_fingerprints.append((to_signed(fingerprint), bit_id))
+            else:
+                fingerprint = from_signed(stored)
+            if content_hash in clustered:
+                continue
+
+            match = index.find(fingerprint)
+            if match:
+                canonical_id, distance = match
+                duplicates.append((content_hash, canonical_id, bit_id, distance, source_url))
+            else:
+                index.add(bit_id, fingerprint)
+
+    conn.executemany("UPDATE learning_bits SET simhash = ? WHERE id = ?", pending_fingerprints)
+    conn.executemany("""
+        INSERT OR IGNORE INTO learning_bit_duplicates
+        (content_hash, canonical_bit_id, bit_id, distance, source_url)
+        VALUES (?, ?, ?, ?, ?)
+    """, duplicates)
+    stats['fingerprinted'] = len(pending_fingerprints)
+    stats['clustered'] = len(duplicates)
+
+    if prune:
+        stats['pruned'] = _prune_duplicates(conn)
+    conn.commit()
+    return stats
+
+
+def _prune_duplicates(conn: sqlite3.Connection) -> int:
+    """Delete clustered duplicate rows, folding their references into the canonical bit"""
+    rows = conn.execute("""
+        SELECT d.content_hash, d.canonical_bit_id, d.bit_id, lb.reference_count
+        FROM learning_bit_duplicates d
+        JOIN learning_bits lb ON lb.id = d.bit_id
+    """).fetchall()
+    if not rows:
+        return 0
+
+    conn.executemany("""
+        UPDATE learning_bits
+        SET reference_count = reference_count + ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, [((references or 0) + 1, canonical_id) for _, canonical_id, _, references in rows])
+
+    pruned_ids = [(bit_id,) for _, _, bit_id, _ in rows]
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table in ('cross_references', 'learning_relationships'):
+        if table in tables:
+            conn.executemany(f"DELETE FROM {table} WHERE source_bit_id = ? OR target_bit_id = ?",
+                             [(bit_id, bit_id) for (bit_id,) in pruned_ids])
+    conn.executemany("DELETE FROM learning_bits WHERE id = ?", pruned_ids)
+    conn.executemany("UPDATE learning_bit_duplicates SET bit_id = NULL WHERE content_hash = ?",
+                     [(content_hash,) for content_hash, _, _, _ in rows])
+    return len(rows)
+
+
+def dedup_statistics(cursor: sqlite3.Cursor, total_bits: int) -> Dict[str, Any]:
+    """
+    Near-duplicate metrics for learning statistics.
+
+    ``dedup_ratio`` is the share of distinct extracted bits (stored bits plus
+    copies that were never stored) that are near duplicates of another bit.
+    """
+    try:
+        cursor.execute("""
+            SELECT
+                SUM(CASE WHEN bit_id IS NULL THEN 1 ELSE 0 END),
+                SUM(CASE WHEN bit_id IS NOT NULL THEN 1 ELSE 0 END)
+            FROM learning_bit_duplicates
+        """)
+        rejected, clustered = (value or 0 for value in cursor.fetchone())
+        cursor.execute("SELECT COUNT(*) FROM learning_bits WHERE simhash IS NOT NULL")
+        fingerprinted = cursor.fetchone()[0]
+    except sqlite3.OperationalError:
+        # Database predates fingerprinting; run scripts/backfill_simhash.py
+        rejected, clustered, fingerprinted = 0, 0, 0
+
+    seen = total_bits + rejected
+    return {
+        'near_duplicates_rejected': rejected,
+        'near_duplicates_clustered': clustered,
+        'fingerprinted_bits': fingerprinted,
+        'dedup_ratio': round((rejected + clustered) / seen, 4) if seen else 0.0
+    }
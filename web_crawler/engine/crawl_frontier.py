@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Crawl Frontier - Priority URL frontier with per-host politeness scheduling
+Hosts are scheduled by ready time so that many domains can be fetched in parallel
+while each individual host still sees at most one request per crawl delay
+"""
+
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class CrawlFrontier:
+    """
+    Heap-based crawl frontier.
+
+    Every host has its own priority heap of pending URLs. Hosts move between
+    three states:
+
+    - ready: idle, cooldown elapsed; kept in a heap keyed by best URL priority
+    - waiting: idle but cooling down; kept in a heap keyed by ready time
+    - busy: a URL of this host has been handed out and not completed yet
+
+    ``pop_ready`` hands out the highest-priority URL among ready hosts, and
+    ``complete`` starts the host's cooldown once the fetch has finished, so a
+    host never has more than one request in flight.
+    """
+
+    def __init__(self, default_delay: float = 1.0, clock=time.monotonic):
+        self.default_delay = default_delay
+        self.clock = clock
+
+        self._host_queues: Dict[str, List[Tuple[float, int, str, int]]] = {}
+        self._host_delays: Dict[str, float] = {}
+        self._host_ready_at: Dict[str, float] = {}
+        self._busy_hosts: Dict[str, str] = {}   # host -> URL in flight
+        self._scheduled: set = set()             # hosts present in the ready or waiting heap
+        self._ready: List[Tuple[float, int, str]] = []    # (-priority, seq, host)
+        self._waiting: List[Tuple[float, int, str]] = []  # (ready_at, seq, host)
+        self._seen: set = set()
+        self._pending = 0
+        self._seq = itertools.count()
+
+        self.stats = {'enqueued': 0, 'duplicates': 0, 'dispatched': 0, 'completed': 0}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Politeness key for a URL"""
+        return urlparse(url).netloc.lower()
+
+    def __len__(self) -> int:
+        """Number of URLs waiting to be dispatched"""
+        return self._pending
+
+    @property
+    def in_flight(self) -> int:
+        """Number of URLs dispatched but not completed"""
+        return len(self._busy_hosts)
+
+    def is_done(self) -> bool:
+        """True when nothing is pending and nothing is in flight"""
+        return self._pending == 0 and not self._busy_hosts
+
+    def seen(self, url: str) -> bool:
+        """Whether the URL was ever added to the frontier"""
+        return url in self._seen
+
+    def mark_seen(self, urls):
+        """Record URLs as already visited without queueing them (e.g. when resuming a crawl)"""
+        self._seen.update(urls)
+
+    def set_host_delay(self, host: str, delay: float):
+        """Override the crawl delay for one host (e.g. from robots.txt Crawl-delay)"""
+        self._host_delays[host.lower()] = max(0.0, delay)
+
+    def get_host_delay(self, host: str) -> float:
+        """Effective crawl delay for a host"""
+        return self._host_delays.get(host.lower(), self.default_delay)
+
+    def add(self, url: str, depth: int = 0, priority: float = 0.5) -> bool:
+        """Add a URL; returns False if it was already seen"""
+        if url in self._seen:
+            self.stats['duplicates'] += 1
+            return False
+        self._seen.add(url)
+
+        host = self.host_of(url)
+        queue = self._host_queues.setdefault(host, [])
+        entry = (-priority, next(self._seq), url, depth)
+        heapq.heappush(queue, entry)
+        self._pending += 1
+        self.stats['enqueued'] += 1
+
+        if host in self._busy_hosts:
+            return True
+        if host not in self._scheduled:
+            self._schedule(host)
+        elif queue[0] is entry and self._host_ready_at.get(host, 0.0) <= self.clock():
+            # A ready host's best priority improved; the stale entry is skipped on pop
+            heapq.heappush(self._ready, (entry[0], next(self._seq), host))
+        return True
+
+    def _schedule(self, host: str):
+        """Put an idle host with pending URLs into the ready or waiting heap"""
+        queue = self._host_queues.get(host)
+        if not queue:
+            return
+        ready_at = self._host_ready_at.get(host, 0.0)
+        if ready_at <= self.clock():
+            heapq.heappush(self._ready, (queue[0][0], next(self._seq), host))
+        else:
+            heapq.heappush(self._waiting, (ready_at, next(self._seq), host))
+        self._scheduled.add(host)
+
+    def _promote_waiting(self, now: float):
+        """Move hosts whose cooldown has elapsed into the ready heap"""
+        while self._waiting and self._waiting[0][0] <= now:
+            _, _, host = heapq.heappop(self._waiting)
+            queue = self._host_queues.get(host)
+            if host in self._busy_hosts or not queue:
+                continue
+            heapq.heappush(self._ready, (queue[0][0], next(self._seq), host))
+
+    def pop_ready(self) -> Optional[Tuple[str, int, float]]:
+        """Hand out the best URL whose host may be fetched now, as (url, depth, priority)"""
+        now = self.clock()
+        self._promote_waiting(now)
+
+        while self._ready:
+            neg_priority, _, host = heapq.heappop(self._ready)
+            queue = self._host_queues.get(host)
+            if host in self._busy_hosts or not queue or self._host_ready_at.get(host, 0.0) > now:
+                continue  # Stale entry (a cooling-down host is tracked in the waiting heap)
+            if queue[0][0] != neg_priority:
+                # Priority changed since the entry was pushed: re-key and retry
+                heapq.heappush(self._ready, (queue[0][0], next(self._seq), host))
+                continue
+
+            neg_priority, _, url, depth = heapq.heappop(queue)
+            if not queue:
+                del self._host_queues[host]
+            self._scheduled.discard(host)
+            self._busy_hosts[host] = url
+            self._pending -= 1
+            self.stats['dispatched'] += 1
+            return url, depth, -neg_priority
+
+        return None
+
+    def complete(self, url: str):
+        """Mark a dispatched URL as finished and start its host's cooldown"""
+        host = self.host_of(url)
+        if self._busy_hosts.pop(host, None) is None:
+            return
+        self._host_ready_at[host] = self.clock() + self.get_host_delay(host)
+        self.stats['completed'] += 1
+        self._schedule(host)
+
+    def next_ready_in(self) -> Optional[float]:
+        """Seconds until the next cooling-down host becomes ready (0 if one is ready now)"""
+        now = self.clock()
+        self._promote_waiting(now)
+        if self._ready:
+            return 0.0
+        while self._waiting:
+            ready_at, _, host = self._waiting[0]
+            if host in self._busy_hosts or not self._host_queues.get(host):
+                heapq.heappop(self._waiting)
+                continue
+            return max(0.0, ready_at - now)
+        return None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Frontier counters and current sizes"""
+        stats = dict(self.stats)
+        stats.update({
+            'pending': self._pending,
+            'in_flight': self.in_flight,
+            'hosts': len(self._host_queues),
+        })
+        return stats
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Durable Crawl Queue - SQLite-backed background crawl jobs and per-job frontiers
+Jobs are claimed with a lease that expires unless it is renewed, so a crawl whose
+process died is picked up again by the next manager; each job's frontier is
+checkpointed page by page so a resumed crawl continues where it stopped
+"""
+
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOB_PRIORITIES = {'high': 0, 'normal': 1, 'low': 2}
+VISIBILITY_TIMEOUT = 300.0  # Seconds a claimed job stays invisible without a renewal
+
+DURABLE_QUEUE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS crawl_jobs (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id TEXT UNIQUE NOT NULL,
+        start_url TEXT NOT NULL,
+        config TEXT,
+        priority INTEGER DEFAULT 1, -- 0=high, 1=normal, 2=low
+        status TEXT DEFAULT 'queued', -- 'queued', 'running', 'completed', 'failed', 'stopped'
+        lease TEXT,
+        lease_expires_at REAL,
+        attempts INTEGER DEFAULT 0,
+        pages_crawled INTEGER DEFAULT 0,
+        result TEXT,
+        error TEXT,
+        queued_at REAL,
+        started_at REAL,
+        finished_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_crawl_jobs_ready ON crawl_jobs(status, priority, seq);
+    CREATE INDEX IF NOT EXISTS idx_crawl_jobs_lease ON crawl_jobs(status, lease_expires_at);
+
+    CREATE TABLE IF NOT EXISTS crawl_job_urls (
+        job_id TEXT NOT NULL,
+        url TEXT NOT NULL,
+        depth INTEGER DEFAULT 0,
+        priority REAL DEFAULT 0.5,
+        status TEXT DEFAULT 'pending', -- 'pending', 'crawled', 'skipped'
+        updated_at REAL,
+        PRIMARY KEY (job_id, url)
+    );
+    CREATE INDEX IF NOT EXISTS idx_crawl_job_urls_pending ON crawl_job_urls(job_id, status, priority DESC);
+"""
+
+_JOB_COLUMNS = ("job_id, start_url, config, priority, status, lease, lease_expires_at, attempts, "
+                "pages_crawled, result, error, queued_at, started_at, finished_at")
+
+
+def _job_from_row(row: tuple) -> Dict[str, Any]:
+    job = dict(zip([column.strip() for column in _JOB_COLUMNS.split(',')], row))
+    job['config'] = json.loads(job['config']) if job['config'] else {}
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+
+class DurableCrawlQueue:
+    """
+    Persistent priority queue of crawl jobs with leases.
+
+    ``claim_job`` hands out the oldest job whose lease expired (its owner
+    died mid-crawl), otherwise the best queued job by (priority, submission
+    order). Both are single index probes, so a claim is O(log n). A claimed
+    job must be renewed within ``visibility_timeout`` seconds or it becomes
+    claimable again; ``JobCheckpoint`` renews it with every crawled page.
+    """
+
+    def __init__(self, db_path: str, visibility_timeout: float = VISIBILITY_TIMEOUT, clock=time.time):
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        self.clock = clock
+        with self._connect() as conn:
+            conn.executescript(DURABLE_QUEUE_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def enqueue_job(self, job_id: str, start_url: str, config: Optional[Dict[str, Any]] = None,
+                    priority: str = 'normal') -> bool:
+        """
+        Queue a job; False if a job with this id is already queued or running.
+
+        A finished, failed or stopped job id is queued again from scratch.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT status FROM crawl_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row and row[0] in ('queued', 'running'):
+                return False
+            if row:
+                conn.execute("DELETE FROM crawl_jobs WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM crawl_job_urls WHERE job_id = ?", (job_id,))
+            conn.execute("""
+                INSERT INTO crawl_jobs (job_id, start_url, config, priority, queued_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (job_id, start_url, json.dumps(config or {}, default=str),
+                  JOB_PRIORITIES.get(priority, JOB_PRIORITIES['normal']), self.clock()))
+        return True
+
+    def claim_job(self) -> Optional[Dict[str, Any]]:
+        """Lease the next job to run, or None; the returned job carries its ``lease`` token"""
+        now = self.clock()
+        lease = uuid.uuid4().hex
+        with self._connect() as conn:
+            for candidate in (
+                # Running jobs whose owner stopped renewing the lease resume first
+                "SELECT seq FROM crawl_jobs WHERE status = 'running' AND lease_expires_at < :now "
+                "ORDER BY lease_expires_at LIMIT 1",
+                "SELECT seq FROM crawl_jobs WHERE status = 'queued' ORDER BY priority, seq LIMIT 1",
+            ):
+                row = conn.execute(f"""
+                    UPDATE crawl_jobs
+                    SET status = 'running', lease = :lease, lease_expires_at = :expires,
+                        attempts = attempts + 1, started_at = COALESCE(started_at, :now)
+                    WHERE seq = ({candidate})
+                    RETURNING {_JOB_COLUMNS}
+                """, {'lease': lease, 'expires': now + self.visibility_timeout, 'now': now}).fetchone()
+                if row:
+                    return _job_from_row(row)
+        return None
+
+    def _update_leased(self, job_id: str, lease: str, assignments: str, params: tuple) -> bool:
+        """Update a job only while the caller still holds its lease"""
+        with self._connect() as conn:
+            cursor = conn.execute(f"""
+                UPDATE crawl_jobs SET {assignments}
+                WHERE job_id = ? AND lease = ? AND status = 'running'
+            """, params + (job_id, lease))
+            return cursor.rowcount == 1
+
+    def renew_job(self, job_id: str, lease: str) -> bool:
+        """Extend a lease; False if it was lost to another worker or the job was stopped"""
+        return self._update_leased(job_id, lease, "lease_expires_at = ?",
+                                   (self.clock() + self.visibility_timeout,))
+
+    def complete_job(self, job_id: str, lease: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        return self._update_leased(job_id, lease,
+                                   "status = 'completed', lease = NULL, result = ?, finished_at = ?",
+                                   (json.dumps(result, default=str), self.clock()))
+
+    def fail_job(self, job_id: str, lease: str, error: str, retry: bool = False, max_attempts: int = 3) -> bool:
+        """Record a failure; with ``retry`` the job is queued again (keeping its frontier) until max_attempts"""
+        return self._update_leased(job_id, lease, """
+            status = CASE WHEN ? AND attempts < ? THEN 'queued' ELSE 'failed' END,
+            lease = NULL, lease_expires_at = NULL, error = ?, finished_at = ?
+        """, (int(retry), max_attempts, error, self.clock()))
+
+    def release_job(self, job_id: str, lease: str) -> bool:
+        """Give a running job back to the queue (e.g. on shutdown) without counting an attempt"""
+        return self._update_leased(job_id, lease,
+                                   "status = 'queued', lease = NULL, lease_expires_at = NULL, "
+                                   "attempts = attempts - 1", ())
+
+    def stop_job(self, job_id: str) -> bool:
+        """Stop a queued or running job so it is never resumed"""
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                UPDATE crawl_jobs SET status = 'stopped', lease = NULL, finished_at = ?
+                WHERE job_id = ? AND status IN ('queued', 'running')
+            """, (self.clock(), job_id))
+            return cursor.rowcount == 1
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {_JOB_COLUMNS} FROM crawl_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _job_from_row(row) if row else None
+
+    def list_jobs(self, status: str) -> List[Dict[str, Any]]:
+        """Jobs with a status, in claim order"""
+        with self._connect() as conn:
+            rows = conn.execute(f"""
+                SELECT {_JOB_COLUMNS} FROM crawl_jobs WHERE status = ? ORDER BY priority, seq
+            """, (status,)).fetchall()
+        return [_job_from_row(row) for row in rows]
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position of a queued job, or None if it is not queued"""
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT COUNT(*) FROM crawl_jobs ahead, crawl_jobs job
+                WHERE job.job_id = ? AND job.status = 'queued' AND ahead.status = 'queued'
+                  AND (ahead.priority, ahead.seq) <= (job.priority, job.seq)
+            """, (job_id,)).fetchone()
+        return row[0] or None
+
+    def checkpoint(self, job: Dict[str, Any]) -> 'JobCheckpoint':
+        return JobCheckpoint(self, job['job_id'], job['lease'])
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM crawl_jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in ('queued', 'running', 'completed', 'failed', 'stopped')}
+
+
+class JobCheckpoint:
+    """
+    Frontier checkpoint of one leased job.
+
+    Discovered URLs are stored as pending and every fetched URL is marked
+    crawled or skipped in the same transaction that stores its new links and
+    renews the job lease, so the persisted frontier is always a consistent
+    cut of the crawl. URLs that were in flight when a crawl died are still
+    pending and are fetched again on resume.
+    """
+
+    def __init__(self, queue: DurableCrawlQueue, job_id: str, lease: str):
+        self.queue = queue
+        self.job_id = job_id
+        self.lease = lease
+        self.lease_lost = False
+
+    def restore(self) -> Tuple[Set[str], List[Tuple[str, int, float]], int]:
+        """(visited URLs, pending (url, depth, priority) best first, pages crawled)"""
+        with self.queue._connect() as conn:
+            visited = {row[0] for row in conn.execute(
+                "SELECT url FROM crawl_job_urls WHERE job_id = ? AND status != 'pending'", (self.job_id,))}
+            pending = conn.execute("""
+                SELECT url, depth, priority FROM crawl_job_urls
+                WHERE job_id = ? AND status = 'pending' ORDER BY priority DESC
+            """, (self.job_id,)).fetchall()
+            row = conn.execute("SELECT pages_crawled FROM crawl_jobs WHERE job_id = ?", (self.job_id,)).fetchone()
+        return visited, pending, row[0] if row else 0
+
+    def add(self, entries: Iterable[Tuple[str, int, float]]):
+        """Persist newly discovered URLs as pending"""
+        with self.queue._connect() as conn:
+            self._insert_pending(conn, entries)
+
+    def _insert_pending(self, conn: sqlite3.Connection, entries: Iterable[Tuple[str, int, float]]):
+        now = self.queue.clock()
+        conn.executemany("""
+            INSERT OR IGNORE INTO crawl_job_urls (job_id, url, depth, priority, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(self.job_id, url, depth, priority, now) for url, depth, priority in entries])
+
+    def record(self, url: str, crawled: bool, new_entries: Iterable[Tuple[str, int, float]]) -> bool:
+        """
+        Checkpoint one fetched URL and the links it added; renews the lease.
+
+        Returns False (and sets ``lease_lost``) once the job was stopped or
+        claimed by another worker; nothing is written in that case.
+        """
+        queue = self.queue
+        now = queue.clock()
+        with queue._connect() as conn:
+            cursor = conn.execute("""
+                UPDATE crawl_jobs
+                SET lease_expires_at = ?, pages_crawled = pages_crawled + ?
+                WHERE job_id = ? AND lease = ? AND status = 'running'
+            """, (now + queue.visibility_timeout, int(crawled), self.job_id, self.lease))
+            if cursor.rowcount != 1:
+                conn.rollback()
+                if not self.lease_lost:
+                    logger.warning(f"⚠️ Lost the lease on crawl job {self.job_id}; stopping")
+                self.lease_lost = True
+                return False
+            conn.execute("""
+                UPDATE crawl_job_urls SET status = ?, updated_at = ? WHERE job_id = ? AND url = ?
+            """, ('crawled' if crawled else 'skipped', now, self.job_id, url))
+            self._insert_pending(conn, new_entries)
+        return True
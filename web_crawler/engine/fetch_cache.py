@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Fetch Cache - Persisted robots.txt rules and HTTP validators for the web crawler
+Keeps one robots.txt per origin (with its Crawl-delay) and the ETag/Last-Modified
+validators of every stored page, so recurring crawls can send conditional
+requests and skip unchanged pages entirely on 304 Not Modified
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+logger = logging.getLogger(__name__)
+
+ROBOTS_TTL = 24 * 3600        # Re-fetch robots.txt once a day
+ROBOTS_ERROR_TTL = 10 * 60    # Retry unreachable robots.txt sooner
+
+FETCH_CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS robots_cache (
+        origin TEXT PRIMARY KEY,
+        status_code INTEGER NOT NULL,
+        robots_txt TEXT,
+        crawl_delay REAL,
+        fetched_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS page_validators (
+        url TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        page_id INTEGER,
+        title TEXT,
+        links TEXT, -- JSON {url: priority} from the last full fetch, NULL if links were not discovered
+        not_modified_count INTEGER DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+
+def origin_of(url: str) -> str:
+    """robots.txt scope of a URL (scheme and host)"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+
+def ensure_fetch_cache_schema(conn: sqlite3.Connection):
+    """Create the robots and validator tables if missing"""
+    conn.executescript(FETCH_CACHE_SCHEMA)
+
+
+def parse_robots(status_code: int, robots_txt: Optional[str]) -> RobotFileParser:
+    """
+    Rules for a robots.txt response, following RFC 9309.
+
+    A missing or forbidden file (4xx) allows everything; a server error or an
+    unreachable host (status 0) disallows everything until it is retried.
+    """
+    rules = RobotFileParser()
+    if 200 <= status_code < 300:
+        rules.parse((robots_txt or '').splitlines())
+    elif 400 <= status_code < 500:
+        rules.allow_all = True
+    else:
+        rules.disallow_all = True
+    return rules
+
+
+class FetchCache:
+    """
+    robots.txt rules per origin and conditional-GET validators per URL.
+
+    Both are persisted in the crawler database and mirrored in memory for the
+    lifetime of the cache; robots rules expire after ``robots_ttl`` seconds.
+    """
+
+    def __init__(self, db_path: str, robots_ttl: float = ROBOTS_TTL, clock=time.time):
+        self.db_path = db_path
+        self.robots_ttl = robots_ttl
+        self.clock = clock
+        self._robots: Dict[str, Tuple[RobotFileParser, Optional[float], float]] = {}  # origin -> (rules, delay, expires)
+        self._validators: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.stats = {'robots_fetched': 0, 'robots_cache_hits': 0, 'robots_blocked': 0,
+                      'conditional_requests': 0, 'not_modified': 0}
+
+    def _expires_at(self, status_code: int, fetched_at: float) -> float:
+        ttl = self.robots_ttl if status_code < 500 and status_code != 0 else min(self.robots_ttl, ROBOTS_ERROR_TTL)
+        return fetched_at + ttl
+
+    def get_robots(self, origin: str) -> Optional[Tuple[RobotFileParser, Optional[float]]]:
+        """Cached (rules, Crawl-delay) for an origin, or None if missing or expired"""
+        now = self.clock()
+        cached = self._robots.get(origin)
+        if cached is None:
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    row = conn.execute("""
+                        SELECT status_code, robots_txt, crawl_delay, fetched_at
+                        FROM robots_cache WHERE origin = ?
+                    """, (origin,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Could not read robots cache for {origin}: {e}")
+                row = None
+            if row is None:
+                return None
+            status_code, robots_txt, crawl_delay, fetched_at = row
+            cached = (parse_robots(status_code, robots_txt), crawl_delay, self._expires_at(status_code, fetched_at))
+            self._robots[origin] = cached
+
+        rules, crawl_delay, expires_at = cached
+        if expires_at <= now:
+            return None
+        self.stats['robots_cache_hits'] += 1
+        return rules, crawl_delay
+
+    def store_robots(self, origin: str, status_code: int, robots_txt: Optional[str],
+                     user_agent: str) -> Tuple[RobotFileParser, Optional[float]]:
+        """Parse and persist a robots.txt response; returns (rules, Crawl-delay for user_agent)"""
+        fetched_at = self.clock()
+        rules = parse_robots(status_code, robots_txt)
+        crawl_delay = rules.crawl_delay(user_agent) if 200 <= status_code < 300 else None
+        if crawl_delay is not None:
+            crawl_delay = float(crawl_delay)
+        self._robots[origin] = (rules, crawl_delay, self._expires_at(status_code, fetched_at))
+        self.stats['robots_fetched'] += 1
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO robots_cache (origin, status_code, robots_txt, crawl_delay, fetched_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (origin, status_code, robots_txt, crawl_delay, fetched_at))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Could not persist robots.txt for {origin}: {e}")
+        return rules, crawl_delay
+
+    def get_validators(self, url: str) -> Optional[Dict[str, Any]]:
+        """Stored validators, page id, title and links of a URL"""
+        if url not in self._validators:
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    row = conn.execute("""
+                        SELECT etag, last_modified, page_id, title, links
+                        FROM page_validators WHERE url = ?
+                    """, (url,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Could not read validators for {url}: {e}")
+                row = None
+            self._validators[url] = None if row is None else {
+                'etag': row[0],
+                'last_modified': row[1],
+                'page_id': row[2],
+                'title': row[3],
+                'links': json.loads(row[4]) if row[4] is not None else None
+            }
+        return self._validators[url]
+
+    def conditional_headers(self, url: str, need_links: bool = False) -> Dict[str, str]:
+        """
+        If-None-Match / If-Modified-Since headers for a revisit.
+
+        Empty when nothing is cached, or when links are needed but were not
+        recorded on the last full fetch (a 304 could not provide them).
+        """
+        validators = self.get_validators(url)
+        if not validators or (need_links and validators['links'] is None):
+            return {}
+        headers = {}
+        if validators['etag']:
+            headers['If-None-Match'] = validators['etag']
+        if validators['last_modified']:
+            headers['If-Modified-Since'] = validators['last_modified']
+        if headers:
+            self.stats['conditional_requests'] += 1
+        return headers
+
+    def store_validators(self, url: str, etag: Optional[str], last_modified: Optional[str],
+                         page_id: int, title: str, links: Optional[Dict[str, float]]):
+        """Remember the validators of a fully fetched and stored page"""
+        if not etag and not last_modified:
+            if self.get_validators(url) is None:
+                return
+            # The server stopped sending validators; forget the stale ones
+            self._validators[url] = None
+            self._execute("DELETE FROM page_validators WHERE url = ?", (url,))
+            return
+
+        self._validators[url] = {'etag': etag, 'last_modified': last_modified, 'page_id': page_id,
+                                 'title': title, 'links': links}
+        self._execute("""
+            INSERT OR REPLACE INTO page_validators (url, etag, last_modified, page_id, title, links, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (url, etag, last_modified, page_id, title, json.dumps(links) if links is not None else None))
+
+    def record_not_modified(self, url: str):
+        """Count a 304 revisit and refresh the stored page's crawl time"""
+        self.stats['not_modified'] += 1
+        validators = self.get_validators(url) or {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    UPDATE page_validators
+                    SET not_modified_count = not_modified_count + 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE url = ?
+                """, (url,))
+                conn.execute("UPDATE crawled_pages SET last_crawled = CURRENT_TIMESTAMP WHERE id = ?",
+                             (validators.get('page_id'),))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Could not record 304 for {url}: {e}")
+
+    def _execute(self, sql: str, params: tuple):
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(sql, params)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Fetch cache write failed: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        stats['robots_origins'] = len(self._robots)
+        return stats
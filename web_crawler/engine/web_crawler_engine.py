@@ -11,16 +11,26 @@ import json
 import logging
 import re
 import time
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set, Tuple, Union
 from urllib.parse import urljoin, urlparse, urlunparse
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import sqlite3
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import trafilatura
 from trafilatura.settings import use_config
 
+from core.memory.database.row_counters import ensure_row_counters
+from core.memory.database.search_index import ensure_search_index, ranked_search
+from utils.pattern_classifier import PatternClassifier
+from .crawl_frontier import CrawlFrontier
+from .content_fingerprint import SimHashIndex, ensure_fingerprint_schema, from_signed, simhash, to_signed
+from .fetch_cache import FetchCache, ROBOTS_TTL, ensure_fetch_cache_schema, origin_of
+from .durable_queue import DurableCrawlQueue, JobCheckpoint
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -29,16 +39,20 @@ class CrawlConfig:
     max_depth: int = 3
     max_pages_per_domain: int = 100
     crawl_delay: float = 1.0
+    max_concurrent_requests: int = 8  # Fetch workers shared across hosts; per-host delay still applies
     timeout: int = 30
     max_retries: int = 3
     user_agent: str = "Memory-Context-Manager-v2/1.0 (Educational Research Bot)"
     respect_robots_txt: bool = True
+    robots_cache_ttl: float = ROBOTS_TTL  # Seconds before a cached robots.txt is fetched again
+    conditional_requests: bool = True  # Revisit stored pages with If-None-Match / If-Modified-Since
     follow_links: bool = True
     extract_images: bool = False
     extract_code: bool = True
     extract_tables: bool = True
     min_content_length: int = 100
     max_content_length: int = 50000
+    near_duplicate_distance: int = 6  # Max SimHash bit distance folded into an existing learning bit; -1 disables
 
 @dataclass
 class LearningBit:
@@ -70,6 +84,17 @@ class CrawledPage:
     domain: str
     path: str
     metadata: Dict[str, Any]
+    learning_bits: List[LearningBit] = field(default_factory=list)
+    links: Dict[str, float] = field(default_factory=dict)  # Discovered link -> priority
+
+@dataclass
+class ParsedPage:
+    """A fetched document parsed once and shared by all extractors"""
+    tree: Optional[Any]  # lxml.html document, None if the HTML could not be parsed
+    title: str
+    content: str
+    links: Dict[str, float]
+    timings: Dict[str, float]  # Stage name -> milliseconds
 
 class ContentAnalyzer:
     """Analyzes and categorizes web content for learning extraction"""
@@ -220,43 +245,33 @@ class ContentAnalyzer:
                 r'\b(?:enterprise|production|scalable)\b'
             ]
         }
+        
+        # All pattern families compiled into one single-pass classifier
+        self.classifier = PatternClassifier({
+            'content_type': self.content_patterns,
+            'category': self.category_patterns,
+            'subcategory': self.subcategory_patterns,
+            'complexity': self.complexity_patterns
+        })
 
     def analyze_content(self, content: str, url: str) -> Dict[str, Any]:
         """Analyze content and return categorization results"""
-        content_lower = content.lower()
-        url_lower = url.lower()
+        scan = self.classifier.scan(content)
+        url_scan = self.classifier.scan(url)
+        
+        # Detect content types and categories
+        detected_types = scan.matched_labels('content_type')
+        detected_categories = scan.matched_labels('category')
         
-        # Detect content types
-        detected_types = []
-        for content_type, patterns in self.content_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, content_lower, re.IGNORECASE):
-                    detected_types.append(content_type)
-                    break
-        
-        # Detect categories
-        detected_categories = []
-        for category, patterns in self.category_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, content_lower, re.IGNORECASE):
-                    detected_categories.append(category)
-                    break
-        
-        # Detect subcategories
-        detected_subcategories = []
-        for subcategory, patterns in self.subcategory_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, content_lower, re.IGNORECASE) or re.search(pattern, url_lower, re.IGNORECASE):
-                    detected_subcategories.append(subcategory)
-                    break
-        
-        # Detect complexity
-        complexity = 'moderate'  # default
-        for comp_level, patterns in self.complexity_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, content_lower, re.IGNORECASE):
-                    complexity = comp_level
-                    break
+        # Detect subcategories (from the content or the URL)
+        detected_subcategories = [
+            subcategory for subcategory in self.subcategory_patterns
+            if scan.has_match('subcategory', subcategory) or url_scan.has_match('subcategory', subcategory)
+        ]
+        
+        # Detect complexity; the last matching level wins
+        complexity_levels = scan.matched_labels('complexity')
+        complexity = complexity_levels[-1] if complexity_levels else 'moderate'
         
         # Calculate importance score based on content characteristics
         importance_score = self._calculate_importance(content, detected_types, detected_categories)
@@ -423,6 +438,9 @@ class IntelligentLearningProcessor:
 class WebCrawler:
     """Main web crawler class for fetching and processing web content"""
     
+    # Previous learning bits per domain that drive adaptive extraction
+    DOMAIN_CONTEXT_SIZE = 50
+    
     def __init__(self, db_path: str):
         """Initialize the web crawler"""
         self.db_path = db_path
@@ -430,7 +448,7 @@ class WebCrawler:
         self.content_analyzer = ContentAnalyzer()
         self.intelligent_processor = IntelligentLearningProcessor()
         self.session = None
-        self.crawl_queue = []
+        self.crawl_queue = CrawlFrontier(default_delay=self.config.crawl_delay)
         self.crawled_urls = set()
         self.url_depths = {}
         self.url_priorities = {}
@@ -439,6 +457,9 @@ class WebCrawler:
         # Initialize database
         self._init_database()
         
+        # Persisted robots.txt rules and conditional-GET validators
+        self.fetch_cache = FetchCache(db_path, robots_ttl=self.config.robots_cache_ttl)
+        
         # Learning evolution tracking
         self.learning_evolution = {
             'total_extractions': 0,
@@ -447,6 +468,15 @@ class WebCrawler:
             'quality_improvements': 0,
             'pattern_discoveries': 0
         }
+        
+        # Page-processing pipeline timings (see _process_page)
+        self.pipeline_stats = {'pages': 0, 'documents_parsed': 0, 'stage_ms': {}}
+        
+        # Crawl-session caches: stored learning bit hashes and per-domain learning context
+        self._known_hashes: Optional[Dict[str, int]] = None
+        self._simhash_index: Optional[SimHashIndex] = None
+        self._domain_context: Dict[str, List[Any]] = {}
+        self.dedup_stats = {'inserted': 0, 'exact_duplicates': 0, 'near_duplicates': 0}
     
     def _init_database(self):
         """Initialize the web crawler database tables"""
@@ -463,6 +493,21 @@ class WebCrawler:
                 else:
                     logger.warning("⚠️ Schema file not found, creating basic tables")
                     self._create_basic_tables(conn)
+                
+                # SimHash fingerprints for near-duplicate learning bits
+                ensure_fingerprint_schema(conn)
+                # robots.txt and ETag/Last-Modified cache
+                ensure_fetch_cache_schema(conn)
+                # Cached learning_bits row count for the status/log tools
+                ensure_row_counters(conn)
+                conn.commit()
+                
+                # Full-text index over learning bits (bm25-ranked search_learning_bits)
+                try:
+                    ensure_search_index(conn, ["learning_bits"])
+                    conn.commit()
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"⚠️ Full-text index for learning bits unavailable: {e}")
         except Exception as e:
             logger.error(f"❌ Database initialization failed: {e}")
             raise
@@ -501,6 +546,7 @@ class WebCrawler:
                 tags TEXT,
                 complexity_level TEXT DEFAULT 'moderate',
                 language TEXT DEFAULT 'en',
+                simhash INTEGER,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (page_id) REFERENCES crawled_pages(id)
             )"""
@@ -518,6 +564,7 @@ class WebCrawler:
                 timeout=timeout,
                 headers={'User-Agent': self.config.user_agent}
             )
+            self.fetch_cache.robots_ttl = self.config.robots_cache_ttl
             logger.info("🚀 Web crawler session started")
     
     async def stop_session(self):
@@ -526,12 +573,32 @@ class WebCrawler:
             await self.session.close()
             self.session = None
             logger.info("🛑 Web crawler session stopped")
+        # Other writers may change the database between sessions
+        self._known_hashes = None
+        self._simhash_index = None
+        self._domain_context.clear()
     
-    async def crawl_url(self, url: str, depth: int = 0, parent_url: Optional[str] = None) -> Optional[CrawledPage]:
-        """Crawl a single URL and extract content"""
+    async def crawl_url(self, url: str, depth: int = 0, parent_url: Optional[str] = None,
+                        discover_links: Optional[bool] = None) -> Optional[CrawledPage]:
+        """Crawl a single URL and extract content
+        
+        The page is parsed once; title, text and links are all derived from the
+        same tree, and the extracted learning bits and links are returned on the
+        CrawledPage so callers do not have to re-parse or re-extract them.
+        Per-stage timings are reported in ``metadata['timings']``.
+        
+        Pages stored with an ETag or Last-Modified header are revisited with a
+        conditional request. On 304 Not Modified nothing is parsed, extracted
+        or stored again: the returned CrawledPage has status 304, empty
+        content, no new learning bits, and the links recorded on the last
+        full fetch.
+        """
         if url in self.crawled_urls:
             return None
         
+        if discover_links is None:
+            discover_links = self.config.follow_links
+        
         try:
             start_time = time.time()
             
@@ -541,51 +608,67 @@ class WebCrawler:
                 logger.info(f"⏭️ Skipping {url} (robots.txt or delay)")
                 return None
             
-            # Fetch the page
-            async with self.session.get(url) as response:
+            # Fetch the page, conditionally if it is already stored
+            request_headers = (self.fetch_cache.conditional_headers(url, need_links=discover_links)
+                               if self.config.conditional_requests else {})
+            async with self.session.get(url, headers=request_headers) as response:
                 response_time = int((time.time() - start_time) * 1000)
                 
+                if response.status == 304 and request_headers:
+                    return self._not_modified_page(url, depth, parent_url, domain, response,
+                                                   response_time, discover_links)
+                
                 if response.status != 200:
                     logger.warning(f"⚠️ HTTP {response.status} for {url}")
                     return None
                 
                 # Get content
                 html_content = await response.text()
+                fetch_ms = (time.time() - start_time) * 1000
                 
-                # Extract clean text content
-                content = self._extract_text_content(html_content)
+                # Parse once and extract text, title and links from the shared tree
+                page = self._process_page(html_content, url, depth + 1 if discover_links else None)
+                page.timings['fetch'] = fetch_ms
+                content = page.content
                 
                 if len(content) < self.config.min_content_length:
                     logger.info(f"📝 Content too short for {url} ({len(content)} chars)")
                     return None
                 
-                # Parse title
-                title = self._extract_title(html_content)
-                
                 # Store in database
+                stage_start = time.perf_counter()
                 page_id = await self._store_crawled_page(
-                    url, title, content, html_content, response.status, 
+                    url, page.title, content, html_content, response.status, 
                     response_time, depth, parent_url, domain
                 )
+                self.fetch_cache.store_validators(
+                    url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                    page_id, page.title, page.links if discover_links else None
+                )
+                page.timings['store_page'] = (time.perf_counter() - stage_start) * 1000
                 
                 # Extract learning bits
+                stage_start = time.perf_counter()
                 learning_bits = await self._extract_learning_bits(content, url, page_id)
+                page.timings['learning_bits'] = (time.perf_counter() - stage_start) * 1000
                 
                 # Store learning bits
-                for bit in learning_bits:
-                    await self._store_learning_bit(bit, page_id)
+                stage_start = time.perf_counter()
+                await self._store_learning_bits(learning_bits, page_id)
+                page.timings['store_learning_bits'] = (time.perf_counter() - stage_start) * 1000
                 
                 # Mark as crawled
                 self.crawled_urls.add(url)
                 
                 # Update domain delay
                 self.domain_delays[domain] = time.time()
+                self._record_stage_timings(page.timings)
                 
                 logger.info(f"✅ Crawled {url} -> {len(learning_bits)} learning bits")
                 
                 return CrawledPage(
                     url=url,
-                    title=title,
+                    title=page.title,
                     content=content,
                     html_content=html_content,
                     status_code=response.status,
@@ -594,73 +677,146 @@ class WebCrawler:
                     parent_url=parent_url,
                     domain=domain,
                     path=urlparse(url).path,
-                    metadata={'headers': dict(response.headers)}
+                    metadata={'headers': dict(response.headers), 'page_id': page_id,
+                              'timings': {stage: round(ms, 3) for stage, ms in page.timings.items()}},
+                    learning_bits=learning_bits,
+                    links=page.links
                 )
                 
         except Exception as e:
             logger.error(f"❌ Error crawling {url}: {e}")
             return None
     
-    def _extract_text_content(self, html_content: str) -> str:
-        """Extract clean text content from HTML"""
+    def _not_modified_page(self, url: str, depth: int, parent_url: Optional[str], domain: str,
+                           response, response_time: int, discover_links: bool) -> CrawledPage:
+        """Result of a 304 revisit: the stored page is reused without parsing or extraction"""
+        validators = self.fetch_cache.get_validators(url)
+        self.fetch_cache.record_not_modified(url)
+        self.crawled_urls.add(url)
+        self.domain_delays[domain] = time.time()
+        timings = {'fetch': float(response_time)}
+        self._record_stage_timings(timings)
+        
+        logger.info(f"♻️ Not modified: {url}")
+        return CrawledPage(
+            url=url,
+            title=validators['title'] or "Untitled",
+            content="",
+            html_content="",
+            status_code=response.status,
+            response_time_ms=response_time,
+            crawl_depth=depth,
+            parent_url=parent_url,
+            domain=domain,
+            path=urlparse(url).path,
+            metadata={'headers': dict(response.headers), 'page_id': validators['page_id'],
+                      'timings': timings, 'not_modified': True},
+            links=dict(validators['links'] or {}) if discover_links else {}
+        )
+    
+    def _process_page(self, html_content: str, url: str, link_depth: Optional[int] = None) -> ParsedPage:
+        """Parse a document once and run the title, text and link extractors on the tree
+        
+        Links are only discovered (and prioritized for ``link_depth``) when a
+        link depth is given. Each stage's wall time is recorded in milliseconds.
+        """
+        timings = {}
+        
+        stage_start = time.perf_counter()
+        tree = self._parse_html(html_content)
+        timings['parse'] = (time.perf_counter() - stage_start) * 1000
+        
+        stage_start = time.perf_counter()
+        content = self._extract_text_content(html_content, tree)
+        timings['text'] = (time.perf_counter() - stage_start) * 1000
+        
+        stage_start = time.perf_counter()
+        title = self._extract_title(html_content, tree)
+        timings['title'] = (time.perf_counter() - stage_start) * 1000
+        
+        links = {}
+        if link_depth is not None:
+            stage_start = time.perf_counter()
+            links = self._discover_and_prioritize_links(html_content, url, link_depth, tree)
+            timings['links'] = (time.perf_counter() - stage_start) * 1000
+        
+        return ParsedPage(tree=tree, title=title, content=content, links=links, timings=timings)
+    
+    def _parse_html(self, html_content: str):
+        """Parse HTML into an lxml document, or None if it cannot be parsed"""
+        if not html_content:
+            return None
         try:
-            # Use trafilatura for better text extraction
-            extracted_text = trafilatura.extract(html_content)
+            self.pipeline_stats['documents_parsed'] += 1
+            try:
+                return lxml.html.document_fromstring(html_content)
+            except ValueError:
+                # Unicode input with an XML encoding declaration has to be parsed as bytes
+                return lxml.html.document_fromstring(html_content.encode('utf-8'))
+        except (etree.LxmlError, ValueError) as e:
+            logger.warning(f"⚠️ HTML parsing failed: {e}")
+            return None
+    
+    def _record_stage_timings(self, timings: Dict[str, float]):
+        """Accumulate per-stage timings of a processed page"""
+        self.pipeline_stats['pages'] += 1
+        stage_totals = self.pipeline_stats['stage_ms']
+        for stage, ms in timings.items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + ms
+    
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Average milliseconds per page for each processing stage"""
+        pages = self.pipeline_stats['pages']
+        return {
+            'pages': pages,
+            'documents_parsed': self.pipeline_stats['documents_parsed'],
+            'average_stage_ms': {
+                stage: round(total / pages, 3)
+                for stage, total in self.pipeline_stats['stage_ms'].items()
+            } if pages else {}
+        }
+    
+    def _extract_text_content(self, html_content: str, tree=None) -> str:
+        """Extract clean text content from HTML (or from an already parsed tree)"""
+        if tree is None:
+            tree = self._parse_html(html_content)
+        try:
+            # Use trafilatura for better text extraction; it works on a copy of the tree
+            extracted_text = trafilatura.extract(tree if tree is not None else html_content)
             if extracted_text:
                 return extracted_text.strip()
-            
-            # Fallback to BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text
-            text = soup.get_text()
+        except Exception as e:
+            logger.warning(f"⚠️ Text extraction failed: {e}")
+        
+        # Fallback to all visible text of the document
+        if tree is None:
+            return ""
+        try:
+            text = ''.join(tree.xpath('//text()[not(ancestor::script) and not(ancestor::style)]'))
             
             # Clean up whitespace
             lines = (line.strip() for line in text.splitlines())
             chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return text
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Text extraction failed: {e}")
-            # Fallback to BeautifulSoup only
-            try:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Get text
-                text = soup.get_text()
-                
-                # Clean up whitespace
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = ' '.join(chunk for chunk in chunks if chunk)
-                
-                return text
-            except Exception as fallback_error:
-                logger.error(f"❌ Fallback text extraction also failed: {fallback_error}")
-                return ""
+            return ' '.join(chunk for chunk in chunks if chunk)
+        except Exception as fallback_error:
+            logger.error(f"❌ Fallback text extraction also failed: {fallback_error}")
+            return ""
     
-    def _extract_title(self, html_content: str) -> str:
-        """Extract page title from HTML"""
+    def _extract_title(self, html_content: str, tree=None) -> str:
+        """Extract page title from HTML (or from an already parsed tree)"""
+        if tree is None:
+            tree = self._parse_html(html_content)
+        if tree is None:
+            return "Untitled"
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            title_tag = soup.find('title')
-            if title_tag:
-                return title_tag.get_text().strip()
+            title_tag = tree.find('.//title')
+            if title_tag is not None:
+                return title_tag.text_content().strip()
             
             # Fallback to h1
-            h1_tag = soup.find('h1')
-            if h1_tag:
-                return h1_tag.get_text().strip()
+            h1_tag = tree.find('.//h1')
+            if h1_tag is not None:
+                return h1_tag.text_content().strip()
             
             return "Untitled"
             
@@ -672,16 +828,44 @@ class WebCrawler:
         if not self.config.respect_robots_txt:
             return True
         
+        rules, robots_delay = await self._get_robots_rules(url)
+        crawl_delay = max(self.config.crawl_delay, robots_delay or 0.0)
+        if robots_delay is not None:
+            # Let the frontier space out this host's fetches by its Crawl-delay
+            self.crawl_queue.set_host_delay(domain, crawl_delay)
+        
         # Check domain delay
         if domain in self.domain_delays:
             time_since_last = time.time() - self.domain_delays[domain]
-            if time_since_last < self.config.crawl_delay:
+            if time_since_last < crawl_delay:
                 return False
         
-        # TODO: Implement robots.txt checking
-        # For now, just respect delays
+        if not rules.can_fetch(self.config.user_agent, url):
+            self.fetch_cache.stats['robots_blocked'] += 1
+            return False
         return True
     
+    async def _get_robots_rules(self, url: str):
+        """robots.txt rules and Crawl-delay for a URL's origin, fetched once per cache TTL"""
+        origin = origin_of(url)
+        cached = self.fetch_cache.get_robots(origin)
+        if cached is not None:
+            return cached
+        
+        try:
+            async with self.session.get(f"{origin}/robots.txt") as response:
+                status_code = response.status
+                robots_txt = await response.text(errors='replace') if 200 <= status_code < 300 else None
+        except Exception as e:
+            logger.warning(f"⚠️ Could not fetch robots.txt for {origin}: {e}")
+            status_code, robots_txt = 0, None
+        
+        rules, crawl_delay = self.fetch_cache.store_robots(origin, status_code, robots_txt,
+                                                           self.config.user_agent)
+        logger.info(f"🤖 robots.txt for {origin}: HTTP {status_code or 'unreachable'}"
+                    + (f", Crawl-delay {crawl_delay}s" if crawl_delay is not None else ""))
+        return rules, crawl_delay
+    
     async def _store_crawled_page(self, url: str, title: str, content: str, 
                                  html_content: str, status_code: int, 
                                  response_time: int, depth: int, 
@@ -973,9 +1157,17 @@ class WebCrawler:
                 logger.info(f"🔍 Discovered {len(new_patterns)} new learning patterns: {', '.join(new_patterns)}")
     
     async def _get_previous_learning_bits_for_domain(self, url: str) -> List[LearningBit]:
-        """Get previous learning bits from the same domain for adaptive learning"""
+        """Get previous learning bits from the same domain for adaptive learning
+        
+        The database is queried once per domain and crawl session; bits stored
+        afterwards are added to the cached context by _remember_domain_bits.
+        """
+        domain = urlparse(url).netloc
+        cached = self._domain_context.get(domain)
+        if cached is not None:
+            return list(cached)
+        
         try:
-            domain = urlparse(url).netloc
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
@@ -984,8 +1176,8 @@ class WebCrawler:
                     JOIN crawled_pages cp ON lb.page_id = cp.id
                     WHERE cp.domain = ?
                     ORDER BY lb.created_at DESC
-                    LIMIT 50
-                """, (domain,))
+                    LIMIT ?
+                """, (domain, self.DOMAIN_CONTEXT_SIZE))
                 
                 results = cursor.fetchall()
                 # Convert to LearningBit objects for compatibility
@@ -1000,12 +1192,22 @@ class WebCrawler:
                     })()
                     learning_bits.append(bit)
                 
-                return learning_bits
+                self._domain_context[domain] = learning_bits
+                return list(learning_bits)
                 
         except Exception as e:
             logger.warning(f"⚠️ Could not retrieve previous learning bits: {e}")
             return []
     
+    def _remember_domain_bits(self, learning_bits: List[LearningBit]):
+        """Prepend newly stored bits to the cached context of their domains (newest first, 50 max)"""
+        for bit in learning_bits:
+            domain = urlparse(bit.source_url).netloc
+            cached = self._domain_context.get(domain)
+            if cached is not None:
+                cached.insert(0, bit)
+                del cached[self.DOMAIN_CONTEXT_SIZE:]
+    
     def _infer_content_type(self, chunk: str, analysis: Dict[str, Any], url: str) -> str:
         """Enhanced content type inference based on multiple factors"""
         chunk_lower = chunk.lower()
@@ -1149,124 +1351,218 @@ class WebCrawler:
             return ""
     
     async def _store_learning_bit(self, learning_bit: LearningBit, page_id: int):
-        """Store learning bit in database with cross-reference generation"""
+        """Store a single learning bit (see _store_learning_bits)"""
+        await self._store_learning_bits([learning_bit], page_id)
+    
+    def _load_known_hashes(self, cursor) -> Dict[str, int]:
+        """content_hash -> id of stored learning bits, loaded once per crawl session
+        
+        Also loads the SimHash index of stored bits, and maps hashes of
+        near-duplicate copies that were never stored to their canonical bit.
+        """
+        if self._known_hashes is None:
+            cursor.execute("SELECT content_hash, id, simhash FROM learning_bits")
+            self._known_hashes = {}
+            self._simhash_index = SimHashIndex(max(0, self.config.near_duplicate_distance))
+            for content_hash, bit_id, fingerprint in cursor.fetchall():
+                self._known_hashes[content_hash] = bit_id
+                if fingerprint is not None:
+                    self._simhash_index.add(content_hash, from_signed(fingerprint))
+            cursor.execute("SELECT content_hash, canonical_bit_id FROM learning_bit_duplicates WHERE bit_id IS NULL")
+            for content_hash, canonical_id in cursor.fetchall():
+                self._known_hashes.setdefault(content_hash, canonical_id)
+            logger.debug(f"📚 Preloaded {len(self._known_hashes)} learning bit hashes, "
+                         f"{len(self._simhash_index)} fingerprints")
+        return self._known_hashes
+    
+    async def _store_learning_bits(self, learning_bits: List[LearningBit], page_id: int) -> Dict[str, int]:
+        """Store a page's learning bits and their cross-references in one transaction
+        
+        Hashes are deduplicated in memory against the preloaded hash set: known
+        bits get their reference count bumped, new bits are inserted with
+        executemany. New bits within ``near_duplicate_distance`` SimHash bits
+        of a stored (or earlier batch) bit are not stored; they are recorded in
+        learning_bit_duplicates and counted as a reference of that bit.
+        Returns content_hash -> learning bit id (the canonical id for near duplicates).
+        """
+        if not learning_bits:
+            return {}
+        
+        # Deduplicate within the batch; repeats count as extra references
+        unique_bits: Dict[str, LearningBit] = {}
+        occurrences: Dict[str, int] = defaultdict(int)
+        for bit in learning_bits:
+            unique_bits.setdefault(bit.content_hash, bit)
+            occurrences[bit.content_hash] += 1
+        
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
-                
-                # Check if learning bit already exists
-                cursor.execute(
-                    "SELECT id FROM learning_bits WHERE content_hash = ?",
-                    (learning_bit.content_hash,)
-                )
-                
-                existing_bit = cursor.fetchone()
-                
-                if existing_bit:
-                    # Update existing bit
-                    cursor.execute("""
-                        UPDATE learning_bits 
-                        SET reference_count = reference_count + 1,
-                            last_referenced = CURRENT_TIMESTAMP,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE content_hash = ?
-                    """, (learning_bit.content_hash,))
-                    bit_id = existing_bit[0]
-                else:
-                    # Insert new bit
-                    cursor.execute("""
-                        INSERT INTO learning_bits 
-                        (page_id, content_hash, content_type, category, subcategory,
-                         content, context, importance_score, confidence_score,
-                         source_url, tags, complexity_level, language)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (page_id, learning_bit.content_hash, learning_bit.content_type,
-                          learning_bit.category, learning_bit.subcategory, learning_bit.content,
-                          learning_bit.context, learning_bit.importance_score,
-                          learning_bit.confidence_score, learning_bit.source_url,
-                          json.dumps(learning_bit.tags), learning_bit.complexity_level,
-                          learning_bit.language))
-                    
-                    bit_id = cursor.lastrowid
+                known_hashes = self._load_known_hashes(cursor)
+                check_near_duplicates = self.config.near_duplicate_distance >= 0
+                
+                new_bits: List[LearningBit] = []
+                fingerprints: Dict[str, Optional[int]] = {}  # hash -> signed simhash column value
+                near_duplicates: Dict[str, Tuple[str, int]] = {}  # hash -> (canonical hash, distance)
+                for content_hash, bit in unique_bits.items():
+                    if content_hash in known_hashes:
+                        continue
+                    # Bits without words have no fingerprint and skip near-duplicate detection
+                    fingerprint = simhash(bit.content)
+                    if fingerprint is not None:
+                        match = self._simhash_index.find(fingerprint) if check_near_duplicates else None
+                        if match:
+                            near_duplicates[content_hash] = match
+                            continue
+                        self._simhash_index.add(content_hash, fingerprint)
+                    fingerprints[content_hash] = None if fingerprint is None else to_signed(fingerprint)
+                    new_bits.append(bit)
+                
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO learning_bits 
+                    (page_id, content_hash, content_type, category, subcategory,
+                     content, context, importance_score, confidence_score,
+                     source_url, tags, complexity_level, language, simhash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [(page_id, bit.content_hash, bit.content_type, bit.category, bit.subcategory,
+                       bit.content, bit.context, bit.importance_score, bit.confidence_score,
+                       bit.source_url, json.dumps(bit.tags), bit.complexity_level, bit.language,
+                       fingerprints[bit.content_hash])
+                      for bit in new_bits])
+                
+                if new_bits:
+                    hashes = [bit.content_hash for bit in new_bits]
+                    for start in range(0, len(hashes), 500):
+                        chunk = hashes[start:start + 500]
+                        cursor.execute(
+                            f"SELECT content_hash, id FROM learning_bits WHERE content_hash IN ({','.join('?' * len(chunk))})",
+                            chunk
+                        )
+                        known_hashes.update(cursor.fetchall())
+                
+                # Near duplicates resolve to their canonical bit from now on
+                duplicate_rows = []
+                for content_hash, (canonical_hash, distance) in near_duplicates.items():
+                    known_hashes[content_hash] = known_hashes[canonical_hash]
+                    duplicate_rows.append((content_hash, known_hashes[canonical_hash], distance,
+                                           unique_bits[content_hash].source_url))
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO learning_bit_duplicates
+                    (content_hash, canonical_bit_id, distance, source_url)
+                    VALUES (?, ?, ?, ?)
+                """, duplicate_rows)
+                
+                # A first insert is the first reference, like the old insert-then-update path
+                inserted = {bit.content_hash for bit in new_bits}
+                references: Dict[int, int] = defaultdict(int)
+                for content_hash, count in occurrences.items():
+                    references[known_hashes[content_hash]] += count - (1 if content_hash in inserted else 0)
+                cursor.executemany("""
+                    UPDATE learning_bits 
+                    SET reference_count = reference_count + ?,
+                        last_referenced = CURRENT_TIMESTAMP,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, [(count, bit_id) for bit_id, count in references.items() if count > 0])
+                
+                stored = [(bit, known_hashes[content_hash]) for content_hash, bit in unique_bits.items()
+                          if content_hash not in near_duplicates]
                 
                 # Generate cross-references for new or updated learning bits
-                await self._generate_cross_references(cursor, learning_bit, bit_id)
+                await self._generate_cross_references(cursor, stored)
                 
                 conn.commit()
-                logger.info(f"✅ Learning bit stored with cross-references: {bit_id}")
-                    
+                logger.info(f"✅ Stored {len(stored)} learning bits ({len(new_bits)} new, "
+                            f"{len(near_duplicates)} near-duplicates folded) with cross-references")
+        
         except Exception as e:
-            logger.error(f"❌ Failed to store learning bit: {e}")
+            # The in-memory hash set and fingerprint index may now be ahead of the database
+            self._known_hashes = None
+            logger.error(f"❌ Failed to store learning bits: {e}")
             raise
+        
+        self.dedup_stats['inserted'] += len(new_bits)
+        self.dedup_stats['near_duplicates'] += len(near_duplicates)
+        self.dedup_stats['exact_duplicates'] += len(learning_bits) - len(new_bits) - len(near_duplicates)
+        self._remember_domain_bits(new_bits)
+        return {content_hash: known_hashes[content_hash] for content_hash in unique_bits}
     
-    async def _generate_cross_references(self, cursor, learning_bit: LearningBit, bit_id: int):
-        """Generate cross-references between learning bits for enhanced context injection"""
+    async def _generate_cross_references(self, cursor, stored_bits: List[Tuple[LearningBit, int]]):
+        """Generate cross-references between learning bits for enhanced context injection
+        
+        Candidate lists are fetched once per (category, content type) in the
+        batch rather than once per bit; one extra row is fetched so that a
+        bit can drop itself from its own candidates.
+        """
         try:
-            # 1. Find similar content by category and content type
-            cursor.execute("""
-                SELECT id, content, content_type, category, importance_score, confidence_score
-                FROM learning_bits 
-                WHERE id != ? AND category = ? AND content_type = ?
-                ORDER BY importance_score DESC, confidence_score DESC
-                LIMIT 5
-            """, (bit_id, learning_bit.category, learning_bit.content_type))
-            
-            similar_bits = cursor.fetchall()
-            
-            # 2. Find related content by category (different content type)
-            cursor.execute("""
-                SELECT id, content, content_type, category, importance_score, confidence_score
-                FROM learning_bits 
-                WHERE id != ? AND category = ? AND content_type != ?
-                ORDER BY importance_score DESC, confidence_score DESC
-                LIMIT 3
-            """, (bit_id, learning_bit.category, learning_bit.content_type))
-            
-            related_bits = cursor.fetchall()
-            
-            # 3. Find prerequisite content (lower complexity, same category)
-            cursor.execute("""
-                SELECT id, content, content_type, category, importance_score, confidence_score
-                FROM learning_bits 
-                WHERE id != ? AND category = ? AND complexity_level = 'beginner'
-                ORDER BY importance_score DESC, confidence_score DESC
-                LIMIT 2
-            """, (bit_id, learning_bit.category))
-            
-            prerequisite_bits = cursor.fetchall()
-            
-            # 4. Create cross-references
-            all_related = similar_bits + related_bits + prerequisite_bits
-            
-            for related_bit in all_related:
-                related_id, related_content, related_type, related_category, related_importance, related_confidence = related_bit
-                
-                # Calculate relationship strength based on similarity
-                relationship_strength = self._calculate_relationship_strength(
-                    learning_bit, related_type, related_category, related_importance, related_confidence
-                )
-                
-                # Only create cross-reference if strength is above threshold
-                if relationship_strength > 0.3:
-                    # Create cross-reference entry
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO cross_references 
-                        (source_bit_id, target_bit_id, source_type, target_type, 
-                         relationship_type, strength, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """, (bit_id, related_id, learning_bit.content_type, related_type, 
-                          'related', relationship_strength))
+            candidate_cache: Dict[Tuple[str, str, str], List[tuple]] = {}
+            
+            def candidates(kind: str, category: str, content_type: str) -> List[tuple]:
+                key = (kind, category, content_type if kind != 'prerequisite' else '')
+                if key not in candidate_cache:
+                    if kind == 'similar':
+                        # 1. Find similar content by category and content type
+                        cursor.execute("""
+                            SELECT id, content, content_type, category, importance_score, confidence_score
+                            FROM learning_bits 
+                            WHERE category = ? AND content_type = ?
+                            ORDER BY importance_score DESC, confidence_score DESC
+                            LIMIT 6
+                        """, (category, content_type))
+                    elif kind == 'related':
+                        # 2. Find related content by category (different content type)
+                        cursor.execute("""
+                            SELECT id, content, content_type, category, importance_score, confidence_score
+                            FROM learning_bits 
+                            WHERE category = ? AND content_type != ?
+                            ORDER BY importance_score DESC, confidence_score DESC
+                            LIMIT 4
+                        """, (category, content_type))
+                    else:
+                        # 3. Find prerequisite content (lower complexity, same category)
+                        cursor.execute("""
+                            SELECT id, content, content_type, category, importance_score, confidence_score
+                            FROM learning_bits 
+                            WHERE category = ? AND complexity_level = 'beginner'
+                            ORDER BY importance_score DESC, confidence_score DESC
+                            LIMIT 3
+                        """, (category,))
+                    candidate_cache[key] = cursor.fetchall()
+                return candidate_cache[key]
+            
+            rows = []
+            for learning_bit, bit_id in stored_bits:
+                all_related = []
+                for kind, limit in (('similar', 5), ('related', 3), ('prerequisite', 2)):
+                    matches = [row for row in candidates(kind, learning_bit.category, learning_bit.content_type)
+                               if row[0] != bit_id]
+                    all_related.extend(matches[:limit])
+                
+                # 4. Create cross-references
+                for related_bit in all_related:
+                    related_id, related_content, related_type, related_category, related_importance, related_confidence = related_bit
                     
-                    # Create reverse cross-reference for bidirectional relationships
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO cross_references 
-                        (source_bit_id, target_bit_id, source_type, target_type, 
-                         relationship_type, strength, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """, (related_id, bit_id, related_type, learning_bit.content_type, 
-                          'related', relationship_strength))
-            
-            logger.info(f"✅ Generated cross-references for learning bit {bit_id}")
+                    # Calculate relationship strength based on similarity
+                    relationship_strength = self._calculate_relationship_strength(
+                        learning_bit, related_type, related_category, related_importance, related_confidence
+                    )
+                    
+                    # Only create cross-reference if strength is above threshold
+                    if relationship_strength > 0.3:
+                        rows.append((bit_id, related_id, learning_bit.content_type, related_type,
+                                     'related', relationship_strength))
+                        # Reverse cross-reference for bidirectional relationships
+                        rows.append((related_id, bit_id, related_type, learning_bit.content_type,
+                                     'related', relationship_strength))
+            
+            cursor.executemany("""
+                INSERT OR IGNORE INTO cross_references 
+                (source_bit_id, target_bit_id, source_type, target_type, 
+                 relationship_type, strength, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, rows)
+            
+            logger.info(f"✅ Generated {len(rows)} cross-references for {len(stored_bits)} learning bits")
             
         except Exception as e:
             logger.error(f"❌ Failed to generate cross-references: {e}")
@@ -1313,10 +1609,25 @@ class WebCrawler:
         
         return (type1, type2) in compatible_pairs or (type2, type1) in compatible_pairs
     
-    async def crawl_website(self, start_url: str, max_pages: int = 50, max_depth: int = 3) -> Dict[str, Any]:
-        """Crawl a website starting from a URL with enhanced navigation"""
+    async def crawl_website(self, start_url: str, max_pages: int = 50, max_depth: int = 3,
+                            max_concurrent_requests: Optional[int] = None,
+                            checkpoint: Optional[JobCheckpoint] = None) -> Dict[str, Any]:
+        """Crawl a website starting from a URL with enhanced navigation
+        
+        URLs are scheduled through a CrawlFrontier and fetched by a pool of
+        concurrent workers: each host is fetched at most once per crawl delay,
+        while different hosts proceed in parallel.
+        
+        With a ``checkpoint`` (a leased background job) the frontier is
+        persisted as the crawl goes: a crawl that already has a checkpointed
+        frontier resumes from it instead of the start URL, and pages crawled
+        before count towards ``max_pages``. The crawl stops early if the job's
+        lease is lost.
+        """
         logger.info(f"🚀 Starting enhanced website crawl: {start_url}")
         
+        worker_count = max(1, max_concurrent_requests or self.config.max_concurrent_requests)
+        
         # Initialize crawl session
         crawl_session = {
             'start_url': start_url,
@@ -1328,100 +1639,111 @@ class WebCrawler:
             'subjects_discovered': set(),
             'categories_found': set(),
             'errors': [],
-            'crawl_paths': []
+            'crawl_paths': [],
+            'concurrency': worker_count,
+            'not_modified_pages': 0,
+            'resumed_pages': 0,
+            'stage_timings_ms': {}
         }
         
         try:
             await self.start_session()
             
-            # Initialize crawl queue with priority system
-            self.crawl_queue = []
+            # Initialize the frontier with the start URL
+            self.crawl_queue = CrawlFrontier(default_delay=self.config.crawl_delay)
             self.crawled_urls = set()
             self.url_depths = {start_url: 0}  # Track depth for each URL
             self.url_priorities = {start_url: 1.0}  # Priority scoring
             
-            # Add start URL to queue (don't mark as crawled yet)
-            self.crawl_queue.append(start_url)
-            
-            page_count = 0
-            current_depth = 0
-            
-            while self.crawl_queue and page_count < max_pages:
-                # Get next URL with highest priority
-                next_url = self._get_next_priority_url()
-                if not next_url:
-                    break
-                
-                current_depth = self.url_depths.get(next_url, 0)
-                
-                # Skip if we've reached max depth
-                if current_depth >= max_depth:
-                    logger.info(f"⏭️ Skipping {next_url} - max depth {max_depth} reached")
-                    continue
-                
-                # Skip if already crawled (but allow start URL to be crawled)
-                if next_url in self.crawled_urls and next_url != start_url:
-                    logger.debug(f"⏭️ Skipping already crawled URL: {next_url}")
-                    continue
-                
-                logger.info(f"🕷️ Crawling {next_url} (depth {current_depth}, priority {self.url_priorities.get(next_url, 0):.2f})")
-                
-                try:
-                    # Crawl the page
-                    crawled_page = await self.crawl_url(next_url, depth=current_depth)
-                    
-                    if crawled_page:
-                        page_count += 1
-                        crawl_session['total_pages'] = page_count
-                        crawl_session['crawl_depth_reached'] = max(crawl_session['crawl_depth_reached'], current_depth)
-                        
-                        # Mark URL as successfully crawled
-                        self.crawled_urls.add(next_url)
-                        
-                        # Track domain
-                        domain = urlparse(next_url).netloc
-                        crawl_session['domains_crawled'].add(domain)
-                        
-                        # Get the page ID from the database for learning bit storage
-                        page_id = await self._get_page_id_from_url(next_url)
+            frontier = self.crawl_queue
+            frontier_changed = asyncio.Condition()
+            # Pages fetched successfully plus fetches in flight, so workers never overshoot max_pages
+            progress = {'pages': 0, 'in_flight': 0}
+            
+            visited, pending, crawled_before = checkpoint.restore() if checkpoint else (set(), [], 0)
+            if visited or pending:
+                # Resume the checkpointed frontier where the previous run stopped
+                frontier.mark_seen(visited)
+                self.crawled_urls.update(visited)
+                for url, depth, priority in pending:
+                    frontier.add(url, depth=depth, priority=priority)
+                    self.url_depths[url] = depth
+                    self.url_priorities[url] = priority
+                progress['pages'] = crawl_session['resumed_pages'] = crawl_session['total_pages'] = crawled_before
+                logger.info(f"♻️ Resuming crawl: {crawled_before} pages done, {len(pending)} URLs pending")
+            else:
+                self.crawl_queue.add(start_url, depth=0, priority=1.0)
+                if checkpoint:
+                    checkpoint.add([(start_url, 0, 1.0)])
+            
+            async def next_url() -> Optional[Tuple[str, int, float]]:
+                async with frontier_changed:
+                    while True:
+                        if progress['pages'] + progress['in_flight'] >= max_pages or (checkpoint and checkpoint.lease_lost):
+                            if progress['in_flight'] == 0:
+                                return None
+                            timeout = None  # Wait for an in-flight fetch to succeed or fail
+                        else:
+                            item = frontier.pop_ready()
+                            if item:
+                                progress['in_flight'] += 1
+                                return item
+                            if frontier.is_done():
+                                return None
+                            timeout = frontier.next_ready_in()
                         
-                        # Extract and analyze learning bits
-                        learning_bits = await self._extract_learning_bits(
-                            crawled_page.content, next_url, page_id
+                        # Sleep until a host cools down or another worker changes the frontier
+                        try:
+                            await asyncio.wait_for(frontier_changed.wait(), timeout=timeout)
+                        except asyncio.TimeoutError:
+                            pass
+            
+            async def worker():
+                while True:
+                    item = await next_url()
+                    if item is None:
+                        return
+                    url, current_depth, priority = item
+                    new_links: Dict[str, float] = {}
+                    crawled = False
+                    try:
+                        crawled, new_links = await self._crawl_frontier_url(
+                            url, current_depth, priority, max_depth, crawl_session
                         )
-                        
-                        # Track subjects and categories discovered
-                        for bit in learning_bits:
-                            crawl_session['subjects_discovered'].add(bit.content_type)
-                            crawl_session['categories_found'].add(bit.category)
-                            if bit.subcategory:
-                                crawl_session['categories_found'].add(f"{bit.category}:{bit.subcategory}")
-                        
-                        # Enhanced link discovery and prioritization
-                        if current_depth < max_depth - 1:
-                            new_links = self._discover_and_prioritize_links(
-                                crawled_page.html_content, next_url, current_depth + 1
-                            )
+                    finally:
+                        async with frontier_changed:
+                            progress['in_flight'] -= 1
+                            if crawled:
+                                progress['pages'] += 1
+                                crawl_session['total_pages'] = progress['pages']
+                                if progress['pages'] % 5 == 0:
+                                    logger.info(f"📊 Crawled {progress['pages']} pages, depth {current_depth}, queue: {len(frontier)}, subjects: {len(crawl_session['subjects_discovered'])}")
                             
-                            # Add new links to queue with calculated priorities
-                            for link, priority in new_links.items():
-                                if link not in self.crawled_urls and link not in self.url_depths:
-                                    self.crawl_queue.append(link)
+                            # Add new links to the frontier with calculated priorities
+                            added = []
+                            for link, link_priority in new_links.items():
+                                if link not in self.crawled_urls and frontier.add(link, current_depth + 1, link_priority):
                                     self.url_depths[link] = current_depth + 1
-                                    self.url_priorities[link] = priority
-                                    logger.debug(f"🔗 Added link: {link} (depth {current_depth + 1}, priority {priority:.2f})")
-                        
-                        # Log progress with enhanced metrics
-                        if page_count % 5 == 0:
-                            logger.info(f"📊 Crawled {page_count} pages, depth {current_depth}, queue: {len(self.crawl_queue)}, subjects: {len(crawl_session['subjects_discovered'])}")
-                    
-                    # Respect crawl delay
-                    await asyncio.sleep(self.config.crawl_delay)
-                
-                except Exception as e:
-                    error_msg = f"❌ Failed to crawl {next_url}: {e}"
-                    logger.error(error_msg)
-                    crawl_session['errors'].append(error_msg)
+                                    self.url_priorities[link] = link_priority
+                                    added.append((link, current_depth + 1, link_priority))
+                                    logger.debug(f"🔗 Added link: {link} (depth {current_depth + 1}, priority {link_priority:.2f})")
+                            
+                            if checkpoint:
+                                checkpoint.record(url, crawled, added)
+                            
+                            # Start this host's crawl delay now that the fetch is done
+                            frontier.complete(url)
+                            frontier_changed.notify_all()
+            
+            await asyncio.gather(*(worker() for _ in range(worker_count)))
+            page_count = progress['pages']
+            pages_this_run = page_count - crawl_session['resumed_pages']
+            crawl_session['frontier'] = frontier.get_stats()
+            crawl_session['fetch_cache'] = self.fetch_cache.get_stats()
+            crawl_session['stage_timings_ms'] = {
+                stage: round(total / pages_this_run, 3)
+                for stage, total in crawl_session['stage_timings_ms'].items()
+            } if pages_this_run else {}
             
             # Final statistics
             crawl_session['end_time'] = datetime.now()
@@ -1452,31 +1774,85 @@ class WebCrawler:
         finally:
             await self.stop_session()
     
-    def _extract_links(self, html_content: str, base_url: str) -> List[str]:
-        """Extract links from HTML content"""
-        links = []
+    async def _crawl_frontier_url(self, url: str, current_depth: int, priority: float,
+                                  max_depth: int, crawl_session: Dict[str, Any]) -> Tuple[bool, Dict[str, float]]:
+        """Crawl one URL handed out by the frontier; returns (crawled, discovered links)"""
+        # Skip if we've reached max depth
+        if current_depth >= max_depth:
+            logger.info(f"⏭️ Skipping {url} - max depth {max_depth} reached")
+            return False, {}
+        
+        logger.info(f"🕷️ Crawling {url} (depth {current_depth}, priority {priority:.2f})")
+        
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                
-                # Convert relative URLs to absolute
-                absolute_url = urljoin(base_url, href)
-                
-                # Filter out non-HTTP URLs and anchors
-                if (absolute_url.startswith('http') and 
-                    '#' not in absolute_url and 
-                    'mailto:' not in absolute_url and
-                    'tel:' not in absolute_url):
-                    links.append(absolute_url)
-            
-            return links
-            
+            # Crawl the page; links are only needed if their depth is still crawlable
+            crawled_page = await self.crawl_url(url, depth=current_depth,
+                                                discover_links=current_depth < max_depth - 1)
+            if not crawled_page:
+                return False, {}
+            
+            crawl_session['crawl_depth_reached'] = max(crawl_session['crawl_depth_reached'], current_depth)
+            
+            # Mark URL as successfully crawled
+            self.crawled_urls.add(url)
+            
+            # Track domain
+            crawl_session['domains_crawled'].add(crawled_page.domain)
+            if crawled_page.status_code == 304:
+                crawl_session['not_modified_pages'] += 1
+            
+            # Track subjects and categories discovered by the page's single extraction pass
+            for bit in crawled_page.learning_bits:
+                crawl_session['subjects_discovered'].add(bit.content_type)
+                crawl_session['categories_found'].add(bit.category)
+                if bit.subcategory:
+                    crawl_session['categories_found'].add(f"{bit.category}:{bit.subcategory}")
+            
+            # Accumulate per-stage timings for the session report
+            stage_totals = crawl_session['stage_timings_ms']
+            for stage, ms in crawled_page.metadata.get('timings', {}).items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + ms
+            
+            # Links were discovered and prioritized from the same parsed tree
+            new_links = crawled_page.links
+            return True, new_links
+        
+        except Exception as e:
+            error_msg = f"❌ Failed to crawl {url}: {e}"
+            logger.error(error_msg)
+            crawl_session['errors'].append(error_msg)
+            return False, {}
+    
+    def _extract_links(self, html_content: str, base_url: str, tree=None) -> List[str]:
+        """Extract links from HTML content (or from an already parsed tree)"""
+        try:
+            return [absolute_url for absolute_url, _ in self._iter_page_links(html_content, base_url, tree)]
         except Exception as e:
             logger.warning(f"⚠️ Link extraction failed: {e}")
             return []
     
+    def _iter_page_links(self, html_content: str, base_url: str, tree=None):
+        """Yield (absolute URL, anchor element) for every crawlable link of a page"""
+        if tree is None:
+            tree = self._parse_html(html_content)
+        if tree is None:
+            return
+        
+        for link in tree.iter('a'):
+            href = link.get('href')
+            if href is None:
+                continue
+            
+            # Convert relative URLs to absolute
+            absolute_url = urljoin(base_url, href)
+            
+            # Filter out non-HTTP URLs and anchors
+            if (absolute_url.startswith('http') and 
+                '#' not in absolute_url and 
+                'mailto:' not in absolute_url and
+                'tel:' not in absolute_url):
+                yield absolute_url, link
+    
     async def get_learning_bits(self, category: Optional[str] = None, 
                                subcategory: Optional[str] = None,
                                content_type: Optional[str] = None,
@@ -1531,9 +1907,35 @@ class WebCrawler:
             return []
     
     async def search_learning_bits(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
-        """Search learning bits by content"""
+        """Search learning bits by content, ranked by bm25, importance and recency"""
         try:
             with sqlite3.connect(self.db_path) as conn:
+                try:
+                    hits = ranked_search(conn, query, ["learning_bits"], limit=limit)
+                    pages = {}
+                    page_ids = {hit["row"]["page_id"] for hit in hits}
+                    if page_ids:
+                        placeholders = ",".join("?" * len(page_ids))
+                        for page_id, url, title in conn.execute(
+                            f"SELECT id, url, title FROM crawled_pages WHERE id IN ({placeholders})",
+                            tuple(page_ids)
+                        ):
+                            pages[page_id] = (url, title)
+                    
+                    learning_bits = []
+                    for hit in hits:
+                        bit_dict = hit["row"]
+                        if bit_dict["page_id"] not in pages:
+                            continue  # Matches the inner join of the LIKE search
+                        bit_dict["page_url"], bit_dict["page_title"] = pages[bit_dict["page_id"]]
+                        bit_dict["search_score"] = hit["score"]
+                        if bit_dict.get('tags'):
+                            bit_dict['tags'] = json.loads(bit_dict['tags'])
+                        learning_bits.append(bit_dict)
+                    return learning_bits
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"⚠️ Full-text search unavailable, using LIKE scan: {e}")
+                
                 cursor = conn.cursor()
                 
                 search_query = """
@@ -1566,43 +1968,18 @@ class WebCrawler:
             logger.error(f"❌ Failed to search learning bits: {e}")
             return []
 
-    def _get_next_priority_url(self) -> Optional[str]:
-        """Get the next URL with highest priority from the queue"""
-        if not self.crawl_queue:
-            return None
-        
-        # Sort queue by priority (highest first)
-        self.crawl_queue.sort(key=lambda url: self.url_priorities.get(url, 0), reverse=True)
-        
-        # Get highest priority URL (don't mark as crawled yet)
-        next_url = self.crawl_queue.pop(0)
-        
-        return next_url
-    
-    def _discover_and_prioritize_links(self, html_content: str, base_url: str, target_depth: int) -> Dict[str, float]:
+    def _discover_and_prioritize_links(self, html_content: str, base_url: str, target_depth: int,
+                                       tree=None) -> Dict[str, float]:
         """Discover links and calculate their priority scores"""
         links_with_priorities = {}
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                
-                # Convert relative URLs to absolute
-                absolute_url = urljoin(base_url, href)
+            for absolute_url, link in self._iter_page_links(html_content, base_url, tree):
+                # Calculate priority score based on multiple factors
+                priority = self._calculate_link_priority(link, absolute_url, base_url, target_depth)
                 
-                # Filter out non-HTTP URLs and anchors
-                if (absolute_url.startswith('http') and 
-                    '#' not in absolute_url and 
-                    'mailto:' not in absolute_url and
-                    'tel:' not in absolute_url):
-                    
-                    # Calculate priority score based on multiple factors
-                    priority = self._calculate_link_priority(link, absolute_url, base_url, target_depth)
-                    
-                    if priority > 0.1:  # Only include relevant links
-                        links_with_priorities[absolute_url] = priority
+                if priority > 0.1:  # Only include relevant links
+                    links_with_priorities[absolute_url] = priority
             
             return links_with_priorities
             
@@ -1616,7 +1993,7 @@ class WebCrawler:
         
         try:
             # Factor 1: Link text relevance
-            link_text = link_element.get_text(strip=True).lower()
+            link_text = link_element.text_content().strip().lower()
             if link_text:
                 # Check if link text contains relevant keywords
                 relevant_keywords = ['guide', 'tutorial', 'documentation', 'api', 'reference', 
@@ -1654,7 +2031,7 @@ class WebCrawler:
             
             # Factor 5: Link element attributes
             if link_element.get('title'):
-                title = link_element['title'].lower()
+                title = link_element.get('title').lower()
                 if any(keyword in title for keyword in ['guide', 'tutorial', 'documentation']):
                     priority += 0.2
             
@@ -1847,42 +2224,63 @@ class WebCrawler:
             return {'error': str(e)}
 
 class BackgroundCrawlerManager:
-    """Manages background crawling operations without user interruption"""
+    """Manages background crawling operations without user interruption
     
-    def __init__(self, db_path: str):
+    Jobs and their frontiers live in a DurableCrawlQueue in the crawler
+    database, so queued work and half-finished crawls survive restarts:
+    call ``resume_crawls`` at startup to pick them up again.
+    """
+    
+    def __init__(self, db_path: str, visibility_timeout: float = 300.0):
         self.db_path = db_path
+        self.job_queue = DurableCrawlQueue(db_path, visibility_timeout=visibility_timeout)
         self.active_crawls = {}  # Track active crawl sessions
-        self.crawl_queue = []    # Queue of pending crawl jobs
         self.crawl_history = []  # History of completed crawls
         self.background_tasks = set()  # Active background tasks
         self.crawl_configs = {}  # Crawl configurations per job
         self.auto_restart = True  # Auto-restart failed crawls
         self.max_concurrent_crawls = 3  # Limit concurrent crawls
+        self.max_attempts = 3  # Runs per job before it is marked failed
         
     async def start_background_crawl(self, job_id: str, start_url: str, 
                                    config: Dict[str, Any] = None) -> Dict[str, Any]:
         """Start a background crawl job"""
-        if len(self.active_crawls) >= self.max_concurrent_crawls:
-            # Queue the job
-            self.crawl_queue.append({
+        config = config or {}
+        if not self.job_queue.enqueue_job(job_id, start_url, config, config.get('priority', 'normal')):
+            return {
+                'status': 'exists',
                 'job_id': job_id,
-                'start_url': start_url,
-                'config': config or {},
-                'queued_at': datetime.now(),
-                'priority': config.get('priority', 'normal') if config else 'normal'
-            })
+                'message': 'A crawl job with this id is already queued or running'
+            }
+        
+        # Start the crawl immediately if a slot is free
+        await self._process_next_queued_job()
+        if job_id in self.active_crawls:
             return {
-                'status': 'queued',
+                'status': 'started',
                 'job_id': job_id,
-                'message': f'Crawl job queued. {len(self.crawl_queue)} jobs ahead.',
-                'estimated_start': self._estimate_start_time(len(self.crawl_queue))
+                'message': 'Background crawl started successfully',
+                'estimated_duration': self._estimate_duration(config)
             }
         
-        # Start the crawl immediately
-        return await self._execute_crawl_job(job_id, start_url, config or {})
+        position = self.job_queue.queue_position(job_id) or 0
+        return {
+            'status': 'queued',
+            'job_id': job_id,
+            'message': f'Crawl job queued. {position} jobs ahead.',
+            'estimated_start': self._estimate_start_time(position)
+        }
+    
+    async def resume_crawls(self) -> int:
+        """Start persisted jobs: queued ones and crawls whose previous owner stopped renewing its lease"""
+        started = await self._process_next_queued_job()
+        if started:
+            logger.info(f"♻️ Resumed {started} background crawl job(s)")
+        return started
     
-    async def _execute_crawl_job(self, job_id: str, start_url: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a crawl job in the background"""
+    async def _execute_crawl_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a claimed crawl job in the background"""
+        job_id, start_url, config = job['job_id'], job['start_url'], job['config']
         try:
             # Initialize crawler with job-specific config
             crawler_config = CrawlConfig()
@@ -1893,9 +2291,12 @@ class BackgroundCrawlerManager:
                     crawler_config.crawl_delay = config['crawl_delay']
                 if 'max_depth' in config:
                     crawler_config.max_depth = config['max_depth']
+                if 'max_concurrent_requests' in config:
+                    crawler_config.max_concurrent_requests = config['max_concurrent_requests']
             
             crawler = WebCrawler(self.db_path)
             crawler.config = crawler_config
+            checkpoint = self.job_queue.checkpoint(job)
             
             # Track active crawl
             self.active_crawls[job_id] = {
@@ -1903,12 +2304,14 @@ class BackgroundCrawlerManager:
                 'start_url': start_url,
                 'config': config,
                 'status': 'running',
-                'progress': {'pages_crawled': 0, 'learning_bits': 0},
+                'attempt': job['attempts'],
+                'progress': {'pages_crawled': job['pages_crawled'], 'learning_bits': 0},
                 'crawler': crawler
             }
             
             # Start background task
-            task = asyncio.create_task(self._run_background_crawl(job_id, crawler, start_url, config))
+            task = asyncio.create_task(self._run_background_crawl(job_id, crawler, start_url, config, checkpoint))
+            self.active_crawls[job_id]['task'] = task
             self.background_tasks.add(task)
             task.add_done_callback(lambda t: self.background_tasks.discard(t))
             
@@ -1921,6 +2324,8 @@ class BackgroundCrawlerManager:
             
         except Exception as e:
             logger.error(f"❌ Failed to start background crawl {job_id}: {e}")
+            self.active_crawls.pop(job_id, None)
+            self.job_queue.fail_job(job_id, job['lease'], str(e))
             return {
                 'status': 'failed',
                 'job_id': job_id,
@@ -1929,19 +2334,27 @@ class BackgroundCrawlerManager:
             }
     
     async def _run_background_crawl(self, job_id: str, crawler: WebCrawler, 
-                                  start_url: str, config: Dict[str, Any]):
+                                  start_url: str, config: Dict[str, Any], checkpoint: JobCheckpoint):
         """Run the actual crawl in the background"""
+        retry_delay = 0
         try:
             logger.info(f"🚀 Starting background crawl {job_id} for {start_url}")
             
-            # Execute the crawl
+            # Execute the crawl, resuming its checkpointed frontier if there is one
             result = await crawler.crawl_website(
                 start_url=start_url,
                 max_pages=config.get('max_pages', 50),
-                max_depth=config.get('max_depth', 3)
+                max_depth=config.get('max_depth', 3),
+                checkpoint=checkpoint
             )
             
+            if checkpoint.lease_lost:
+                # Stopped, or taken over by another worker; the job record is theirs now
+                logger.info(f"⏹️ Background crawl {job_id} ended without its lease")
+                return
+            
             # Update crawl status
+            self.job_queue.complete_job(job_id, checkpoint.lease, result)
             self.active_crawls[job_id]['status'] = 'completed'
             self.active_crawls[job_id]['result'] = result
             self.active_crawls[job_id]['end_time'] = datetime.now()
@@ -1956,44 +2369,36 @@ class BackgroundCrawlerManager:
                 'end_time': self.active_crawls[job_id]['end_time']
             })
             
-            # Remove from active crawls
-            del self.active_crawls[job_id]
-            
-            # Process next queued job
-            await self._process_next_queued_job()
-            
             logger.info(f"✅ Background crawl {job_id} completed successfully")
             
         except Exception as e:
             logger.error(f"❌ Background crawl {job_id} failed: {e}")
             
-            # Update status
-            if job_id in self.active_crawls:
-                self.active_crawls[job_id]['status'] = 'failed'
-                self.active_crawls[job_id]['error'] = str(e)
-                self.active_crawls[job_id]['end_time'] = datetime.now()
-            
-            # Auto-restart if enabled
-            if self.auto_restart and job_id in self.active_crawls:
+            # Auto-restart if enabled: the job is queued again and resumes its frontier
+            requeued = self.job_queue.fail_job(job_id, checkpoint.lease, str(e),
+                                               retry=self.auto_restart, max_attempts=self.max_attempts)
+            job = self.job_queue.get_job(job_id) if requeued else None
+            if job and job['status'] == 'queued':
                 logger.info(f"🔄 Auto-restarting failed crawl {job_id}")
-                await asyncio.sleep(5)  # Wait before restart
-                await self._execute_crawl_job(job_id, start_url, config)
-    
-    async def _process_next_queued_job(self):
-        """Process the next job in the queue"""
-        if self.crawl_queue and len(self.active_crawls) < self.max_concurrent_crawls:
-            # Sort by priority and queued time
-            self.crawl_queue.sort(key=lambda job: (
-                {'high': 0, 'normal': 1, 'low': 2}.get(job['priority'], 1),
-                job['queued_at']
-            ))
-            
-            next_job = self.crawl_queue.pop(0)
-            await self._execute_crawl_job(
-                next_job['job_id'],
-                next_job['start_url'],
-                next_job['config']
-            )
+                retry_delay = 5  # Wait before restart
+        finally:
+            # Remove from active crawls and process the next queued job
+            self.active_crawls.pop(job_id, None)
+            if retry_delay:
+                await asyncio.sleep(retry_delay)
+            await self._process_next_queued_job()
+    
+    async def _process_next_queued_job(self) -> int:
+        """Claim queued (or abandoned) jobs while crawl slots are free; returns how many started"""
+        started = 0
+        while len(self.active_crawls) < self.max_concurrent_crawls:
+            job = self.job_queue.claim_job()
+            if job is None:
+                break
+            result = await self._execute_crawl_job(job)
+            if result['status'] == 'started':
+                started += 1
+        return started
     
     def get_crawl_status(self, job_id: str = None) -> Dict[str, Any]:
         """Get status of crawls"""
@@ -2013,28 +2418,38 @@ class BackgroundCrawlerManager:
                             'status': 'completed',
                             'details': crawl
                         }
+                # Jobs queued, or run by an earlier process or another worker
+                job = self.job_queue.get_job(job_id)
+                if job:
+                    return {'job_id': job_id, 'status': job['status'], 'details': job}
                 return {'job_id': job_id, 'status': 'not_found'}
         
         # Return overall status
+        queued = self.job_queue.list_jobs('queued')
         return {
             'active_crawls': len(self.active_crawls),
-            'queued_jobs': len(self.crawl_queue),
             'completed_crawls': len(self.crawl_history),
             'max_concurrent': self.max_concurrent_crawls,
             'active_jobs': list(self.active_crawls.keys()),
-            'queued_jobs': [job['job_id'] for job in self.crawl_queue]
+            'queued_jobs': [job['job_id'] for job in queued],
+            'persisted_jobs': self.job_queue.get_stats()
         }
     
     def stop_crawl(self, job_id: str) -> Dict[str, Any]:
-        """Stop an active crawl"""
+        """Stop an active or queued crawl; a stopped job is never resumed"""
+        stopped = self.job_queue.stop_job(job_id)
         if job_id in self.active_crawls:
             crawl_info = self.active_crawls[job_id]
             crawl_info['status'] = 'stopped'
             crawl_info['end_time'] = datetime.now()
             
-            # Cancel background task if possible
-            # Note: This is a simplified approach - in production you'd want more robust task cancellation
-            
+            # The crawl notices the revoked lease at its next checkpoint; cancel it right away
+            task = crawl_info.get('task')
+            if task and not task.done():
+                task.cancel()
+            stopped = True
+        
+        if stopped:
             return {
                 'status': 'stopped',
                 'job_id': job_id,
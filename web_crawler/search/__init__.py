@@ -3,9 +3,13 @@ Web Crawler Search Package
 Search engine integration with Google and Bing APIs
 """
 
-from .search_engine_integration import SearchEngineIntegration, SearchEngineConfig
+from .search_engine_integration import (
+    SearchEngineIntegration, SearchEngineConfig, LoopbackSearchAPI, SearchResultCache
+)
 
 __all__ = [
     "SearchEngineIntegration",
-    "SearchEngineConfig"
+    "SearchEngineConfig",
+    "LoopbackSearchAPI",
+    "SearchResultCache"
 ]
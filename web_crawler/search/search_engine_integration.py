@@ -9,6 +9,7 @@ import aiohttp
 import json
 import logging
 import time
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set, Tuple, Union
@@ -40,6 +41,10 @@ class SearchEngineConfig:
     enable_bing_search: bool = True
     enable_duplicate_filtering: bool = True
     enable_relevance_scoring: bool = True
+    search_timeout: float = 10.0  # Deadline for the whole multi-engine fan-out, in seconds
+    enable_result_cache: bool = True
+    result_cache_ttl: int = 3600  # Seconds a cached engine response stays valid
+    max_connections_per_engine: int = 10
 
 @dataclass
 class SearchResult:
@@ -72,10 +77,50 @@ class SearchQuery:
     created_at: datetime
     status: str  # 'pending', 'active', 'completed', 'failed'
 
-class GoogleCustomSearchAPI:
+class PooledSearchAPI:
+    """Base class for search engine clients sharing one pooled HTTP session
+    
+    The session (and its connection pool, DNS cache and TLS connections) is
+    created lazily on first use and reused for every query. A new session is
+    opened only if the previous one was closed or belongs to another event loop.
+    """
+    
+    name = 'engine'
+    
+    def __init__(self, max_connections: int = 10, timeout: float = 30.0):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+        self.sessions_created = 0
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, opening it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._session_loop = loop
+            self.sessions_created += 1
+        return self._session
+    
+    async def close(self):
+        """Close the shared session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+class GoogleCustomSearchAPI(PooledSearchAPI):
     """Google Custom Search API integration"""
     
-    def __init__(self, api_key: str, engine_id: str):
+    name = 'google'
+    
+    def __init__(self, api_key: str, engine_id: str, **session_options):
+        super().__init__(**session_options)
         self.api_key = api_key
         self.engine_id = engine_id
         self.base_url = "https://www.googleapis.com/customsearch/v1"
@@ -103,45 +148,45 @@ class GoogleCustomSearchAPI:
             }
             
             # Perform search
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.base_url, params=params) as response:
-                    if response.status != 200:
-                        logger.error(f"❌ Google search failed: {response.status}")
-                        return []
+            session = await self._get_session()
+            async with session.get(self.base_url, params=params) as response:
+                if response.status != 200:
+                    logger.error(f"❌ Google search failed: {response.status}")
+                    return []
                     
-                    data = await response.json()
+                data = await response.json()
                     
-                    # Update rate limit info
-                    if 'quotaLimit' in data.get('queries', {}).get('request', [{}])[0]:
-                        self.rate_limit_remaining = data['queries']['request'][0]['quotaLimit']
+                # Update rate limit info
+                if 'quotaLimit' in data.get('queries', {}).get('request', [{}])[0]:
+                    self.rate_limit_remaining = data['queries']['request'][0]['quotaLimit']
                     
-                    # Parse results
-                    results = []
-                    if 'items' in data:
-                        for i, item in enumerate(data['items']):
-                            result = SearchResult(
-                                result_id=f"google_{hashlib.md5(item['link'].encode()).hexdigest()}",
-                                title=item.get('title', ''),
-                                url=item['link'],
-                                description=item.get('snippet', ''),
-                                source_engine='google',
-                                relevance_score=self._calculate_google_relevance(item, i),
-                                content_type=self._determine_content_type(item),
-                                domain=urlparse(item['link']).netloc,
-                                search_query=query,
-                                result_rank=i + 1,
-                                metadata={
-                                    'displayLink': item.get('displayLink', ''),
-                                    'formattedUrl': item.get('formattedUrl', ''),
-                                    'pagemap': item.get('pagemap', {}),
-                                    'queries': data.get('queries', {})
-                                },
-                                discovered_at=datetime.now()
-                            )
-                            results.append(result)
+                # Parse results
+                results = []
+                if 'items' in data:
+                    for i, item in enumerate(data['items']):
+                        result = SearchResult(
+                            result_id=f"google_{hashlib.md5(item['link'].encode()).hexdigest()}",
+                            title=item.get('title', ''),
+                            url=item['link'],
+                            description=item.get('snippet', ''),
+                            source_engine='google',
+                            relevance_score=self._calculate_google_relevance(item, i),
+                            content_type=self._determine_content_type(item),
+                            domain=urlparse(item['link']).netloc,
+                            search_query=query,
+                            result_rank=i + 1,
+                            metadata={
+                                'displayLink': item.get('displayLink', ''),
+                                'formattedUrl': item.get('formattedUrl', ''),
+                                'pagemap': item.get('pagemap', {}),
+                                'queries': data.get('queries', {})
+                            },
+                            discovered_at=datetime.now()
+                        )
+                        results.append(result)
                     
-                    logger.info(f"✅ Google search completed: {len(results)} results for '{query}'")
-                    return results
+                logger.info(f"✅ Google search completed: {len(results)} results for '{query}'")
+                return results
                     
         except Exception as e:
             logger.error(f"❌ Google search error: {e}")
@@ -211,10 +256,13 @@ class GoogleCustomSearchAPI:
         
         return 'general'
 
-class BingWebSearchAPI:
+class BingWebSearchAPI(PooledSearchAPI):
     """Bing Web Search API integration"""
     
-    def __init__(self, api_key: str, endpoint: str = None):
+    name = 'bing'
+    
+    def __init__(self, api_key: str, endpoint: str = None, **session_options):
+        super().__init__(**session_options)
         self.api_key = api_key
         self.endpoint = endpoint or "https://api.bing.microsoft.com/v7.0/search"
         self.rate_limit_remaining = 100
@@ -247,44 +295,44 @@ class BingWebSearchAPI:
             }
             
             # Perform search
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.endpoint, headers=headers, params=params) as response:
-                    if response.status != 200:
-                        logger.error(f"❌ Bing search failed: {response.status}")
-                        return []
+            session = await self._get_session()
+            async with session.get(self.endpoint, headers=headers, params=params) as response:
+                if response.status != 200:
+                    logger.error(f"❌ Bing search failed: {response.status}")
+                    return []
                     
-                    data = await response.json()
+                data = await response.json()
                     
-                    # Parse results
-                    results = []
-                    if 'webPages' in data and 'value' in data['webPages']:
-                        for i, item in enumerate(data['webPages']['value']):
-                            result = SearchResult(
-                                result_id=f"bing_{hashlib.md5(item['url'].encode()).hexdigest()}",
-                                title=item.get('name', ''),
-                                url=item['url'],
-                                description=item.get('snippet', ''),
-                                source_engine='bing',
-                                relevance_score=self._calculate_bing_relevance(item, i),
-                                content_type=self._determine_content_type(item),
-                                domain=urlparse(item['url']).netloc,
-                                search_query=query,
-                                result_rank=i + 1,
-                                metadata={
-                                    'displayUrl': item.get('displayUrl', ''),
-                                    'dateLastCrawled': item.get('dateLastCrawled', ''),
-                                    'language': item.get('language', ''),
-                                    'isFamilyFriendly': item.get('isFamilyFriendly', False)
-                                },
-                                discovered_at=datetime.now()
-                            )
-                            results.append(results)
+                # Parse results
+                results = []
+                if 'webPages' in data and 'value' in data['webPages']:
+                    for i, item in enumerate(data['webPages']['value']):
+                        result = SearchResult(
+                            result_id=f"{self.name}_{hashlib.md5(item['url'].encode()).hexdigest()}",
+                            title=item.get('name', ''),
+                            url=item['url'],
+                            description=item.get('snippet', ''),
+                            source_engine=self.name,
+                            relevance_score=self._calculate_bing_relevance(item, i),
+                            content_type=self._determine_content_type(item),
+                            domain=urlparse(item['url']).netloc,
+                            search_query=query,
+                            result_rank=i + 1,
+                            metadata={
+                                'displayUrl': item.get('displayUrl', ''),
+                                'dateLastCrawled': item.get('dateLastCrawled', ''),
+                                'language': item.get('language', ''),
+                                'isFamilyFriendly': item.get('isFamilyFriendly', False)
+                            },
+                            discovered_at=datetime.now()
+                        )
+                        results.append(result)
                     
-                    logger.info(f"✅ Bing search completed: {len(results)} results for '{query}'")
-                    return results
+                logger.info(f"✅ {self.name.title()} search completed: {len(results)} results for '{query}'")
+                return results
                     
         except Exception as e:
-            logger.error(f"❌ Bing search error: {e}")
+            logger.error(f"❌ {self.name.title()} search error: {e}")
             return []
     
     def _calculate_bing_relevance(self, item: Dict[str, Any], rank: int) -> float:
@@ -351,6 +399,89 @@ class BingWebSearchAPI:
         
         return 'general'
 
+class LoopbackSearchAPI(BingWebSearchAPI):
+    """Stand-in engine speaking the Bing response format against a local endpoint
+    
+    Lets the multi-engine pipeline (fan-out, pooling, caching) be exercised and
+    benchmarked offline, e.g. against scripts/benchmark_search_engines.py.
+    """
+    
+    def __init__(self, endpoint: str, name: str = 'loopback', **session_options):
+        super().__init__(api_key='loopback', endpoint=endpoint, **session_options)
+        self.name = name
+
+class SearchResultCache:
+    """SQLite-backed TTL cache of per-engine search results keyed by normalized query"""
+    
+    def __init__(self, db_path: str, ttl: int = 3600):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # get() runs in worker threads
+        self._stats_lock = threading.Lock()
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_result_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    engine TEXT,
+                    query TEXT,
+                    results TEXT,
+                    created_at REAL,
+                    expires_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_expires ON search_result_cache (expires_at)")
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Case- and whitespace-insensitive form of a query"""
+        return ' '.join(query.lower().split())
+    
+    def _key(self, engine: str, query: str, max_results: int) -> str:
+        raw = f"{engine}|{self.normalize_query(query)}|{max_results}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def get(self, engine: str, query: str, max_results: int) -> Optional[List[SearchResult]]:
+        """Cached results, or None if absent or expired"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT results FROM search_result_cache WHERE cache_key = ? AND expires_at > ?",
+                (self._key(engine, query, max_results), time.time())
+            ).fetchone()
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        
+        results = []
+        for item in json.loads(row[0]):
+            item['discovered_at'] = datetime.fromisoformat(item['discovered_at'])
+            results.append(SearchResult(**item))
+        return results
+    
+    def put(self, engine: str, query: str, max_results: int, results: List[SearchResult]):
+        """Store an engine response (empty responses are not cached)"""
+        if not results:
+            return
+        now = time.time()
+        payload = json.dumps([asdict(r) for r in results], default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                INSERT INTO search_result_cache (cache_key, engine, query, results, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    results = excluded.results, created_at = excluded.created_at, expires_at = excluded.expires_at
+            """, (self._key(engine, query, max_results), engine, self.normalize_query(query), payload, now, now + self.ttl))
+            conn.execute("DELETE FROM search_result_cache WHERE expires_at <= ?", (now,))
+    
+    def clear(self):
+        """Drop every cached response"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM search_result_cache")
+
 class SearchEngineIntegration:
     """Main search engine integration orchestrator"""
     
@@ -359,12 +490,14 @@ class SearchEngineIntegration:
         self.config = config or SearchEngineConfig()
         self.google_search = None
         self.bing_search = None
+        self.engines: Dict[str, PooledSearchAPI] = {}
         
         # Initialize search engines
         self._init_search_engines()
         
         # Initialize database
         self._init_search_database()
+        self.result_cache = SearchResultCache(db_path, self.config.result_cache_ttl) if self.config.enable_result_cache else None
         
         # Search metrics
         self.search_metrics = {
@@ -373,7 +506,10 @@ class SearchEngineIntegration:
             'bing_searches': 0,
             'total_results': 0,
             'average_relevance': 0.0,
-            'duplicate_filtered': 0
+            'duplicate_filtered': 0,
+            'cache_hits': 0,
+            'engine_timeouts': 0,
+            'last_search_ms': 0.0
         }
     
     def _init_search_engines(self):
@@ -383,8 +519,10 @@ class SearchEngineIntegration:
             if len(self.config.google_custom_search_api_key) > 20:  # Basic validation
                 self.google_search = GoogleCustomSearchAPI(
                     self.config.google_custom_search_api_key,
-                    self.config.google_custom_search_engine_id
+                    self.config.google_custom_search_engine_id,
+                    max_connections=self.config.max_connections_per_engine
                 )
+                self.engines['google'] = self.google_search
                 logger.info("✅ Google Custom Search API initialized successfully")
                 logger.info(f"   API Key: {self.config.google_custom_search_api_key[:10]}...")
                 logger.info(f"   Engine ID: {self.config.google_custom_search_engine_id}")
@@ -396,7 +534,12 @@ class SearchEngineIntegration:
         # Check Bing Web Search API
         if self.config.enable_bing_search and self.config.bing_search_api_key:
             if len(self.config.bing_search_api_key) > 20:  # Basic validation
-                self.bing_search = BingWebSearchAPI(self.config.bing_search_api_key)
+                self.bing_search = BingWebSearchAPI(
+                    self.config.bing_search_api_key,
+                    self.config.bing_search_endpoint,
+                    max_connections=self.config.max_connections_per_engine
+                )
+                self.engines['bing'] = self.bing_search
                 logger.info("✅ Bing Web Search API initialized successfully")
                 logger.info(f"   API Key: {self.config.bing_search_api_key[:10]}...")
             else:
@@ -490,30 +633,69 @@ class SearchEngineIntegration:
             logger.error(f"❌ Failed to initialize search database: {e}")
             raise
     
+    def register_engine(self, engine: PooledSearchAPI):
+        """Add a search engine client (e.g. a LoopbackSearchAPI) under its name"""
+        self.engines[engine.name] = engine
+    
+    async def close(self):
+        """Close the pooled HTTP sessions of every engine"""
+        for engine in self.engines.values():
+            await engine.close()
+    
+    async def _search_engine(self, name: str, query: str, max_results: int) -> List[SearchResult]:
+        """Query one engine, answering from the result cache when possible"""
+        # The cache is synchronous SQLite; keep it off the event loop
+        if self.result_cache:
+            cached = await asyncio.to_thread(self.result_cache.get, name, query, max_results)
+            if cached is not None:
+                self.search_metrics['cache_hits'] += 1
+                logger.info(f"💾 {name.title()} results served from cache for '{query}'")
+                return cached
+        
+        logger.info(f"🔍 Searching {name.title()}...")
+        results = await self.engines[name].search(query, max_results)
+        self.search_metrics[f'{name}_searches'] = self.search_metrics.get(f'{name}_searches', 0) + 1
+        if self.result_cache:
+            await asyncio.to_thread(self.result_cache.put, name, query, max_results, results)
+        return results
+    
     async def perform_multi_engine_search(self, query: str, max_results: int = None, 
-                                        engines: List[str] = None) -> List[SearchResult]:
-        """Perform search across multiple search engines"""
+                                        engines: List[str] = None, timeout: float = None) -> List[SearchResult]:
+        """Perform search across multiple search engines
+        
+        Engines are queried concurrently; engines that miss the deadline are
+        cancelled and the search continues with whatever arrived in time.
+        """
         try:
+            start_time = time.perf_counter()
             max_results = max_results or self.config.max_results_per_query
-            engines = engines or ['google', 'bing']
+            engines = engines or list(self.engines)
+            timeout = timeout if timeout is not None else self.config.search_timeout
             
             logger.info(f"🔍 Performing multi-engine search: '{query}' (max: {max_results})")
             
-            all_results = []
-            
-            # Google search
-            if 'google' in engines and self.google_search:
-                logger.info("🔍 Searching Google...")
-                google_results = await self.google_search.search(query, max_results)
-                all_results.extend(google_results)
-                self.search_metrics['google_searches'] += 1
+            # Fan out to every requested engine at once
+            tasks = {
+                name: asyncio.create_task(self._search_engine(name, query, max_results))
+                for name in engines if name in self.engines
+            }
+            if tasks:
+                done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    self.search_metrics['engine_timeouts'] += len(pending)
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    late = [name for name, task in tasks.items() if task in pending]
+                    logger.warning(f"⏰ Search engines missed the {timeout}s deadline: {', '.join(late)}")
             
-            # Bing search
-            if 'bing' in engines and self.bing_search:
-                logger.info("🔍 Searching Bing...")
-                bing_results = await self.bing_search.search(query, max_results)
-                all_results.extend(bing_results)
-                self.search_metrics['bing_searches'] += 1
+            # Keep the requested engine order in the merged list
+            all_results = []
+            for name, task in tasks.items():
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    all_results.extend(task.result())
+                elif task.done() and not task.cancelled():
+                    logger.error(f"❌ {name.title()} search error: {task.exception()}")
             
             # Update metrics
             self.search_metrics['total_searches'] += 1
@@ -547,7 +729,9 @@ class SearchEngineIntegration:
                     self.search_metrics['total_searches']
                 )
             
-            logger.info(f"✅ Multi-engine search completed: {len(final_results)} results")
+            self.search_metrics['last_search_ms'] = (time.perf_counter() - start_time) * 1000
+            logger.info(f"✅ Multi-engine search completed: {len(final_results)} results "
+                        f"in {self.search_metrics['last_search_ms']:.0f}ms")
             return final_results
             
         except Exception as e:
@@ -649,7 +833,14 @@ class SearchEngineIntegration:
             'search_metrics': self.search_metrics,
             'engine_status': {
                 'google': self.google_search is not None,
-                'bing': self.bing_search is not None
+                'bing': self.bing_search is not None,
+                **{name: True for name in self.engines if name not in ('google', 'bing')}
+            },
+            'result_cache': {
+                'enabled': self.result_cache is not None,
+                'hits': self.result_cache.hits if self.result_cache else 0,
+                'misses': self.result_cache.misses if self.result_cache else 0,
+                'ttl': self.config.result_cache_ttl
             },
             'rate_limits': {
                 'google_remaining': self.google_search.rate_limit_remaining if self.google_search else 0,
@@ -670,10 +861,13 @@ async def main():
     integration = SearchEngineIntegration('brain_memory_store/brain.db', config)
     
     # Perform search
-    results = await integration.perform_multi_engine_search(
-        query="Model Context Protocol MCP documentation",
-        max_results=20
-    )
+    try:
+        results = await integration.perform_multi_engine_search(
+            query="Model Context Protocol MCP documentation",
+            max_results=20
+        )
+    finally:
+        await integration.close()
     
     print(f"Search completed: {len(results)} results")
     
@@ -13,6 +13,7 @@ import sqlite3
 import os
 
 from web_crawler.engine.web_crawler_engine import WebCrawler, CrawlConfig, LearningBit, BackgroundCrawlerManager
+from web_crawler.engine.content_fingerprint import dedup_statistics
 from integration import SymbioticIntegrationBridge
 from web_crawler.discovery.extensive_search_engine import MultiSiteDiscoveryEngine, DiscoveryConfig
 from web_crawler.search.search_engine_integration import SearchEngineIntegration, SearchEngineConfig
@@ -24,8 +25,10 @@ class WebCrawlerMCPTools:
     
     def __init__(self, db_path: str):
         """Initialize MCP tools with web crawler"""
+        self.db_path = db_path
         self.crawler = WebCrawler(db_path)
         self.background_manager = BackgroundCrawlerManager(db_path)
+        self._background_resumed = False
         self.symbiotic_bridge = SymbioticIntegrationBridge(db_path)
         self.extensive_search_engine = MultiSiteDiscoveryEngine(db_path)
         
@@ -40,6 +43,11 @@ class WebCrawlerMCPTools:
         logger.info("✅ Web crawler MCP tools initialized with background manager, symbiotic bridge, extensive search engine, and search engine integration")
         self.active_crawls: Dict[str, Dict[str, Any]] = {}
     
+    async def close(self):
+        """Shut down: close the crawler session and the pooled search engine sessions"""
+        await self.crawler.stop_session()
+        await self.search_engine_integration.close()
+    
     async def crawl_website(
         self,
         url: str,
@@ -357,7 +365,8 @@ class WebCrawlerMCPTools:
         📈 Get comprehensive statistics about extracted learning content
         
         Provides detailed statistics about the learning bits database including
-        counts by category, content type, complexity, and usage patterns.
+        counts by category, content type, complexity, usage patterns, and the
+        near-duplicate dedup ratio.
         
         Returns:
             Comprehensive learning content statistics
@@ -428,6 +437,9 @@ class WebCrawlerMCPTools:
                 """)
                 recent_bits = cursor.fetchone()[0]
                 
+                # Near-duplicate detection (SimHash)
+                deduplication = dedup_statistics(cursor, total_bits)
+                
                 return {
                     "success": True,
                     "total_learning_bits": total_bits,
@@ -444,6 +456,8 @@ class WebCrawlerMCPTools:
                     "recent_activity": {
                         "bits_last_7_days": recent_bits
                     },
+                    "dedup_ratio": deduplication["dedup_ratio"],
+                    "deduplication": deduplication,
                     "database_info": {
                         "path": self.db_path,
                         "last_updated": datetime.now().isoformat()
@@ -598,9 +612,16 @@ class WebCrawlerMCPTools:
                 "message": "Failed to generate comprehensive learning report"
             }
     
+    async def _resume_background_crawls(self):
+        """Pick up crawl jobs persisted by a previous server run (once, on first use)"""
+        if not self._background_resumed:
+            self._background_resumed = True
+            await self.background_manager.resume_crawls()
+    
     async def start_background_crawl(self, job_id: str, start_url: str, config: Dict[str, Any] = None) -> Dict[str, Any]:
         """Start a background crawl job"""
         try:
+            await self._resume_background_crawls()
             result = await self.background_manager.start_background_crawl(job_id, start_url, config)
             return {
                 "success": True,
@@ -617,6 +638,7 @@ class WebCrawlerMCPTools:
     async def get_background_crawl_status(self, job_id: str = None) -> Dict[str, Any]:
         """Get status of background crawls"""
         try:
+            await self._resume_background_crawls()
             status = self.background_manager.get_crawl_status(job_id)
             return {
                 "success": True,